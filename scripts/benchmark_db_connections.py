@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite connection handling for hot public endpoints.
+
+Compares the legacy behaviour of get_db_connection() (a fresh sqlite3.connect
+plus three PRAGMAs and an INFO log line on every call) with the pooled
+connections from src/db_pool.py, and reports connections opened per request
+and p50/p99 request latency.
+
+Runs against a throwaway copy of the schema seeded with synthetic draws and
+tickets, so it never touches the production database.
+
+Usage:
+    python scripts/benchmark_db_connections.py [--requests 500]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger  # noqa: E402
+
+import src.database as db  # noqa: E402
+from src import db_pool  # noqa: E402
+
+ENDPOINTS = [
+    "/api/v1/public/predictions/by-draw/{draw_date}",
+    "/api/v1/public/recent-draws?limit=20",
+]
+
+
+def seed_database(path: str, draws: int = 1500, tickets_per_draw: int = 50) -> str:
+    """Create the schema and synthetic data; returns the latest draw date."""
+    db.get_db_path = lambda: path
+    db.initialize_database()
+
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    day = time.mktime((2010, 1, 2, 0, 0, 0, 0, 0, -1))
+    draw_rows = []
+    for i in range(draws):
+        date = time.strftime("%Y-%m-%d", time.localtime(day + i * 3 * 86400))
+        draw_rows.append((date, *sorted(rng.sample(range(1, 70), 5)), rng.randint(1, 26)))
+    conn.executemany(
+        "INSERT OR REPLACE INTO powerball_draws (draw_date, n1, n2, n3, n4, n5, pb) VALUES (?,?,?,?,?,?,?)",
+        draw_rows,
+    )
+    ticket_rows = []
+    for date, *_ in draw_rows[-25:]:
+        for _ in range(tickets_per_draw):
+            ticket_rows.append((date, "frequency_weighted", *sorted(rng.sample(range(1, 70), 5)),
+                                rng.randint(1, 26), rng.random()))
+    conn.executemany(
+        "INSERT INTO generated_tickets (draw_date, strategy_used, n1, n2, n3, n4, n5, powerball, confidence_score)"
+        " VALUES (?,?,?,?,?,?,?,?,?)",
+        ticket_rows,
+    )
+    conn.commit()
+    conn.close()
+    return draw_rows[-1][0]
+
+
+def legacy_acquire(self):
+    """Replica of the pre-pool get_db_connection() body."""
+    conn = sqlite3.connect(self.db_path, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA foreign_keys=ON")
+    except Exception:
+        pass
+    logger.info(f"Successfully connected to database at {self.db_path}")
+    self.stats["created"] += 1
+    return conn
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(client, path: str, draw_date: str, requests: int) -> dict:
+    pools = [db_pool.get_pool(path), db_pool.get_pool(path, read_only=True)]
+    created_before = sum(p.stats["created"] for p in pools)
+    latencies = {endpoint: [] for endpoint in ENDPOINTS}
+
+    for _ in range(requests):
+        for endpoint in ENDPOINTS:
+            url = endpoint.format(draw_date=draw_date)
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies[endpoint].append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, (url, response.status_code, response.text[:200])
+
+    created = sum(p.stats["created"] for p in pools) - created_before
+    return {
+        "connections_per_request": created / (requests * len(ENDPOINTS)),
+        "latency": {
+            endpoint: (percentile(samples, 50), percentile(samples, 99), statistics.mean(samples))
+            for endpoint, samples in latencies.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and mode")
+    args = parser.parse_args()
+
+    # Keep the legacy INFO line (it is part of the old per-call cost) but send it nowhere
+    logger.remove()
+    logger.add(lambda _msg: None, level="INFO")
+
+    from fastapi.testclient import TestClient
+    import src.api as api
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        draw_date = seed_database(path)
+        client = TestClient(api.app)
+
+        pooled_acquire = db_pool.ConnectionPool.acquire
+        db_pool.ConnectionPool.acquire = legacy_acquire
+        try:
+            client.get(ENDPOINTS[1])  # warm imports/caches
+            before = run(client, path, draw_date, args.requests)
+        finally:
+            db_pool.ConnectionPool.acquire = pooled_acquire
+
+        client.get(ENDPOINTS[1])
+        after = run(client, path, draw_date, args.requests)
+        db_pool.close_all_pools()
+
+    print("\n" + "=" * 78)
+    print(f"SQLite connection benchmark ({args.requests} requests per endpoint)")
+    print("=" * 78)
+    for label, result in (("before (connect per call)", before), ("after (pooled)", after)):
+        print(f"\n{label}: {result['connections_per_request']:.2f} new connections per request")
+        for endpoint, (p50, p99, mean) in result["latency"].items():
+            print(f"  {endpoint:50s} p50 {p50:7.2f}ms  p99 {p99:7.2f}ms  mean {mean:7.2f}ms")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bitmask prize kernel against the legacy per-ticket loop.
+
+Two scenarios:
+  1. 1M tickets scored against a single draw (ticket evaluation, analytics)
+  2. 10k tickets scored against the full draw history (~1,900 draws)
+
+The legacy loop (set intersection + calculate_prize_amount per pair) is timed
+on a sample and extrapolated, since running it on every pair takes minutes.
+Tickets and draws are synthetic; no database is touched.
+
+Usage:
+    python scripts/benchmark_prize_kernel.py [--tickets 1000000] [--history-tickets 10000] [--draws 1900]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import calculate_prize_amount  # noqa: E402
+from src.prize_kernel import score_history, score_tickets  # noqa: E402
+
+
+def random_tickets(n: int, rng: np.random.Generator):
+    numbers = np.sort(np.argsort(rng.random((n, 69)), axis=1)[:, :5] + 1, axis=1)
+    return numbers, rng.integers(1, 27, size=n)
+
+
+def legacy_score(numbers, powerball, winning_numbers, winning_pb) -> float:
+    """Replica of the per-ticket loops the kernel replaced."""
+    total = 0.0
+    winning = set(winning_numbers)
+    for nums, pb in zip(numbers, powerball):
+        matches = len(set(nums) & winning)
+        amount, _ = calculate_prize_amount(matches, pb == winning_pb)
+        total += amount
+    return total
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=1_000_000, help="Tickets scored against one draw")
+    parser.add_argument("--history-tickets", type=int, default=10_000, help="Tickets scored against the history")
+    parser.add_argument("--draws", type=int, default=1900, help="Draws in the synthetic history")
+    parser.add_argument("--legacy-sample", type=int, default=100_000, help="Pairs timed for the legacy loop")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print("\n" + "=" * 78)
+    print("Prize kernel benchmark")
+    print("=" * 78)
+
+    # Scenario 1: many tickets, one draw
+    numbers, powerball = random_tickets(args.tickets, rng)
+    draw, draw_pb = random_tickets(1, rng)
+    scores, kernel_s = timed(score_tickets, numbers, powerball, draw[0], int(draw_pb[0]), calculate_prize_amount)
+
+    sample = min(args.legacy_sample, args.tickets)
+    legacy_total, legacy_s = timed(
+        legacy_score, numbers[:sample].tolist(), powerball[:sample].tolist(), draw[0].tolist(), int(draw_pb[0])
+    )
+    assert legacy_total == float(scores.prize_amount[:sample].sum())
+    legacy_s *= args.tickets / sample
+
+    print(f"\n{args.tickets:,} tickets x 1 draw")
+    print(f"  legacy loop (extrapolated) {legacy_s * 1000:10.1f}ms")
+    print(f"  bitmask kernel             {kernel_s * 1000:10.1f}ms  ({legacy_s / kernel_s:.0f}x)")
+    print(f"  throughput                 {args.tickets / kernel_s / 1e6:10.1f}M pairs/s")
+
+    # Scenario 2: tickets against the full history
+    tickets, tickets_pb = random_tickets(args.history_tickets, rng)
+    draws, draws_pb = random_tickets(args.draws, rng)
+    history, kernel_s = timed(score_history, tickets, tickets_pb, draws, draws_pb, calculate_prize_amount)
+    pairs = args.history_tickets * args.draws
+
+    sample_tickets = max(1, min(args.history_tickets, args.legacy_sample // args.draws))
+    start = time.perf_counter()
+    for j in range(args.draws):
+        legacy_score(tickets[:sample_tickets].tolist(), tickets_pb[:sample_tickets].tolist(),
+                     draws[j].tolist(), int(draws_pb[j]))
+    legacy_s = (time.perf_counter() - start) * args.history_tickets / sample_tickets
+
+    print(f"\n{args.history_tickets:,} tickets x {args.draws:,} draws ({pairs:,} pairs)")
+    print(f"  legacy loop (extrapolated) {legacy_s * 1000:10.1f}ms")
+    print(f"  bitmask kernel             {kernel_s * 1000:10.1f}ms  ({legacy_s / kernel_s:.0f}x)")
+    print(f"  throughput                 {pairs / kernel_s / 1e6:10.1f}M pairs/s")
+    print(f"  tier counts                {history.tier_counts().tolist()}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
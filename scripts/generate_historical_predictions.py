@@ -73,7 +73,7 @@ def generate_predictions_for_date(draw_date: str, total_tickets: int = 500) -> i
     # Generate tickets using StrategyManager
     # CRITICAL: Pass max_date to prevent data leakage
     manager = StrategyManager(max_date=draw_date)
-    tickets = manager.generate_balanced_tickets(total=total_tickets)
+    tickets = manager.generate_balanced_tickets(total=total_tickets, load_timeout=None)
     
     logger.info(f"✅ {len(tickets)} tickets generated by StrategyManager")
     
@@ -64,7 +64,7 @@ def generate_predictions(draw_date: str, total_tickets: int = 500) -> int:
     # CRITICAL: Pass max_date to prevent data leakage
     # Only use draws that occurred BEFORE the target draw date
     manager = StrategyManager(max_date=draw_date)
-    tickets = manager.generate_balanced_tickets(total=total_tickets)
+    tickets = manager.generate_balanced_tickets(total=total_tickets, load_timeout=None)
     
     logger.info(f"✅ Generated {len(tickets)} tickets by StrategyManager")
     
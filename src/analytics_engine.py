@@ -4,11 +4,107 @@ SHIOL+ Analytics Engine
 Advanced statistical analysis for Powerball historical data.
 """
 
+import hashlib
+import json
+import sqlite3
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field, asdict
+from itertools import combinations
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from src.database import get_db_connection, get_all_draws
+from src.frequency_index import get_frequency_index, last_seen_rows, number_counts
+
+# Key of the incremental accumulator row in the analytics_state table
+ANALYTICS_STATE_KEY = 'pattern_cooccurrence_accumulators'
+TOTAL_PAIRS = 69 * 68 // 2
+
+
+@dataclass
+class AnalyticsAccumulator:
+    """
+    Running accumulators behind the cooccurrences and pattern_stats tables.
+
+    Holds raw moments (count, sum, sum of squares) for the sum/range/gap
+    patterns and low/mid/high totals, plus a fingerprint of the processed
+    draw history so corrections or deletions can be detected.
+    """
+    draw_count: int = 0
+    last_draw_day: Optional[int] = None
+    fingerprint: str = ''
+    sum_moments: List[float] = field(default_factory=lambda: [0.0, 0.0])
+    range_moments: List[float] = field(default_factory=lambda: [0.0, 0.0])
+    gap_moments: List[float] = field(default_factory=lambda: [0.0, 0.0])
+    low_total: int = 0
+    mid_total: int = 0
+    high_total: int = 0
+
+    @staticmethod
+    def history_fingerprint(days: np.ndarray, numbers: np.ndarray) -> str:
+        """Hash of (day, n1..n5, pb) for every processed draw."""
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(days, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(numbers, dtype=np.int64).tobytes())
+        return digest.hexdigest()
+
+    def add(self, days: np.ndarray, numbers: np.ndarray) -> None:
+        """
+        Fold new draws into the accumulators.
+
+        Args:
+            days: (K,) int day ordinals of the new draws, ascending
+            numbers: (K, 6) int matrix of [n1..n5, pb] as stored
+        """
+        if len(days) == 0:
+            return
+        white = numbers[:, :5]
+        sums = white.sum(axis=1)
+        ranges = white[:, 4] - white[:, 0]
+        gaps = ranges / 4  # mean of the four consecutive spacings telescopes to (n5 - n1) / 4
+
+        for moments, values in ((self.sum_moments, sums), (self.range_moments, ranges), (self.gap_moments, gaps)):
+            moments[0] += float(values.sum())
+            moments[1] += float((values.astype(float) ** 2).sum())
+
+        self.low_total += int((white <= 23).sum())
+        self.mid_total += int(((white >= 24) & (white <= 46)).sum())
+        self.high_total += int((white >= 47).sum())
+
+        self.draw_count += len(days)
+        self.last_draw_day = int(days[-1])
+
+    @staticmethod
+    def _mean_std(moments: List[float], n: int) -> Tuple[float, float]:
+        mean = moments[0] / n
+        variance = max(moments[1] / n - mean ** 2, 0.0)
+        return float(mean), float(np.sqrt(variance))
+
+    def pattern_statistics(self) -> Dict[str, Dict]:
+        """Mean/std figures persisted to pattern_stats, derived from the moments."""
+        n = self.draw_count
+        if n == 0:
+            return {}
+        sum_mean, sum_std = self._mean_std(self.sum_moments, n)
+        range_mean, range_std = self._mean_std(self.range_moments, n)
+        gap_mean, gap_std = self._mean_std(self.gap_moments, n)
+        return {
+            'sum': {'mean': sum_mean, 'std': sum_std},
+            'range': {'mean': range_mean, 'std': range_std},
+            'gaps': {'mean': gap_mean, 'std': gap_std},
+            'distribution': {
+                'low_mean': self.low_total / n,
+                'mid_mean': self.mid_total / n,
+                'high_mean': self.high_total / n
+            }
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'AnalyticsAccumulator':
+        return cls(**json.loads(payload))
 
 
 class AnalyticsEngine:
@@ -51,37 +147,100 @@ class AnalyticsEngine:
 
         return sorted(nums)
 
+    def _valid_white_balls(self) -> np.ndarray:
+        """
+        Vectorized counterpart of _safe_get_numbers for the whole history.
+
+        Returns:
+            np.ndarray: (N_valid, 5) int matrix of sorted white balls, with rows that
+                        are incomplete, out of range 1-69 or contain duplicates dropped
+        """
+        cols = ['n1', 'n2', 'n3', 'n4', 'n5']
+        if self.draws_df.empty or not set(cols).issubset(self.draws_df.columns):
+            return np.empty((0, 5), dtype=np.int64)
+
+        values = self.draws_df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        complete = ~np.isnan(values).any(axis=1)
+        numbers = np.sort(np.where(complete[:, None], values, 0).astype(np.int64), axis=1)
+
+        in_range = ((numbers >= 1) & (numbers <= 69)).all(axis=1)
+        unique = (np.diff(numbers, axis=1) != 0).all(axis=1)
+        valid = complete & in_range & unique
+
+        skipped = len(numbers) - int(valid.sum())
+        if skipped:
+            logger.debug(f"Skipping {skipped} draws with invalid white balls")
+        return numbers[valid]
+
+    def _one_hot_draws(self) -> np.ndarray:
+        """
+        Build the (N x 69) one-hot draw matrix X where X[d, n-1] = 1 if number n was drawn in d.
+
+        float32 keeps the X.T @ X product on BLAS and is exact for counts below 2^24.
+        """
+        numbers = self._valid_white_balls()
+        one_hot = np.zeros((len(numbers), 69), dtype=np.float32)
+        one_hot[np.arange(len(numbers))[:, None], numbers - 1] = 1.0
+        return one_hot
+
     def calculate_cooccurrence_matrix(self) -> np.ndarray:
         """
         Calculate 69x69 matrix of how often number pairs appear together.
-        
+
+        Computed as a single X.T @ X product over the one-hot draw matrix; the
+        diagonal (single-number frequency) is zeroed so only pairs remain.
+
         Returns:
             np.ndarray: Symmetric matrix where [i][j] = count of times i and j appeared together
         """
-        matrix = np.zeros((69, 69), dtype=int)
-
-        # Use safe accessor to avoid invalid historical entries
-        total = len(self.draws_df)
-        for idx, (_, draw) in enumerate(self.draws_df.iterrows(), start=1):
-            numbers = self._safe_get_numbers(draw)
-            if not numbers:
-                continue
-
-            # For each pair in this draw
-            for i in range(len(numbers)):
-                for j in range(i + 1, len(numbers)):
-                    num_a = min(numbers[i], numbers[j]) - 1  # 0-indexed
-                    num_b = max(numbers[i], numbers[j]) - 1
-                    matrix[num_a][num_b] += 1
-                    matrix[num_b][num_a] += 1  # Symmetric
-
-            # Progress logging for long runs
-            if idx % 100 == 0 or idx == total:
-                logger.info(f"Co-occurrence progress: processed {idx}/{total} draws")
-
-        logger.info("Co-occurrence matrix calculated")
+        one_hot = self._one_hot_draws()
+        matrix = np.rint(one_hot.T @ one_hot).astype(int)
+        np.fill_diagonal(matrix, 0)
+
+        logger.info(f"Co-occurrence matrix calculated from {len(one_hot)} draws")
         return matrix
 
+    def calculate_top_triples(self, top_k: int = 50) -> List[Dict[str, Any]]:
+        """
+        Find the most frequent number triples (sparse top-k).
+
+        Each draw contributes its C(5,3) = 10 triples, encoded as a single
+        integer key, so only triples that actually occurred are counted
+        instead of materializing a dense 69x69x69 tensor.
+
+        Args:
+            top_k: Number of triples to return
+
+        Returns:
+            List of dicts (numbers, count, expected, deviation_pct), most frequent first
+        """
+        numbers = self._valid_white_balls()
+        total_draws = len(numbers)
+        if total_draws == 0 or top_k <= 0:
+            return []
+
+        idx = np.array(list(combinations(range(5), 3)))  # (10, 3)
+        triples = numbers[:, idx].reshape(-1, 3)          # rows are already sorted
+        keys = (triples[:, 0] * 70 + triples[:, 1]) * 70 + triples[:, 2]
+        unique_keys, counts = np.unique(keys, return_counts=True)
+
+        k = min(top_k, len(unique_keys))
+        top = np.argpartition(-counts, k - 1)[:k]
+        top = top[np.lexsort((unique_keys[top], -counts[top]))]
+
+        # P(A, B and C in the same draw) = (5/69) * (4/68) * (3/67)
+        expected = (5/69) * (4/68) * (3/67) * total_draws
+        results = []
+        for key, count in zip(unique_keys[top], counts[top]):
+            key = int(key)
+            results.append({
+                'numbers': [key // 4900, (key // 70) % 70, key % 70],
+                'count': int(count),
+                'expected': expected,
+                'deviation_pct': float((count - expected) / expected * 100)
+            })
+        return results
+
     def save_cooccurrence_to_db(self):
         """Save co-occurrence data to database with statistical analysis"""
         matrix = self.calculate_cooccurrence_matrix()
@@ -101,17 +260,16 @@ class AnalyticsEngine:
         # Clear existing data
         cursor.execute("DELETE FROM cooccurrences")
 
-        records = []
-        for i in range(69):
-            for j in range(i + 1, 69):  # Only upper triangle (avoid duplicates)
-                count = int(matrix[i][j])
-                expected = expected_per_pair
-                deviation_pct = ((count - expected) / expected * 100) if expected > 0 else 0
-                is_significant = abs(deviation_pct) > 20  # >20% deviation is significant
+        # Only upper triangle (avoid duplicates)
+        rows, cols = np.triu_indices(69, k=1)
+        counts = matrix[rows, cols]
+        deviation_pct = (counts - expected_per_pair) / expected_per_pair * 100
+        is_significant = np.abs(deviation_pct) > 20  # >20% deviation is significant
 
-                records.append((
-                    i + 1, j + 1, count, expected, deviation_pct, is_significant
-                ))
+        records = list(zip(
+            (rows + 1).tolist(), (cols + 1).tolist(), counts.tolist(),
+            [expected_per_pair] * len(counts), deviation_pct.tolist(), is_significant.tolist()
+        ))
 
         cursor.executemany("""
             INSERT INTO cooccurrences (number_a, number_b, count, expected, deviation_pct, is_significant)
@@ -133,92 +291,17 @@ class AnalyticsEngine:
             logger.warning("Cannot calculate patterns: no draws available")
             return {}
 
-        patterns = {}
-
-        # 1. Sum distribution (sum of 5 white balls)
-        sums = []
-        for _, draw in self.draws_df.iterrows():
-            total = draw['n1'] + draw['n2'] + draw['n3'] + draw['n4'] + draw['n5']
-            sums.append(total)
-
-        patterns['sum'] = {
-            'mean': float(np.mean(sums)),
-            'std': float(np.std(sums)),
-            'min': int(np.min(sums)),
-            'max': int(np.max(sums)),
-            'typical_range': (float(np.percentile(sums, 16)), float(np.percentile(sums, 84)))  # ±1σ
-        }
-
-        # 2. Range distribution (max - min)
-        ranges = []
-        for _, draw in self.draws_df.iterrows():
-            r = draw['n5'] - draw['n1']
-            ranges.append(r)
-
-        patterns['range'] = {
-            'mean': float(np.mean(ranges)),
-            'std': float(np.std(ranges)),
-            'typical_range': (float(np.percentile(ranges, 16)), float(np.percentile(ranges, 84)))
-        }
-
-        # 3. Gap analysis (average spacing between consecutive numbers)
-        gaps = []
-        for _, draw in self.draws_df.iterrows():
-            numbers = [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]
-            draw_gaps = [numbers[i+1] - numbers[i] for i in range(4)]
-            gaps.append(np.mean(draw_gaps))
-
-        patterns['gaps'] = {
-            'mean': float(np.mean(gaps)),
-            'std': float(np.std(gaps)),
-            'typical_range': (float(np.percentile(gaps, 16)), float(np.percentile(gaps, 84)))
-        }
-
-        # 4. Low/Mid/High distribution (1-23 low, 24-46 mid, 47-69 high)
-        distributions = {'low': [], 'mid': [], 'high': []}
-        for _, draw in self.draws_df.iterrows():
-            numbers = [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]
-            low = sum(1 for n in numbers if n <= 23)
-            mid = sum(1 for n in numbers if 24 <= n <= 46)
-            high = sum(1 for n in numbers if n >= 47)
-            distributions['low'].append(low)
-            distributions['mid'].append(mid)
-            distributions['high'].append(high)
-
-        patterns['distribution'] = {
-            'low_mean': float(np.mean(distributions['low'])),
-            'mid_mean': float(np.mean(distributions['mid'])),
-            'high_mean': float(np.mean(distributions['high']))
-        }
-
+        patterns = _pattern_statistics(DrawMatrix.from_dataframe(self.draws_df))
         logger.info("Pattern statistics calculated")
         return patterns
 
-    def save_patterns_to_db(self):
-        """Save pattern statistics to database"""
-        patterns = self.calculate_pattern_statistics()
-
-        if not patterns:
-            logger.warning("No patterns to save")
-            return
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Log era distribution for pattern analysis
-        current_era_count = len(self.draws_df[
-            (self.draws_df['pb'] >= 1) & (self.draws_df['pb'] <= 26)
-        ])
-        logger.info(f"Pattern analysis using {len(self.draws_df)} draws ({current_era_count} current-era for PB-specific patterns)")
-
-        cursor.execute("DELETE FROM pattern_stats")
-
+    @staticmethod
+    def _pattern_records(patterns: Dict[str, Dict]) -> List[tuple]:
+        """Rows written to pattern_stats for a set of pattern statistics."""
         records = []
 
         # Sum patterns
         for percentile in [10, 25, 50, 75, 90]:
-            sums = [d['n1']+d['n2']+d['n3']+d['n4']+d['n5'] for _, d in self.draws_df.iterrows()]
-            _ = np.percentile(sums, percentile)
             records.append(('sum', f'p{percentile}', 0, percentile/100, True,
                           patterns['sum']['mean'], patterns['sum']['std']))
 
@@ -237,17 +320,315 @@ class AnalyticsEngine:
                        patterns['distribution']['mid_mean'], 0))
         records.append(('distribution', 'high_mean', 0, 0, True,
                        patterns['distribution']['high_mean'], 0))
+        return records
 
+    @staticmethod
+    def _write_pattern_records(cursor, records: List[tuple]) -> None:
+        cursor.execute("DELETE FROM pattern_stats")
         cursor.executemany("""
             INSERT INTO pattern_stats (pattern_type, pattern_value, frequency, percentage, 
                                       is_typical, mean_value, std_dev)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, records)
 
+    def save_patterns_to_db(self):
+        """Save pattern statistics to database"""
+        patterns = self.calculate_pattern_statistics()
+
+        if not patterns:
+            logger.warning("No patterns to save")
+            return
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # Log era distribution for pattern analysis
+        current_era_count = len(self.draws_df[
+            (self.draws_df['pb'] >= 1) & (self.draws_df['pb'] <= 26)
+        ])
+        logger.info(f"Pattern analysis using {len(self.draws_df)} draws ({current_era_count} current-era for PB-specific patterns)")
+
+        records = self._pattern_records(patterns)
+        self._write_pattern_records(cursor, records)
+
         conn.commit()
         conn.close()
         logger.info(f"Saved {len(records)} pattern statistics to database")
 
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+    def _history_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(N,) day ordinals and (N, 6) [n1..n5, pb] matrix of the loaded history."""
+        if self.draws_df.empty:
+            return np.empty(0, dtype=np.int64), np.empty((0, 6), dtype=np.int64)
+        days = pd.to_datetime(self.draws_df['draw_date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+        numbers = self.draws_df[['n1', 'n2', 'n3', 'n4', 'n5', 'pb']].to_numpy(dtype=np.int64)
+        return days, numbers
+
+    def build_accumulator(self) -> AnalyticsAccumulator:
+        """Build accumulators from the full loaded history."""
+        days, numbers = self._history_arrays()
+        accumulator = AnalyticsAccumulator()
+        accumulator.add(days, numbers)
+        accumulator.fingerprint = AnalyticsAccumulator.history_fingerprint(days, numbers)
+        return accumulator
+
+    @staticmethod
+    def _load_accumulator(cursor) -> Optional[AnalyticsAccumulator]:
+        cursor.execute("SELECT value FROM analytics_state WHERE key = ?", (ANALYTICS_STATE_KEY,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return AnalyticsAccumulator.from_json(row[0])
+
+    @staticmethod
+    def _save_accumulator(cursor, accumulator: AnalyticsAccumulator) -> None:
+        cursor.execute("""
+            INSERT OR REPLACE INTO analytics_state (key, value, last_updated)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+        """, (ANALYTICS_STATE_KEY, accumulator.to_json()))
+
+    def save_accumulator_to_db(self) -> None:
+        """Persist accumulators for the full history (after a full rebuild)."""
+        conn = get_db_connection()
+        try:
+            self._save_accumulator(conn.cursor(), self.build_accumulator())
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist analytics accumulators, next run will rebuild: {e}")
+        finally:
+            conn.close()
+
+    def update_incremental(self) -> bool:
+        """
+        Apply only the draws added since the last run to cooccurrences and pattern_stats.
+
+        Each new draw bumps exactly its 10 pair counts; expected/deviation_pct
+        are then refreshed for all pairs with one set-based UPDATE, and pattern
+        rows are rewritten from the running moments.
+
+        Returns:
+            True if the tables are up to date, False if a full rebuild is needed
+            (no accumulator yet, missing pair rows, or a processed draw was
+            corrected or deleted).
+        """
+        days, numbers = self._history_arrays()
+        if len(days) == 0:
+            return False
+
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                accumulator = self._load_accumulator(cursor)
+                cursor.execute("SELECT COUNT(*) FROM cooccurrences")
+                pair_rows = int(cursor.fetchone()[0])
+            except (sqlite3.Error, TypeError, ValueError, KeyError) as e:
+                logger.warning(f"Unreadable analytics accumulator state ({e}), full rebuild required")
+                return False
+
+            if accumulator is None or accumulator.last_draw_day is None:
+                logger.info("No analytics accumulator state yet, full rebuild required")
+                return False
+            if pair_rows != TOTAL_PAIRS:
+                logger.info(f"cooccurrences has {pair_rows}/{TOTAL_PAIRS} rows, full rebuild required")
+                return False
+
+            processed = int(np.searchsorted(days, accumulator.last_draw_day, side='right'))
+            if (processed != accumulator.draw_count or
+                    AnalyticsAccumulator.history_fingerprint(days[:processed], numbers[:processed]) != accumulator.fingerprint):
+                logger.info("Previously processed draws were corrected or deleted, full rebuild required")
+                return False
+
+            new_days, new_numbers = days[processed:], numbers[processed:]
+            if len(new_days) == 0:
+                logger.info("Analytics already up to date, nothing to apply")
+                return True
+
+            # Pair counts: only the 10 pairs of each valid new draw
+            white = np.sort(new_numbers[:, :5], axis=1)
+            valid = ((white >= 1) & (white <= 69)).all(axis=1) & (np.diff(white, axis=1) != 0).all(axis=1)
+            pairs = [(int(a), int(b)) for row in white[valid] for a, b in combinations(row, 2)]
+            cursor.executemany("""
+                UPDATE cooccurrences SET count = count + 1, last_updated = CURRENT_TIMESTAMP
+                WHERE number_a = ? AND number_b = ?
+            """, pairs)
+
+            # Expected frequency moves with the draw count for every pair: one set-based UPDATE
+            expected_per_pair = (5/69) * (4/68) * len(days)
+            cursor.execute("""
+                UPDATE cooccurrences
+                SET expected = :expected,
+                    deviation_pct = (count - :expected) / :expected * 100,
+                    is_significant = ABS((count - :expected) / :expected * 100) > 20
+            """, {'expected': expected_per_pair})
+
+            accumulator.add(new_days, new_numbers)
+            accumulator.fingerprint = AnalyticsAccumulator.history_fingerprint(days, numbers)
+            self._write_pattern_records(cursor, self._pattern_records(accumulator.pattern_statistics()))
+            self._save_accumulator(cursor, accumulator)
+            conn.commit()
+
+            logger.info(f"Incremental analytics applied {len(new_days)} new draw(s) "
+                        f"({len(pairs)} pair updates), total {accumulator.draw_count} draws")
+            return True
+        finally:
+            conn.close()
+
+
+_DAY_NS = np.int64(86_400_000_000_000)
+
+
+@dataclass(frozen=True)
+class DrawMatrix:
+    """
+    Draw history as arrays, built once and shared by the analytics functions.
+
+    Rows keep the DataFrame order and numbers keep their column order, so
+    every statistic matches the row-by-row definitions exactly.
+    """
+    dates: np.ndarray    # Shape: (N,), int64 nanoseconds since epoch
+    white: np.ndarray    # Shape: (N, 5), int64 [n1..n5]
+    pb: np.ndarray       # Shape: (N,), int64
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'DrawMatrix':
+        if df.empty:
+            return cls(np.empty(0, np.int64), np.empty((0, 5), np.int64), np.empty(0, np.int64))
+        return cls(
+            dates=pd.to_datetime(df['draw_date']).to_numpy(dtype='datetime64[ns]').astype(np.int64),
+            white=df[['n1', 'n2', 'n3', 'n4', 'n5']].to_numpy(dtype=np.int64),
+            pb=df['pb'].to_numpy(dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+    def days_ago(self) -> np.ndarray:
+        """Whole days between each draw and the most recent one (Timedelta.days semantics)."""
+        return (self.dates.max() - self.dates) // _DAY_NS
+
+    def sorted_by_date(self) -> 'DrawMatrix':
+        if np.all(self.dates[1:] >= self.dates[:-1]):
+            return self
+        order = np.argsort(self.dates, kind='stable')
+        return DrawMatrix(self.dates[order], self.white[order], self.pb[order])
+
+
+def _current_era(pb: np.ndarray) -> np.ndarray:
+    return (pb >= 1) & (pb <= 26)
+
+
+def _gap_analysis(draws: DrawMatrix) -> Dict[str, Dict[int, int]]:
+    days_ago = draws.days_ago()
+
+    def gaps(numbers: np.ndarray, max_num: int) -> Dict[int, int]:
+        # Later rows win like the chronological dict updates
+        last_row = last_seen_rows(numbers, max_num)
+        result = np.where(last_row >= 0, days_ago[last_row], 999)  # 999 = never appeared
+        return {num: int(result[num - 1]) for num in range(1, max_num + 1)}
+
+    # Powerball: only current era (1-26) counts
+    pb = np.where(_current_era(draws.pb), draws.pb, 0)
+    return {
+        'white_balls': gaps(draws.white, 69),
+        'powerball': gaps(pb, 26)
+    }
+
+
+def _temporal_frequencies(draws: DrawMatrix, decay_rate: float) -> Dict[str, np.ndarray]:
+    weights = np.exp(-decay_rate * draws.days_ago())
+    white_ball_freq = number_counts(draws.white, 69, weights)
+    powerball_freq = number_counts(draws.pb, 26, weights)
+
+    # Normalize to probabilities
+    wb_total = white_ball_freq.sum()
+    white_ball_freq = white_ball_freq / wb_total if wb_total > 0 else np.ones(69) / 69
+    pb_total = powerball_freq.sum()
+    powerball_freq = powerball_freq / pb_total if pb_total > 0 else np.ones(26) / 26
+    return {
+        'white_balls': white_ball_freq,
+        'powerball': powerball_freq
+    }
+
+
+def _momentum_scores(draws: DrawMatrix, window: int) -> Dict[str, Dict[int, float]]:
+    n_draws = len(draws)
+    if n_draws == 0 or n_draws < window:
+        logger.warning(f"Insufficient data for momentum analysis (need {window} draws, have {n_draws})")
+        # Return neutral momentum (0.0) for all numbers
+        return {
+            'white_balls': {i: 0.0 for i in range(1, 70)},
+            'powerball': {i: 0.0 for i in range(1, 27)}
+        }
+
+    draws = draws.sorted_by_date()
+    half_window = window // 2
+
+    # Last window/2 draws vs the first window/2 of the last `window` draws
+    recent = slice(n_draws - half_window, n_draws)
+    previous = slice(n_draws - window, n_draws - window + half_window)
+
+    # Momentum = (recent_freq - previous_freq) / (recent_freq + previous_freq + epsilon)
+    # This gives a score between -1 and +1
+    epsilon = 0.1  # Small constant to avoid division by zero
+    scores = {}
+    for key, numbers, max_num in (('white_balls', draws.white, 69), ('powerball', draws.pb, 26)):
+        recent_counts = number_counts(numbers[recent], max_num)
+        previous_counts = number_counts(numbers[previous], max_num)
+        momentum = (recent_counts - previous_counts) / (recent_counts + previous_counts + epsilon)
+        scores[key] = {num: float(momentum[num - 1]) for num in range(1, max_num + 1)}
+    return scores
+
+
+def _index_momentum_scores(window: int) -> Dict[str, Dict[int, float]]:
+    """_momentum_scores of the draw store's history, from its prefix counts."""
+    index = get_frequency_index()
+    if len(index) < window:
+        logger.warning(f"Insufficient data for momentum analysis (need {window} draws, have {len(index)})")
+    white, pb = index.momentum(window=window)
+    return {
+        'white_balls': {num: float(white[num - 1]) for num in range(1, 70)},
+        'powerball': {num: float(pb[num - 1]) for num in range(1, 27)}
+    }
+
+
+def _pattern_statistics(draws: DrawMatrix) -> Dict[str, Dict]:
+    """Sum, range, gap and low/mid/high statistics in one pass over the white ball matrix."""
+    white = draws.white
+    sums = white.sum(axis=1)
+    ranges = white[:, 4] - white[:, 0]
+    gaps = np.diff(white, axis=1).mean(axis=1)  # Average spacing between consecutive numbers
+    low = (white <= 23).sum(axis=1)
+    mid = ((white >= 24) & (white <= 46)).sum(axis=1)
+    high = (white >= 47).sum(axis=1)
+
+    return {
+        'sum': {
+            'mean': float(np.mean(sums)),
+            'std': float(np.std(sums)),
+            'min': int(np.min(sums)),
+            'max': int(np.max(sums)),
+            'typical_range': (float(np.percentile(sums, 16)), float(np.percentile(sums, 84)))  # ±1σ
+        },
+        'range': {
+            'mean': float(np.mean(ranges)),
+            'std': float(np.std(ranges)),
+            'typical_range': (float(np.percentile(ranges, 16)), float(np.percentile(ranges, 84)))
+        },
+        'gaps': {
+            'mean': float(np.mean(gaps)),
+            'std': float(np.std(gaps)),
+            'typical_range': (float(np.percentile(gaps, 16)), float(np.percentile(gaps, 84)))
+        },
+        'distribution': {
+            'low_mean': float(np.mean(low)),
+            'mid_mean': float(np.mean(mid)),
+            'high_mean': float(np.mean(high))
+        }
+    }
+
 
 def compute_gap_analysis(df: pd.DataFrame) -> Dict[str, Dict[int, int]]:
     """
@@ -268,54 +649,9 @@ def compute_gap_analysis(df: pd.DataFrame) -> Dict[str, Dict[int, int]]:
             'powerball': {i: 0 for i in range(1, 27)}
         }
     
-    # Ensure draw_date is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df['draw_date']):
-        df = df.copy()
-        df['draw_date'] = pd.to_datetime(df['draw_date'])
-    
-    # Get the most recent draw date
-    most_recent_date = df['draw_date'].max()
-    
-    # Initialize gap tracking (last seen date for each number)
-    white_ball_last_seen = {}
-    powerball_last_seen = {}
-    
-    # Process draws in chronological order
-    for _, draw in df.iterrows():
-        draw_date = draw['draw_date']
-        
-        # Track white balls
-        for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-            white_ball_last_seen[int(num)] = draw_date
-        
-        # Track powerball (only current era: 1-26)
-        pb = int(draw['pb'])
-        if 1 <= pb <= 26:
-            powerball_last_seen[pb] = draw_date
-    
-    # Calculate gaps in days
-    white_ball_gaps = {}
-    for num in range(1, 70):
-        if num in white_ball_last_seen:
-            gap = (most_recent_date - white_ball_last_seen[num]).days
-            white_ball_gaps[num] = gap
-        else:
-            # Never appeared in dataset
-            white_ball_gaps[num] = 999  # Large number to indicate very overdue
-    
-    powerball_gaps = {}
-    for num in range(1, 27):
-        if num in powerball_last_seen:
-            gap = (most_recent_date - powerball_last_seen[num]).days
-            powerball_gaps[num] = gap
-        else:
-            powerball_gaps[num] = 999
-    
-    logger.debug(f"Gap analysis complete: {len(white_ball_gaps)} white balls, {len(powerball_gaps)} powerballs")
-    return {
-        'white_balls': white_ball_gaps,
-        'powerball': powerball_gaps
-    }
+    result = _gap_analysis(DrawMatrix.from_dataframe(df))
+    logger.debug(f"Gap analysis complete: {len(result['white_balls'])} white balls, {len(result['powerball'])} powerballs")
+    return result
 
 
 def compute_temporal_frequencies(df: pd.DataFrame, decay_rate: float = 0.05) -> Dict[str, np.ndarray]:
@@ -339,51 +675,9 @@ def compute_temporal_frequencies(df: pd.DataFrame, decay_rate: float = 0.05) ->
             'powerball': np.ones(26) / 26
         }
     
-    # Ensure draw_date is datetime
-    if not pd.api.types.is_datetime64_any_dtype(df['draw_date']):
-        df = df.copy()
-        df['draw_date'] = pd.to_datetime(df['draw_date'])
-    
-    # Get the most recent draw date
-    most_recent_date = df['draw_date'].max()
-    
-    # Initialize weighted frequency counters
-    white_ball_freq = np.zeros(69)
-    powerball_freq = np.zeros(26)
-    
-    # Process each draw with exponential decay weight
-    for _, draw in df.iterrows():
-        days_ago = (most_recent_date - draw['draw_date']).days
-        weight = np.exp(-decay_rate * days_ago)
-        
-        # Weight white balls
-        for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-            if 1 <= num <= 69:
-                white_ball_freq[int(num) - 1] += weight
-        
-        # Weight powerball (current era only)
-        pb = int(draw['pb'])
-        if 1 <= pb <= 26:
-            powerball_freq[pb - 1] += weight
-    
-    # Normalize to probabilities
-    wb_total = white_ball_freq.sum()
-    if wb_total > 0:
-        white_ball_freq = white_ball_freq / wb_total
-    else:
-        white_ball_freq = np.ones(69) / 69
-    
-    pb_total = powerball_freq.sum()
-    if pb_total > 0:
-        powerball_freq = powerball_freq / pb_total
-    else:
-        powerball_freq = np.ones(26) / 26
-    
+    result = _temporal_frequencies(DrawMatrix.from_dataframe(df), decay_rate)
     logger.debug(f"Temporal frequencies computed with decay_rate={decay_rate}")
-    return {
-        'white_balls': white_ball_freq,
-        'powerball': powerball_freq
-    }
+    return result
 
 
 def compute_momentum_scores(df: pd.DataFrame, window: int = 20) -> Dict[str, Dict[int, float]]:
@@ -400,64 +694,9 @@ def compute_momentum_scores(df: pd.DataFrame, window: int = 20) -> Dict[str, Dic
         Dict with 'white_balls' and 'powerball' keys, each mapping number to momentum score
         Example: {'white_balls': {1: 0.5, 2: -0.3, ...}, 'powerball': {1: 0.8, ...}}
     """
-    if df.empty or len(df) < window:
-        logger.warning(f"Insufficient data for momentum analysis (need {window} draws, have {len(df)})")
-        # Return neutral momentum (0.0) for all numbers
-        return {
-            'white_balls': {i: 0.0 for i in range(1, 70)},
-            'powerball': {i: 0.0 for i in range(1, 27)}
-        }
-    
-    # Ensure chronological order
-    df = df.sort_values('draw_date').reset_index(drop=True)
-    
-    half_window = window // 2
-    
-    # Get recent and previous windows
-    recent_draws = df.tail(half_window)
-    previous_draws = df.tail(window).head(half_window)
-    
-    # Count frequencies in each window
-    def count_frequencies(draws_subset):
-        wb_counts = np.zeros(69)
-        pb_counts = np.zeros(26)
-        
-        for _, draw in draws_subset.iterrows():
-            for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-                if 1 <= num <= 69:
-                    wb_counts[int(num) - 1] += 1
-            
-            pb = int(draw['pb'])
-            if 1 <= pb <= 26:
-                pb_counts[pb - 1] += 1
-        
-        return wb_counts, pb_counts
-    
-    recent_wb, recent_pb = count_frequencies(recent_draws)
-    previous_wb, previous_pb = count_frequencies(previous_draws)
-    
-    # Calculate momentum scores
-    # Momentum = (recent_freq - previous_freq) / (recent_freq + previous_freq + epsilon)
-    # This gives a score between -1 and +1
-    epsilon = 0.1  # Small constant to avoid division by zero
-    
-    white_ball_momentum = {}
-    for num in range(1, 70):
-        idx = num - 1
-        momentum = (recent_wb[idx] - previous_wb[idx]) / (recent_wb[idx] + previous_wb[idx] + epsilon)
-        white_ball_momentum[num] = float(momentum)
-    
-    powerball_momentum = {}
-    for num in range(1, 27):
-        idx = num - 1
-        momentum = (recent_pb[idx] - previous_pb[idx]) / (recent_pb[idx] + previous_pb[idx] + epsilon)
-        powerball_momentum[num] = float(momentum)
-    
+    result = _momentum_scores(DrawMatrix.from_dataframe(df), window)
     logger.debug(f"Momentum scores computed with window={window}")
-    return {
-        'white_balls': white_ball_momentum,
-        'powerball': powerball_momentum
-    }
+    return result
 
 
 def get_analytics_overview() -> Dict[str, Any]:
@@ -488,17 +727,17 @@ def get_analytics_overview() -> Dict[str, Any]:
                 }
             }
         
-        # Compute new analytics
-        gap_analysis = compute_gap_analysis(df)
-        temporal_frequencies = compute_temporal_frequencies(df, decay_rate=0.05)
-        momentum_scores = compute_momentum_scores(df, window=20)
+        # One shared matrix for every statistic (no second history load or iterrows pass)
+        draws = DrawMatrix.from_dataframe(df)
+        gap_analysis = _gap_analysis(draws)
+        temporal_frequencies = _temporal_frequencies(draws, decay_rate=0.05)
+        momentum_scores = _index_momentum_scores(window=20)
         
-        # Get traditional pattern statistics
-        engine = AnalyticsEngine()
-        pattern_statistics = engine.calculate_pattern_statistics()
+        # Traditional pattern statistics
+        pattern_statistics = _pattern_statistics(draws)
         
         # Data summary
-        current_era_count = len(df[(df['pb'] >= 1) & (df['pb'] <= 26)])
+        current_era_count = int(_current_era(draws.pb).sum())
         most_recent_date = df['draw_date'].max() if not df.empty else None
         
         overview = {
@@ -535,14 +774,26 @@ def get_analytics_overview() -> Dict[str, Any]:
         }
 
 
-def update_analytics():
-    """Main function to update all analytics tables"""
+def update_analytics(incremental: bool = True):
+    """
+    Main function to update all analytics tables.
+
+    Args:
+        incremental: If True (default), apply only draws added since the last run
+                     and fall back to a full rebuild when that is not possible.
+    """
     logger.info("Starting analytics update...")
 
     try:
         engine = AnalyticsEngine()
+        if incremental and engine.update_incremental():
+            logger.info("All analytics updated successfully (incremental)")
+            return True
+
         engine.save_cooccurrence_to_db()
         engine.save_patterns_to_db()
+        if not engine.draws_df.empty:
+            engine.save_accumulator_to_db()
         logger.info("All analytics updated successfully")
         return True
     except Exception as e:
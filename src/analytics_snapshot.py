@@ -0,0 +1,360 @@
+"""
+SHIOL+ Analytics Snapshot
+=========================
+
+One versioned set of analytics per draw history.
+
+The v3 overview (``/api/v3/analytics/overview``), the PLP analytics context,
+hot/cold and dashboard endpoints, the ticket analyzer and the interactive
+generator all computed overlapping statistics (temporal weights, momentum,
+gaps, patterns, top pairs, hot/cold) for themselves, each behind its own
+5-minute TTL cache. The history only changes when a draw is inserted, so
+the snapshot computes every section once per version
+
+- latest draw date
+- number of draws
+
+keeps it in memory and persists it to the ``analytics_snapshots`` table as
+a zlib-compressed JSON blob keyed by the latest draw date, so a cold
+process (restart, other worker) answers from the stored blob immediately.
+A new draw changes the version, so there is no TTL: the next request (or
+the pipeline, right after STEP 3 refreshes the co-occurrences) builds the
+next snapshot.
+
+Usage:
+    snapshot = get_analytics_snapshot()
+    snapshot.sections["hot_cold"]
+    snapshot.analytics_overview()  # get_analytics_overview() shape
+
+    snapshot = await get_analytics_snapshot_async()  # async endpoints
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src import database
+
+# Bump when the shape of a section changes; older blobs are then rebuilt
+SNAPSHOT_FORMAT = 1
+
+# Persisted snapshots kept per database (one per latest draw date)
+KEEP_PERSISTED = int(os.getenv("ANALYTICS_SNAPSHOT_KEEP", "10"))
+
+_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS analytics_snapshots (
+        latest_draw_date TEXT PRIMARY KEY,
+        draw_count INTEGER NOT NULL,
+        format INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        build_ms REAL NOT NULL,
+        created_at TEXT NOT NULL
+    )
+"""
+
+SnapshotVersion = Tuple[Optional[str], int]  # src.data_version.DataVersion.draws
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+@dataclass(frozen=True)
+class AnalyticsSnapshot:
+    """Every analytics section for one version of the draw history"""
+    latest_draw_date: Optional[str]
+    draw_count: int
+    sections: Dict[str, Any]  # JSON-decoded, shared by all readers: do not mutate
+    created_at: float         # Epoch seconds
+    build_ms: float
+
+    @property
+    def version(self) -> SnapshotVersion:
+        return self.latest_draw_date, self.draw_count
+
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+    def analytics_overview(self) -> Dict[str, Any]:
+        """
+        The ``src.analytics_engine.get_analytics_overview()`` section.
+
+        Returns a private copy with the integer number keys of gap_analysis
+        and momentum_scores restored (JSON stores them as strings).
+        """
+        overview = copy.deepcopy(self.sections["analytics_overview"])
+        for name in ("gap_analysis", "momentum_scores"):
+            overview[name] = {
+                kind: {int(number): value for number, value in values.items()}
+                for kind, values in overview.get(name, {}).items()
+            }
+        return overview
+
+    def to_blob(self) -> bytes:
+        payload = json.dumps(self.sections, separators=(",", ":"), default=_json_default)
+        return zlib.compress(payload.encode("utf-8"), 6)
+
+    @classmethod
+    def from_blob(cls, version: SnapshotVersion, blob: bytes, created_at: float,
+                  build_ms: float) -> "AnalyticsSnapshot":
+        sections = json.loads(zlib.decompress(blob).decode("utf-8"))
+        return cls(version[0], version[1], sections, created_at, build_ms)
+
+
+def current_version() -> SnapshotVersion:
+    """(latest draw date, draw count) of the configured database (draws part of the data version)."""
+    from src.data_version import get_data_version
+
+    return get_data_version().draws
+
+
+def build_sections() -> Dict[str, Any]:
+    """
+    Compute every snapshot section for the current draw history.
+
+    Returns:
+        Dict with overview_v3 (None without draws), analytics_overview,
+        hot_cold and draw_stats
+    """
+    from src.analytics_engine import get_analytics_overview
+    from src.frequency_index import get_frequency_index
+    from src.v2.analytics_api import compute_analytics_overview
+
+    index = get_frequency_index()
+    latest_date, draw_count = current_version()
+    return {
+        "overview_v3": compute_analytics_overview(),
+        "analytics_overview": get_analytics_overview(),
+        "hot_cold": index.hot_cold(last=100),
+        "draw_stats": {
+            "total_draws": draw_count,
+            "most_recent": latest_date,
+            "current_era": int(index.powerball[-1].sum()),
+        },
+    }
+
+
+class AnalyticsSnapshotStore:
+    """Analytics snapshots of a single database file (memory + analytics_snapshots table)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._snapshot: Optional[AnalyticsSnapshot] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._table_ready = False
+        self.builds = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _ensure_table(self, conn) -> None:
+        if not self._table_ready:
+            conn.execute(_TABLE_SQL)
+            conn.commit()
+            self._table_ready = True
+
+    def _load(self, version: SnapshotVersion) -> Optional[AnalyticsSnapshot]:
+        if version[0] is None:
+            return None
+        try:
+            conn = database.get_db_connection()
+            try:
+                self._ensure_table(conn)
+                row = conn.execute(
+                    "SELECT payload, build_ms, created_at FROM analytics_snapshots"
+                    " WHERE latest_draw_date = ? AND draw_count = ? AND format = ?",
+                    (version[0], version[1], SNAPSHOT_FORMAT),
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return None
+            created_at = datetime.fromisoformat(row[2]).timestamp()
+            return AnalyticsSnapshot.from_blob(version, row[0], created_at, row[1])
+        except Exception as e:
+            logger.debug(f"Persisted analytics snapshot unavailable: {e}")
+            return None
+
+    def _store(self, snapshot: AnalyticsSnapshot, blob: bytes) -> None:
+        if snapshot.latest_draw_date is None:
+            return
+        try:
+            conn = database.get_db_connection()
+            try:
+                self._ensure_table(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO analytics_snapshots"
+                    " (latest_draw_date, draw_count, format, payload, build_ms, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (snapshot.latest_draw_date, snapshot.draw_count, SNAPSHOT_FORMAT, blob,
+                     snapshot.build_ms, datetime.fromtimestamp(snapshot.created_at).isoformat()),
+                )
+                conn.execute(
+                    "DELETE FROM analytics_snapshots WHERE latest_draw_date NOT IN ("
+                    " SELECT latest_draw_date FROM analytics_snapshots ORDER BY latest_draw_date DESC LIMIT ?)",
+                    (KEEP_PERSISTED,),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Could not persist analytics snapshot: {e}")
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+    def _build(self, version: SnapshotVersion) -> AnalyticsSnapshot:
+        start = time.perf_counter()
+        sections = build_sections()
+        build_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        # Served through the same JSON round trip as a persisted blob, so a
+        # fresh and a cold-loaded snapshot answer identically
+        blob = AnalyticsSnapshot(version[0], version[1], sections, time.time(), build_ms).to_blob()
+        snapshot = AnalyticsSnapshot.from_blob(version, blob, time.time(), build_ms)
+        self._store(snapshot, blob)
+        self.builds += 1
+        logger.info(f"Analytics snapshot built for {version[1]} draws (latest {version[0]}) "
+                    f"in {build_ms:.0f}ms, {len(blob) / 1024:.1f} KB")
+        return snapshot
+
+    def peek(self, version: Optional[SnapshotVersion] = None) -> Optional[AnalyticsSnapshot]:
+        """In-memory snapshot if it matches the current (or given) version, without building."""
+        version = version or current_version()
+        with self._lock:
+            snapshot = self._snapshot
+        return snapshot if snapshot is not None and snapshot.version == version else None
+
+    def get(self) -> AnalyticsSnapshot:
+        """
+        Snapshot of the current draw history.
+
+        Served from memory, else from the analytics_snapshots table, else
+        built (and persisted). Concurrent callers wait for a single build.
+        """
+        version = current_version()
+        snapshot = self.peek(version)
+        if snapshot is not None:
+            return snapshot
+
+        with self._build_lock:
+            snapshot = self.peek(version) or self._load(version)
+            if snapshot is None:
+                snapshot = self._build(version)
+            with self._lock:
+                self._snapshot = snapshot
+            return snapshot
+
+    def refresh(self) -> AnalyticsSnapshot:
+        """Rebuild and persist the snapshot of the current draw history."""
+        with self._build_lock:
+            snapshot = self._build(current_version())
+            with self._lock:
+                self._snapshot = snapshot
+            return snapshot
+
+    def forget(self) -> None:
+        """Drop the in-memory snapshot; the next get() loads the persisted one."""
+        with self._lock:
+            self._snapshot = None
+
+    def invalidate(self) -> None:
+        """Drop the in-memory and persisted snapshot of the current version."""
+        version = current_version()
+        with self._build_lock:
+            with self._lock:
+                self._snapshot = None
+            if version[0] is None:
+                return
+            try:
+                conn = database.get_db_connection()
+                try:
+                    self._ensure_table(conn)
+                    conn.execute("DELETE FROM analytics_snapshots WHERE latest_draw_date = ?", (version[0],))
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.debug(f"Could not delete persisted analytics snapshot: {e}")
+
+
+_stores: Dict[str, AnalyticsSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store() -> AnalyticsSnapshotStore:
+    """Process-wide snapshot store for the configured database (keyed by path)."""
+    db_path = database.get_db_path()
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = AnalyticsSnapshotStore(db_path)
+            _stores[db_path] = store
+        return store
+
+
+def get_analytics_snapshot() -> AnalyticsSnapshot:
+    """Analytics snapshot of the configured database's current draw history."""
+    return get_snapshot_store().get()
+
+
+def _single_flight_name() -> str:
+    return f"analytics_snapshot:{database.get_db_path()}"
+
+
+async def get_analytics_snapshot_async() -> AnalyticsSnapshot:
+    """
+    Analytics snapshot for async endpoints, without blocking the event loop.
+
+    Loading or building runs on the cpu work pool, once per draw history
+    version however many requests arrive meanwhile; after a new draw the
+    previous snapshot is served until the new one is ready.
+    """
+    from src.single_flight import single_flight
+
+    version = current_version()
+    if version[0] is None:
+        # Nothing to analyze (cheap), and an empty snapshot must never be served as stale
+        return get_analytics_snapshot()
+    return await single_flight(_single_flight_name(), version, get_analytics_snapshot,
+                               endpoint="analytics_snapshot")
+
+
+def refresh_analytics_snapshot() -> AnalyticsSnapshot:
+    """Rebuild the snapshot (e.g. after the pipeline refreshed co-occurrences)."""
+    from src.single_flight import forget_single_flight
+
+    snapshot = get_snapshot_store().refresh()
+    forget_single_flight(_single_flight_name())
+    return snapshot
+
+
+def reload_analytics_snapshot() -> None:
+    """Serve the snapshot another process (the pipeline worker) persisted from now on."""
+    from src.single_flight import forget_single_flight
+
+    get_snapshot_store().forget()
+    forget_single_flight(_single_flight_name())
+
+
+def invalidate_analytics_snapshot() -> None:
+    """Force the next request to rebuild the current snapshot."""
+    from src.single_flight import forget_single_flight
+
+    get_snapshot_store().invalidate()
+    forget_single_flight(_single_flight_name())
+    logger.info("Analytics snapshot invalidated")
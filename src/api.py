@@ -1,11 +1,11 @@
-from fastapi import FastAPI, APIRouter, Query, HTTPException, Request
+from fastapi import FastAPI, APIRouter, Depends, Query, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 import os
 from datetime import datetime, timezone, timedelta
 import uuid
-from typing import Dict, List
+from typing import Any, Dict, List
 import traceback
 import subprocess
 import zlib
@@ -24,6 +24,19 @@ from src.loader import (
     poll_draw_layer3
 )
 import src.database as db
+from src.evaluation_engine import run_draw_evaluation
+from src.pipeline_worker import run_pipeline_step, shutdown_pipeline_worker
+from src.data_version import publish_tickets
+from src.http_cache import cache_policy
+from src.single_flight import get_single_flight_stats
+from src.work_pools import get_work_pool_stats, offload, shutdown_work_pools
+from src.auth_middleware import require_admin_access
+from src.loop_stalls import (
+    ENABLED as LOOP_STALL_DETECTOR_ENABLED,
+    get_loop_stall_report,
+    start_loop_stall_detector,
+    stop_loop_stall_detector,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
@@ -150,6 +163,9 @@ def signal_handler(signum, frame):
         except Exception as e:
             logger.error(f"❌ Failed to update pipeline status on shutdown: {e}")
 
+    # Don't let interpreter exit wait for a running pipeline step
+    shutdown_pipeline_worker()
+
     # Allow default signal handling to proceed
     sys.exit(0)
 
@@ -194,6 +210,7 @@ async def adaptive_learning_update():
                 )
 
             conn.commit()
+            publish_tickets()
             logger.info("Adaptive learning update: strategy weights updated")
             return True
     except Exception as e:
@@ -203,120 +220,7 @@ async def adaptive_learning_update():
 
 async def evaluate_predictions_for_draw(draw_date: str):
     """Evaluate predictions for a specific draw date and record performance."""
-    try:
-        with db.get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get official result
-            cursor.execute("SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?", (draw_date,))
-            official = cursor.fetchone()
-            if not official:
-                logger.warning(f"No official draw found for {draw_date}")
-                return False
-
-            winning_nums = [official[0], official[1], official[2], official[3], official[4]]
-            winning_pb = official[5]
-
-            # Find predictions for this draw that haven't been evaluated
-            cursor.execute(
-                "SELECT id, n1, n2, n3, n4, n5, powerball FROM generated_tickets WHERE draw_date = ? AND evaluated = 0",
-                (draw_date,)
-            )
-
-            preds = cursor.fetchall()
-
-            for row in preds:
-                pred_id = row[0]
-                pred_nums = [row[1], row[2], row[3], row[4], row[5]]
-                pred_pb = row[6]
-
-                matches_main = len(set(pred_nums) & set(winning_nums))
-                matches_pb = 1 if pred_pb == winning_pb else 0
-
-                prize_amount, prize_description = db.calculate_prize_amount(matches_main, bool(matches_pb))
-
-                # Insert into performance_tracking using the SAME connection/cursor to avoid locks
-                try:
-                    db.save_performance_tracking(
-                        pred_id,
-                        draw_date,
-                        winning_nums,
-                        winning_pb,
-                        matches_main,
-                        matches_pb,
-                        prize_description or 'Non-winning',
-                        0.0,
-                        {},
-                        cursor=cursor,
-                    )
-                except Exception as ex:
-                    logger.error(f"Failed to save performance tracking for prediction {pred_id}: {ex}")
-
-                # Update predictions_log evaluated fields
-                try:
-                    cursor.execute(
-                        "UPDATE generated_tickets SET evaluated = 1, matches_wb = ?, matches_pb = ?, prize_won = ?, prize_description = ?, evaluation_date = CURRENT_TIMESTAMP WHERE id = ?",
-                        (matches_main, matches_pb, float(prize_amount), prize_description or '', pred_id)
-                    )
-                except Exception as ex:
-                    logger.error(f"Failed to update prediction {pred_id}: {ex}")
-
-                # Commit per prediction to release write lock early and avoid contention
-                try:
-                    conn.commit()
-                except Exception as ex:
-                    logger.warning(f"Commit failed after processing prediction {pred_id}: {ex}")
-
-            # Update strategy_performance with aggregated results
-            try:
-                # Get strategy-level stats from evaluated predictions
-                cursor.execute("""
-                    SELECT strategy_used,
-                           COUNT(*) as plays,
-                           SUM(CASE WHEN prize_won > 0 THEN 1 ELSE 0 END) as wins,
-                           SUM(prize_won) as total_prize
-                    FROM generated_tickets
-                    WHERE draw_date = ? AND evaluated = 1
-                    GROUP BY strategy_used
-                """, (draw_date,))
-
-                strategy_stats = cursor.fetchall()
-
-                for strategy_name, plays, wins, total_prize in strategy_stats:
-                    # Update total_plays and total_wins (increment, not replace)
-                    cursor.execute("""
-                        UPDATE strategy_performance
-                        SET total_plays = total_plays + ?,
-                            total_wins = total_wins + ?,
-                            win_rate = CASE
-                                WHEN (total_plays + ?) > 0
-                                THEN CAST((total_wins + ?) AS REAL) / (total_plays + ?)
-                                ELSE 0.0
-                            END,
-                            roi = CASE
-                                WHEN (total_plays + ?) > 0
-                                THEN (COALESCE(roi * total_plays, 0) + ?) / (total_plays + ?)
-                                ELSE 0.0
-                            END,
-                            last_updated = CURRENT_TIMESTAMP
-                        WHERE strategy_name = ?
-                    """, (plays, wins, plays, wins, plays, plays, total_prize or 0, plays, strategy_name))
-
-                    logger.debug(f"Updated {strategy_name}: +{plays} plays, +{wins} wins, +${total_prize or 0:.2f}")
-
-                conn.commit()
-                logger.info(f"Strategy performance updated for {len(strategy_stats)} strategies")
-
-            except Exception as ex:
-                logger.error(f"Failed to update strategy_performance: {ex}")
-
-            # Final safety commit (most work committed per-iteration already)
-            conn.commit()
-            logger.info(f"Evaluated {len(preds)} predictions for draw {draw_date}")
-            return True
-    except Exception as e:
-        logger.error(f"Error evaluating predictions for {draw_date}: {e}")
-        return False
+    return run_draw_evaluation(draw_date)
 
 
 def save_generated_tickets(tickets: List[Dict], draw_date: str):
@@ -359,6 +263,7 @@ def save_generated_tickets(tickets: List[Dict], draw_date: str):
             )
 
             conn.commit()
+            publish_tickets()
             inserted = cursor.rowcount
             logger.debug(f"Saved {inserted} tickets for {draw_date}")
             return inserted
@@ -1147,9 +1052,9 @@ async def _execute_pipeline_steps(
     - STEP 4: Evaluate previous predictions
     - STEP 5: Adaptive learning update
     - STEP 6: Generate new predictions
+
+    STEP 3, 4 and 6 run in the pipeline worker process (src/pipeline_worker.py).
     """
-    from src.analytics_engine import update_analytics
-    from src.strategy_generators import StrategyManager
     from src.date_utils import DateManager
     import gc
 
@@ -1174,24 +1079,26 @@ async def _execute_pipeline_steps(
 
         # ========== STEP 3: ANALYTICS ==========
         logger.info(f"[{execution_id}] STEP 3: Updating analytics...")
+        step_label = f"LAYER {layer} STEP 3: Analytics update"
         db.update_pipeline_execution_log(
             execution_id=execution_id,
-            current_step=f"LAYER {layer} STEP 3: Analytics update",
+            current_step=step_label,
             steps_completed=2
         )
 
-        analytics_result = update_analytics()
+        analytics_result = await run_pipeline_step(execution_id, step_label, "analytics")
         logger.info(f"[{execution_id}] ✅ STEP 3 Complete: Analytics updated")
 
         # ========== STEP 4: EVALUATE PREDICTIONS ==========
         logger.info(f"[{execution_id}] STEP 4: Evaluating predictions...")
+        step_label = f"LAYER {layer} STEP 4: Evaluation"
         db.update_pipeline_execution_log(
             execution_id=execution_id,
-            current_step=f"LAYER {layer} STEP 4: Evaluation",
+            current_step=step_label,
             steps_completed=3
         )
 
-        eval_result = await evaluate_predictions_for_draw(expected_draw_date)
+        eval_result = await run_pipeline_step(execution_id, step_label, "evaluation", expected_draw_date)
         logger.info(f"[{execution_id}] ✅ STEP 4 Complete: Evaluation {'succeeded' if eval_result else 'skipped (no predictions)'}")
 
         # ========== STEP 5: ADAPTIVE LEARNING ==========
@@ -1208,19 +1115,18 @@ async def _execute_pipeline_steps(
         # ========== STEP 6: GENERATE PREDICTIONS ==========
         next_draw = DateManager.calculate_next_drawing_date()
         logger.info(f"[{execution_id}] STEP 6: Generating predictions for {next_draw}...")
+        step_label = f"LAYER {layer} STEP 6: Generating predictions"
         db.update_pipeline_execution_log(
             execution_id=execution_id,
-            current_step=f"LAYER {layer} STEP 6: Generating predictions",
+            current_step=step_label,
             steps_completed=5,
             target_draw_date=next_draw
         )
 
-        manager = StrategyManager()
-
         # Generate 55 tickets distributed by adaptive weights (5 per strategy)
         # Strategies with higher win rates get more tickets
         # This allows the system to naturally phase out underperforming strategies
-        batch_tickets = manager.generate_balanced_tickets(total=55)
+        batch_tickets = await run_pipeline_step(execution_id, step_label, "generation", 55)
         total_saved = save_generated_tickets(batch_tickets, next_draw)
         logger.info(f"[{execution_id}] Saved {total_saved} tickets for {next_draw}")
         gc.collect()
@@ -1305,9 +1211,9 @@ async def _execute_pipeline_steps_without_insert(
     - STEP 4: Evaluate previous predictions
     - STEP 5: Adaptive learning update
     - STEP 6: Generate new predictions
+
+    STEP 3, 4 and 6 run in the pipeline worker process (src/pipeline_worker.py).
     """
-    from src.analytics_engine import update_analytics
-    from src.strategy_generators import StrategyManager
     from src.date_utils import DateManager
     import gc
 
@@ -1320,7 +1226,7 @@ async def _execute_pipeline_steps_without_insert(
             steps_completed=2
         )
 
-        analytics_result = update_analytics()
+        analytics_result = await run_pipeline_step(execution_id, "STEP 3/6: Analytics update", "analytics")
         logger.info(f"[{execution_id}] ✅ STEP 3 Complete: Analytics updated")
 
         # ========== STEP 4: EVALUATE PREDICTIONS ==========
@@ -1331,7 +1237,7 @@ async def _execute_pipeline_steps_without_insert(
             steps_completed=3
         )
 
-        eval_result = await evaluate_predictions_for_draw(expected_draw_date)
+        eval_result = await run_pipeline_step(execution_id, "STEP 4/6: Evaluation", "evaluation", expected_draw_date)
         logger.info(f"[{execution_id}] ✅ STEP 4 Complete: Evaluation {'succeeded' if eval_result else 'skipped (no predictions)'}")
 
         # ========== STEP 5: ADAPTIVE LEARNING ==========
@@ -1361,15 +1267,15 @@ async def _execute_pipeline_steps_without_insert(
             cursor.execute("DELETE FROM generated_tickets WHERE draw_date = ?", (next_draw,))
             deleted_count = cursor.rowcount
             conn.commit()
+        publish_tickets()
 
         if deleted_count > 0:
             logger.info(f"[{execution_id}] Deleted {deleted_count} old predictions for {next_draw}")
 
-        manager = StrategyManager()
-
         # Generate 55 tickets distributed by adaptive weights (5 per strategy)
         # Strategies with higher win rates get more tickets
-        batch_tickets = manager.generate_balanced_tickets(total=55)
+        batch_tickets = await run_pipeline_step(execution_id, "STEP 6/6: Generating predictions",
+                                                "generation", 55)
         total_saved = save_generated_tickets(batch_tickets, next_draw)
         logger.info(f"[{execution_id}] Generated {total_saved} tickets (weighted by strategy performance)")
         gc.collect()
@@ -1430,15 +1336,15 @@ async def _generate_predictions_only(next_draw: str) -> int:
     Generate predictions for the next draw without requiring a completed draw.
     Used by Layer 3 when draws fail but we still need predictions.
     """
-    from src.strategy_generators import StrategyManager
+    from src.strategy_registry import get_strategy_manager
     import gc
 
     logger.info(f"🎯 Generating predictions for {next_draw} (standalone)")
 
-    manager = StrategyManager()
+    manager = get_strategy_manager(revalidate=True)
 
     # Generate 55 tickets distributed by adaptive weights (5 per strategy)
-    batch_tickets = manager.generate_balanced_tickets(total=55)
+    batch_tickets = manager.generate_balanced_tickets(total=55, load_timeout=None)
     total_saved = save_generated_tickets(batch_tickets, next_draw)
     gc.collect()
 
@@ -1874,11 +1780,19 @@ async def lifespan(app: FastAPI):
     current_utc = datetime.now(pytz.UTC)
     logger.info(f"Current time - UTC: {current_utc.isoformat()} | ET: {current_et.isoformat()}")
 
+    if LOOP_STALL_DETECTOR_ENABLED:
+        start_loop_stall_detector(app)
+
     yield
     # On shutdown
     logger.info("Application shutdown...")
+    stop_loop_stall_detector()
+    shutdown_pipeline_worker()
     scheduler.shutdown()
     logger.info("Scheduler shut down.")
+    shutdown_work_pools()
+    from src.db_pool import close_all_pools
+    close_all_pools()
 
 # --- Application Initialization ---
 logger.info("Initializing FastAPI application...")
@@ -2150,104 +2064,115 @@ async def get_scheduler_health():
         }
 
 # --- System Stats Endpoint ---
-@api_router.get("/system/stats")
-async def get_system_stats():
-    """
-    Get comprehensive system statistics for status dashboard.
-    Returns database stats, pipeline metrics, and system health.
-    """
-    try:
-        from src.database import get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
+def _collect_system_stats() -> Dict[str, Any]:
+    """Database, Google Analytics and system statistics (blocking: SQLite + GA API)."""
+    from src.database import get_db_connection
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        # Get database statistics
-        cursor.execute("SELECT COUNT(*) FROM powerball_draws")
-        total_draws = cursor.fetchone()[0]
+    # Get database statistics
+    cursor.execute("SELECT COUNT(*) FROM powerball_draws")
+    total_draws = cursor.fetchone()[0]
 
-        cursor.execute("SELECT COUNT(*) FROM generated_tickets")
-        total_predictions = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM generated_tickets")
+    total_predictions = cursor.fetchone()[0]
 
-        cursor.execute("SELECT COUNT(*) FROM users")
-        total_users = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM users")
+    total_users = cursor.fetchone()[0]
 
-        cursor.execute("SELECT COUNT(*) FROM users WHERE is_premium = 1")
-        premium_users = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM users WHERE is_premium = 1")
+    premium_users = cursor.fetchone()[0]
 
-        # Total visits (sum of visit_count across unique devices)
-        try:
-            cursor.execute("SELECT COALESCE(SUM(visit_count), 0) FROM unique_visits")
-            total_visits = cursor.fetchone()[0] or 0
-        except Exception:
-            total_visits = 0
+    # Total visits (sum of visit_count across unique devices)
+    try:
+        cursor.execute("SELECT COALESCE(SUM(visit_count), 0) FROM unique_visits")
+        total_visits = cursor.fetchone()[0] or 0
+    except Exception:
+        total_visits = 0
 
-        # Unique visitors (number of distinct device fingerprints)
-        try:
-            cursor.execute("SELECT COUNT(*) FROM unique_visits")
-            unique_visitors = cursor.fetchone()[0] or 0
-        except Exception:
-            unique_visitors = 0
+    # Unique visitors (number of distinct device fingerprints)
+    try:
+        cursor.execute("SELECT COUNT(*) FROM unique_visits")
+        unique_visitors = cursor.fetchone()[0] or 0
+    except Exception:
+        unique_visitors = 0
 
-        # Get predictions with matches
-        cursor.execute("""
-            SELECT COUNT(*) FROM generated_tickets
-            WHERE evaluated = 1
-            AND matches_wb > 0
-        """)
-        winning_predictions = cursor.fetchone()[0]
+    # Get predictions with matches
+    cursor.execute("""
+        SELECT COUNT(*) FROM generated_tickets
+        WHERE evaluated = 1
+        AND matches_wb > 0
+    """)
+    winning_predictions = cursor.fetchone()[0]
 
-        conn.close()
+    conn.close()
 
-        # Try to get Google Analytics data
-        ga_stats = {}
-        try:
-            from src.google_analytics_service import get_ga_service
-            ga_service = get_ga_service()
-
-            if ga_service.is_enabled():
-                # Get GA4 traffic stats (last 7 days)
-                ga_traffic = ga_service.get_traffic_stats(days_back=7)
-                # Get real-time stats
-                ga_realtime = ga_service.get_realtime_stats()
-                # Get device breakdown
-                ga_devices = ga_service.get_device_breakdown()
-
-                ga_stats = {
-                    "enabled": True,
-                    "unique_visitors_7d": ga_traffic.get("unique_visitors", 0),
-                    "total_sessions_7d": ga_traffic.get("total_sessions", 0),
-                    "total_pageviews_7d": ga_traffic.get("total_pageviews", 0),
-                    "avg_session_duration_sec": ga_traffic.get("avg_session_duration_sec", 0),
-                    "pages_per_session": ga_traffic.get("pages_per_session", 0.0),
-                    "new_visitors_7d": ga_traffic.get("new_visitors", 0),
-                    "active_users_now": ga_realtime.get("active_users", 0),
-                    "pageviews_30min": ga_realtime.get("pageviews_30min", 0),
-                    "devices": ga_devices.get("devices", {}),
-                }
-            else:
-                ga_stats = {"enabled": False}
-        except Exception as e:
-            logger.warning(f"Could not fetch Google Analytics data: {e}")
-            ga_stats = {"enabled": False, "error": str(e)}
+    # Try to get Google Analytics data
+    ga_stats = {}
+    try:
+        from src.google_analytics_service import get_ga_service
+        ga_service = get_ga_service()
 
-        return {
-            "database": {
-                "total_draws": total_draws,
-                "total_predictions": total_predictions,
-                "total_users": total_users,
-                "premium_users": premium_users,
-                "winning_predictions": winning_predictions,
-                "total_visits": total_visits,
-                "unique_visitors": unique_visitors
-            },
-            "analytics": ga_stats,
-            "system": {
-                "version": "6.0.0",
-                "model_loaded": predictor is not None and hasattr(predictor, 'model') and predictor.model is not None,
-                "generators_loaded": intelligent_generator is not None and deterministic_generator is not None
-            },
-            "timestamp": datetime.now().isoformat()
-        }
+        if ga_service.is_enabled():
+            # Get GA4 traffic stats (last 7 days)
+            ga_traffic = ga_service.get_traffic_stats(days_back=7)
+            # Get real-time stats
+            ga_realtime = ga_service.get_realtime_stats()
+            # Get device breakdown
+            ga_devices = ga_service.get_device_breakdown()
+
+            ga_stats = {
+                "enabled": True,
+                "unique_visitors_7d": ga_traffic.get("unique_visitors", 0),
+                "total_sessions_7d": ga_traffic.get("total_sessions", 0),
+                "total_pageviews_7d": ga_traffic.get("total_pageviews", 0),
+                "avg_session_duration_sec": ga_traffic.get("avg_session_duration_sec", 0),
+                "pages_per_session": ga_traffic.get("pages_per_session", 0.0),
+                "new_visitors_7d": ga_traffic.get("new_visitors", 0),
+                "active_users_now": ga_realtime.get("active_users", 0),
+                "pageviews_30min": ga_realtime.get("pageviews_30min", 0),
+                "devices": ga_devices.get("devices", {}),
+            }
+        else:
+            ga_stats = {"enabled": False}
+    except Exception as e:
+        logger.warning(f"Could not fetch Google Analytics data: {e}")
+        ga_stats = {"enabled": False, "error": str(e)}
+
+    return {
+        "database": {
+            "total_draws": total_draws,
+            "total_predictions": total_predictions,
+            "total_users": total_users,
+            "premium_users": premium_users,
+            "winning_predictions": winning_predictions,
+            "total_visits": total_visits,
+            "unique_visitors": unique_visitors
+        },
+        "analytics": ga_stats,
+        "system": {
+            "version": "6.0.0",
+            "model_loaded": predictor is not None and hasattr(predictor, 'model') and predictor.model is not None,
+            "generators_loaded": intelligent_generator is not None and deterministic_generator is not None
+        },
+        "caches": {
+            "single_flight": get_single_flight_stats()
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@api_router.get("/system/stats")
+async def get_system_stats():
+    """
+    Get comprehensive system statistics for status dashboard.
+    Returns database stats, pipeline metrics, system health and the
+    queue depth of the work pools (the queries themselves run on the io pool).
+    """
+    try:
+        stats = await offload("system_stats", _collect_system_stats)
+        stats["work_pools"] = get_work_pool_stats()
+        return stats
     except Exception as e:
         logger.error(f"Error getting system stats: {e}")
         raise HTTPException(
@@ -2256,6 +2181,20 @@ async def get_system_stats():
         )
 
 
+@api_router.get("/system/loop-stalls")
+async def get_loop_stalls(
+    limit: int = Query(10, ge=1, le=100, description="Number of offenders to return"),
+    admin: dict = Depends(require_admin_access)
+):
+    """
+    Event-loop lag and the code that blocked the loop the longest (admin only).
+
+    Requires LOOP_STALL_DETECTOR=1. Each offender is a (route, location) pair
+    with its stall count, total/max/avg stall time and the latest captured stack.
+    """
+    return get_loop_stall_report(limit)
+
+
 @api_router.get("/analytics/ga4")
 async def get_google_analytics_stats(days_back: int = 7):
     """
@@ -2713,20 +2652,22 @@ async def cookies_page():
     else:
         raise HTTPException(status_code=404, detail="Cookie policy page not found")
 
-# Add cache control middleware for critical files to prevent caching issues
+# Per-endpoint Cache-Control (src/http_cache.py CACHE_POLICIES)
 @app.middleware("http")
 async def cache_control_middleware(request, call_next):
     """
-    Prevent aggressive caching of HTML, CSS, and JS files to ensure users always get latest version.
-    This prevents PWA service worker cache issues and ensures updates are visible immediately.
+    Apply the Cache-Control policy of the request path unless the endpoint set its own.
+
+    HTML, CSS and JS are always revalidated (StaticFiles answers 304 when
+    unchanged) so PWA updates are visible immediately; data endpoints get
+    short public freshness or private revalidation, see src/http_cache.py.
     """
     response = await call_next(request)
 
-    # Apply no-cache headers to HTML, CSS, and JS files
-    if request.url.path.endswith(('.html', '.css', '.js')) or request.url.path == '/':
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+    if "cache-control" not in response.headers:
+        policy = cache_policy(request.url.path)
+        if policy:
+            response.headers["Cache-Control"] = policy
 
     return response
 
@@ -10,6 +10,7 @@ from src.database import (
     toggle_user_premium,
 )
 from src.auth_middleware import require_admin_access
+from src.data_version import publish_tickets
 import secrets
 from loguru import logger
 from src.api_auth_endpoints import hash_password_secure
@@ -386,12 +387,13 @@ async def regenerate_predictions_for_draw(
                     if existing_count > 0:
                         cursor.execute("DELETE FROM generated_tickets WHERE draw_date = ?", (draw_date,))
                         conn.commit()
+                        publish_tickets()
                         logger.info(f"🗑️  Deleted {existing_count} existing tickets for {draw_date}")
 
                 # Step 2: Generate new predictions (using historical data BEFORE draw_date)
                 logger.info(f"🎲 Generating {tickets} predictions for {draw_date}")
                 manager = StrategyManager(max_date=draw_date)
-                new_tickets = manager.generate_balanced_tickets(total=tickets)
+                new_tickets = manager.generate_balanced_tickets(total=tickets, load_timeout=None)
 
                 # Insert new tickets
                 with get_db_connection() as conn:
@@ -420,6 +422,7 @@ async def regenerate_predictions_for_draw(
                         inserted += 1
 
                     conn.commit()
+                publish_tickets()
 
                 logger.success(f"✅ Inserted {inserted} tickets for {draw_date}")
 
@@ -10,6 +10,7 @@ from loguru import logger
 from src.utils import get_latest_draw_date
 from src.prediction_evaluator import PredictionEvaluator
 from src.database import get_db_connection
+from src.work_pools import offload
 # from src.auth import get_current_user, User  # REMOVED - no authentication in simplified version
 
 # Define Pydantic models for response
@@ -740,11 +741,14 @@ async def generate_tickets_multi_strategy(count: int = Query(5, ge=1, le=100)):
     """
     try:
         from src.prediction_engine import UnifiedPredictionEngine
+        from src.strategy_registry import get_strategy_manager
 
         logger.info(f"Generating {count} tickets using multi-strategy system")
 
-        engine = UnifiedPredictionEngine()
-        tickets = engine.generate_tickets(count)
+        # v1 mode reuses the shared StrategyManager from the strategy registry;
+        # generation runs on the cpu work pool, off the event loop
+        tickets = await offload("generate_multi_strategy",
+                                lambda: UnifiedPredictionEngine().generate_tickets(count))
 
         # Calculate metadata
         all_numbers = set()
@@ -761,7 +765,7 @@ async def generate_tickets_multi_strategy(count: int = Query(5, ge=1, le=100)):
         coverage_pct = len(all_numbers) / 69 * 100
 
         # Get current strategy weights
-        weights = manager.get_strategy_weights()
+        weights = get_strategy_manager().get_strategy_weights()
 
         response = {
             "success": True,
@@ -825,6 +829,19 @@ async def get_strategy_performance():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@prediction_router.get("/strategy-registry", response_model=Dict[str, Any])
+async def get_strategy_registry_stats():
+    """
+    Get build info and per-strategy load time / memory of the shared StrategyManager.
+
+    Returns:
+        Dict with registry generation, data/model version and strategy load stats
+    """
+    from src.strategy_registry import get_strategy_registry
+
+    return {"success": True, "registry": get_strategy_registry().stats()}
+
+
 # --- PHASE 3: External Project API Endpoints ---
 
 @prediction_router.get("/latest", response_model=Dict[str, Any])
@@ -6,15 +6,20 @@ API endpoints specifically for the public frontend (index.html).
 These endpoints provide public access to predictions and historical data.
 """
 
-from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import APIRouter, HTTPException, Request, Response, Query
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from loguru import logger
 import os
-from src.auth_middleware import apply_freemium_restrictions
+from typing import Any, Dict
+import numpy as np
+from src.auth_middleware import apply_freemium_restrictions, get_user_access_level
 
 from src.simple_utils import convert_numpy_types
 from src.database import get_grouped_predictions_with_results_comparison
+from src.http_cache import conditional_response
+from src.work_pools import offload
+from src.prize_kernel import encode_white_balls, score
 
 # Create router for public frontend endpoints
 public_frontend_router = APIRouter(tags=["public_frontend"])
@@ -46,34 +51,60 @@ async def serve_public(request: Request):
     """Serve the public static page"""
     return templates.TemplateResponse(request, "static_public.html")
 
+def _access_variant(request: Request, draw_date: str) -> tuple:
+    """
+    ETag part for responses filtered by apply_freemium_restrictions.
+
+    Guests (no session cookie, bearer token or Premium Pass) all see the same
+    response, so no lookup is needed; signed-in callers are resolved to their
+    access level.
+    """
+    has_credentials = (
+        request.cookies.get("session_token")
+        or request.cookies.get("premium_pass")
+        or request.headers.get("Authorization", "").startswith("Bearer ")
+    )
+    if not has_credentials:
+        return ("guest",)
+    access = get_user_access_level(request, draw_date)
+    user = access.get("user") or {}
+    return access["access_level"], access["max_predictions"], user.get("id"), user.get("email")
+
 @public_frontend_router.get("/api/v1/public/predictions/by-draw/{draw_date}")
 async def get_public_predictions_by_draw(
     request: Request,
+    response: Response,
     draw_date: str,
     min_matches: int = Query(0, description="Minimum number of matches to include"),
     limit: int = Query(200, description="Maximum number of predictions to return")
 ):
     """Get predictions for a specific draw date (public endpoint)"""
     try:
+        not_modified = conditional_response(request, response, *_access_variant(request, draw_date))
+        if not_modified is not None:
+            return not_modified
+
         logger.info(f"Public API request for predictions by draw date: {draw_date} (min_matches: {min_matches}, limit: {limit})")
 
-        # Connect to database and get predictions
+        # Connect to database and get predictions (one read-only connection for both queries)
         from src.database import get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with get_db_connection(read_only=True) as conn:
+            cursor = conn.cursor()
 
-        # Query predictions for the specific draw date
-        cursor.execute("""
-            SELECT id, created_at, draw_date, n1, n2, n3, n4, n5, powerball,
-                   strategy_used, confidence_score, created_at, was_played, 0, 0
-            FROM generated_tickets
-            WHERE draw_date = ?
-            ORDER BY confidence_score DESC, created_at DESC
-            LIMIT ?
-        """, (draw_date, limit))
+            # Query predictions for the specific draw date
+            cursor.execute("""
+                SELECT id, created_at, draw_date, n1, n2, n3, n4, n5, powerball,
+                       strategy_used, confidence_score, created_at, was_played, 0, 0
+                FROM generated_tickets
+                WHERE draw_date = ?
+                ORDER BY confidence_score DESC, created_at DESC
+                LIMIT ?
+            """, (draw_date, limit))
+            predictions = cursor.fetchall()
 
-        predictions = cursor.fetchall()
-        conn.close()
+            # Get actual draw numbers for comparison
+            cursor.execute("SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?", (draw_date,))
+            draw_result = cursor.fetchone()
 
         # Format predictions for frontend
         predictions_list = []
@@ -100,12 +131,6 @@ async def get_public_predictions_by_draw(
                 logger.warning(f"Error formatting prediction data: {format_error}, skipping prediction")
                 continue
 
-        # Get actual draw numbers for comparison
-        cursor = get_db_connection().cursor()
-        cursor.execute("SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?", (draw_date,))
-        draw_result = cursor.fetchone()
-        cursor.connection.close()
-
         draw_numbers = None
         if draw_result:
             draw_numbers = {
@@ -149,8 +174,120 @@ async def get_public_smart_predictions(limit: int = 100):
         }
     )
 
+def _load_recent_draws(limit: int) -> Dict[str, Any]:
+    """Recent draws with their ticket counts and real-time total prizes (blocking: SQLite + numpy)."""
+    from src.database import get_db_connection
+    from src.prize_calculator import calculate_prize_amount
+    import time
+
+    start_time = time.time()
+    conn = get_db_connection()
+
+    if not conn:
+        logger.error("Database connection failed")
+        raise HTTPException(status_code=503, detail="Database temporarily unavailable")
+
+    cursor = conn.cursor()
+
+    # Step 1: Get all recent draws with their winning numbers
+    try:
+        cursor.execute("""
+            SELECT
+                p.rowid,
+                p.draw_date,
+                p.n1, p.n2, p.n3, p.n4, p.n5, p.pb
+            FROM powerball_draws p
+            ORDER BY p.draw_date DESC
+            LIMIT ?
+        """, (limit,))
+        draws = cursor.fetchall()
+    except Exception as query_error:
+        logger.error(f"Database query error: {query_error}")
+        conn.close()
+        raise HTTPException(status_code=500, detail="Database query failed")
+
+    if not draws:
+        conn.close()
+        logger.warning("No draws found in database")
+        return {"draws": [], "count": 0, "status": "no_data"}
+
+    # Step 2: Parse the draws; malformed rows are skipped as before
+    parsed_draws = []
+    for draw in draws:
+        try:
+            draw_id = int(draw[0]) if draw[0] is not None else 0
+            draw_date = str(draw[1]) if draw[1] else ""
+            winning_numbers = [int(n) if n is not None else 0 for n in draw[2:7]]
+            winning_pb = int(draw[7]) if draw[7] is not None else 0
+            parsed_draws.append((draw_id, draw_date, winning_numbers, winning_pb))
+        except (ValueError, TypeError) as format_error:
+            logger.warning(f"Error formatting draw data: {format_error}, skipping draw")
+            continue
+
+    # Step 3: Calculate total_prize in real-time (same as modal) for every ticket of
+    # these draws with one query and one pass of the shared prize kernel
+    date_index = {d[1]: i for i, d in enumerate(parsed_draws)}
+    total_tickets = np.zeros(len(parsed_draws), dtype=np.int64)
+    total_prizes = np.zeros(len(parsed_draws), dtype=np.float64)
+    if date_index:
+        placeholders = ",".join("?" * len(date_index))
+        cursor.execute(f"""
+            SELECT draw_date, n1, n2, n3, n4, n5, powerball
+            FROM generated_tickets
+            WHERE draw_date IN ({placeholders})
+        """, tuple(date_index))
+        ticket_rows = cursor.fetchall()
+
+        if ticket_rows:
+            draw_idx = np.array([date_index[str(r[0])] for r in ticket_rows], dtype=np.int64)
+            tickets = np.array([[x or 0 for x in r[1:7]] for r in ticket_rows], dtype=np.int64)
+            draw_numbers = np.array([d[2] for d in parsed_draws], dtype=np.int64)
+            draw_pb = np.array([d[3] for d in parsed_draws], dtype=np.int64)
+
+            scores = score(
+                encode_white_balls(tickets[:, :5]),
+                tickets[:, 5],
+                encode_white_balls(draw_numbers)[draw_idx],
+                draw_pb[draw_idx],
+                calculate_prize_amount,
+            )
+            # Only draws with valid winning numbers produce prizes
+            has_result = (draw_numbers[:, 0] > 0)[draw_idx]
+            total_tickets = np.bincount(draw_idx, minlength=len(parsed_draws))
+            total_prizes = np.bincount(draw_idx, weights=scores.prize_amount * has_result,
+                                       minlength=len(parsed_draws))
+
+    draws_list = []
+    for i, (draw_id, draw_date, winning_numbers, winning_pb) in enumerate(parsed_draws):
+        draws_list.append({
+            "id": draw_id,
+            "draw_date": draw_date,
+            "n1": winning_numbers[0],
+            "n2": winning_numbers[1],
+            "n3": winning_numbers[2],
+            "n4": winning_numbers[3],
+            "n5": winning_numbers[4],
+            "pb": winning_pb,
+            "has_predictions": bool(total_tickets[i] > 0),
+            "total_prize": float(total_prizes[i]),
+            "total_tickets": int(total_tickets[i]),
+            "jackpot": "Not available"  # Legacy field for compatibility
+        })
+
+    conn.close()
+
+    elapsed = time.time() - start_time
+    logger.info(f"Recent draws query completed in {elapsed:.3f}s, found {len(draws_list)} draws")
+
+    return {
+        "draws": draws_list,
+        "count": len(draws_list),
+        "status": "success",
+        "query_time": f"{elapsed:.3f}s"
+    }
+
 @public_frontend_router.get("/api/v1/public/recent-draws")
-async def get_public_recent_draws(limit: int = Query(default=50, le=100)):
+async def get_public_recent_draws(request: Request = None, response: Response = None, limit: int = Query(default=50, le=100)):
     """
     Get recent powerball draws for public access - OPTIMIZED v6.0
 
@@ -161,113 +298,16 @@ async def get_public_recent_draws(limit: int = Query(default=50, le=100)):
     - All draws (with or without predictions)
     - Real-time calculated total_prize (same as Smart Insights modal)
     - Always verifies has_predictions against generated_tickets (source of truth)
+
+    Sends an ETag derived from the data version; If-None-Match answers 304.
+    The queries run on the io work pool, off the event loop.
     """
     try:
-        from src.database import get_db_connection
-        from src.prize_calculator import calculate_prize_amount
-        import time
-
-        start_time = time.time()
-        conn = get_db_connection()
-
-        if not conn:
-            logger.error("Database connection failed")
-            raise HTTPException(status_code=503, detail="Database temporarily unavailable")
-
-        cursor = conn.cursor()
-
-        # Step 1: Get all recent draws with their winning numbers
-        try:
-            cursor.execute("""
-                SELECT
-                    p.rowid,
-                    p.draw_date,
-                    p.n1, p.n2, p.n3, p.n4, p.n5, p.pb
-                FROM powerball_draws p
-                ORDER BY p.draw_date DESC
-                LIMIT ?
-            """, (limit,))
-            draws = cursor.fetchall()
-        except Exception as query_error:
-            logger.error(f"Database query error: {query_error}")
-            conn.close()
-            raise HTTPException(status_code=500, detail="Database query failed")
-
-        if not draws:
-            conn.close()
-            logger.warning("No draws found in database")
-            return {"draws": [], "count": 0, "status": "no_data"}
-
-        # Step 2: For each draw, calculate total_prize in real-time (same as modal)
-        draws_list = []
-        for draw in draws:
-            try:
-                draw_id = int(draw[0]) if draw[0] is not None else 0
-                draw_date = str(draw[1]) if draw[1] else ""
-                winning_numbers = [
-                    int(draw[2]) if draw[2] is not None else 0,
-                    int(draw[3]) if draw[3] is not None else 0,
-                    int(draw[4]) if draw[4] is not None else 0,
-                    int(draw[5]) if draw[5] is not None else 0,
-                    int(draw[6]) if draw[6] is not None else 0,
-                ]
-                winning_pb = int(draw[7]) if draw[7] is not None else 0
-
-                # Get all predictions for this draw
-                cursor.execute("""
-                    SELECT n1, n2, n3, n4, n5, powerball
-                    FROM generated_tickets
-                    WHERE draw_date = ?
-                """, (draw_date,))
-                predictions = cursor.fetchall()
-
-                total_tickets = len(predictions)
-                has_predictions = total_tickets > 0
-                total_prize = 0.0
-
-                # Calculate prize for each prediction (same logic as get_draw_analytics)
-                if has_predictions and winning_numbers[0] > 0:  # Only if we have valid winning numbers
-                    for pred in predictions:
-                        pred_numbers = [pred[0], pred[1], pred[2], pred[3], pred[4]]
-                        pred_pb = pred[5]
-
-                        # Count main number matches
-                        matches_main = sum(1 for n in pred_numbers if n in winning_numbers)
-                        pb_match = (pred_pb == winning_pb)
-
-                        # Calculate prize using same function as modal
-                        prize_amount, _ = calculate_prize_amount(matches_main, pb_match)
-                        total_prize += float(prize_amount or 0.0)
-
-                draws_list.append({
-                    "id": draw_id,
-                    "draw_date": draw_date,
-                    "n1": winning_numbers[0],
-                    "n2": winning_numbers[1],
-                    "n3": winning_numbers[2],
-                    "n4": winning_numbers[3],
-                    "n5": winning_numbers[4],
-                    "pb": winning_pb,
-                    "has_predictions": has_predictions,
-                    "total_prize": total_prize,
-                    "total_tickets": total_tickets,
-                    "jackpot": "Not available"  # Legacy field for compatibility
-                })
-            except (ValueError, TypeError) as format_error:
-                logger.warning(f"Error formatting draw data: {format_error}, skipping draw")
-                continue
+        not_modified = conditional_response(request, response)
+        if not_modified is not None:
+            return not_modified
 
-        conn.close()
-
-        elapsed = time.time() - start_time
-        logger.info(f"Recent draws query completed in {elapsed:.3f}s, found {len(draws_list)} draws")
-
-        return {
-            "draws": draws_list,
-            "count": len(draws_list),
-            "status": "success",
-            "query_time": f"{elapsed:.3f}s"
-        }
+        return await offload("recent_draws", _load_recent_draws, limit)
 
     except HTTPException:
         raise
@@ -276,9 +316,13 @@ async def get_public_recent_draws(limit: int = Query(default=50, le=100)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @public_frontend_router.get("/api/v1/public/history/grouped")
-async def get_public_grouped_history():
-    """Get grouped prediction history for public access"""
+async def get_public_grouped_history(request: Request = None, response: Response = None):
+    """Get grouped prediction history for public access (ETag from the data version)"""
     try:
+        not_modified = conditional_response(request, response)
+        if not_modified is not None:
+            return not_modified
+
         grouped_data = get_grouped_predictions_with_results_comparison()
         return {"grouped_dates": convert_numpy_types(grouped_data)}
 
@@ -384,9 +428,9 @@ async def get_public_latest_predictions(request: Request, limit: int = Query(def
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @public_frontend_router.get("/api/v1/public/draws/recent")
-async def get_public_draws_recent_alias(limit: int = Query(default=12, le=100)):
+async def get_public_draws_recent_alias(request: Request, response: Response, limit: int = Query(default=12, le=100)):
     """Alias endpoint for draws/recent to match frontend expectations"""
-    return await get_public_recent_draws(limit=limit)
+    return await get_public_recent_draws(request, response, limit=limit)
 
 @public_frontend_router.get("/api/v1/public/next-drawing")
 async def get_public_next_drawing():
@@ -476,51 +520,34 @@ async def get_winners_stats():
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Prefetch all official draw results into a map: draw_date -> (numbers, pb)
+        # Pair every prediction with its official result in SQL and score the pairs
+        # in chunks with the shared prize kernel
         cursor.execute(
             """
-            SELECT draw_date, n1, n2, n3, n4, n5, pb
-            FROM powerball_draws
+            SELECT gt.n1, gt.n2, gt.n3, gt.n4, gt.n5, gt.powerball,
+                   pd.n1, pd.n2, pd.n3, pd.n4, pd.n5, pd.pb
+            FROM generated_tickets gt
+            JOIN powerball_draws pd ON pd.draw_date = gt.draw_date
             """
         )
-        draw_rows = cursor.fetchall()
-        draws_map = {}
-        for dr in draw_rows:
-            date = str(dr[0])
-            draws_map[date] = {
-                'nums': [int(dr[1] or 0), int(dr[2] or 0), int(dr[3] or 0), int(dr[4] or 0), int(dr[5] or 0)],
-                'pb': int(dr[6] or 0)
-            }
-
-        # Fetch all predictions (only the fields we need)
-        cursor.execute(
-            """
-            SELECT draw_date, n1, n2, n3, n4, n5, powerball
-            FROM generated_tickets
-            """
-        )
-        preds = cursor.fetchall()
 
         total_won = 0.0
         winning_count = 0
 
-        for p in preds:
-            draw_date = str(p[0]) if p[0] else None
-            if not draw_date or draw_date not in draws_map:
-                continue
-            nums = [int(p[1] or 0), int(p[2] or 0), int(p[3] or 0), int(p[4] or 0), int(p[5] or 0)]
-            pb = int(p[6] or 0)
-
-            winning_nums = draws_map[draw_date]['nums']
-            winning_pb = draws_map[draw_date]['pb']
-
-            main_matches = len(set(nums) & set(winning_nums))
-            pb_match = (pb == winning_pb)
-
-            prize_amount, _ = calculate_prize_amount(main_matches, pb_match)
-            if prize_amount and prize_amount > 0:
-                total_won += float(prize_amount)
-                winning_count += 1
+        while True:
+            rows = cursor.fetchmany(50000)
+            if not rows:
+                break
+            pairs = np.array([[x or 0 for x in r] for r in rows], dtype=np.int64)
+            scores = score(
+                encode_white_balls(pairs[:, 0:5]),
+                pairs[:, 5],
+                encode_white_balls(pairs[:, 6:11]),
+                pairs[:, 11],
+                calculate_prize_amount,
+            )
+            total_won += scores.total_prize
+            winning_count += scores.winners
 
         conn.close()
 
@@ -0,0 +1,193 @@
+"""
+SHIOL+ Data Version
+===================
+
+In-process publish/subscribe "data version" for cache invalidation.
+
+Cached API responses depend on two kinds of data:
+
+- the draw history: latest draw date + number of draws, read from the draw
+  store (which also notices rows written by other processes when it
+  revalidates)
+- generated tickets and their evaluation / strategy performance: a digest
+  of MAX(id), row count and evaluated count of ``generated_tickets`` plus
+  the ``strategy_performance`` totals, read from SQLite. Writers in this
+  process re-read it when they publish; writes from other processes (e.g.
+  scripts/regenerate_predictions_for_draw.py) are noticed within
+  REVALIDATE_INTERVAL_SECONDS, like the draw store does for draws
+
+Caches key their entries on ``get_data_version()`` (or its ``draws`` part
+when they only read draws), so an entry is valid exactly until the data
+it was computed from changes - no TTL. Writers call ``publish_draws()`` /
+``publish_tickets()`` after committing; subscribers are notified of the
+new version, e.g. to release memory held by entries of older versions.
+
+Usage:
+    version = get_data_version()
+    if cached_version != version: recompute()
+
+    unsubscribe = subscribe(lambda db_path, version: ...)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src import database
+
+DrawsVersion = Tuple[Optional[str], int]
+
+# Writers in other processes don't publish, so the tickets digest is re-read at most this often
+REVALIDATE_INTERVAL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """Version of the data cached responses are computed from"""
+    latest_draw_date: Optional[str]  # None when there are no draws
+    draw_count: int
+    tickets: str                     # Digest of generated_tickets / strategy_performance state
+
+    @property
+    def draws(self) -> DrawsVersion:
+        return self.latest_draw_date, self.draw_count
+
+    @property
+    def tag(self) -> str:
+        """Compact string form, e.g. for logs and ETags."""
+        return f"{self.latest_draw_date or 'none'}.{self.draw_count}.{self.tickets}"
+
+
+# listener(db_path, new_version)
+Listener = Callable[[str, DataVersion], None]
+
+_tickets: Dict[str, Tuple[str, float]] = {}  # db_path -> (digest, validated at)
+_published: Dict[str, DataVersion] = {}
+_observed: Dict[str, Tuple[DataVersion, float]] = {}  # db_path -> (version, first seen at)
+_listeners: List[Listener] = []
+_lock = threading.Lock()
+
+
+def _draws_version() -> DrawsVersion:
+    from src.draw_store import day_to_date
+    from src.frequency_index import get_frequency_index
+
+    index = get_frequency_index()
+    if len(index) == 0:
+        return None, 0
+    return day_to_date(index.days[-1]), len(index)
+
+
+def _read_tickets_digest() -> str:
+    """Digest of the ticket, evaluation and strategy performance state in SQLite."""
+    queries = (
+        "SELECT IFNULL(MAX(id), 0), COUNT(*) FROM generated_tickets",
+        "SELECT COUNT(*) FROM generated_tickets WHERE evaluated = 1",
+        "SELECT COUNT(*), TOTAL(total_plays), TOTAL(current_weight), IFNULL(MAX(last_updated), '')"
+        " FROM strategy_performance",
+    )
+    state = []
+    conn = database.get_db_connection(read_only=True)
+    try:
+        for query in queries:
+            try:
+                state.append(tuple(conn.execute(query).fetchone()))
+            except sqlite3.OperationalError:
+                state.append(None)  # Table or column missing (e.g. a database without tickets yet)
+    finally:
+        conn.close()
+    if not any(state):
+        return "none"
+    return hashlib.sha1(repr(state).encode()).hexdigest()[:12]
+
+
+def _tickets_version(db_path: str, refresh: bool = False) -> str:
+    """Tickets digest of db_path, re-read when refresh is set or the interval elapsed."""
+    now = time.monotonic()
+    with _lock:
+        cached = _tickets.get(db_path)
+    if cached is not None and not refresh and now - cached[1] < REVALIDATE_INTERVAL_SECONDS:
+        return cached[0]
+    digest = _read_tickets_digest()
+    with _lock:
+        _tickets[db_path] = (digest, now)
+    return digest
+
+
+def get_data_version() -> DataVersion:
+    """Current data version of the configured database."""
+    return observe_data_version()[0]
+
+
+def observe_data_version() -> Tuple[DataVersion, float]:
+    """
+    Current data version and the epoch seconds at which this process first saw it.
+
+    The timestamp serves as Last-Modified: it is never earlier than the
+    actual change (at most the process start time after a restart).
+    """
+    db_path = database.get_db_path()
+    latest_date, draw_count = _draws_version()
+    tickets = _tickets_version(db_path)
+    with _lock:
+        version = DataVersion(latest_date, draw_count, tickets)
+        observed = _observed.get(db_path)
+        if observed is None or observed[0] != version:
+            observed = (version, time.time())
+            _observed[db_path] = observed
+    return observed
+
+
+def subscribe(listener: Listener) -> Callable[[], None]:
+    """
+    Call listener(db_path, version) whenever a writer publishes a new version.
+
+    Listeners run synchronously in the writer's thread, so they should only
+    drop references; exceptions are logged and ignored.
+
+    Returns:
+        Function that removes the listener
+    """
+    with _lock:
+        _listeners.append(listener)
+
+    def unsubscribe() -> None:
+        with _lock:
+            if listener in _listeners:
+                _listeners.remove(listener)
+
+    return unsubscribe
+
+
+def _publish() -> DataVersion:
+    db_path = database.get_db_path()
+    version = get_data_version()
+    with _lock:
+        if _published.get(db_path) == version:
+            return version
+        _published[db_path] = version
+        listeners = list(_listeners)
+
+    logger.debug(f"Data version {version.tag} published for {db_path}")
+    for listener in listeners:
+        try:
+            listener(db_path, version)
+        except Exception as e:
+            logger.warning(f"Data version listener {getattr(listener, '__name__', listener)} failed: {e}")
+    return version
+
+
+def publish_draws() -> DataVersion:
+    """Announce that draws were written (after the draw store was synced)."""
+    return _publish()
+
+
+def publish_tickets() -> DataVersion:
+    """Announce that generated tickets, their evaluation or strategy performance changed."""
+    _tickets_version(database.get_db_path(), refresh=True)
+    return _publish()
@@ -8,6 +8,9 @@ import numpy as np
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 import hashlib
+from itertools import groupby
+
+from src.prize_kernel import score_tickets
 
 
 def calculate_prize_amount(main_matches: int, powerball_match: bool) -> Tuple[float, str]:
@@ -105,9 +108,17 @@ def calculate_next_drawing_date() -> str:
         raise
 
 
-def get_db_connection() -> sqlite3.Connection:
+def get_db_connection(read_only: bool = False) -> sqlite3.Connection:
     """
-    Establishes a connection to the SQLite database.
+    Get a pooled, pre-configured connection to the SQLite database.
+
+    Connections come from src/db_pool.py: PRAGMAs are applied once per
+    connection, and close() / leaving a ``with`` block returns the connection
+    to the pool instead of closing it.
+
+    Args:
+        read_only: If True, hand out a connection from the read-only pool
+                   (PRAGMA query_only=ON); writes raise sqlite3.OperationalError.
 
     Returns:
         sqlite3.Connection: A connection object to the database.
@@ -115,20 +126,11 @@ def get_db_connection() -> sqlite3.Connection:
     Raises:
         sqlite3.Error: If database connection fails
     """
+    from src.db_pool import get_pool
+
     db_path = get_db_path()
     try:
-        # Use a reasonable timeout to wait on busy DB instead of failing fast
-        conn = sqlite3.connect(db_path, timeout=30)
-        # Configure connection pragmas to reduce write-lock contention
-        try:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA busy_timeout=5000")
-            conn.execute("PRAGMA foreign_keys=ON")
-        except Exception:
-            # PRAGMA calls are best-effort; ignore failures
-            pass
-        logger.info(f"Successfully connected to database at {db_path}")
-        return conn
+        return get_pool(db_path, read_only=read_only).acquire()
     except sqlite3.Error as e:
         logger.error(f"Error connecting to database at {db_path}: {e}")
         raise
@@ -569,6 +571,15 @@ def create_analytics_tables():
             )
         """)
 
+        # Table 7: Analytics state - running accumulators for incremental analytics updates
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS analytics_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Create indexes for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_cooccurrence_significant ON cooccurrences(is_significant)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_generated_tickets_date ON generated_tickets(draw_date)")
@@ -1054,7 +1065,7 @@ def _create_indexes(cursor):
 def get_latest_draw_date() -> Optional[str]:
     """Retrieve the most recent draw date from the database."""
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(read_only=True) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT MAX(draw_date) FROM powerball_draws")
             result = cursor.fetchone()
@@ -1080,7 +1091,7 @@ def get_draw_by_date(draw_date: str) -> Optional[Dict[str, Any]]:
         Dict with draw data or None if not found
     """
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(read_only=True) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT draw_date, n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?",
@@ -1122,7 +1133,8 @@ def bulk_insert_draws(df: pd.DataFrame) -> int:
             df.to_sql('powerball_draws', conn, if_exists='append', index=False)
             row_count = len(df)
             logger.info(f"Successfully inserted {row_count} rows into the database.")
-            return row_count
+        _sync_draw_store(df)
+        return row_count
     except sqlite3.IntegrityError as e:
         logger.warning(f"Integrity constraint violation during bulk insert: {e}. Using upsert method.")
         return _upsert_draws(df)
@@ -1131,6 +1143,23 @@ def bulk_insert_draws(df: pd.DataFrame) -> int:
         return 0
 
 
+def _sync_draw_store(df: pd.DataFrame) -> None:
+    """Append freshly written draws to the in-memory draw store and publish the new data version."""
+    try:
+        from src.draw_store import get_draw_store
+        get_draw_store().append(df)
+    except Exception as e:
+        logger.warning(f"Could not sync draw store after insert: {e}")
+        from src.draw_store import invalidate_draw_store
+        invalidate_draw_store()
+
+    try:
+        from src.data_version import publish_draws
+        publish_draws()
+    except Exception as e:
+        logger.warning(f"Could not publish data version after insert: {e}")
+
+
 def _upsert_draws(df: pd.DataFrame) -> int:
     """
     Slower, row-by-row insert/replace for handling duplicates.
@@ -1153,52 +1182,51 @@ def _upsert_draws(df: pd.DataFrame) -> int:
             conn.commit()
             row_count = len(df)
             logger.info(f"Successfully upserted {row_count} rows.")
-            return row_count
+        _sync_draw_store(df)
+        return row_count
     except sqlite3.Error as e:
         logger.error(f"SQLite error during upsert: {e}")
         return 0
 
 
 def get_all_draws(max_date: str = None) -> pd.DataFrame:
-    """Retrieve all historical draw data from the database.
+    """Retrieve all historical draw data.
+
+    Served from the process-wide draw store (src/draw_store.py), which loads
+    powerball_draws once and keeps it in memory, instead of re-querying SQLite.
 
     Args:
         max_date: Optional date limit (YYYY-MM-DD). Only returns draws before this date.
                   Used to prevent data leakage when generating historical predictions.
+
+    Returns:
+        DataFrame with columns [draw_date, n1, n2, n3, n4, n5, pb], sorted by date.
     """
+    from src.draw_store import get_draw_store
+
     try:
-        with get_db_connection() as conn:
-            if max_date:
-                query = "SELECT * FROM powerball_draws WHERE draw_date < ? ORDER BY draw_date ASC"
-                df = pd.read_sql_query(
-                    query,
-                    conn,
-                    params=(max_date,),
-                    parse_dates=['draw_date']
-                )
-                logger.info(f"Successfully loaded {len(df)} rows from the database (filtered to before {max_date}).")
-            else:
-                df = pd.read_sql_query(
-                    "SELECT * FROM powerball_draws ORDER BY draw_date ASC",
-                    conn,
-                    parse_dates=['draw_date']
-                )
-                logger.info(f"Successfully loaded {len(df)} rows from the database.")
-            return df
+        df = get_draw_store().snapshot(max_date=max_date).to_dataframe()
+        if max_date:
+            logger.debug(f"Loaded {len(df)} draws from draw store (filtered to before {max_date}).")
+        else:
+            logger.debug(f"Loaded {len(df)} draws from draw store.")
+        return df
     except sqlite3.Error as e:
         logger.error(f"SQLite error retrieving draws data: {e}")
         return pd.DataFrame()
-    except pd.errors.DatabaseError as e:
-        logger.error(f"Pandas database error: {e}")
+    except (ValueError, TypeError) as e:
+        logger.error(f"Error building draws data: {e}")
         return pd.DataFrame()
 
 
-
-def save_prediction_log(prediction_data: Dict[str, Any], allow_simulation: bool = False, execution_source: Optional[str] = None) -> Optional[int]:
+def save_prediction_log(prediction_data: Dict[str, Any], allow_simulation: bool = False, execution_source: Optional[str] = None,
+                        publish: bool = True) -> Optional[int]:
     """Save a prediction into the active generated_tickets table and return its ID.
 
     This function replaces legacy predictions_log usage by mapping fields to the
     generated_tickets schema. It validates inputs and ensures ascending numbers.
+    Callers saving a batch pass publish=False and call
+    ``data_version.publish_tickets()`` once after the last ticket.
     """
     try:
         logger.debug(f"Received prediction data: {prediction_data}")
@@ -1256,6 +1284,9 @@ def save_prediction_log(prediction_data: Dict[str, Any], allow_simulation: bool
             )
             new_id = cursor.lastrowid
             conn.commit()
+            if publish:
+                from src.data_version import publish_tickets
+                publish_tickets()
             logger.info(f"Saved prediction to generated_tickets with id={new_id} for draw {draw_date}")
             return int(new_id)
     except sqlite3.Error as e:
@@ -1675,19 +1706,21 @@ def get_draw_analytics(draw_date: str, limit: int = 50) -> Dict[str, Any]:
                     return (4.0, 'Powerball Only')
                 return (0.0, 'No Prize')
 
+        # Score every ticket with the shared kernel; the loop below only aggregates
+        tickets = np.array([[x or 0 for x in r[1:7]] for r in rows], dtype=np.int64).reshape(-1, 6)
+        scores = score_tickets(
+            tickets[:, :5],
+            tickets[:, 5],
+            [x or 0 for x in winning_numbers] if winning_numbers else [0] * 5,
+            winning_pb if winning_pb is not None else -1,
+            calculate_prize_amount,
+        )
+        scored = zip(scores.main_matches.tolist(), scores.powerball_match.tolist(),
+                     scores.prize_amount.tolist(), scores.descriptions())
+
         # Compute analytics by iterating tickets
-        for r in rows:
+        for r, (matches_main, pb_match, prize_amount, prize_desc) in zip(rows, scored):
             tid, a, b, c, d, e, pb, conf, strat, prize_val, created_at = r
-            ticket_nums = [a, b, c, d, e]
-            # Compute main matches by counting intersections
-            matches_main = 0
-            for n in ticket_nums:
-                if n in winning_numbers:
-                    matches_main += 1
-
-            pb_match = (pb == winning_pb)
-
-            prize_amount, prize_desc = calculate_prize_amount(matches_main, pb_match)
 
             # Accumulate totals
             total_prize += float(prize_amount or 0.0)
@@ -2051,9 +2084,12 @@ def get_predictions_grouped_by_date(limit_dates: int = 25) -> List[Dict]:
     """
     Get predictions grouped by date for draws that have already occurred.
     Only includes REAL pipeline predictions for draws with official results.
+
+    Tickets for all selected dates are streamed from a single join with
+    powerball_draws and scored one date group at a time.
     """
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(read_only=True) as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -2079,90 +2115,69 @@ def get_predictions_grouped_by_date(limit_dates: int = 25) -> List[Dict]:
                 LIMIT ?
             """, (limit_dates,))
 
-            date_groups = cursor.fetchall()
+            total_by_date = {row[0]: row[1] for row in cursor.fetchall()}
 
             grouped_results = []
+            if not total_by_date:
+                logger.info("Retrieved 0 grouped prediction dates")
+                return grouped_results
 
             spanish_months = {
                 1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr', 5: 'May', 6: 'Jun',
                 7: 'Jul', 8: 'Ago', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dic'
             }
 
-            for date_row in date_groups:
-                target_date = date_row[0]
-                total_predictions_for_date = date_row[1]
-
-                cursor.execute(
-                    """
-                    SELECT
-                        pl.id, pl.created_at, pl.n1, pl.n2, pl.n3, pl.n4, pl.n5, pl.pb,
-                        pt.matches_main, pt.matches_pb, pt.prize_tier,
-                        pl.draw_date,
-                        pl.created_at
-                    FROM generated_tickets pl
-                    LEFT JOIN performance_tracking pt ON pl.id = pt.prediction_id
-                    WHERE pl.draw_date = ?
-                    ORDER BY pl.confidence_score DESC
-                """, (target_date,))
-
-                predictions_data = cursor.fetchall()
+            placeholders = ",".join("?" * len(total_by_date))
+            cursor.execute(
+                f"""
+                SELECT
+                    pl.draw_date, pl.id, pl.created_at,
+                    pl.n1, pl.n2, pl.n3, pl.n4, pl.n5, pl.pb,
+                    pd.n1, pd.n2, pd.n3, pd.n4, pd.n5, pd.pb
+                FROM generated_tickets pl
+                INNER JOIN powerball_draws pd ON pd.draw_date = pl.draw_date
+                WHERE pl.draw_date IN ({placeholders})
+                ORDER BY pl.draw_date DESC, pl.confidence_score DESC, pl.id ASC
+            """, tuple(total_by_date))
+
+            for target_date, group in groupby(cursor, key=lambda row: row[0]):
+                rows = list(group)
+                total_predictions_for_date = total_by_date[target_date]
+
+                tickets = np.array([[x or 0 for x in row[3:9]] for row in rows], dtype=np.int64)
+                scores = score_tickets(
+                    tickets[:, :5], tickets[:, 5], [x or 0 for x in rows[0][9:14]], rows[0][14],
+                    calculate_prize_amount,
+                )
+                main_matches = scores.main_matches.tolist()
+                powerball_match = scores.powerball_match.tolist()
+                prize_amount = scores.prize_amount.tolist()
+                prize_description = scores.descriptions()
+
+                predictions = [
+                    {
+                        "prediction_id": row[1],
+                        "created_at": row[2],
+                        "numbers": list(row[3:8]),
+                        "powerball": row[8],
+                        "draw_date": target_date,
+                        "matches_main": main_matches[i],
+                        "powerball_match": powerball_match[i],
+                        "prize_amount": prize_amount[i],
+                        "prize_description": prize_description[i],
+                        "has_prize": prize_amount[i] > 0
+                    }
+                    for i, row in enumerate(rows)
+                ]
 
-                predictions = []
-                total_prize = 0.0
-                winning_predictions = 0
+                total_prize = scores.total_prize
+                winning_predictions = scores.winners
                 best_prize_amount = 0.0
                 best_prize_description = "No matches"
-
-                for pred_row in predictions_data:
-                    prediction_numbers = [pred_row[2], pred_row[3], pred_row[4], pred_row[5], pred_row[6]]
-                    prediction_pb = pred_row[7]
-                    prediction_draw_date = pred_row[11] or target_date
-                    prediction_created_at = pred_row[12]
-
-                    cursor.execute(
-                        "SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?",
-                        (prediction_draw_date,))
-                    official_result = cursor.fetchone()
-
-                    matches_main = 0
-                    powerball_match = False
-                    prize_amount = 0.0
-                    prize_description = "No matches"
-
-                    if official_result:
-                        winning_numbers = [official_result[0], official_result[1], official_result[2], official_result[3], official_result[4]]
-                        winning_pb = official_result[5]
-
-                        matches_main = len(set(prediction_numbers) & set(winning_numbers))
-                        powerball_match = prediction_pb == winning_pb
-
-                        try:
-                            prize_amount, prize_description = calculate_prize_amount(matches_main, powerball_match)
-                        except Exception as e:
-                            logger.error(f"Error calculating prize amount: {e}")
-                            prize_amount, prize_description = 0.0, "Error calculating prize"
-
-                    total_prize += prize_amount
-                    if prize_amount > 0:
-                        winning_predictions += 1
-
-                    if prize_amount > best_prize_amount:
-                        best_prize_amount = prize_amount
-                        best_prize_description = prize_description
-
-                    prediction_detail = {
-                        "prediction_id": pred_row[0],
-                        "created_at": pred_row[1],
-                        "numbers": prediction_numbers,
-                        "powerball": prediction_pb,
-                        "draw_date": prediction_draw_date,
-                        "matches_main": matches_main,
-                        "powerball_match": powerball_match,
-                        "prize_amount": prize_amount,
-                        "prize_description": prize_description,
-                        "has_prize": prize_amount > 0
-                    }
-                    predictions.append(prediction_detail)
+                if winning_predictions:
+                    best = int(np.argmax(scores.prize_amount))
+                    best_prize_amount = prize_amount[best]
+                    best_prize_description = predictions[best]["prize_description"]
 
                 try:
                     date_obj = datetime.strptime(target_date, '%Y-%m-%d')
@@ -2209,13 +2224,25 @@ def get_predictions_grouped_by_date(limit_dates: int = 25) -> List[Dict]:
         return []
 
 
+# Best-result labels indexed by [main_matches, powerball_match]
+_BEST_RESULT_LABELS = [
+    ["No Match", "PB Only"],
+    ["No Match", "1 + PB"],
+    ["No Match", "2 + PB"],
+    ["3 Numbers", "3 + PB"],
+    ["4 Numbers", "4 + PB"],
+    ["5 Numbers", "JACKPOT"],
+]
+
+
 def get_grouped_predictions_with_results_comparison(limit_groups: int = 5) -> List[Dict]:
     """Return grouped prediction results by draw_date using generated_tickets + powerball_draws.
 
     Builds a compact structure the frontend expects, including a summary with totals.
+    Tickets and their official results come from a single join, scored per draw date.
     """
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(read_only=True) as conn:
             cursor = conn.cursor()
 
             # Latest draw dates where we have both official results and generated tickets
@@ -2233,56 +2260,44 @@ def get_grouped_predictions_with_results_comparison(limit_groups: int = 5) -> Li
             draw_dates = [row[0] for row in cursor.fetchall()]
 
             grouped: List[Dict[str, Any]] = []
+            if not draw_dates:
+                logger.info("Grouped history built for 0 draw dates")
+                return grouped
 
-            for draw_date in draw_dates:
-                # Official results
-                cursor.execute(
-                    "SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?",
-                    (draw_date,)
-                )
-                r = cursor.fetchone()
-                if not r:
-                    # Shouldn't happen due to join above
-                    continue
-                winning_numbers = [r[0], r[1], r[2], r[3], r[4]]
-                winning_powerball = r[5]
+            placeholders = ",".join("?" * len(draw_dates))
+            cursor.execute(
+                f"""
+                SELECT gt.draw_date, gt.id, gt.created_at,
+                       gt.n1, gt.n2, gt.n3, gt.n4, gt.n5, gt.powerball,
+                       pd.n1, pd.n2, pd.n3, pd.n4, pd.n5, pd.pb
+                FROM generated_tickets gt
+                JOIN powerball_draws pd ON pd.draw_date = gt.draw_date
+                WHERE gt.draw_date IN ({placeholders})
+                ORDER BY gt.draw_date DESC, gt.created_at ASC, gt.id ASC
+                """,
+                tuple(draw_dates)
+            )
 
-                # Predictions for this draw
-                cursor.execute(
-                    """
-                    SELECT id, created_at, n1, n2, n3, n4, n5, powerball
-                    FROM generated_tickets
-                    WHERE draw_date = ?
-                    ORDER BY created_at ASC
-                    """,
-                    (draw_date,)
+            for draw_date, group in groupby(cursor, key=lambda row: row[0]):
+                rows = list(group)
+                winning_numbers = list(rows[0][9:14])
+                winning_powerball = rows[0][14]
+
+                tickets = np.array([[x or 0 for x in row[3:9]] for row in rows], dtype=np.int64)
+                scores = score_tickets(
+                    tickets[:, :5], tickets[:, 5], [x or 0 for x in winning_numbers], winning_powerball,
+                    calculate_prize_amount,
                 )
-                preds = cursor.fetchall()
-                if not preds:
-                    continue
+                number_hits = np.isin(tickets[:, :5], winning_numbers).tolist()
+                main_matches = scores.main_matches.tolist()
+                pb_matches = scores.powerball_match.tolist()
+                prize_amounts = scores.prize_amount.tolist()
+                prize_descriptions = scores.descriptions()
 
                 predictions = []
-                total_prize = 0.0
-                total_matches = 0
-                winning_predictions = 0
-
-                for idx, row in enumerate(preds):
-                    pid, created_at, a, b, c, d, e, pb = row
-                    numbers = [a, b, c, d, e]
-                    number_matches = [{
-                        'number': n,
-                        'position': i,
-                        'is_match': n in winning_numbers
-                    } for i, n in enumerate(numbers)]
-
-                    main_matches = sum(1 for m in number_matches if m['is_match'])
-                    pb_match = (pb == winning_powerball)
-                    prize_amount, prize_desc = calculate_prize_amount(main_matches, pb_match)
-
-                    total_prize += float(prize_amount or 0.0)
-                    total_matches += int(main_matches)
-                    if prize_amount and prize_amount > 0:
-                        winning_predictions += 1
+                for idx, row in enumerate(rows):
+                    numbers = list(row[3:8])
+                    prize_amount = prize_amounts[idx]
 
                     if prize_amount >= 100000000:
                         prize_display = "JACKPOT!"
@@ -2296,25 +2311,31 @@ def get_grouped_predictions_with_results_comparison(limit_groups: int = 5) -> Li
                         prize_display = "$0.00"
 
                     predictions.append({
-                        'prediction_id': pid,
-                        'prediction_date': created_at,
+                        'prediction_id': row[1],
+                        'prediction_date': row[2],
                         'prediction_numbers': numbers,
-                        'prediction_powerball': pb,
+                        'prediction_powerball': row[8],
                         'winning_numbers': winning_numbers,
                         'winning_powerball': winning_powerball,
-                        'number_matches': number_matches,
-                        'powerball_match': pb_match,
-                        'total_matches': main_matches,
-                        'prize_amount': float(prize_amount or 0.0),
-                        'prize_description': prize_desc,
+                        'number_matches': [{
+                            'number': n,
+                            'position': i,
+                            'is_match': number_hits[idx][i]
+                        } for i, n in enumerate(numbers)],
+                        'powerball_match': pb_matches[idx],
+                        'total_matches': main_matches[idx],
+                        'prize_amount': prize_amount,
+                        'prize_description': prize_descriptions[idx],
                         'prize_display': prize_display,
-                        'has_prize': bool(prize_amount and prize_amount > 0),
+                        'has_prize': prize_amount > 0,
                         'play_number': idx + 1
                     })
 
                 num_predictions = len(predictions)
-                avg_matches = (total_matches / num_predictions) if num_predictions > 0 else 0.0
-                win_rate = (winning_predictions / num_predictions * 100.0) if num_predictions > 0 else 0.0
+                total_prize = float(sum(prize_amounts))
+                winning_predictions = scores.winners
+                avg_matches = float(scores.main_matches.mean())
+                win_rate = winning_predictions / num_predictions * 100.0
 
                 if total_prize >= 100000000:
                     total_prize_display = "JACKPOT!"
@@ -2327,37 +2348,18 @@ def get_grouped_predictions_with_results_comparison(limit_groups: int = 5) -> Li
                 else:
                     total_prize_display = "$0"
 
-                # Determine best result
-                best_result = "No Match"
-                if predictions:
-                    bp = max(predictions, key=lambda p: (p['total_matches'], p['powerball_match'], p['prize_amount']))
-                    if bp['total_matches'] == 5 and bp['powerball_match']:
-                        best_result = 'JACKPOT'
-                    elif bp['total_matches'] == 5:
-                        best_result = '5 Numbers'
-                    elif bp['total_matches'] == 4 and bp['powerball_match']:
-                        best_result = '4 + PB'
-                    elif bp['total_matches'] == 4:
-                        best_result = '4 Numbers'
-                    elif bp['total_matches'] == 3 and bp['powerball_match']:
-                        best_result = '3 + PB'
-                    elif bp['total_matches'] == 3:
-                        best_result = '3 Numbers'
-                    elif bp['total_matches'] == 2 and bp['powerball_match']:
-                        best_result = '2 + PB'
-                    elif bp['total_matches'] == 1 and bp['powerball_match']:
-                        best_result = '1 + PB'
-                    elif bp['powerball_match']:
-                        best_result = 'PB Only'
+                # Best result: most main matches, then powerball
+                best = int(np.argmax(scores.tier))
+                best_result = _BEST_RESULT_LABELS[main_matches[best]][pb_matches[best]]
 
                 grouped.append({
                     'draw_date': draw_date,
                     'winning_numbers': winning_numbers,
                     'winning_powerball': winning_powerball,
-                    'prediction_date': predictions[0]['prediction_date'] if predictions else None,
+                    'prediction_date': predictions[0]['prediction_date'],
                     'predictions': predictions,
                     'summary': {
-                        'total_prize': float(total_prize),
+                        'total_prize': total_prize,
                         'total_prize_display': total_prize_display,
                         'predictions_with_prizes': winning_predictions,
                         'win_rate_percentage': f"{win_rate:.0f}",
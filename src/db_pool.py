@@ -0,0 +1,267 @@
+"""
+SHIOL+ SQLite Connection Pool
+=============================
+
+Pooled, pre-configured SQLite connections behind ``database.get_db_connection``.
+
+Opening a connection used to cost a ``sqlite3.connect`` plus three PRAGMAs and
+an INFO log line on every call, and hot endpoints call it several times per
+request. The pool keeps configured connections around instead:
+
+- PRAGMAs are applied once, when a connection is created
+- Idle connections are handed back to the thread that last used them first
+- Connections idle for longer than HEALTHCHECK_INTERVAL_SECONDS are pinged
+  (``SELECT 1``) before reuse and replaced if broken
+- The number of open connections per pool is capped at ``max_size``
+- Read-only handles come from a separate pool with ``PRAGMA query_only=ON``
+
+Pooled connections subclass ``sqlite3.Connection``, so existing call sites
+(``conn.close()``, ``with get_db_connection() as conn:``, pandas
+``read_sql_query``) keep working unchanged: ``close()`` and leaving the
+``with`` block return the connection to the pool instead of closing it.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+DEFAULT_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "16"))
+CHECKOUT_TIMEOUT_SECONDS = 5.0
+HEALTHCHECK_INTERVAL_SECONDS = 30.0
+CONNECT_TIMEOUT_SECONDS = 30
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() returns it to its pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool: Optional["ConnectionPool"] = None
+        self._released = True
+        self._last_used = time.monotonic()
+        self._owner_thread: Optional[int] = None
+        # Bumped on every checkout; with-blocks remember the one they entered
+        self._generation = 0
+        self._entered: Dict[int, List[int]] = {}
+
+    def close(self) -> None:
+        """Return the connection to its pool (uncommitted changes are rolled back)."""
+        if self._pool is None:
+            sqlite3.Connection.close(self)
+        elif not self._released:
+            self._pool.release(self)
+
+    def __enter__(self):
+        self._entered.setdefault(threading.get_ident(), []).append(self._generation)
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        thread_id = threading.get_ident()
+        stack = self._entered.get(thread_id)
+        generation = stack.pop() if stack else self._generation
+        if not stack:
+            self._entered.pop(thread_id, None)
+        if self._released or generation != self._generation:
+            # Closed inside the with-block (and possibly checked out again
+            # since): the current checkout is not this block's to finish
+            return False
+        try:
+            return super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections for a single database file.
+
+    Args:
+        db_path: Path to the SQLite database
+        read_only: If True, connections reject writes (PRAGMA query_only=ON)
+        max_size: Maximum number of open connections (idle + checked out)
+    """
+
+    def __init__(self, db_path: str, read_only: bool = False, max_size: int = DEFAULT_MAX_SIZE):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.max_size = max(1, max_size)
+        self._idle: Deque[PooledConnection] = deque()
+        self._in_use: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+        self._cond = threading.Condition(threading.Lock())
+        self.stats = {
+            "created": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "thread_affinity_hits": 0,
+            "healthcheck_failures": 0,
+            "overflow": 0,
+            "waits": 0,
+        }
+
+    def _create(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=CONNECT_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        # Configure connection pragmas once to reduce write-lock contention
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA foreign_keys=ON")
+            if self.read_only:
+                conn.execute("PRAGMA query_only=ON")
+        except sqlite3.Error:
+            # PRAGMA calls are best-effort; ignore failures
+            pass
+        self.stats["created"] += 1
+        mode = "read-only" if self.read_only else "read-write"
+        logger.debug(f"Opened {mode} pooled connection #{self.stats['created']} to {self.db_path}")
+        return conn
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if time.monotonic() - conn._last_used < HEALTHCHECK_INTERVAL_SECONDS:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            self.stats["healthcheck_failures"] += 1
+            logger.warning(f"Discarding unhealthy pooled connection to {self.db_path}: {e}")
+            try:
+                sqlite3.Connection.close(conn)
+            except sqlite3.Error:
+                pass
+            return False
+
+    def _take_idle(self) -> Optional[PooledConnection]:
+        """Pop an idle connection, preferring one last used by this thread."""
+        thread_id = threading.get_ident()
+        for conn in reversed(self._idle):
+            if conn._owner_thread == thread_id:
+                self._idle.remove(conn)
+                self.stats["thread_affinity_hits"] += 1
+                return conn
+        return self._idle.pop() if self._idle else None
+
+    def acquire(self) -> PooledConnection:
+        """Check a connection out of the pool, creating one if needed."""
+        deadline = time.monotonic() + CHECKOUT_TIMEOUT_SECONDS
+        with self._cond:
+            while True:
+                conn = self._take_idle()
+                if conn is not None:
+                    if not self._is_healthy(conn):
+                        continue
+                    self.stats["reused"] += 1
+                    pooled = True
+                    break
+                if len(self._in_use) < self.max_size:
+                    conn = None
+                    pooled = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    conn = None
+                    pooled = False
+                    break
+                self.stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            if conn is None:
+                conn = self._create()
+                if not pooled:
+                    # Pool exhausted: hand out a one-off connection rather than deadlock
+                    self.stats["overflow"] += 1
+                    logger.warning(f"Connection pool for {self.db_path} exhausted "
+                                   f"({self.max_size} in use), opening overflow connection")
+
+            conn._pool = self if pooled else None
+            conn._released = False
+            conn._generation += 1
+            conn._owner_thread = threading.get_ident()
+            if pooled:
+                self._in_use.add(conn)
+            self.stats["checkouts"] += 1
+            return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """Return a checked-out connection to the idle list."""
+        try:
+            if conn.in_transaction:
+                # Match sqlite3 close() semantics: uncommitted work is discarded
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+            conn.isolation_level = ""
+            healthy = True
+        except sqlite3.Error as e:
+            logger.warning(f"Dropping pooled connection after reset failure: {e}")
+            healthy = False
+
+        with self._cond:
+            conn._released = True
+            conn._last_used = time.monotonic()
+            self._in_use.discard(conn)
+            if healthy:
+                self._idle.append(conn)
+            else:
+                conn._pool = None
+                try:
+                    sqlite3.Connection.close(conn)
+                except sqlite3.Error:
+                    pass
+            self._cond.notify()
+
+    def close_all(self) -> None:
+        """Close every idle connection (checked-out ones close when released)."""
+        with self._cond:
+            while self._idle:
+                conn = self._idle.pop()
+                conn._pool = None
+                try:
+                    sqlite3.Connection.close(conn)
+                except sqlite3.Error:
+                    pass
+
+    def snapshot_stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self.stats, "idle": len(self._idle), "in_use": len(self._in_use), "max_size": self.max_size}
+
+
+_pools: Dict[Tuple[str, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str, read_only: bool = False) -> ConnectionPool:
+    """Get (or lazily create) the pool for a database path and access mode."""
+    key = (os.path.abspath(db_path), read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key[0], read_only=read_only)
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Per-pool counters, keyed by '<db_path> (rw|ro)'."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {f"{path} ({'ro' if ro else 'rw'})": pool.snapshot_stats() for (path, ro), pool in pools}
+
+
+def close_all_pools() -> None:
+    """Close idle connections in every pool (call on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+    logger.info("Database connection pools closed")
@@ -0,0 +1,363 @@
+"""
+SHIOL+ Draw Store
+=================
+
+Process-wide, in-memory copy of the ``powerball_draws`` history.
+
+Every strategy, the analytics engine, the ticket verifier and the v2 analytics
+router used to run their own ``SELECT * FROM powerball_draws`` + pandas date
+parsing pass. The draw store loads the history once into compact NumPy arrays
+and hands out read-only views of it:
+
+- ``days``: int32 day ordinals (days since 1970-01-01), ascending
+- ``white_balls``: uint8 matrix of shape (N, 5)
+- ``powerball``: uint8 vector of shape (N,)
+
+It also maintains cumulative occurrence counts of every number (see
+``src/frequency_index.py``), so window frequencies are two row subtractions.
+
+New draws inserted through ``database.bulk_insert_draws`` are appended in
+place, and ``max_date`` cutoffs are resolved with a binary search so historical
+predictions get a zero-copy prefix view instead of a filtered copy.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src import database
+from src.frequency_index import POWERBALLS, WHITE_BALLS, FrequencyIndex, cumulative_counts
+
+# External writers (e.g. scripts/update_draws.py run from cron) bypass
+# bulk_insert_draws, so the store re-checks COUNT/MAX(draw_date) at most this often.
+REVALIDATE_INTERVAL_SECONDS = 60.0
+
+_INITIAL_CAPACITY = 4096
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def date_to_day(value) -> int:
+    """
+    Convert a date-like value to an int day ordinal (days since 1970-01-01).
+
+    Args:
+        value: 'YYYY-MM-DD' string (time suffix ignored), date, datetime or Timestamp
+
+    Returns:
+        Day ordinal as int
+    """
+    if isinstance(value, str):
+        value = value[:10]
+    return int((np.datetime64(pd.Timestamp(value).date(), "D") - _EPOCH).astype(np.int64))
+
+
+def day_to_date(day: int) -> str:
+    """Convert a day ordinal back to a 'YYYY-MM-DD' string."""
+    return str(_EPOCH + np.timedelta64(int(day), "D"))
+
+
+@dataclass(frozen=True)
+class DrawArrays:
+    """Read-only snapshot of (a prefix of) the draw history"""
+    days: np.ndarray         # Shape: (N,), int32 day ordinals, ascending
+    white_balls: np.ndarray  # Shape: (N, 5), uint8
+    powerball: np.ndarray    # Shape: (N,), uint8
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Build the legacy ``get_all_draws`` DataFrame from this snapshot.
+
+        Numbers are widened to int64 so downstream arithmetic (sums, ranges)
+        behaves exactly as it did with ``pd.read_sql_query`` results.
+
+        Returns:
+            DataFrame with columns [draw_date, n1, n2, n3, n4, n5, pb]
+        """
+        data = {"draw_date": (_EPOCH + self.days.astype("timedelta64[D]")).astype("datetime64[ns]")}
+        white = self.white_balls.astype(np.int64)
+        for i in range(5):
+            data[f"n{i + 1}"] = white[:, i]
+        data["pb"] = self.powerball.astype(np.int64)
+        return pd.DataFrame(data)
+
+
+class DrawStore:
+    """
+    In-memory draw history for a single SQLite database file.
+
+    Buffers grow geometrically so appending a draw is amortized O(1); views
+    handed out earlier keep pointing at valid (immutable) data because rows
+    are never modified in place - corrections trigger a full reload into
+    fresh buffers instead.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._days = np.empty(0, dtype=np.int32)
+        self._white = np.empty((0, 5), dtype=np.uint8)
+        self._pb = np.empty(0, dtype=np.uint8)
+        self._white_counts = np.zeros((1, WHITE_BALLS), dtype=np.int32)
+        self._pb_counts = np.zeros((1, POWERBALLS), dtype=np.int32)
+        self._size = 0
+        self._loaded = False
+        self._last_validated = 0.0
+        self.load_count = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        """Load the full history from SQLite into fresh buffers."""
+        start = time.perf_counter()
+        conn = database.get_db_connection(read_only=True)
+        try:
+            rows = conn.execute(
+                "SELECT draw_date, n1, n2, n3, n4, n5, pb FROM powerball_draws ORDER BY draw_date ASC"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        size = len(rows)
+        capacity = max(_INITIAL_CAPACITY, size * 2)
+        days = np.empty(capacity, dtype=np.int32)
+        white = np.empty((capacity, 5), dtype=np.uint8)
+        pb = np.empty(capacity, dtype=np.uint8)
+        white_counts = np.zeros((capacity + 1, WHITE_BALLS), dtype=np.int32)
+        pb_counts = np.zeros((capacity + 1, POWERBALLS), dtype=np.int32)
+
+        if size:
+            dates = np.array([str(r[0])[:10] for r in rows], dtype="datetime64[D]")
+            days[:size] = (dates - _EPOCH).astype(np.int32)
+            values = np.array([r[1:7] for r in rows], dtype=np.int64)
+            white[:size] = values[:, :5]
+            pb[:size] = values[:, 5]
+            white_counts[1:size + 1] = cumulative_counts(values[:, :5], WHITE_BALLS)
+            pb_counts[1:size + 1] = cumulative_counts(values[:, 5], POWERBALLS)
+
+        self._days, self._white, self._pb = days, white, pb
+        self._white_counts, self._pb_counts = white_counts, pb_counts
+        self._size = size
+        self._loaded = True
+        self._last_validated = time.monotonic()
+        self.load_count += 1
+        logger.info(
+            f"Draw store loaded {size} draws from {self.db_path} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    def _is_stale(self) -> bool:
+        """Compare COUNT/MAX(draw_date) in SQLite with the in-memory copy."""
+        conn = database.get_db_connection(read_only=True)
+        try:
+            count, max_date = conn.execute(
+                "SELECT COUNT(*), MAX(draw_date) FROM powerball_draws"
+            ).fetchone()
+        finally:
+            conn.close()
+        if count != self._size:
+            return True
+        if count and date_to_day(str(max_date)) != int(self._days[self._size - 1]):
+            return True
+        return False
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load()
+            return
+        now = time.monotonic()
+        if now - self._last_validated < REVALIDATE_INTERVAL_SECONDS:
+            return
+        self._last_validated = now
+        if self._is_stale():
+            logger.info("Draw store out of sync with database (external write), reloading")
+            self._load()
+
+    def invalidate(self) -> None:
+        """Drop the in-memory copy; the next access reloads from SQLite."""
+        with self._lock:
+            self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def append(self, draws_df: pd.DataFrame) -> None:
+        """
+        Append newly inserted draws in place.
+
+        Only strictly newer draws can be appended; anything else (a corrected
+        or back-filled draw) invalidates the store so it is rebuilt on next use.
+
+        Args:
+            draws_df: DataFrame with columns [draw_date, n1, n2, n3, n4, n5, pb]
+        """
+        if draws_df is None or draws_df.empty:
+            return
+        with self._lock:
+            if not self._loaded:
+                return  # Nothing cached yet; the first access loads everything
+
+            try:
+                ordered = draws_df.sort_values("draw_date")
+                new_days = np.array([date_to_day(str(d)) for d in ordered["draw_date"]], dtype=np.int32)
+                new_white = ordered[["n1", "n2", "n3", "n4", "n5"]].to_numpy(dtype=np.int64)
+                new_pb = ordered["pb"].to_numpy(dtype=np.int64)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.warning(f"Draw store could not append draws ({e}), invalidating")
+                self._loaded = False
+                return
+
+            last_day = int(self._days[self._size - 1]) if self._size else None
+            if (last_day is not None and new_days[0] <= last_day) or np.any(np.diff(new_days) <= 0):
+                logger.info("Draw store received a correction or back-filled draw, invalidating")
+                self._loaded = False
+                return
+
+            needed = self._size + len(new_days)
+            if needed > self._days.shape[0]:
+                capacity = max(needed, self._days.shape[0] * 2)
+                days = np.empty(capacity, dtype=np.int32)
+                white = np.empty((capacity, 5), dtype=np.uint8)
+                pb = np.empty(capacity, dtype=np.uint8)
+                white_counts = np.empty((capacity + 1, WHITE_BALLS), dtype=np.int32)
+                pb_counts = np.empty((capacity + 1, POWERBALLS), dtype=np.int32)
+                days[:self._size] = self._days[:self._size]
+                white[:self._size] = self._white[:self._size]
+                pb[:self._size] = self._pb[:self._size]
+                white_counts[:self._size + 1] = self._white_counts[:self._size + 1]
+                pb_counts[:self._size + 1] = self._pb_counts[:self._size + 1]
+                self._days, self._white, self._pb = days, white, pb
+                self._white_counts, self._pb_counts = white_counts, pb_counts
+
+            self._days[self._size:needed] = new_days
+            self._white[self._size:needed] = new_white
+            self._pb[self._size:needed] = new_pb
+            self._white_counts[self._size + 1:needed + 1] = cumulative_counts(
+                new_white, WHITE_BALLS, initial=self._white_counts[self._size])
+            self._pb_counts[self._size + 1:needed + 1] = cumulative_counts(
+                new_pb, POWERBALLS, initial=self._pb_counts[self._size])
+            self._size = needed
+            logger.info(f"Draw store appended {len(new_days)} draw(s), now {self._size} draws")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def snapshot(self, max_date: Optional[str] = None) -> DrawArrays:
+        """
+        Get a read-only view of the draw history.
+
+        Args:
+            max_date: Optional date limit (YYYY-MM-DD). Only draws strictly before
+                      this date are included (same semantics as get_all_draws).
+
+        Returns:
+            DrawArrays whose arrays are zero-copy views into the store buffers
+        """
+        with self._lock:
+            self._ensure_loaded()
+            end = self._size
+            if max_date:
+                end = int(np.searchsorted(self._days[:self._size], date_to_day(max_date), side="left"))
+            days = self._days[:end]
+            white = self._white[:end]
+            pb = self._pb[:end]
+
+        for arr in (days, white, pb):
+            arr.flags.writeable = False
+        return DrawArrays(days=days, white_balls=white, powerball=pb)
+
+    def frequency_index(self, max_date: Optional[str] = None) -> FrequencyIndex:
+        """
+        Get the cumulative number counts of the draw history.
+
+        Args:
+            max_date: Optional date limit (YYYY-MM-DD), same semantics as snapshot()
+
+        Returns:
+            FrequencyIndex whose arrays are zero-copy views into the store buffers
+        """
+        with self._lock:
+            self._ensure_loaded()
+            end = self._size
+            if max_date:
+                end = int(np.searchsorted(self._days[:self._size], date_to_day(max_date), side="left"))
+            arrays = (self._days[:end], self._white_counts[:end + 1], self._pb_counts[:end + 1],
+                      self._white[:end], self._pb[:end])
+
+        for arr in arrays:
+            arr.flags.writeable = False
+        days, white_counts, pb_counts, white, pb = arrays
+        return FrequencyIndex(days=days, white=white_counts, powerball=pb_counts, white_balls=white, powerballs=pb)
+
+    def find(self, draw_date: str, tolerance_days: int = 0) -> Optional[Dict]:
+        """
+        Look up a single draw by date with a binary search.
+
+        Args:
+            draw_date: Date in YYYY-MM-DD format
+            tolerance_days: If no exact match, accept the closest draw within this many days
+
+        Returns:
+            Dict with draw_date (YYYY-MM-DD), n1..n5 and pb, or None if not found
+        """
+        snap = self.snapshot()
+        if snap.empty:
+            return None
+        target = date_to_day(draw_date)
+        idx = int(np.searchsorted(snap.days, target, side="left"))
+
+        candidates = [i for i in (idx - 1, idx) if 0 <= i < len(snap)]
+        best = min(candidates, key=lambda i: abs(int(snap.days[i]) - target))
+        if abs(int(snap.days[best]) - target) > tolerance_days:
+            return None
+
+        draw = {"draw_date": day_to_date(snap.days[best])}
+        for i in range(5):
+            draw[f"n{i + 1}"] = int(snap.white_balls[best, i])
+        draw["pb"] = int(snap.powerball[best])
+        return draw
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return self._size
+
+
+_stores: Dict[str, DrawStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_draw_store() -> DrawStore:
+    """
+    Get the process-wide draw store for the configured database.
+
+    Stores are keyed by database path so tests (and tools) that point
+    get_db_path() at a different file never see another database's draws.
+    """
+    db_path = database.get_db_path()
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = DrawStore(db_path)
+            _stores[db_path] = store
+        return store
+
+
+def invalidate_draw_store() -> None:
+    """Force every draw store to reload on next access (e.g. after manual DB edits)."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.invalidate()
+    logger.info("Draw store invalidated")
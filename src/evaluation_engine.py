@@ -0,0 +1,248 @@
+"""
+SHIOL+ Batch Evaluation Engine
+==============================
+
+Scores every generated ticket for a draw in one pass.
+
+Ticket evaluation used to be a Python loop per ticket (set intersection,
+prize lookup, INSERT into performance_tracking, UPDATE and commit), i.e.
+thousands of fsyncs per draw. The engine instead:
+
+- loads all tickets for the draw as an (N x 5) array
+- scores them with the shared bitmask kernel (src/prize_kernel.py)
+- writes the results with ``executemany`` inside the caller's transaction
+
+Used by ``run_draw_evaluation`` (pipeline STEP 4, also in the pipeline
+worker process) and ``PredictionEvaluator.evaluate_predictions_for_date``.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.prize_kernel import PrizeCalculator, score_tickets
+
+
+@dataclass
+class DrawEvaluation:
+    """Vectorized evaluation of a draw's tickets"""
+    draw_date: str
+    winning_numbers: List[int]
+    winning_powerball: int
+    ticket_ids: np.ndarray         # Shape: (N,), int64
+    numbers: np.ndarray            # Shape: (N, 5), int64
+    powerball: np.ndarray          # Shape: (N,), int64
+    main_matches: np.ndarray       # Shape: (N,), uint8
+    powerball_match: np.ndarray    # Shape: (N,), bool
+    prize_amount: np.ndarray       # Shape: (N,), float64
+    prize_description: List[str]
+    skipped_ids: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return int(self.ticket_ids.shape[0])
+
+    @property
+    def total_prize(self) -> float:
+        return float(self.prize_amount.sum())
+
+    @property
+    def winners(self) -> int:
+        return int(np.count_nonzero(self.prize_amount > 0))
+
+    def best_index(self) -> Optional[int]:
+        """Index of the first ticket with the highest prize, or None if nothing won."""
+        if not self.winners:
+            return None
+        return int(np.argmax(self.prize_amount))
+
+
+def evaluate_draw(
+    cursor: sqlite3.Cursor,
+    draw_date: str,
+    prize_calculator: PrizeCalculator,
+    only_unevaluated: bool = False,
+) -> Optional[DrawEvaluation]:
+    """
+    Load and score all tickets for a draw (read-only; nothing is written).
+
+    Tickets with missing numbers are not scored; their ids are reported in
+    ``skipped_ids``.
+
+    Args:
+        cursor: Cursor on the connection the caller will write results with
+        draw_date: Draw date in YYYY-MM-DD format
+        prize_calculator: Function (main_matches, powerball_match) -> (amount, description)
+        only_unevaluated: If True, only tickets with evaluated = 0 are loaded
+
+    Returns:
+        DrawEvaluation, or None if there is no official result for the date
+
+    Raises:
+        ValueError: If the official result for the date is incomplete
+    """
+    cursor.execute("SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws WHERE draw_date = ?", (draw_date,))
+    official = cursor.fetchone()
+    if not official:
+        return None
+    if any(x is None for x in official):
+        raise ValueError(f"Invalid draw result data for {draw_date}")
+
+    query = "SELECT id, n1, n2, n3, n4, n5, powerball FROM generated_tickets WHERE draw_date = ?"
+    if only_unevaluated:
+        query += " AND evaluated = 0"
+    cursor.execute(query, (draw_date,))
+    rows = cursor.fetchall()
+
+    valid = [r for r in rows if all(x is not None for x in r)]
+    skipped_ids = [r[0] for r in rows if any(x is None for x in r)]
+    if skipped_ids:
+        logger.warning(f"Skipping {len(skipped_ids)} ticket(s) with missing numbers for {draw_date}")
+    data = np.array(valid, dtype=np.int64).reshape(-1, 7)
+
+    winning_numbers = list(official[:5])
+    winning_powerball = official[5]
+    scores = score_tickets(data[:, 1:6], data[:, 6], winning_numbers, winning_powerball, prize_calculator)
+
+    return DrawEvaluation(
+        draw_date=draw_date,
+        winning_numbers=winning_numbers,
+        winning_powerball=winning_powerball,
+        ticket_ids=data[:, 0],
+        numbers=data[:, 1:6],
+        powerball=data[:, 6],
+        main_matches=scores.main_matches,
+        powerball_match=scores.powerball_match,
+        prize_amount=scores.prize_amount,
+        prize_description=scores.descriptions(),
+        skipped_ids=skipped_ids,
+    )
+
+
+def record_evaluation(cursor: sqlite3.Cursor, evaluation: DrawEvaluation) -> None:
+    """
+    Persist an evaluation: one performance_tracking row per ticket and the
+    evaluated/match/prize columns on generated_tickets.
+
+    Runs two ``executemany`` statements on the caller's cursor and does NOT
+    commit; the caller owns the transaction.
+
+    Args:
+        cursor: Cursor inside the caller's transaction
+        evaluation: Result of evaluate_draw()
+    """
+    if not len(evaluation):
+        return
+
+    ids = evaluation.ticket_ids.tolist()
+    matches = evaluation.main_matches.tolist()
+    pb_matches = evaluation.powerball_match.astype(np.int64).tolist()
+    prizes = evaluation.prize_amount.tolist()
+    descriptions = evaluation.prize_description
+    actual = [*evaluation.winning_numbers, evaluation.winning_powerball]
+    empty_components = json.dumps({})
+
+    cursor.executemany(
+        """
+        INSERT INTO performance_tracking
+        (prediction_id, draw_date, actual_n1, actual_n2, actual_n3, actual_n4, actual_n5,
+         actual_pb, matches_main, matches_pb, prize_tier, score_accuracy, component_accuracy)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (ids[i], evaluation.draw_date, *actual, matches[i], pb_matches[i],
+             descriptions[i] or 'Non-winning', 0.0, empty_components)
+            for i in range(len(ids))
+        ],
+    )
+    cursor.executemany(
+        "UPDATE generated_tickets SET evaluated = 1, matches_wb = ?, matches_pb = ?, prize_won = ?, "
+        "prize_description = ?, evaluation_date = CURRENT_TIMESTAMP WHERE id = ?",
+        [(matches[i], pb_matches[i], prizes[i], descriptions[i] or '', ids[i]) for i in range(len(ids))],
+    )
+
+
+def run_draw_evaluation(draw_date: str) -> bool:
+    """
+    Evaluate every unevaluated ticket of a draw and update strategy_performance.
+
+    Ticket results, performance_tracking rows and the per-strategy counters are
+    written in a single transaction.
+
+    Args:
+        draw_date: Draw date (YYYY-MM-DD)
+
+    Returns:
+        True if the draw exists (even with nothing left to evaluate), False if it
+        does not or the evaluation failed
+    """
+    from src import database
+    from src.data_version import publish_tickets
+
+    try:
+        with database.get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            # Score every unevaluated ticket for the draw in one vectorized pass
+            evaluation = evaluate_draw(cursor, draw_date, database.calculate_prize_amount, only_unevaluated=True)
+            if evaluation is None:
+                logger.warning(f"No official draw found for {draw_date}")
+                return False
+
+            # performance_tracking rows + ticket updates go out as two executemany
+            # statements in the same transaction as the strategy stats below
+            record_evaluation(cursor, evaluation)
+
+            # Update strategy_performance with aggregated results
+            try:
+                # Get strategy-level stats from evaluated predictions
+                cursor.execute("""
+                    SELECT strategy_used,
+                           COUNT(*) as plays,
+                           SUM(CASE WHEN prize_won > 0 THEN 1 ELSE 0 END) as wins,
+                           SUM(prize_won) as total_prize
+                    FROM generated_tickets
+                    WHERE draw_date = ? AND evaluated = 1
+                    GROUP BY strategy_used
+                """, (draw_date,))
+
+                strategy_stats = cursor.fetchall()
+
+                for strategy_name, plays, wins, total_prize in strategy_stats:
+                    # Update total_plays and total_wins (increment, not replace)
+                    cursor.execute("""
+                        UPDATE strategy_performance
+                        SET total_plays = total_plays + ?,
+                            total_wins = total_wins + ?,
+                            win_rate = CASE
+                                WHEN (total_plays + ?) > 0
+                                THEN CAST((total_wins + ?) AS REAL) / (total_plays + ?)
+                                ELSE 0.0
+                            END,
+                            roi = CASE
+                                WHEN (total_plays + ?) > 0
+                                THEN (COALESCE(roi * total_plays, 0) + ?) / (total_plays + ?)
+                                ELSE 0.0
+                            END,
+                            last_updated = CURRENT_TIMESTAMP
+                        WHERE strategy_name = ?
+                    """, (plays, wins, plays, wins, plays, plays, total_prize or 0, plays, strategy_name))
+
+                    logger.debug(f"Updated {strategy_name}: +{plays} plays, +{wins} wins, +${total_prize or 0:.2f}")
+
+                logger.info(f"Strategy performance updated for {len(strategy_stats)} strategies")
+
+            except Exception as ex:
+                logger.error(f"Failed to update strategy_performance: {ex}")
+
+            # Single commit for ticket results and strategy stats
+            conn.commit()
+            publish_tickets()
+            logger.info(f"Evaluated {len(evaluation)} predictions for draw {draw_date}")
+            return True
+    except Exception as e:
+        logger.error(f"Error evaluating predictions for {draw_date}: {e}")
+        return False
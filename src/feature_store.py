@@ -0,0 +1,258 @@
+"""
+SHIOL+ Feature Store
+====================
+
+Persisted, append-only feature matrices for the ML models.
+
+The draw history only grows by one row per draw, but the XGBoost
+(``FeatureEngineer``) and Random Forest (``_engineer_features``) prediction
+paths used to rebuild their features from the whole history on every call.
+A ``FeatureStore`` keeps one model family's matrix in an ``.npz`` file under
+``SHIOL_FEATURE_STORE_DIR`` (default: ``feature_store/`` next to the
+database, outside the model directories the model fingerprints watch), with
+
+- one row per draw, plus a key per row (draw date and numbers) so an edited
+  or reordered history is detected and rebuilt
+- the feature-code version (hash of the builder source and its parameters);
+  rows from older code are discarded
+- the family's incremental state (e.g. last-seen index of every number)
+
+``rows()`` appends features for new draws only, so inference reads the last
+row without touching the rest of the history. Families are declared by the
+model modules (``XGBOOST_FEATURES`` in ``src.intelligent_generator``,
+``RF_FEATURES`` in ``src.ml_models.random_forest_model``). LSTM inference
+already reads only the last ``sequence_length`` draws and has no family.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Directory of the .npz files; unset = feature_store/ next to the database
+FEATURE_STORE_DIR = os.getenv("SHIOL_FEATURE_STORE_DIR")
+
+FeatureState = Dict[str, np.ndarray]
+# build(draws_df, start, state) -> (features of draws start.., new state)
+FeatureBuilder = Callable[[pd.DataFrame, int, Optional[FeatureState]], Tuple[pd.DataFrame, FeatureState]]
+
+
+@dataclass(frozen=True)
+class FeatureFamily:
+    """A model family's feature builder and what its rows depend on"""
+    name: str
+    build: FeatureBuilder
+    code: Tuple[Any, ...]  # Functions/classes whose source versions the rows
+    params: Callable[[], Dict[str, Any]] = field(default=dict)  # Config the rows depend on
+
+    @cached_property
+    def code_version(self) -> str:
+        digest = hashlib.sha256()
+        for obj in self.code:
+            digest.update(inspect.getsource(obj).encode())
+        return digest.hexdigest()
+
+    def version(self) -> str:
+        """Hash of the feature code and the current parameters."""
+        params = json.dumps(self.params(), sort_keys=True, default=str)
+        return hashlib.sha256(f"{self.code_version}:{params}".encode()).hexdigest()[:16]
+
+
+def draw_keys(draws_df: pd.DataFrame) -> np.ndarray:
+    """
+    One int64 key per draw: day number and the six numbers (7 bits each).
+
+    Returns:
+        int64 array of len(draws_df)
+    """
+    if draws_df.empty:
+        return np.zeros(0, dtype=np.int64)
+    days = pd.to_datetime(draws_df["draw_date"]).to_numpy(dtype="datetime64[D]").astype(np.int64)
+    numbers = draws_df[["n1", "n2", "n3", "n4", "n5", "pb"]].to_numpy(dtype=float)
+    numbers = np.where(np.isfinite(numbers), numbers, 127).astype(np.int64) & 127
+    keys = days << np.int64(42)
+    for i in range(6):
+        keys |= numbers[:, i] << np.int64(7 * i)
+    return keys
+
+
+@dataclass
+class FeatureMatrix:
+    """Stored rows of one family"""
+    version: str
+    columns: List[str]
+    keys: np.ndarray      # int64 (n,)
+    values: np.ndarray    # float64 (n, len(columns))
+    state: FeatureState
+
+
+class FeatureStore:
+    """Feature matrix of one family, persisted at `path`."""
+
+    def __init__(self, family: FeatureFamily, path: str):
+        self.family = family
+        self.path = path
+        self._matrix: Optional[FeatureMatrix] = None
+        self._lock = threading.Lock()
+        self.appended_rows = 0
+        self.rebuilds = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _load(self) -> Optional[FeatureMatrix]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                return FeatureMatrix(
+                    version=str(data["version"]),
+                    columns=[str(c) for c in data["columns"]],
+                    keys=data["keys"],
+                    values=data["values"],
+                    state={name[6:]: data[name] for name in data.files if name.startswith("state_")},
+                )
+        except Exception as e:
+            logger.warning(f"Feature store {self.path} unreadable, rebuilding: {e}")
+            return None
+
+    def _save(self, matrix: FeatureMatrix) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                version=np.array(matrix.version),
+                columns=np.array(matrix.columns),
+                keys=matrix.keys,
+                values=matrix.values,
+                **{f"state_{name}": value for name, value in matrix.state.items()},
+            )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not persist feature store {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+    def _reusable_rows(self, matrix: Optional[FeatureMatrix], version: str, keys: np.ndarray) -> int:
+        """Number of stored rows still valid for this history (0 = rebuild)."""
+        if matrix is None or matrix.version != version:
+            return 0
+        stored = len(matrix.keys)
+        if stored > len(keys) or not np.array_equal(matrix.keys, keys[:stored]):
+            return 0
+        return stored
+
+    def update(self, draws_df: pd.DataFrame) -> FeatureMatrix:
+        """
+        Bring the stored matrix up to date with draws_df (sorted by date).
+
+        Only draws after the stored rows are engineered; the whole matrix is
+        rebuilt if the feature code changed or earlier draws differ.
+        """
+        keys = draw_keys(draws_df)
+        version = self.family.version()
+        with self._lock:
+            matrix = self._matrix if self._matrix is not None else self._load()
+            if (matrix is not None and matrix.version == version and len(keys) <= len(matrix.keys)
+                    and np.array_equal(matrix.keys[:len(keys)], keys)):
+                self._matrix = matrix
+                if len(keys) == len(matrix.keys):
+                    return matrix
+                # An earlier cut of the history (e.g. max_date runs): serve the prefix, keep the file
+                return FeatureMatrix(version, matrix.columns, keys, matrix.values[:len(keys)], {})
+
+            start = self._reusable_rows(matrix, version, keys)
+            if start:
+                features, state = self.family.build(draws_df, start, matrix.state)
+            if not start or list(features.columns) != matrix.columns:
+                # New code, a changed history or a changed column set (e.g. lag
+                # features that only exist once there are enough draws)
+                if matrix is not None:
+                    logger.info(f"Feature store '{self.family.name}': rebuilding {len(keys)} rows")
+                    self.rebuilds += 1
+                matrix = None
+                features, state = self.family.build(draws_df, 0, None)
+            values = features.to_numpy(dtype=np.float64)
+            if matrix is not None:
+                values = np.concatenate([matrix.values, values])
+            matrix = FeatureMatrix(version, list(features.columns), keys.copy(), values, state)
+            self.appended_rows += len(features)
+            self._matrix = matrix
+            self._save(matrix)
+            logger.debug(f"Feature store '{self.family.name}': {len(features)} new rows, {len(keys)} total")
+            return matrix
+
+    def rows(self, draws_df: pd.DataFrame, last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Features of draws_df (or only its `last` draws), indexed like draws_df.
+
+        Args:
+            draws_df: Draw history sorted by date
+            last: Return only this many trailing rows (1 for prediction)
+
+        Returns:
+            DataFrame of float64 features
+        """
+        matrix = self.update(draws_df)
+        count = len(matrix.values) if last is None else min(last, len(matrix.values))
+        return pd.DataFrame(
+            matrix.values[len(matrix.values) - count:],
+            columns=matrix.columns,
+            index=draws_df.index[len(draws_df) - count:],
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        matrix = self._matrix
+        return {
+            "family": self.family.name,
+            "path": self.path,
+            "rows": 0 if matrix is None else len(matrix.values),
+            "version": None if matrix is None else matrix.version,
+            "appended_rows": self.appended_rows,
+            "rebuilds": self.rebuilds,
+        }
+
+
+_stores: Dict[str, FeatureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def feature_store_dir() -> str:
+    """Directory of the feature matrices: FEATURE_STORE_DIR, else feature_store/ next to the database."""
+    if FEATURE_STORE_DIR:
+        return FEATURE_STORE_DIR
+    from src.database import get_db_path
+    return os.path.join(os.path.dirname(os.path.abspath(get_db_path())), "feature_store")
+
+
+def feature_store_path(family: str, store_dir: Optional[str] = None) -> str:
+    """Location of a family's matrix in store_dir (default feature_store_dir())."""
+    return os.path.join(store_dir or feature_store_dir(), f"features_{family}.npz")
+
+
+def get_feature_store(family: FeatureFamily) -> FeatureStore:
+    """Process-wide store for a family's matrix (keyed by file path)."""
+    path = os.path.abspath(feature_store_path(family.name))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None or store.family.name != family.name:
+            store = FeatureStore(family, path)
+            _stores[path] = store
+        return store
+
+
+def list_feature_stores() -> Sequence[Dict[str, Any]]:
+    """stats() of every store used in this process."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    return [store.stats() for store in stores]
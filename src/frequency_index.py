@@ -0,0 +1,306 @@
+"""
+SHIOL+ Frequency Index
+======================
+
+Prefix-sum occurrence counts over the draw history.
+
+Hot/cold numbers, momentum and frequency weights all count how often each
+number was drawn inside some window of draws. Instead of re-walking the
+draws for every window, the draw store keeps two cumulative count matrices
+alongside its buffers and extends them on every insert:
+
+- ``white``: int32 matrix of shape (N + 1, 69); row i = counts in draws [0, i)
+- ``powerball``: int32 matrix of shape (N + 1, 26); Powerballs outside 1-26
+  (2009-2015 era) are not counted
+
+Counts for any window ``[i, j)`` are ``white[j] - white[i]``, and a
+``max_date`` cutoff is a binary search on the draw days, so every query
+below is O(69) regardless of history length.
+
+Usage:
+    index = get_frequency_index(max_date="2024-01-01")
+    index.hot_cold(last=100)
+    index.momentum(window=20)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+WHITE_BALLS = 69
+POWERBALLS = 26
+
+
+def cumulative_counts(numbers: np.ndarray, max_number: int, initial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Running occurrence counts of numbers 1..max_number.
+
+    Args:
+        numbers: Array of shape (N,) or (N, k) with one draw per row
+        max_number: Highest countable number; values outside 1..max_number are ignored
+        initial: Optional counts to start from (last row of an existing matrix)
+
+    Returns:
+        int32 array of shape (N, max_number); row i = initial + counts in rows 0..i
+    """
+    numbers = np.asarray(numbers, dtype=np.int64).reshape(len(numbers), -1)
+    rows = np.broadcast_to(np.arange(len(numbers))[:, None], numbers.shape)
+    valid = (numbers >= 1) & (numbers <= max_number)
+    occurrences = np.zeros((len(numbers), max_number), dtype=np.int32)
+    np.add.at(occurrences, (rows[valid], numbers[valid] - 1), 1)
+    counts = np.cumsum(occurrences, axis=0, dtype=np.int32)
+    if initial is not None:
+        counts += initial
+    return counts
+
+
+def number_counts(numbers: np.ndarray, max_number: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    (Weighted) occurrences of 1..max_number in a window of draws.
+
+    Args:
+        numbers: Array of shape (N,) or (N, k) with one draw per row; values
+            outside 1..max_number (and NaN) are ignored
+        max_number: Highest countable number
+        weights: Optional per-draw weights of shape (N,)
+
+    Returns:
+        float64 array of shape (max_number,); index 0 is number 1
+    """
+    numbers = np.asarray(numbers)
+    if weights is not None:
+        weights = np.broadcast_to(np.reshape(weights, (-1,) + (1,) * (numbers.ndim - 1)), numbers.shape)
+    valid = (numbers >= 1) & (numbers <= max_number)
+    counts = np.bincount(
+        numbers[valid].astype(np.intp) - 1,
+        weights=None if weights is None else weights[valid],
+        minlength=max_number,
+    )
+    return counts.astype(np.float64)
+
+
+def last_seen_rows(numbers: np.ndarray, max_number: int) -> np.ndarray:
+    """
+    Row of each number's last occurrence (rows in draw order).
+
+    Args:
+        numbers: Array of shape (N,) or (N, k) with one draw per row; values
+            outside 1..max_number (and NaN) are ignored
+        max_number: Highest countable number
+
+    Returns:
+        int64 array of shape (max_number,); -1 for numbers never drawn
+    """
+    numbers = np.asarray(numbers)
+    rows = np.broadcast_to(np.arange(len(numbers)).reshape((-1,) + (1,) * (numbers.ndim - 1)), numbers.shape)
+    valid = (numbers >= 1) & (numbers <= max_number)
+    last_seen = np.full(max_number, -1, dtype=np.int64)
+    np.maximum.at(last_seen, numbers[valid].astype(np.intp) - 1, rows[valid])
+    return last_seen
+
+
+def _ranked(counts: np.ndarray, first_seen: np.ndarray) -> np.ndarray:
+    """Numbers drawn at least once, most frequent first, ties to the most recently drawn."""
+    drawn = np.flatnonzero(counts)
+    order = np.lexsort((first_seen[drawn], -counts[drawn]))
+    return drawn[order] + 1
+
+
+def _first_seen(numbers: np.ndarray, max_number: int) -> np.ndarray:
+    """Position of each number's first occurrence in `numbers` (newest draw first)."""
+    flat = numbers.ravel().astype(np.int64)
+    first = np.full(max_number + 1, flat.size, dtype=np.int64)
+    values, positions = np.unique(flat, return_index=True)
+    valid = (values >= 1) & (values <= max_number)
+    first[values[valid]] = positions[valid]
+    return first[1:]
+
+
+@dataclass(frozen=True)
+class FrequencyIndex:
+    """Read-only cumulative counts for (a prefix of) the draw history"""
+    days: np.ndarray         # Shape: (N,), int32 day ordinals, ascending
+    white: np.ndarray        # Shape: (N + 1, 69), int32 cumulative counts
+    powerball: np.ndarray    # Shape: (N + 1, 26), int32 cumulative counts
+    white_balls: np.ndarray  # Shape: (N, 5), draws (only read for hot/cold tie-breaks)
+    powerballs: np.ndarray   # Shape: (N,)
+
+    @classmethod
+    def from_dataframe(cls, draws_df) -> "FrequencyIndex":
+        """
+        Build an index for a draws DataFrame (e.g. a strategy's filtered history).
+
+        Args:
+            draws_df: DataFrame with columns [draw_date, n1, n2, n3, n4, n5, pb], sorted by date
+        """
+        import pandas as pd
+
+        if draws_df is None or draws_df.empty:
+            return cls(
+                days=np.zeros(0, dtype=np.int32),
+                white=np.zeros((1, WHITE_BALLS), dtype=np.int32),
+                powerball=np.zeros((1, POWERBALLS), dtype=np.int32),
+                white_balls=np.zeros((0, 5), dtype=np.int64),
+                powerballs=np.zeros(0, dtype=np.int64),
+            )
+        days = pd.to_datetime(draws_df["draw_date"]).to_numpy(dtype="datetime64[D]").astype(np.int32)
+        white_balls = draws_df[["n1", "n2", "n3", "n4", "n5"]].to_numpy(dtype=np.int64)
+        powerballs = draws_df["pb"].to_numpy(dtype=np.int64)
+        zero_white = np.zeros((1, WHITE_BALLS), dtype=np.int32)
+        zero_pb = np.zeros((1, POWERBALLS), dtype=np.int32)
+        return cls(
+            days=days,
+            white=np.concatenate([zero_white, cumulative_counts(white_balls, WHITE_BALLS)]),
+            powerball=np.concatenate([zero_pb, cumulative_counts(powerballs, POWERBALLS)]),
+            white_balls=white_balls,
+            powerballs=powerballs,
+        )
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    # ------------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------------
+    def position(self, max_date: Optional[str]) -> int:
+        """Number of draws strictly before max_date (all draws if None)."""
+        if not max_date:
+            return len(self)
+        from src.draw_store import date_to_day
+
+        return int(np.searchsorted(self.days, date_to_day(max_date), side="left"))
+
+    def last(self, count: int, max_date: Optional[str] = None, current_era: bool = False) -> Tuple[int, int]:
+        """
+        Bounds [start, stop) of the `count` most recent draws before max_date.
+
+        Args:
+            count: Number of draws
+            max_date: Optional cutoff (YYYY-MM-DD), exclusive
+            current_era: Only include draws with a current-era Powerball (1-26)
+
+        Returns:
+            Tuple (start, stop) usable with the count methods
+        """
+        stop = self.position(max_date)
+        start = max(0, stop - count)
+        if current_era:
+            # Pre-2015 draws all precede the current era, so any in the window are at its start
+            current = int(self.powerball[stop].sum() - self.powerball[start].sum())
+            start = stop - current
+        return start, stop
+
+    def _bounds(self, start: Optional[int], stop: Optional[int]) -> Tuple[int, int]:
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return start, max(start, stop)
+
+    # ------------------------------------------------------------------
+    # Counts
+    # ------------------------------------------------------------------
+    def white_counts(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """
+        White ball counts in draws [start, stop) (slice semantics).
+
+        Returns:
+            int32 array of shape (69,); index 0 is number 1
+        """
+        start, stop = self._bounds(start, stop)
+        return self.white[stop] - self.white[start]
+
+    def powerball_counts(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Powerball counts (1-26) in draws [start, stop) (slice semantics).
+
+        Returns:
+            int32 array of shape (26,); index 0 is number 1
+        """
+        start, stop = self._bounds(start, stop)
+        return self.powerball[stop] - self.powerball[start]
+
+    def frequencies(self, start: Optional[int] = None, stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Normalized frequencies in draws [start, stop), uniform when the window is empty.
+
+        Returns:
+            Tuple (white (69,), powerball (26,)) of float64 arrays summing to 1
+        """
+        result = []
+        for counts, size in ((self.white_counts(start, stop), WHITE_BALLS),
+                             (self.powerball_counts(start, stop), POWERBALLS)):
+            total = counts.sum()
+            result.append(counts / total if total > 0 else np.ones(size) / size)
+        return result[0], result[1]
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+    def hot_cold(self, last: int = 100, max_date: Optional[str] = None, top_white: int = 10,
+                 top_powerball: int = 5) -> Dict[str, Any]:
+        """
+        Most and least frequent numbers among the last current-era draws.
+
+        Only numbers drawn at least once are ranked; ties go to the number
+        drawn more recently.
+
+        Args:
+            last: Number of recent draws to analyze
+            max_date: Optional cutoff (YYYY-MM-DD), exclusive
+            top_white: White balls per list
+            top_powerball: Powerballs per list
+
+        Returns:
+            Dict with hot_numbers, cold_numbers ({white_balls, powerballs}) and draws_analyzed
+        """
+        start, stop = self.last(last, max_date, current_era=True)
+        newest_first = np.arange(stop - 1, start - 1, -1)
+        era = (self.powerballs[newest_first] >= 1) & (self.powerballs[newest_first] <= POWERBALLS)
+        white = _ranked(self.white_counts(start, stop), _first_seen(self.white_balls[newest_first][era], WHITE_BALLS))
+        pb = _ranked(self.powerball_counts(start, stop), _first_seen(self.powerballs[newest_first][era], POWERBALLS))
+        return {
+            "hot_numbers": {
+                "white_balls": white[:top_white].tolist(),
+                "powerballs": pb[:top_powerball].tolist(),
+            },
+            "cold_numbers": {
+                "white_balls": white[-top_white:].tolist(),
+                "powerballs": pb[-top_powerball:].tolist(),
+            },
+            "draws_analyzed": int(era.sum()),
+        }
+
+    def momentum(self, window: int = 20, max_date: Optional[str] = None,
+                 epsilon: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rising/falling score per number: last window/2 draws vs the first window/2 of the window.
+
+        Score = (recent - previous) / (recent + previous + epsilon), in (-1, 1),
+        as in ``analytics_engine.compute_momentum_scores``.
+
+        Returns:
+            Tuple (white (69,), powerball (26,)) of float64 arrays; all zeros
+            with fewer than `window` draws
+        """
+        stop = self.position(max_date)
+        if stop == 0 or stop < window:
+            return np.zeros(WHITE_BALLS), np.zeros(POWERBALLS)
+        half = window // 2
+        start = stop - window
+        scores = []
+        for counts in (self.white_counts, self.powerball_counts):
+            recent = counts(stop - half, stop).astype(np.float64)
+            previous = counts(start, start + half).astype(np.float64)
+            scores.append((recent - previous) / (recent + previous + epsilon))
+        return scores[0], scores[1]
+
+
+def get_frequency_index(max_date: Optional[str] = None) -> FrequencyIndex:
+    """
+    Frequency index of the configured database's draws before max_date.
+
+    Backed by the process-wide draw store, so this is a zero-copy view and
+    new draws are counted as they are inserted.
+    """
+    from src.draw_store import get_draw_store
+
+    return get_draw_store().frequency_index(max_date=max_date)
@@ -0,0 +1,180 @@
+"""
+SHIOL+ HTTP Caching
+===================
+
+Conditional responses (ETag / Last-Modified / 304) and per-endpoint
+Cache-Control.
+
+Between draws the dashboard, analytics, recent draws, predictions and
+history endpoints return the same JSON on every frontend poll. Their
+ETags are derived from the data version (src/data_version.py), a deploy
+token (so a release that changes a response's shape invalidates tags
+issued before it), the path, query and any per-caller variant, so a
+matching ``If-None-Match`` is answered with 304 before the endpoint
+queries the database or serializes anything. ETags are weak: equal tags
+mean the same data, while volatile fields (timestamps, timings) may
+differ.
+
+``CACHE_POLICIES`` maps path prefixes to Cache-Control values; the
+``cache_control_middleware`` in src/api.py applies them to every
+response that did not set its own.
+
+Usage (endpoint with ``request: Request, response: Response`` params):
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+"""
+
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Public data that only changes with draws/tickets: short freshness, then revalidate
+PUBLIC_DATA = "public, max-age=60, stale-while-revalidate=300"
+# Per-caller responses (cookies, API keys): browser-only, always revalidate
+PRIVATE_DATA = "private, no-cache"
+# HTML/CSS/JS: always revalidate (StaticFiles answers 304) so updates show immediately
+STATIC_ASSETS = "no-cache, must-revalidate"
+
+# First matching prefix wins
+CACHE_POLICIES: Tuple[Tuple[str, str], ...] = (
+    ("/api/v3/analytics/overview", PUBLIC_DATA),
+    ("/api/v1/public/recent-draws", PUBLIC_DATA),
+    ("/api/v1/public/draws/recent", PUBLIC_DATA),
+    ("/api/v1/public/history/", PUBLIC_DATA),
+    ("/api/v1/public/predictions/by-draw/", PRIVATE_DATA),
+    ("/api/v2/", PRIVATE_DATA),
+)
+
+
+def _deploy_token() -> str:
+    """
+    Identify the deployed code: GIT_COMMIT / COMMIT_HASH when the deploy sets
+    them, else a hash of the path, mtime and size of every module under src/
+    (the same for every worker of one deploy, different after an update).
+    """
+    commit = os.getenv("GIT_COMMIT") or os.getenv("COMMIT_HASH")
+    if commit:
+        return commit
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    entries = []
+    for root, _, files in os.walk(src_dir):
+        for name in files:
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(path, src_dir)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha256("\n".join(sorted(entries)).encode()).hexdigest()[:16]
+
+
+DEPLOY_TOKEN = _deploy_token()
+
+
+def cache_policy(path: str) -> Optional[str]:
+    """Cache-Control value for a request path, or None to leave the response alone."""
+    for prefix, policy in CACHE_POLICIES:
+        if path.startswith(prefix):
+            return policy
+    if path == "/" or path.endswith((".html", ".css", ".js")):
+        return STATIC_ASSETS
+    return None
+
+
+def make_etag(version_tag: str, *parts: Any) -> str:
+    """Weak ETag for the deployed code, a data version and the request variant (path, query, caller)."""
+    digest = hashlib.blake2b(repr((DEPLOY_TOKEN, version_tag) + parts).encode("utf-8"), digest_size=10)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison) or, without it, If-Modified-Since.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+        last_modified: Epoch seconds of the last change
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque_tag(etag)
+        return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= since
+    return False
+
+
+def conditional_response(
+    request: Optional[Request],
+    response: Optional[Response],
+    *variant: Any,
+    version_tag: Optional[str] = None,
+    last_modified: Optional[float] = None,
+    policy: Optional[str] = None,
+) -> Optional[Response]:
+    """
+    Answer 304 if the client already has the current representation.
+
+    Otherwise sets ETag, Last-Modified and Cache-Control on ``response``
+    (the endpoint's injected Response) and returns None.
+
+    Args:
+        request: Incoming request (path and query are part of the ETag)
+        response: Response whose headers FastAPI merges into the endpoint result
+        *variant: Extra ETag parts, e.g. the caller's access level
+        version_tag: Data version the body depends on (default: full data version)
+        last_modified: Epoch seconds of the last change (default: when the version was first seen)
+        policy: Cache-Control value (default: cache_policy(path))
+
+    Returns:
+        304 Response to return as-is, or None to build the body (always None
+        when the endpoint is called directly, without a request)
+    """
+    if request is None or response is None:
+        return None
+
+    if version_tag is None or last_modified is None:
+        from src.data_version import observe_data_version
+
+        version, observed_at = observe_data_version()
+        version_tag = version.tag if version_tag is None else version_tag
+        last_modified = observed_at if last_modified is None else last_modified
+
+    query = tuple(sorted(request.query_params.multi_items()))
+    etag = make_etag(version_tag, request.url.path, query, *variant)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+    }
+    cache_control = policy or cache_policy(request.url.path)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+        if cache_control.startswith("private"):
+            # The body depends on the caller's session cookie / API key
+            headers["Vary"] = "Cookie, Authorization"
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -6,9 +6,142 @@ import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 from loguru import logger
-from scipy.spatial.distance import euclidean
 from typing import Dict, List, Tuple
 
+from src.feature_store import FeatureFamily
+
+# Features the XGBoost model is trained on and predicts from, in model order
+PREDICTION_FEATURES = [
+    "even_count", "odd_count", "sum", "spread", "consecutive_count",
+    "avg_delay", "max_delay", "min_delay",
+    "dist_to_recent", "avg_dist_to_top_n", "dist_to_centroid",
+    "time_weight", "increasing_trend_count", "decreasing_trend_count",
+    "stable_trend_count",
+]
+
+_TREND_LABELS = ("increasing", "decreasing", "stable")
+_TREND_SLOPE_THRESHOLD = 0.005
+
+
+def _ball_index(values: np.ndarray, max_ball: int) -> np.ndarray:
+    """
+    Map ball values to lookup-table indices 1..max_ball.
+
+    NaN, out-of-range and fractional values map to 0, so tables sized
+    max_ball + 1 can reserve index 0 for "no valid ball".
+    """
+    with np.errstate(invalid="ignore"):
+        valid = (values >= 1) & (values <= max_ball) & (values == np.round(values))
+    return np.where(valid, values, 0).astype(np.intp)
+
+
+def _distances_to(numbers: np.ndarray, references: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distances between every row and every reference combination.
+
+    Args:
+        numbers: (N, k) float array
+        references: (M, k) float array
+
+    Returns:
+        (N, M) distances; NaN for rows (or references) containing NaN/inf
+    """
+    with np.errstate(invalid="ignore", over="ignore"):
+        diff = numbers[:, None, :] - references[None, :, :]
+        distances = np.sqrt(np.einsum("nmk,nmk->nm", diff, diff))
+    valid = np.isfinite(numbers).all(axis=1)[:, None] & np.isfinite(references).all(axis=1)[None, :]
+    distances[~valid] = np.nan
+    return distances
+
+
+def _trend_codes(windows: np.ndarray, max_ball: int, window_size: int) -> np.ndarray:
+    """
+    Classify each number's frequency trend across moving windows.
+
+    Args:
+        windows: (window_count, draws_per_window * balls) ball indices from
+                 _ball_index, oldest window first
+        max_ball: Highest ball number
+        window_size: Draws per window (frequencies are counts / window_size)
+
+    Returns:
+        int8 array of size max_ball + 1 with the index into _TREND_LABELS for
+        each number; -1 at index 0
+    """
+    window_count = len(windows)
+    offsets = np.arange(window_count)[:, None] * (max_ball + 1)
+    counts = np.bincount((windows + offsets).ravel(), minlength=window_count * (max_ball + 1))
+    freqs = counts.reshape(window_count, max_ball + 1)[::-1] / window_size
+    codes = _classify_trends(freqs)
+    codes[0] = -1
+    return codes
+
+
+def _classify_trends(freqs: np.ndarray) -> np.ndarray:
+    """
+    Trend label index of each column of a (windows, K) frequency matrix.
+
+    Row 0 is the most recent window. The least-squares slope of frequency vs.
+    window number is fitted with one polyfit over all columns; slopes of
+    exactly +-0.005 are common, so the same solver as the per-number fits
+    keeps their classification.
+    """
+    slopes = np.polyfit(np.arange(len(freqs)), freqs, 1)[0]
+    return np.where(
+        slopes > _TREND_SLOPE_THRESHOLD, 0, np.where(slopes < -_TREND_SLOPE_THRESHOLD, 1, 2)
+    ).astype(np.int8)
+
+
+def load_temporal_config() -> Dict[str, object]:
+    """
+    Temporal analysis parameters from config/config.ini ([temporal_analysis]).
+
+    Returns:
+        Dict of FeatureEngineer attribute name -> value (defaults if the
+        section or file is missing)
+    """
+    try:
+        config = configparser.ConfigParser()
+        config.read(os.path.join("config", "config.ini"))
+        params = {
+            "time_decay_function": config.get(
+                "temporal_analysis", "time_decay_function", fallback="exponential"
+            ),
+            "time_decay_rate": config.getfloat(
+                "temporal_analysis", "time_decay_rate", fallback=0.05
+            ),
+            "min_weight_percent": config.getfloat(
+                "temporal_analysis", "min_weight_percent", fallback=10
+            ) / 100,
+            "moving_window_size": config.getint(
+                "temporal_analysis", "moving_window_size", fallback=20
+            ),
+            "num_windows": config.getint(
+                "temporal_analysis", "num_windows", fallback=5
+            ),
+            "seasonality_period": config.getint(
+                "temporal_analysis", "seasonality_period", fallback=30
+            ),
+            "seasonality_threshold": config.getfloat(
+                "temporal_analysis", "seasonality_threshold", fallback=0.6
+            ),
+        }
+        logger.info("Temporal analysis configuration loaded successfully")
+        return params
+    except Exception as e:
+        logger.error(f"Error loading temporal analysis configuration: {e}")
+        logger.warning("Using default temporal analysis parameters")
+        return {
+            "time_decay_function": "exponential",
+            "time_decay_rate": 0.05,
+            "min_weight_percent": 0.1,
+            "moving_window_size": 20,
+            "num_windows": 5,
+            "seasonality_period": 30,
+            "seasonality_threshold": 0.6,
+        }
+
+
 class FeatureEngineer:
     def __init__(self, historical_data):
         self.data = historical_data.copy()
@@ -24,42 +157,8 @@ class FeatureEngineer:
         """
         Loads temporal analysis configuration parameters from config.ini
         """
-        try:
-            config = configparser.ConfigParser()
-            config.read(os.path.join("config", "config.ini"))
-            self.time_decay_function = config.get(
-                "temporal_analysis", "time_decay_function", fallback="exponential"
-            )
-            self.time_decay_rate = config.getfloat(
-                "temporal_analysis", "time_decay_rate", fallback=0.05
-            )
-            self.min_weight_percent = (
-                config.getfloat("temporal_analysis", "min_weight_percent", fallback=10)
-                / 100
-            )
-            self.moving_window_size = config.getint(
-                "temporal_analysis", "moving_window_size", fallback=20
-            )
-            self.num_windows = config.getint(
-                "temporal_analysis", "num_windows", fallback=5
-            )
-            self.seasonality_period = config.getint(
-                "temporal_analysis", "seasonality_period", fallback=30
-            )
-            self.seasonality_threshold = config.getfloat(
-                "temporal_analysis", "seasonality_threshold", fallback=0.6
-            )
-            logger.info("Temporal analysis configuration loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading temporal analysis configuration: {e}")
-            self.time_decay_function = "exponential"
-            self.time_decay_rate = 0.05
-            self.min_weight_percent = 0.1
-            self.moving_window_size = 20
-            self.num_windows = 5
-            self.seasonality_period = 30
-            self.seasonality_threshold = 0.6
-            logger.warning("Using default temporal analysis parameters")
+        for name, value in load_temporal_config().items():
+            setattr(self, name, value)
 
     def _validate_required_columns(self):
         """
@@ -258,34 +357,21 @@ class FeatureEngineer:
 
     def _calculate_consecutive_features(self, white_ball_cols):
         try:
-            def count_consecutive(row):
-                valid_numbers = [x for x in row if pd.notna(x)]
-                if not valid_numbers:
-                    return 0
-                numbers = sorted(valid_numbers)
-                consecutive_count = 0
-                for i in range(len(numbers) - 1):
-                    if numbers[i + 1] - numbers[i] == 1:
-                        consecutive_count += 1
-                return consecutive_count
-            self.data["consecutive_count"] = self.data[white_ball_cols].apply(
-                count_consecutive, axis=1
-            )
+            # NaN sorts last and never differs by exactly 1
+            numbers = np.sort(self.data[white_ball_cols].to_numpy(dtype=float), axis=1)
+            self.data["consecutive_count"] = (np.diff(numbers, axis=1) == 1).sum(axis=1)
         except Exception as e:
             logger.error(f"Error calculating consecutive number features: {e}")
             self.data["consecutive_count"] = np.nan
 
     def _calculate_low_high_balance(self, white_ball_cols):
         try:
-            def low_high_balance(row):
-                valid_numbers = [x for x in row if pd.notna(x)]
-                if not valid_numbers:
-                    return "0L-0H"
-                low_count = sum(1 for x in valid_numbers if x <= 35)
-                high_count = len(valid_numbers) - low_count
-                return f"{low_count}L-{high_count}H"
-            self.data["low_high_balance"] = self.data[white_ball_cols].apply(
-                low_high_balance, axis=1
+            numbers = self.data[white_ball_cols].to_numpy(dtype=float)
+            low_count = (numbers <= 35).sum(axis=1)
+            high_count = (~np.isnan(numbers)).sum(axis=1) - low_count
+            self.data["low_high_balance"] = (
+                pd.Series(low_count, index=self.data.index).astype(str) + "L-"
+                + pd.Series(high_count, index=self.data.index).astype(str) + "H"
             )
         except Exception as e:
             logger.error(f"Error calculating low/high balance features: {e}")
@@ -366,32 +452,27 @@ class FeatureEngineer:
                 return
             self.data.sort_values(by="draw_date", inplace=True)
             self.data.reset_index(drop=True, inplace=True)
-            last_seen = {}
-            delays = []
-            white_ball_cols = ["n1", "n2", "n3", "n4", "n5"]
-            for index, row in self.data.iterrows():
-                current_delays = []
-                numbers_in_draw = []
-                for col in white_ball_cols:
-                    if col in row:
-                        num = row.get(col)
-                        if pd.notna(num):
-                            numbers_in_draw.append(num)
-                for num in numbers_in_draw:
-                    delay = index - last_seen.get(num, index)
-                    current_delays.append(delay)
-                    last_seen[num] = index
-                if not current_delays:
-                    current_delays = [0] * 5
-                while len(current_delays) < 5:
-                    current_delays.append(0)
-                if len(current_delays) > 5:
-                    current_delays = current_delays[:5]
-                delays.append(current_delays)
-            delay_df = pd.DataFrame(delays, columns=[f"delay_n{i+1}" for i in range(5)])
-            self.data["avg_delay"] = delay_df.mean(axis=1)
-            self.data["max_delay"] = delay_df.max(axis=1)
-            self.data["min_delay"] = delay_df.min(axis=1)
+            white_ball_cols = [
+                col for col in ["n1", "n2", "n3", "n4", "n5"] if col in self.data.columns
+            ]
+            numbers = self.data[white_ball_cols].to_numpy(dtype=float).ravel()
+            draw_index = np.repeat(np.arange(len(self.data)), len(white_ball_cols))
+            # Delay of each number = draws since its previous occurrence (0 the first time).
+            # A stable sort by value keeps each number's occurrences in draw order, so
+            # the previous occurrence (its last-seen index) is the neighbour in the sort.
+            seen = np.flatnonzero(~np.isnan(numbers))
+            order = seen[np.argsort(numbers[seen], kind="stable")]
+            repeat = numbers[order[1:]] == numbers[order[:-1]]
+            flat_delays = np.zeros(len(numbers), dtype=np.int64)
+            flat_delays[order[1:][repeat]] = (
+                draw_index[order[1:][repeat]] - draw_index[order[:-1][repeat]]
+            )
+            # Missing numbers count as a delay of 0, as do the padding columns up to 5
+            delays = np.zeros((len(self.data), 5), dtype=np.int64)
+            delays[:, : len(white_ball_cols)] = flat_delays.reshape(len(self.data), -1)
+            self.data["avg_delay"] = delays.mean(axis=1)
+            self.data["max_delay"] = delays.max(axis=1)
+            self.data["min_delay"] = delays.min(axis=1)
         except Exception as e:
             logger.error(f"Error calculating recency features: {e}")
             self.data["avg_delay"] = np.nan
@@ -420,52 +501,28 @@ class FeatureEngineer:
         if len(self.data) == 0:
             self.data["dist_to_recent"] = np.nan
             return
-        most_recent = self.data[white_ball_cols].iloc[-1].values
-        self.data["dist_to_recent"] = self.data[white_ball_cols].apply(
-            lambda row: self._safe_euclidean(row.values, most_recent), axis=1
-        )
+        numbers = self.data[white_ball_cols].to_numpy(dtype=float)
+        self.data["dist_to_recent"] = _distances_to(numbers, numbers[-1:])[:, 0]
 
     def _calculate_distance_to_top_n(self, white_ball_cols, top_n):
         if len(self.data) <= top_n:
             self.data["avg_dist_to_top_n"] = np.nan
             return
-        top_combinations = self.data[white_ball_cols].iloc[-top_n - 1 : -1].values
-        top_combinations_float = []
-        for combo in top_combinations:
-            try:
-                combo_array = np.array(combo, dtype=float)
-                if not np.isnan(combo_array).any() and not np.isinf(combo_array).any():
-                    top_combinations_float.append(combo_array)
-            except Exception:
-                continue
-        distances = []
-        for _, row in self.data.iterrows():
-            current = row[white_ball_cols].values
-            try:
-                current = np.array(current, dtype=float)
-                if np.isnan(current).any() or np.isinf(current).any():
-                    distances.append(np.nan)
-                    continue
-                valid_distances = [
-                    euclidean(current, combo) for combo in top_combinations_float
-                ]
-                if valid_distances:
-                    avg_dist = np.mean(valid_distances)
-                    distances.append(avg_dist)
-                else:
-                    distances.append(np.nan)
-            except Exception:
-                distances.append(np.nan)
-        self.data["avg_dist_to_top_n"] = distances
+        numbers = self.data[white_ball_cols].to_numpy(dtype=float)
+        top_combinations = numbers[-top_n - 1 : -1]
+        top_combinations = top_combinations[np.isfinite(top_combinations).all(axis=1)]
+        if len(top_combinations) == 0:
+            self.data["avg_dist_to_top_n"] = np.nan
+            return
+        self.data["avg_dist_to_top_n"] = _distances_to(numbers, top_combinations).mean(axis=1)
 
     def _calculate_distance_to_centroid(self, white_ball_cols):
         if len(self.data) <= 1:
             self.data["dist_to_centroid"] = np.nan
             return
-        centroid = self.data[white_ball_cols].mean().values
-        self.data["dist_to_centroid"] = self.data[white_ball_cols].apply(
-            lambda row: self._safe_euclidean(row.values, centroid), axis=1
-        )
+        centroid = self.data[white_ball_cols].mean().to_numpy(dtype=float)
+        numbers = self.data[white_ball_cols].to_numpy(dtype=float)
+        self.data["dist_to_centroid"] = _distances_to(numbers, centroid[None, :])[:, 0]
 
     def _normalize_distance_features(self):
         for col in ["dist_to_recent", "avg_dist_to_top_n", "dist_to_centroid"]:
@@ -474,22 +531,6 @@ class FeatureEngineer:
                 if max_val > 0:
                     self.data[f"{col}_norm"] = self.data[col] / max_val
 
-    def _safe_euclidean(self, row_values, reference_values):
-        try:
-            row_values = np.array(row_values, dtype=float)
-            reference_values = np.array(reference_values, dtype=float)
-            if (
-                np.isnan(row_values).any()
-                or np.isinf(row_values).any()
-                or np.isnan(reference_values).any()
-                or np.isinf(reference_values).any()
-            ):
-                return np.nan
-            return euclidean(row_values, reference_values)
-        except Exception as e:
-            logger.warning(f"Error calculating Euclidean distance: {e}")
-            return np.nan
-
     def _calculate_time_weights(self):
         if "draw_date" not in self.data.columns or len(self.data) == 0:
             self.data["draw_date"] = pd.to_datetime("today") - pd.to_timedelta(
@@ -546,75 +587,40 @@ class FeatureEngineer:
             return
         self.data.sort_values(by="draw_date", inplace=True)
         self.data.reset_index(drop=True, inplace=True)
-        number_trends = {i: [] for i in range(1, 70)}
-        pb_trends = {i: [] for i in range(1, 27)}
         window_count = min(self.num_windows, len(self.data) // self.moving_window_size)
         if window_count < 2:
             return
-        for w in range(window_count):
-            end_idx = len(self.data) - w * self.moving_window_size
-            start_idx = max(0, end_idx - self.moving_window_size)
-            window_data = self.data.iloc[start_idx:end_idx]
-            white_counts = {i: 0 for i in range(1, 70)}
-            pb_counts = {i: 0 for i in range(1, 27)}
-            for _, row in window_data.iterrows():
-                for col in ["n1", "n2", "n3", "n4", "n5"]:
-                    num = row[col]
-                    if 1 <= num <= 69:
-                        white_counts[num] += 1
-                pb = row.get("pb")
-                if pd.notna(pb) and 1 <= pb <= 26:
-                    pb_counts[pb] += 1
-            for num, count in white_counts.items():
-                number_trends[num].append(count / len(window_data))
-            for num, count in pb_counts.items():
-                pb_trends[num].append(count / len(window_data))
-        white_ball_trends = {}
-        pb_ball_trends = {}
-        for num, freqs in number_trends.items():
-            if len(freqs) >= 2:
-                x = np.arange(len(freqs))
-                poly_coeffs = np.polyfit(x, freqs, 1)
-                slope = poly_coeffs[0]
-                if slope > 0.005: white_ball_trends[num] = "increasing"
-                elif slope < -0.005: white_ball_trends[num] = "decreasing"
-                else: white_ball_trends[num] = "stable"
-        for num, freqs in pb_trends.items():
-            if len(freqs) >= 2:
-                x = np.arange(len(freqs))
-                poly_coeffs = np.polyfit(x, freqs, 1)
-                slope = poly_coeffs[0]
-                if slope > 0.005: pb_ball_trends[num] = "increasing"
-                elif slope < -0.005: pb_ball_trends[num] = "decreasing"
-                else: pb_ball_trends[num] = "stable"
-        def get_trends_for_draw(row):
-            trends = []
-            for col in ["n1", "n2", "n3", "n4", "n5"]:
-                num = row[col]
-                if num in white_ball_trends:
-                    trends.append(white_ball_trends[num])
-            pb = row.get("pb")
-            if pd.notna(pb) and pb in pb_ball_trends:
-                trends.append(pb_ball_trends[pb])
-            increasing = trends.count("increasing")
-            decreasing = trends.count("decreasing")
-            stable = trends.count("stable")
-            return pd.Series(
-                {
-                    "increasing_trend_count": increasing,
-                    "decreasing_trend_count": decreasing,
-                    "stable_trend_count": stable,
-                    "dominant_trend": max(
-                        ["increasing", "decreasing", "stable"],
-                        key=lambda x: [increasing, decreasing, stable][
-                            ["increasing", "decreasing", "stable"].index(x)
-                        ],
-                    ),
-                }
-            )
-        trend_features = self.data.apply(get_trends_for_draw, axis=1)
+        # Window w covers the moving_window_size draws ending w windows before the
+        # latest draw; block b of the reshaped tail is window w = window_count - 1 - b
+        tail = len(self.data) - window_count * self.moving_window_size
+        white = _ball_index(self.data[["n1", "n2", "n3", "n4", "n5"]].to_numpy(dtype=float), 69)
+        pb = _ball_index(self._column_values("pb"), 26)
+        white_ball_trends = _trend_codes(
+            white[tail:].reshape(window_count, -1), 69, self.moving_window_size
+        )
+        pb_ball_trends = _trend_codes(
+            pb[tail:].reshape(window_count, -1), 26, self.moving_window_size
+        )
+        codes = np.column_stack([white_ball_trends[white], pb_ball_trends[pb]])
+        counts = np.stack([(codes == code).sum(axis=1) for code in range(3)], axis=1)
+        trend_features = pd.DataFrame(
+            {
+                "increasing_trend_count": counts[:, 0],
+                "decreasing_trend_count": counts[:, 1],
+                "stable_trend_count": counts[:, 2],
+                # argmax keeps the first label on ties, like max() over the list did
+                "dominant_trend": np.array(_TREND_LABELS, dtype=object)[counts.argmax(axis=1)],
+            },
+            index=self.data.index,
+        )
         self.data = pd.concat([self.data, trend_features], axis=1)
 
+    def _column_values(self, col):
+        """Column as a float array, all NaN if the column is missing."""
+        if col not in self.data.columns:
+            return np.full(len(self.data), np.nan)
+        return self.data[col].to_numpy(dtype=float)
+
     def _detect_seasonal_patterns(self):
         if "draw_date" not in self.data.columns:
             self.data["draw_date"] = pd.to_datetime("today") - pd.to_timedelta(
@@ -632,60 +638,26 @@ class FeatureEngineer:
         self.data["day_of_month"] = self.data["draw_date"].dt.day
         self.data["month"] = self.data["draw_date"].dt.month
         self.data["quarter"] = self.data["draw_date"].dt.quarter
-        seasonal_numbers = set()
-        for num in range(1, 70):
-            time_series = pd.Series(0, index=self.data.index)
-            for col in ["n1", "n2", "n3", "n4", "n5"]:
-                time_series = time_series | (self.data[col] == num)
-            time_series = time_series.astype(int)
-            if time_series.sum() == 0:
-                continue
-            try:
-                acf = sm.tsa.acf(
-                    time_series, nlags=self.seasonality_period * 2, fft=True
-                )
-                if (
-                    len(acf) > self.seasonality_period
-                    and abs(acf[self.seasonality_period]) > self.seasonality_threshold
-                ):
-                    seasonal_numbers.add(num)
-            except Exception as e:
-                logger.warning(
-                    f"Error calculating autocorrelation for number {num}: {e}"
-                )
-        seasonal_pb_numbers = set()
-        for num in range(1, 27):
-            time_series = (self.data["pb"] == num).astype(int)
-            if time_series.sum() == 0:
-                continue
-            try:
-                acf = sm.tsa.acf(
-                    time_series, nlags=self.seasonality_period * 2, fft=True
-                )
-                if (
-                    len(acf) > self.seasonality_period
-                    and abs(acf[self.seasonality_period]) > self.seasonality_threshold
-                ):
-                    seasonal_pb_numbers.add(num)
-            except Exception as e:
-                logger.warning(
-                    f"Error calculating autocorrelation for Powerball {num}: {e}"
-                )
-        def count_seasonal_numbers(row):
-            count = sum(
-                1
-                for col in ["n1", "n2", "n3", "n4", "n5"]
-                if row[col] in seasonal_numbers
-            )
-            pb_seasonal = 1 if row.get("pb") in seasonal_pb_numbers else 0
-            return pd.Series(
-                {
-                    "seasonal_number_count": count,
-                    "pb_seasonal": pb_seasonal,
-                    "has_seasonality": count > 0 or pb_seasonal > 0,
-                }
-            )
-        seasonality_features = self.data.apply(count_seasonal_numbers, axis=1)
+        white = _ball_index(self.data[["n1", "n2", "n3", "n4", "n5"]].to_numpy(dtype=float), 69)
+        pb = _ball_index(self._column_values("pb"), 26)
+        rows = np.arange(len(self.data))
+        white_series = np.zeros((len(self.data), 70), dtype=bool)
+        white_series[rows[:, None], white] = True
+        pb_series = np.zeros((len(self.data), 27), dtype=bool)
+        pb_series[rows, pb] = True
+        # Index 0 collects missing/invalid numbers and is never seasonal
+        seasonal_numbers = self._seasonal_mask(white_series)
+        seasonal_pb_numbers = self._seasonal_mask(pb_series)
+        seasonal_count = seasonal_numbers[white].sum(axis=1)
+        pb_seasonal = seasonal_pb_numbers[pb].astype(np.int64)
+        seasonality_features = pd.DataFrame(
+            {
+                "seasonal_number_count": seasonal_count,
+                "pb_seasonal": pb_seasonal,
+                "has_seasonality": (seasonal_count > 0) | (pb_seasonal > 0),
+            },
+            index=self.data.index,
+        )
         self.data = pd.concat([self.data, seasonality_features], axis=1)
         day_counts = self.data.groupby("day_of_week").size()
         month_counts = self.data.groupby("month").size()
@@ -696,6 +668,172 @@ class FeatureEngineer:
         self.data["high_freq_day"] = self.data["day_of_week"].isin(high_freq_days)
         self.data["high_freq_month"] = self.data["month"].isin(high_freq_months)
 
+    def _seasonal_mask(self, series):
+        """
+        Flag numbers whose occurrence series autocorrelates at the seasonality period.
+
+        Computes the lag-``seasonality_period`` autocorrelation of every column of
+        a (draws, numbers) occurrence matrix at once, with the same definition as
+        ``statsmodels.tsa.acf`` (demeaned, unadjusted).
+
+        Args:
+            series: Boolean matrix, True where the number was drawn
+
+        Returns:
+            Boolean array with one flag per column (column 0 is always False)
+        """
+        lag = self.seasonality_period
+        seasonal = np.zeros(series.shape[1], dtype=bool)
+        if lag <= 0 or lag >= len(series):
+            return seasonal
+        centered = series - series.mean(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            acf = (centered[:-lag] * centered[lag:]).sum(axis=0) / (centered ** 2).sum(axis=0)
+        # Numbers never drawn are skipped; constant series give NaN and never qualify
+        seasonal = series.any(axis=0) & (np.abs(acf) > self.seasonality_threshold)
+        seasonal[0] = False
+        return seasonal
+
+    def prediction_feature_rows(self, start=0, state=None, chunk_size=4096):
+        """
+        PREDICTION_FEATURES of each draw as of the time it was the latest draw.
+
+        engineer_features() computes several features relative to the whole
+        history (distance to the latest draw, the centroid, trend windows
+        counted from the end), so all its rows change when a draw is added and
+        only the last one is used for prediction. Row k here equals the last
+        row of engineer_features() run on draws 0..k, which makes the rows
+        append-only: later draws are computed from `state` plus the last few
+        draws before `start`.
+
+        Args:
+            start: First draw to compute; draws before it are summarized by `state`
+            state: State returned by the call that computed draws 0..start-1
+                   (None when start is 0)
+            chunk_size: Draws per block for the windowed trend counts
+
+        Returns:
+            Tuple of (DataFrame of PREDICTION_FEATURES for draws start.., new state).
+            Features engineer_features() does not produce yet (too few draws) are NaN.
+        """
+        if start and state is None:
+            raise ValueError("state is required to continue from a non-zero start")
+        self._standardize_column_names()
+        self._validate_date_column()
+        white_ball_cols = ["n1", "n2", "n3", "n4", "n5"]
+        numbers = self.data[white_ball_cols].to_numpy(dtype=float)
+        balls = _ball_index(numbers, 69)
+        pb = _ball_index(self._column_values("pb"), 26)
+        draw_ns = self.data["draw_date"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        index = np.arange(start, len(self.data))
+        history = index + 1  # draws engineer_features() would see
+        new = numbers[start:]
+        state = {
+            "last_seen": np.full(70, -1, dtype=np.int64),
+            "column_sum": np.zeros(5),
+            "column_count": np.zeros(5, dtype=np.int64),
+            "first_draw_ns": draw_ns[:1].copy(),
+        } if state is None else {name: value.copy() for name, value in state.items()}
+        features = pd.DataFrame(np.nan, index=self.data.index[start:], columns=PREDICTION_FEATURES)
+
+        part = self.data.iloc[start:]
+        even_count = ((part[white_ball_cols] % 2 == 0) & part[white_ball_cols].notna()).sum(axis=1)
+        features["even_count"] = even_count
+        features["odd_count"] = part[white_ball_cols].notna().sum(axis=1) - even_count
+        features["sum"] = part[white_ball_cols].sum(axis=1)
+        features["spread"] = part[white_ball_cols].max(axis=1) - part[white_ball_cols].min(axis=1)
+        features["consecutive_count"] = (np.diff(np.sort(new, axis=1), axis=1) == 1).sum(axis=1)
+
+        # Delays: previous occurrence inside the new draws, else the persisted last-seen index
+        flat = balls[start:].ravel()
+        draw_of = np.repeat(index, 5)
+        delays = np.zeros(len(flat), dtype=np.int64)
+        drawn = np.flatnonzero(flat)
+        order = drawn[np.argsort(flat[drawn], kind="stable")]
+        if len(order):
+            repeat = flat[order[1:]] == flat[order[:-1]]
+            delays[order[1:][repeat]] = draw_of[order[1:][repeat]] - draw_of[order[:-1][repeat]]
+            first = order[np.concatenate(([True], ~repeat))]
+            seen = state["last_seen"][flat[first]]
+            delays[first] = np.where(seen >= 0, draw_of[first] - seen, 0)
+            last = order[np.concatenate((~repeat, [True]))]
+            state["last_seen"][flat[last]] = draw_of[last]
+        delays = delays.reshape(-1, 5)
+        delays[history < 10] = 0  # Corresponds to min_draws_for_recency
+        features["avg_delay"] = delays.mean(axis=1)
+        features["max_delay"] = delays.max(axis=1)
+        features["min_delay"] = delays.min(axis=1)
+
+        # Distances: to itself (the latest draw), the 5 draws before it and the running centroid
+        valid = ~np.isnan(new)
+        column_sum = state["column_sum"] + np.cumsum(np.where(valid, new, 0), axis=0)
+        column_count = state["column_count"] + np.cumsum(valid, axis=0)
+        if len(new):
+            state["column_sum"], state["column_count"] = column_sum[-1].copy(), column_count[-1].copy()
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            centroid = column_sum / column_count
+            finite = np.isfinite(new).all(axis=1)
+            to_centroid = np.sqrt(((new - centroid) ** 2).sum(axis=1))
+            to_centroid[~(finite & np.isfinite(centroid).all(axis=1))] = np.nan
+            previous = index[:, None] - np.arange(5, 0, -1)
+            references = numbers[previous.clip(0)]
+            usable = (previous >= 0) & np.isfinite(references).all(axis=2)
+            to_previous = np.sqrt(((new[:, None, :] - references) ** 2).sum(axis=2))
+            to_top_n = np.where(usable, to_previous, 0).sum(axis=1) / usable.sum(axis=1)
+        to_top_n[~finite | (history <= 5)] = np.nan
+        few = history < 5  # Corresponds to min_draws_for_distance
+        features["dist_to_recent"] = np.where(few, 0.5, np.where(finite, 0.0, np.nan))
+        features["avg_dist_to_top_n"] = np.where(few, 0.5, to_top_n)
+        features["dist_to_centroid"] = np.where(few, 0.5, to_centroid)
+
+        # Time weight of the latest draw (days_since_first == max_days)
+        max_days = (draw_ns[start:] - state["first_draw_ns"][0]) // (86400 * 10**9)
+        decay = 1 - self.min_weight_percent
+        if self.time_decay_function == "linear":
+            weight = 1 - np.ones(len(max_days)) * decay
+        elif self.time_decay_function == "inverse_square":
+            weight = (1 / (1 + (max_days * self.time_decay_rate) ** 2)) * decay + self.min_weight_percent
+        else:
+            weight = np.exp(-self.time_decay_rate * max_days) * decay + self.min_weight_percent
+        weight = np.where(max_days == 0, 1.0, weight)
+        features["time_weight"] = np.where(history < 30, np.nan, weight)  # min_draws_for_analysis
+
+        # Trends over the windows ending at each draw, from prefix counts of every number
+        size = self.moving_window_size
+        window_count = np.minimum(self.num_windows, history // size)
+        trending = (history >= 20) & (history >= size) & (window_count >= 2)
+        trend_counts = np.full((len(index), 3), np.nan)
+        for chunk in range(0, len(index), chunk_size):
+            rows = np.arange(chunk, min(chunk + chunk_size, len(index)))
+            rows = rows[trending[rows]]
+            if not len(rows):
+                continue
+            low = max(0, index[rows[0]] + 1 - self.num_windows * size)
+            high = index[rows[-1]] + 1
+            codes = []
+            for values, max_ball in ((balls[low:high], 69), (pb[low:high, None], 26)):
+                counts = np.zeros((high - low + 1, max_ball + 1), dtype=np.int32)
+                np.add.at(counts, (np.arange(1, high - low + 1)[:, None], values), 1)
+                prefix = np.cumsum(counts, axis=0)
+                row_codes = np.full((len(rows), max_ball + 1), -1, dtype=np.int8)
+                for windows in np.unique(window_count[rows]):
+                    group = np.flatnonzero(window_count[rows] == windows)
+                    ends = history[rows[group]] - low
+                    bounds = ends[None, :] - np.arange(windows + 1)[:, None] * size
+                    freqs = (prefix[bounds[:-1]] - prefix[bounds[1:]]) / size
+                    classified = _classify_trends(freqs.reshape(windows, -1))
+                    row_codes[group] = classified.reshape(len(group), max_ball + 1)
+                row_codes[:, 0] = -1
+                codes.append(row_codes)
+            ball_codes = np.take_along_axis(codes[0], balls[index[rows]], axis=1)
+            pb_codes = np.take_along_axis(codes[1], pb[index[rows], None], axis=1)
+            labels = np.concatenate([ball_codes, pb_codes], axis=1)
+            trend_counts[rows] = np.stack([(labels == code).sum(axis=1) for code in range(3)], axis=1)
+        features["increasing_trend_count"] = trend_counts[:, 0]
+        features["decreasing_trend_count"] = trend_counts[:, 1]
+        features["stable_trend_count"] = trend_counts[:, 2]
+        return features, state
+
 class IntelligentGenerator:
     """
     Generates lottery plays based on predicted probabilities from the model.
@@ -1451,3 +1589,16 @@ class DeterministicGenerator:
         except Exception as e:
             logger.warning(f"Error calculating dataset hash: {e}")
             return "unknown_hash"
+
+
+def _prediction_feature_rows(draws_df: pd.DataFrame, start: int, state=None):
+    """Feature store builder for the XGBoost prediction features (see prediction_feature_rows)."""
+    return FeatureEngineer(draws_df).prediction_feature_rows(start, state)
+
+
+XGBOOST_FEATURES = FeatureFamily(
+    name="xgboost",
+    build=_prediction_feature_rows,
+    code=(FeatureEngineer.prediction_feature_rows, _prediction_feature_rows, _ball_index, _classify_trends),
+    params=load_temporal_config,
+)
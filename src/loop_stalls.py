@@ -0,0 +1,221 @@
+"""
+SHIOL+ Event-Loop Stall Detector
+================================
+
+Diagnostic mode that finds code blocking the asyncio event loop.
+
+Most routes in src/api*.py are ``async def``; any synchronous work they do
+(SQLite, pandas, model inference) stalls every other request. With
+``LOOP_STALL_DETECTOR=1`` the application runs:
+
+- a heartbeat task that sleeps for LOOP_STALL_INTERVAL_MS and measures how
+  late it wakes up (event-loop lag)
+- a watchdog thread that, once the heartbeat is overdue by more than
+  LOOP_STALL_THRESHOLD_MS, captures the stack of the event-loop thread -
+  i.e. of the callback that is blocking it right now
+
+Each stall is attributed to the route whose endpoint function is on the
+captured stack and to the innermost frame in the project's own code, and
+aggregated per (route, location): count, total and max stall time and the
+latest stack. ``/api/v1/system/loop-stalls`` (admin) lists the top
+offenders, so regressions can be found in production without attaching a
+profiler. Stalls that end before the watchdog samples them are counted
+with an unknown location.
+
+Usage:
+    detector = start_loop_stall_detector(app)  # inside the running loop (lifespan)
+    get_loop_stall_report(limit=10)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+ENABLED = os.getenv("LOOP_STALL_DETECTOR", "false").strip().lower() in ("1", "true", "yes", "on")
+THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+INTERVAL_MS = float(os.getenv("LOOP_STALL_INTERVAL_MS", "50"))
+STACK_DEPTH = 25
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC_DIR = os.path.join(_PROJECT_ROOT, "src") + os.sep
+
+StallKey = Tuple[str, str]  # (route, location)
+
+
+class LoopStallDetector:
+    """Heartbeat task + watchdog thread measuring lag and sampling blocking stacks."""
+
+    def __init__(self, threshold_ms: float = THRESHOLD_MS, interval_ms: float = INTERVAL_MS):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._routes: Dict[CodeType, str] = {}
+        self._offenders: Dict[StallKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._pending: Optional[Tuple[StallKey, List[str]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.lag = {"beats": 0, "stalls": 0, "max_ms": 0.0, "total_ms": 0.0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def register_routes(self, routes) -> None:
+        """Map endpoint functions to "METHOD /path" for attribution."""
+        for route in routes:
+            code = getattr(getattr(route, "endpoint", None), "__code__", None)
+            if code is not None:
+                methods = ",".join(sorted(getattr(route, "methods", None) or []))
+                self._routes[code] = f"{methods} {route.path}".strip()
+
+    def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-stall-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Event-loop stall detector started (threshold {self.threshold * 1000:.0f}ms, "
+                    f"heartbeat {self.interval * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            with self._lock:
+                self._last_beat = now
+                pending, self._pending = self._pending, None
+                self.lag["beats"] += 1
+                self.lag["total_ms"] += lag * 1000
+                self.lag["max_ms"] = max(self.lag["max_ms"], lag * 1000)
+                if lag >= self.threshold:
+                    self.lag["stalls"] += 1
+                    key, stack = pending or (("unknown", "unknown (stall ended before it was sampled)"), [])
+                    self._record(key, stack, lag * 1000)
+
+    def _watchdog(self) -> None:
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            with self._lock:
+                beat = self._last_beat
+                overdue = time.monotonic() - beat - self.interval
+                if overdue < self.threshold or self._pending is not None:
+                    continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            captured = self._capture(frame)
+            with self._lock:
+                # Only if the loop is still stuck in the same stall
+                if self._last_beat == beat and self._pending is None:
+                    self._pending = captured
+
+    def _capture(self, frame: FrameType) -> Tuple[StallKey, List[str]]:
+        route, location = "background", None
+        current = frame
+        while current is not None:
+            code = current.f_code
+            if location is None and code.co_filename.startswith(_SRC_DIR):
+                location = f"{os.path.relpath(code.co_filename, _PROJECT_ROOT)}:{current.f_lineno} in {code.co_name}"
+            if code in self._routes:
+                route = self._routes[code]
+                break
+            current = current.f_back
+
+        stack = traceback.extract_stack(frame, limit=STACK_DEPTH)
+        if location is None and stack:
+            innermost = stack[-1]
+            location = f"{innermost.filename}:{innermost.lineno} in {innermost.name}"
+        lines = [f"{entry.filename}:{entry.lineno} in {entry.name}" + (f": {entry.line}" if entry.line else "")
+                 for entry in stack]
+        return (route, location or "unknown"), lines
+
+    def _record(self, key: StallKey, stack: List[str], stall_ms: float) -> None:
+        """Add a stall to the offender table (caller holds the lock)."""
+        entry = self._offenders.get(key)
+        if entry is None:
+            entry = {"route": key[0], "location": key[1], "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            self._offenders[key] = entry
+        entry["count"] += 1
+        entry["total_ms"] += stall_ms
+        entry["max_ms"] = max(entry["max_ms"], stall_ms)
+        entry["last_seen"] = datetime.now().isoformat()
+        if stack:
+            entry["stack"] = stack
+        logger.warning(f"Event loop blocked for {stall_ms:.0f}ms by {key[0]} at {key[1]}")
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Lag summary and the top offenders by total stall time."""
+        with self._lock:
+            lag = dict(self.lag)
+            offenders = sorted((dict(entry) for entry in self._offenders.values()),
+                               key=lambda entry: entry["total_ms"], reverse=True)[:limit]
+        for entry in offenders:
+            entry["total_ms"] = round(entry["total_ms"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 1)
+        return {
+            "enabled": True,
+            "threshold_ms": self.threshold * 1000,
+            "heartbeat_ms": self.interval * 1000,
+            "lag": {
+                "beats": lag["beats"],
+                "stalls": lag["stalls"],
+                "max_ms": round(lag["max_ms"], 1),
+                "avg_ms": round(lag["total_ms"] / lag["beats"], 2) if lag["beats"] else 0.0,
+            },
+            "top_offenders": offenders,
+        }
+
+
+_detector: Optional[LoopStallDetector] = None
+
+
+def start_loop_stall_detector(app) -> LoopStallDetector:
+    """Start the detector for an application (call from its lifespan, inside the loop)."""
+    global _detector
+    stop_loop_stall_detector()
+    detector = LoopStallDetector()
+    detector.register_routes(app.routes)
+    detector.start()
+    _detector = detector
+    return detector
+
+
+def stop_loop_stall_detector() -> None:
+    global _detector
+    if _detector is not None:
+        _detector.stop()
+        _detector = None
+
+
+def get_loop_stall_report(limit: int = 10) -> Dict[str, Any]:
+    """Report of the running detector, or ``{"enabled": False}``."""
+    if _detector is None:
+        return {"enabled": False, "hint": "Set LOOP_STALL_DETECTOR=1 to enable"}
+    return _detector.report(limit)
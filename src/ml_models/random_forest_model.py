@@ -18,6 +18,134 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+from src.feature_store import FeatureFamily, get_feature_store
+from src.prize_kernel import encode_white_balls, match_counts
+
+
+def engineer_features(draws_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Engineer Random Forest features from historical draw data.
+    
+    OPTIMIZED VERSION: Uses vectorized operations to avoid O(n²) complexity.
+    Reduces feature count from 354 to ~50 for dramatic speedup.
+    
+    Each row only depends on the draw itself and the 50 draws before it.
+    
+    Args:
+        draws_df: DataFrame with historical draws
+        
+    Returns:
+        DataFrame with engineered features
+    """
+    logger.info(f"Engineering features from {len(draws_df)} draws...")
+    features = pd.DataFrame(index=draws_df.index)
+    
+    # Ensure draw_date is datetime
+    if 'draw_date' in draws_df.columns:
+        draws_df['draw_date'] = pd.to_datetime(draws_df['draw_date'])
+    
+    # White ball columns
+    white_ball_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
+    white_balls = draws_df[white_ball_cols].to_numpy(dtype=float)
+    
+    # 1. OPTIMIZED: Rolling statistics for each ball position (15 features)
+    logger.debug("Computing position-based rolling statistics...")
+    for window in [10, 20, 50]:
+        for col in white_ball_cols:
+            features[f'{col}_freq_last_{window}'] = (
+                draws_df[col].rolling(window=window, min_periods=1).mean()
+            )
+    
+    # 2. OPTIMIZED: Overall number distribution statistics (8 features)
+    # Mean/variance of all numbers in the `window` draws before each draw,
+    # from prefix sums of x and x^2 (O(n) instead of rebuilding each window)
+    logger.debug("Computing aggregate frequency statistics...")
+    incomplete = np.isnan(white_balls).any(axis=1)
+    numbers = np.where(np.isnan(white_balls), 0, white_balls).astype(np.int64)
+    sum_prefix = np.concatenate(([0], np.cumsum(numbers.sum(axis=1))))
+    sq_prefix = np.concatenate(([0], np.cumsum((numbers ** 2).sum(axis=1))))
+    nan_prefix = np.concatenate(([0], np.cumsum(incomplete)))
+    end = np.arange(len(draws_df))
+    for window in [20, 50]:
+        start = np.maximum(0, end - window)
+        count = (end - start) * len(white_ball_cols)
+        total = sum_prefix[end] - sum_prefix[start]
+        total_sq = sq_prefix[end] - sq_prefix[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_values = np.where(count > 0, total / count, 0.0)
+            # Integer numerator keeps E[x^2] - E[x]^2 exact before the division
+            variance_values = np.where(count > 0, (total_sq * count - total ** 2) / count ** 2, 0.0)
+        # Windows containing a missing number were NaN (filled with 0 below)
+        has_nan = nan_prefix[end] - nan_prefix[start] > 0
+        variance_values[has_nan] = np.nan
+        mean_values[has_nan] = np.nan
+        
+        features[f'num_variance_last_{window}'] = variance_values
+        features[f'num_mean_last_{window}'] = mean_values
+    
+    # 3. Temporal features (3 features) - Fast
+    logger.debug("Computing temporal features...")
+    if 'draw_date' in draws_df.columns:
+        features['day_of_week'] = draws_df['draw_date'].dt.dayofweek
+        features['month'] = draws_df['draw_date'].dt.month
+        features['day_of_month'] = draws_df['draw_date'].dt.day
+    
+    # 4. Statistical features per draw (6 features) - Fast
+    logger.debug("Computing per-draw statistics...")
+    features['draw_sum'] = draws_df[white_ball_cols].sum(axis=1)
+    features['draw_mean'] = draws_df[white_ball_cols].mean(axis=1)
+    features['draw_std'] = draws_df[white_ball_cols].std(axis=1)
+    features['draw_range'] = draws_df['n5'] - draws_df['n1']
+    features['draw_min'] = draws_df['n1']
+    features['draw_max'] = draws_df['n5']
+    
+    # 5. OPTIMIZED: Powerball rolling statistics (4 features)
+    logger.debug("Computing powerball statistics...")
+    if 'pb' in draws_df.columns:
+        for window in [10, 20, 50]:
+            features[f'pb_mean_last_{window}'] = (
+                draws_df['pb'].rolling(window=window, min_periods=1).mean()
+            )
+        
+        # Add one std feature
+        features['pb_std_last_20'] = (
+            draws_df['pb'].rolling(window=20, min_periods=1).std().fillna(0)
+        )
+    
+    # 6. Pattern features (4 features) - Fast
+    logger.debug("Computing pattern features...")
+    features['even_count'] = (white_balls % 2 == 0).sum(axis=1)
+    features['odd_count'] = 5 - features['even_count']
+    
+    # High-low split (1-34 vs 35-69)
+    features['low_count'] = (white_balls <= 34).sum(axis=1)
+    features['high_count'] = 5 - features['low_count']
+    
+    # 7. OPTIMIZED: Gap features - only for last draw (eliminate per-row loops)
+    # Instead of computing gap for each historical draw, compute only for prediction
+    logger.debug("Computing simplified gap features...")
+    # Count how many numbers of each draw appeared i draws earlier, comparing
+    # 69-bit number masks (missing numbers set no bit and never match)
+    masks = encode_white_balls(np.where(np.isnan(white_balls), 0, white_balls))
+    for i in range(1, 4):  # Last 3 draws
+        col_name = f'draw_minus_{i}'
+        if len(draws_df) > i:
+            match_count = np.zeros(len(draws_df), dtype=np.int64)
+            match_count[i:] = match_counts(masks[i:], masks[:-i])
+            # Draws whose earlier draw lacks n1 count as no match, as before
+            match_count[i:][np.isnan(white_balls[:-i, 0])] = 0
+            features[col_name + '_matches'] = match_count
+    
+    # Fill NaN values with 0
+    features = features.fillna(0)
+    
+    logger.info(
+        f"✓ Engineered {len(features.columns)} features from {len(draws_df)} draws "
+        f"(optimized, <50 features)"
+    )
+    
+    return features
+
 
 class RandomForestModel:
     """
@@ -37,6 +165,9 @@ class RandomForestModel:
         - Temporal features (day of week, month, etc.)
     """
     
+    # Draws the last row's features depend on (50-draw windows before it, plus itself)
+    FEATURE_HISTORY = 51
+    
     def __init__(
         self,
         n_estimators: int = 200,
@@ -85,141 +216,23 @@ class RandomForestModel:
             f"max_depth={max_depth})"
         )
     
-    def _engineer_features(self, draws_df: pd.DataFrame) -> pd.DataFrame:
+    def _engineer_features(self, draws_df: pd.DataFrame, latest_only: bool = False) -> pd.DataFrame:
         """
-        Engineer features from historical draw data.
-        
-        OPTIMIZED VERSION: Uses vectorized operations to avoid O(n²) complexity.
-        Reduces feature count from 354 to ~50 for dramatic speedup.
+        Engineer features from historical draw data (see engineer_features).
         
         Args:
             draws_df: DataFrame with historical draws
+            latest_only: Only compute the features of the last draw (what
+                predict_probabilities needs); uses just the trailing
+                FEATURE_HISTORY draws
             
         Returns:
-            DataFrame with engineered features
+            DataFrame with engineered features (a single row if latest_only)
         """
-        logger.info(f"Engineering features from {len(draws_df)} draws...")
-        features = pd.DataFrame(index=draws_df.index)
-        
-        # Ensure draw_date is datetime
-        if 'draw_date' in draws_df.columns:
-            draws_df['draw_date'] = pd.to_datetime(draws_df['draw_date'])
-        
-        # White ball columns
-        white_ball_cols = ['n1', 'n2', 'n3', 'n4', 'n5']
-        
-        # 1. OPTIMIZED: Rolling statistics for each ball position (15 features)
-        logger.debug("Computing position-based rolling statistics...")
-        for window in [10, 20, 50]:
-            for col in white_ball_cols:
-                features[f'{col}_freq_last_{window}'] = (
-                    draws_df[col].rolling(window=window, min_periods=1).mean()
-                )
-        
-        # 2. OPTIMIZED: Overall number distribution statistics (8 features)
-        # Instead of per-number tracking, use aggregate statistics
-        logger.debug("Computing aggregate frequency statistics...")
-        for window in [20, 50]:
-            # Compute overall frequency variance across all numbers in window
-            variance_values = []
-            mean_values = []
-            
-            for idx in range(len(draws_df)):
-                start_idx = max(0, idx - window)
-                window_draws = draws_df.iloc[start_idx:idx]
-                
-                if len(window_draws) > 0:
-                    # Get all numbers in window
-                    all_nums = []
-                    for col in white_ball_cols:
-                        all_nums.extend(window_draws[col].tolist())
-                    
-                    if all_nums:
-                        variance_values.append(np.var(all_nums))
-                        mean_values.append(np.mean(all_nums))
-                    else:
-                        variance_values.append(0)
-                        mean_values.append(0)
-                else:
-                    variance_values.append(0)
-                    mean_values.append(0)
-            
-            features[f'num_variance_last_{window}'] = variance_values
-            features[f'num_mean_last_{window}'] = mean_values
-        
-        # 3. Temporal features (3 features) - Fast
-        logger.debug("Computing temporal features...")
-        if 'draw_date' in draws_df.columns:
-            features['day_of_week'] = draws_df['draw_date'].dt.dayofweek
-            features['month'] = draws_df['draw_date'].dt.month
-            features['day_of_month'] = draws_df['draw_date'].dt.day
-        
-        # 4. Statistical features per draw (6 features) - Fast
-        logger.debug("Computing per-draw statistics...")
-        features['draw_sum'] = draws_df[white_ball_cols].sum(axis=1)
-        features['draw_mean'] = draws_df[white_ball_cols].mean(axis=1)
-        features['draw_std'] = draws_df[white_ball_cols].std(axis=1)
-        features['draw_range'] = draws_df['n5'] - draws_df['n1']
-        features['draw_min'] = draws_df['n1']
-        features['draw_max'] = draws_df['n5']
-        
-        # 5. OPTIMIZED: Powerball rolling statistics (4 features)
-        logger.debug("Computing powerball statistics...")
-        if 'pb' in draws_df.columns:
-            for window in [10, 20, 50]:
-                features[f'pb_mean_last_{window}'] = (
-                    draws_df['pb'].rolling(window=window, min_periods=1).mean()
-                )
-            
-            # Add one std feature
-            features['pb_std_last_20'] = (
-                draws_df['pb'].rolling(window=20, min_periods=1).std().fillna(0)
-            )
-        
-        # 6. Pattern features (4 features) - Fast
-        logger.debug("Computing pattern features...")
-        features['even_count'] = draws_df[white_ball_cols].apply(
-            lambda row: sum(1 for x in row if x % 2 == 0), axis=1
-        )
-        features['odd_count'] = 5 - features['even_count']
-        
-        # High-low split (1-34 vs 35-69)
-        features['low_count'] = draws_df[white_ball_cols].apply(
-            lambda row: sum(1 for x in row if x <= 34), axis=1
-        )
-        features['high_count'] = 5 - features['low_count']
-        
-        # 7. OPTIMIZED: Gap features - only for last draw (eliminate per-row loops)
-        # Instead of computing gap for each historical draw, compute only for prediction
-        logger.debug("Computing simplified gap features...")
-        # Compute "days since last appearance" for most frequent numbers only
-        # Use a simple heuristic: track gap to last 3 draws instead of all history
-        for i in range(1, 4):  # Last 3 draws
-            col_name = f'draw_minus_{i}'
-            if len(draws_df) > i:
-                # Shift and compare
-                shifted = draws_df[white_ball_cols].shift(i)
-                # Count how many numbers from current draw appeared i draws ago
-                match_count = []
-                for idx in range(len(draws_df)):
-                    if idx < i or pd.isna(shifted.iloc[idx].iloc[0]):
-                        match_count.append(0)
-                    else:
-                        current = set(draws_df.iloc[idx][white_ball_cols])
-                        previous = set(shifted.iloc[idx])
-                        matches = len(current.intersection(previous))
-                        match_count.append(matches)
-                features[col_name + '_matches'] = match_count
-        
-        # Fill NaN values with 0
-        features = features.fillna(0)
-        
-        logger.info(
-            f"✓ Engineered {len(features.columns)} features from {len(draws_df)} draws "
-            f"(optimized, <50 features)"
-        )
-        
-        return features
+        if latest_only:
+            tail = draws_df.iloc[-self.FEATURE_HISTORY:].copy()
+            return engineer_features(tail).iloc[-1:]
+        return engineer_features(draws_df)
     
     def train(
         self,
@@ -396,10 +409,14 @@ class RandomForestModel:
         logger.debug(f"Predicting probabilities from {len(recent_draws)} historical draws...")
         
         try:
-            # Engineer features for the most recent draw
+            # Features of the most recent draw, appended to the persisted feature store
             logger.debug("Engineering features...")
             feature_start = time.time()
-            X = self._engineer_features(recent_draws)
+            try:
+                X = get_feature_store(RF_FEATURES).rows(recent_draws, last=1)
+            except Exception as e:
+                logger.warning(f"Feature store unavailable, engineering the last draw directly: {e}")
+                X = self._engineer_features(recent_draws, latest_only=True)
             feature_time = time.time() - feature_start
             logger.debug(f"Feature engineering completed in {feature_time:.2f}s ({len(X.columns)} features)")
             
@@ -552,3 +569,18 @@ class RandomForestModel:
             'wb_models_path': self.wb_models_path,
             'pb_model_path': self.pb_model_path
         }
+
+
+def _feature_rows(draws_df: pd.DataFrame, start: int, state=None):
+    """Feature store builder: rows for draws start.., from the draws they depend on."""
+    context = draws_df.iloc[max(0, start - RandomForestModel.FEATURE_HISTORY + 1):].copy()
+    features = engineer_features(context)
+    return features.iloc[len(features) - (len(draws_df) - start):], {}
+
+
+RF_FEATURES = FeatureFamily(
+    name="random_forest",
+    build=_feature_rows,
+    code=(engineer_features, _feature_rows, encode_white_balls, match_counts),
+    params=lambda: {"feature_history": RandomForestModel.FEATURE_HISTORY},
+)
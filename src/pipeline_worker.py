@@ -0,0 +1,243 @@
+"""
+SHIOL+ Pipeline Worker
+======================
+
+Runs the CPU-heavy draw pipeline steps in a dedicated worker process.
+
+The pipeline runs on APScheduler's AsyncIOExecutor, i.e. on the event loop
+that serves HTTP, and STEP 3 (analytics), STEP 4 (evaluation) and STEP 6
+(ticket generation) are long synchronous calls: the whole site froze while
+a draw was processed. The steps are dispatched to one long-lived worker
+process instead:
+
+- the worker is spawned (the API process runs threads, so no fork), uses
+  the parent's database path and reloads the draw store before every step,
+  so it sees the draw the parent has just inserted
+- it reports the step it is running through update_pipeline_execution_log;
+  the parent records step completion as before
+- results come back to the parent, which saves generated tickets itself,
+  publishes the data version and drops its in-memory analytics snapshot
+  (the worker persisted the new one to analytics_snapshots)
+- PIPELINE_WORKER_MEMORY_MB caps the worker's resident memory: the parent
+  polls it while a step runs and kills the worker above the cap, failing
+  the step; the next step starts a fresh worker
+- shutdown_pipeline_worker() cancels queued steps and terminates the worker
+
+With PIPELINE_WORKER=0 the same steps run on the cpu work pool (a thread of
+the API process) instead.
+
+Usage:
+    tickets = await run_pipeline_step(execution_id, "STEP 6: Generating predictions",
+                                      "generation", 55)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.work_pools import offload
+
+ENABLED = os.getenv("PIPELINE_WORKER", "true").strip().lower() in ("1", "true", "yes", "on")
+MEMORY_LIMIT_MB = int(os.getenv("PIPELINE_WORKER_MEMORY_MB", "2048"))  # 0 disables the cap
+MEMORY_POLL_SECONDS = 1.0
+
+
+class PipelineWorkerError(RuntimeError):
+    """The worker process died, exceeded its memory cap or was shut down during a step"""
+
+
+# =============================================================================
+# STEPS (run in the worker process, or on the cpu work pool)
+# =============================================================================
+
+def analytics_step() -> bool:
+    """STEP 3: co-occurrences and pattern statistics, then the analytics snapshot built from them."""
+    from src.analytics_engine import update_analytics
+    from src.analytics_snapshot import refresh_analytics_snapshot
+
+    result = update_analytics()
+    try:
+        refresh_analytics_snapshot()
+    except Exception as e:
+        # Endpoints build (and persist) the snapshot themselves if this fails
+        logger.warning(f"Analytics snapshot refresh failed: {e}")
+    return result
+
+
+def evaluation_step(draw_date: str) -> bool:
+    """STEP 4: evaluate the draw's tickets and update strategy_performance."""
+    from src.evaluation_engine import run_draw_evaluation
+
+    return run_draw_evaluation(draw_date)
+
+
+def generation_step(total: int) -> List[Dict[str, Any]]:
+    """STEP 6: tickets distributed by adaptive strategy weights (not saved)."""
+    from src.probability_service import warm_probabilities
+    from src.strategy_registry import get_strategy_manager
+
+    try:
+        # Compute model probability vectors for the new history once, before the strategies need them
+        warm_probabilities()
+    except Exception as e:
+        # Strategies compute (and cache) the vectors themselves if warming fails
+        logger.warning(f"Probability cache warm-up failed: {e}")
+
+    # Revalidate so the draw inserted in STEP 2 triggers a rebuild. The worker's
+    # models are cold after the rebuild; wait for every selected strategy rather
+    # than saving random_baseline tickets that would skew the adaptive weights.
+    return get_strategy_manager(revalidate=True).generate_balanced_tickets(total=total, load_timeout=None)
+
+
+STEPS: Dict[str, Callable[..., Any]] = {
+    "analytics": analytics_step,
+    "evaluation": evaluation_step,
+    "generation": generation_step,
+}
+
+
+def _run_in_worker(db_path: str, execution_id: str, label: str, step: str, args: tuple) -> Any:
+    """Worker-process entry point for one step."""
+    from src import database
+    from src.draw_store import invalidate_draw_store
+
+    # Same database as the parent, whatever this process's config resolves to
+    database.get_db_path = lambda: db_path
+    # The parent inserted the draw; don't wait for the draw store's revalidation interval
+    invalidate_draw_store()
+
+    database.update_pipeline_execution_log(
+        execution_id=execution_id,
+        current_step=f"{label} [worker pid {os.getpid()}]"
+    )
+    return STEPS[step](*args)
+
+
+def _after_worker_step(step: str) -> None:
+    """Make the API process see what the worker wrote."""
+    if step == "analytics":
+        from src.analytics_snapshot import reload_analytics_snapshot
+        reload_analytics_snapshot()
+    elif step == "evaluation":
+        from src.data_version import publish_tickets
+        publish_tickets()
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            logger.info("Pipeline worker pool started")
+        return _executor
+
+
+def _worker_processes(executor: ProcessPoolExecutor) -> List[multiprocessing.Process]:
+    # ProcessPoolExecutor has no public accessor for its processes
+    return list((getattr(executor, "_processes", None) or {}).values())
+
+
+def worker_memory_mb(executor: Optional[ProcessPoolExecutor] = None) -> float:
+    """Resident memory of the worker process(es) in MB (0 if unknown)."""
+    executor = executor or _executor
+    if executor is None:
+        return 0.0
+    try:
+        import psutil
+    except ImportError:
+        return 0.0
+
+    total = 0
+    for process in _worker_processes(executor):
+        try:
+            total += psutil.Process(process.pid).memory_info().rss
+        except (psutil.Error, TypeError):
+            continue
+    return total / (1024 * 1024)
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Terminate the worker and forget the pool; the next step starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    processes = _worker_processes(executor)
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+async def run_pipeline_step(execution_id: str, label: str, step: str, *args: Any) -> Any:
+    """
+    Run a pipeline step without blocking the event loop.
+
+    Args:
+        execution_id: Pipeline execution the worker reports progress to
+        label: current_step text of the execution log
+        step: Name in STEPS ("analytics", "evaluation", "generation")
+        *args: Step arguments (must be picklable)
+
+    Returns:
+        The step's result
+
+    Raises:
+        PipelineWorkerError: If the worker died, exceeded its memory cap or was shut down
+    """
+    if not ENABLED:
+        return await offload("pipeline", STEPS[step], *args)
+
+    from src import database
+
+    executor = _get_executor()
+    try:
+        future = executor.submit(_run_in_worker, database.get_db_path(), execution_id, label, step, args)
+    except RuntimeError as e:
+        # Pool shut down (application shutdown) or broken by a previous step
+        raise PipelineWorkerError(f"Pipeline worker unavailable for {label}: {e}") from e
+
+    waiter = asyncio.wrap_future(future)
+    try:
+        while not waiter.done():
+            await asyncio.wait({waiter}, timeout=MEMORY_POLL_SECONDS)
+            memory_mb = worker_memory_mb(executor)
+            if not waiter.done() and MEMORY_LIMIT_MB and memory_mb > MEMORY_LIMIT_MB:
+                _discard_executor(executor)
+                raise PipelineWorkerError(
+                    f"Pipeline worker exceeded its memory cap during {label} "
+                    f"({memory_mb:.0f} MB > {MEMORY_LIMIT_MB} MB)"
+                )
+        result = waiter.result()
+    except BrokenProcessPool as e:
+        _discard_executor(executor)
+        raise PipelineWorkerError(f"Pipeline worker died during {label}: {e}") from e
+    finally:
+        if not waiter.done():
+            waiter.cancel()
+
+    _after_worker_step(step)
+    return result
+
+
+def shutdown_pipeline_worker() -> None:
+    """Cancel queued steps and terminate the worker (call on application shutdown)."""
+    with _executor_lock:
+        executor = _executor
+    if executor is not None:
+        _discard_executor(executor)
+        logger.info("Pipeline worker shut down")
@@ -68,9 +68,9 @@ class UnifiedPredictionEngine:
             self._initialize_rf_backend()
     
     def _initialize_v1_backend(self):
-        """Initialize v1 backend (StrategyManager)"""
-        from src.strategy_generators import StrategyManager
-        self._backend = StrategyManager()
+        """Initialize v1 backend (shared StrategyManager from the strategy registry)"""
+        from src.strategy_registry import get_strategy_manager
+        self._backend = get_strategy_manager()
         logger.debug("v1 backend (StrategyManager) initialized")
     
     def _initialize_v2_backend(self):
@@ -11,7 +11,9 @@ from typing import Dict
 from loguru import logger
 import traceback
 
+from src.data_version import publish_tickets
 from src.database import get_db_connection
+from src.evaluation_engine import evaluate_draw
 from src.prize_calculator import calculate_prize_amount
 
 
@@ -98,102 +100,71 @@ class PredictionEvaluator:
             with get_db_connection() as conn:
                 cursor = conn.cursor()
 
-                # Get the actual drawing result
-                cursor.execute("""
-                    SELECT n1, n2, n3, n4, n5, pb FROM powerball_draws 
-                    WHERE draw_date = ?
-                """, (draw_date,))
+                # Load and score ALL generated tickets for this date in one pass
+                try:
+                    evaluation = evaluate_draw(cursor, draw_date, calculate_prize_amount)
+                except ValueError as e:
+                    logger.error(str(e))
+                    return {'error': str(e)}
 
-                actual_result = cursor.fetchone()
-                if not actual_result:
+                if evaluation is None:
                     logger.warning(f"No actual drawing result found for {draw_date}")
                     return {'error': f'No drawing result for {draw_date}'}
 
-                # Validate draw result data
-                if any(x is None for x in actual_result[:5]) or actual_result[5] is None:
-                    logger.error(f"Invalid draw result data for {draw_date}: {actual_result}")
-                    return {'error': f'Invalid draw result data for {draw_date}'}
+                for pred_id in evaluation.skipped_ids:
+                    logger.warning(f"Skipping prediction {pred_id} due to invalid data")
 
-                winning_numbers = list(actual_result[:5])
-                winning_powerball = actual_result[5]
-
-                # Get ALL generated tickets for this date
-                cursor.execute("""
-                    SELECT id, n1, n2, n3, n4, n5, powerball, confidence_score
-                    FROM generated_tickets
-                    WHERE draw_date = ?
-                """, (draw_date,))
+                ids = evaluation.ticket_ids.tolist()
+                numbers = evaluation.numbers.tolist()
+                powerballs = evaluation.powerball.tolist()
+                matches_main = evaluation.main_matches.tolist()
+                matches_pb = evaluation.powerball_match.tolist()
+                prizes = evaluation.prize_amount.tolist()
 
-                predictions = cursor.fetchall()
+                # Update generated_tickets with prize info and mark as played
+                cursor.executemany("""
+                    UPDATE generated_tickets
+                    SET prize_won = ?,
+                        was_played = TRUE
+                    WHERE id = ?
+                """, list(zip(prizes, ids)))
 
                 date_summary = {
                     'draw_date': draw_date,
-                    'winning_numbers': winning_numbers,
-                    'winning_powerball': winning_powerball,
-                    'predictions_evaluated': len(predictions),
-                    'predictions_with_prizes': 0,
-                    'total_prize': 0.0,
+                    'winning_numbers': evaluation.winning_numbers,
+                    'winning_powerball': evaluation.winning_powerball,
+                    'predictions_evaluated': len(evaluation) + len(evaluation.skipped_ids),
+                    'predictions_with_prizes': evaluation.winners,
+                    'total_prize': evaluation.total_prize,
                     'best_prediction': None,
-                    'evaluation_details': []
+                    'evaluation_details': [
+                        {
+                            'prediction_id': ids[i],
+                            'matches_main': matches_main[i],
+                            'matches_pb': matches_pb[i],
+                            'prize_amount': prizes[i],
+                            'prize_description': evaluation.prize_description[i]
+                        }
+                        for i in range(len(ids))
+                    ]
                 }
 
-                for prediction in predictions:
-                    try:
-                        pred_id, n1, n2, n3, n4, n5, powerball, already_evaluated = prediction
-
-                        # Validate prediction data
-                        if any(x is None for x in prediction[:6]) or powerball is None:
-                            logger.warning(f"Skipping prediction {pred_id} due to invalid data")
-                            continue
-
-                        prediction_numbers = [n1, n2, n3, n4, n5]
-
-                        # Calculate matches
-                        matches_main = len(set(prediction_numbers) & set(winning_numbers))
-                        matches_pb = powerball == winning_powerball
-
-                        # Calculate prize
-                        prize_amount, prize_description = calculate_prize_amount(matches_main, matches_pb)
-
-                        # Update generated_tickets with prize info and mark as played
-                        cursor.execute("""
-                            UPDATE generated_tickets
-                            SET prize_won = ?,
-                                was_played = TRUE
-                            WHERE id = ?
-                        """, (prize_amount, pred_id))
-
-                        # Update summary
-                        if prize_amount > 0:
-                            date_summary['predictions_with_prizes'] += 1
-                            date_summary['total_prize'] += prize_amount
-
-                            # Track best prediction
-                            if not date_summary['best_prediction'] or prize_amount > date_summary['best_prediction']['prize_amount']:
-                                date_summary['best_prediction'] = {
-                                    'prediction_id': pred_id,
-                                    'numbers': prediction_numbers,
-                                    'powerball': powerball,
-                                    'matches_main': matches_main,
-                                    'matches_pb': matches_pb,
-                                    'prize_amount': prize_amount,
-                                    'prize_description': prize_description
-                                }
-
-                        date_summary['evaluation_details'].append({
-                            'prediction_id': pred_id,
-                            'matches_main': matches_main,
-                            'matches_pb': matches_pb,
-                            'prize_amount': prize_amount,
-                            'prize_description': prize_description
-                        })
-                    except Exception as pred_error:
-                        logger.error(f"Error processing prediction {pred_id if 'pred_id' in locals() else 'unknown'}: {pred_error}")
-                        continue
+                best = evaluation.best_index()
+                if best is not None:
+                    date_summary['best_prediction'] = {
+                        'prediction_id': ids[best],
+                        'numbers': numbers[best],
+                        'powerball': powerballs[best],
+                        'matches_main': matches_main[best],
+                        'matches_pb': matches_pb[best],
+                        'prize_amount': prizes[best],
+                        'prize_description': evaluation.prize_description[best]
+                    }
 
                 conn.commit()
+                publish_tickets()
 
-                logger.info(f"Evaluated {len(predictions)} predictions for {draw_date}: {date_summary['predictions_with_prizes']} won prizes, total: ${date_summary['total_prize']:.2f}")
+                logger.info(f"Evaluated {date_summary['predictions_evaluated']} predictions for {draw_date}: {date_summary['predictions_with_prizes']} won prizes, total: ${date_summary['total_prize']:.2f}")
                 return date_summary
 
         except Exception as e:
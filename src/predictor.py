@@ -12,8 +12,10 @@ from xgboost import XGBClassifier
 from typing import Dict, List, Tuple, Any, Optional
 
 from src.loader import DataLoader # Assuming DataLoader is available for retraining
-from src.intelligent_generator import FeatureEngineer, DeterministicGenerator
+from src.intelligent_generator import FeatureEngineer, DeterministicGenerator, XGBOOST_FEATURES
+from src.feature_store import get_feature_store
 from src.database import save_prediction_log
+from src.data_version import publish_tickets
 
 # EnsemblePredictor intentionally not implemented in v6.0+
 # The system uses strategy-based diversity (6 strategies) instead of model ensemble
@@ -466,15 +468,43 @@ class Predictor:
         Generate probability predictions for white balls and Powerball.
         OPTIMIZED: Prioritizes ensemble prediction for v6.1 performance.
 
+        Results are shared through the probability service, keyed by the
+        historical data and the model files, so every strategy and endpoint
+        computes them once per dataset/model version.
+
         Args:
             use_ensemble: Boolean to explicitly use or ignore ensemble prediction.
 
         Returns:
             Tuple of (white_ball_probabilities, powerball_probabilities) or fallback values.
         """
+        from src.probability_service import frame_fingerprint, get_probability_service, list_model_files
+
         # OPTIMIZED: Default to ensemble for better performance
         should_use_ensemble = use_ensemble if use_ensemble is not None else True
+        if should_use_ensemble and self.ensemble_predictor is not None:
+            ensemble_files = list_model_files(self.ensemble_predictor.models_dir)
+            model_name, model_paths = 'xgboost_ensemble', [self.model_trainer.model_path, *ensemble_files]
+        elif self.model is not None:
+            model_name, model_paths = 'xgboost', [self.model_trainer.model_path]
+        else:
+            logger.warning("No model available. Using intelligent fallback probabilities.")
+            # Use slightly better fallback based on historical frequency
+            return self._get_intelligent_fallback_probabilities()
+
+        probabilities = get_probability_service().get(
+            model_name,
+            frame_fingerprint(self.historical_data),
+            model_paths,
+            lambda: self._compute_probabilities(should_use_ensemble),
+        )
+        if probabilities is None:
+            # Return uniform probabilities as fallback
+            return np.ones(69) / 69, np.ones(26) / 26
+        return probabilities
 
+    def _compute_probabilities(self, should_use_ensemble: bool) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Run the ensemble or single model; None if prediction failed."""
         # Try ensemble prediction first (optimized path)
         if should_use_ensemble and self.ensemble_predictor is not None:
             try:
@@ -506,21 +536,21 @@ class Predictor:
                 self.historical_data = self.data_loader.load_historical_data()
                 self.feature_engineer = FeatureEngineer(self.historical_data) # Re-initialize feature engineer
 
-            # Generate features with proper validation for prediction
-            features = self.feature_engineer.engineer_features(use_temporal_analysis=True)
+            # Latest draw's features, appended to the persisted feature store
+            features = self._latest_prediction_features()
 
             # Validate and prepare features for model
             prepared_features = self._prepare_features_for_model(features)
             if prepared_features is None:
                 logger.error("Feature preparation failed for single model prediction.")
-                return np.ones(69) / 69, np.ones(26) / 26
+                return None
 
             # Get predictions from the model
             predictions = self.model_trainer.predict_probabilities(prepared_features) # Use model_trainer's predict method
 
             if predictions is None:
                 logger.error("Model prediction returned None.")
-                return np.ones(69) / 69, np.ones(26) / 26
+                return None
 
             # Extract and normalize probabilities
             wb_probs, pb_probs = self._extract_and_normalize_probabilities(predictions)
@@ -529,8 +559,21 @@ class Predictor:
 
         except Exception as e:
             logger.error(f"Error generating single model predictions: {e}")
-            # Return uniform probabilities as fallback
-            return np.ones(69) / 69, np.ones(26) / 26
+            return None
+
+    def _latest_prediction_features(self) -> pd.DataFrame:
+        """
+        Prediction features of the latest draw from the feature store.
+
+        Equal to the last row of engineer_features(), but only draws added
+        since the last call are engineered. Falls back to engineering the
+        full history if the store fails.
+        """
+        try:
+            return get_feature_store(XGBOOST_FEATURES).rows(self.historical_data, last=1)
+        except Exception as e:
+            logger.warning(f"Feature store unavailable, engineering the full history: {e}")
+            return self.feature_engineer.engineer_features(use_temporal_analysis=True)
 
     def _prepare_features_for_model(self, features_df: pd.DataFrame) -> Optional[np.ndarray]:
         """Prepares the latest features for model prediction with robust validation."""
@@ -803,12 +846,14 @@ class Predictor:
                     'dataset_hash': prediction.get('dataset_hash'),
                     'draw_date': actual_draw_date # Include draw date if provided
                 }
-                prediction_id = save_prediction_log(prediction_data)
+                prediction_id = save_prediction_log(prediction_data, publish=False)
                 if prediction_id:
                     prediction['log_id'] = prediction_id
                     saved_count += 1
                 else:
                     logger.warning("Failed to save one or more diverse predictions to log")
+            if saved_count:
+                publish_tickets()
 
             logger.info(f"Saved {saved_count}/{len(diverse_predictions)} diverse predictions to log")
 
@@ -872,12 +917,14 @@ class Predictor:
                     'syndicate_tier': prediction.get('syndicate_tier'),
                     'expected_coverage': prediction.get('expected_coverage')
                 }
-                prediction_id = save_prediction_log(prediction_data)
+                prediction_id = save_prediction_log(prediction_data, publish=False)
                 if prediction_id:
                     prediction['log_id'] = prediction_id
                     saved_count += 1
                 else:
                     logger.warning("Failed to save one or more syndicate predictions to log")
+            if saved_count:
+                publish_tickets()
 
             logger.info(f"Saved {saved_count}/{len(syndicate_predictions)} syndicate predictions to log")
 
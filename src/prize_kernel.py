@@ -0,0 +1,263 @@
+"""
+SHIOL+ Prize Kernel
+===================
+
+Vectorized "compare tickets to a draw" primitive shared by ticket evaluation,
+draw analytics, the public history endpoints and the ticket verifier.
+
+Each set of five white balls is encoded as a 69-bit mask stored in two
+uint64 words (ball n sets bit n-1; balls 65-69 live in the second word).
+Main-number matches between a ticket and a draw are then
+``popcount(ticket & draw)`` summed over both words, which works for one
+draw, one draw per ticket, or every ticket/draw pair through NumPy
+broadcasting. (main matches, powerball match) is mapped to a prize tier
+``main * 2 + pb`` and looked up in a 6x2 table built from a prize calculator.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+PrizeCalculator = Callable[[int, bool], Tuple[float, str]]
+
+MAX_WHITE_BALL = 69
+NUM_TIERS = 12  # 0..5 main matches x powerball match
+
+_ONE = np.uint64(1)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+# Bit for each ball value in the low and high mask word; index 0 (invalid/NULL) sets no bit
+_BALL_BITS = (np.zeros(MAX_WHITE_BALL + 1, dtype=np.uint64), np.zeros(MAX_WHITE_BALL + 1, dtype=np.uint64))
+for _ball in range(1, MAX_WHITE_BALL + 1):
+    _BALL_BITS[(_ball - 1) // 64][_ball] = np.uint64(1) << np.uint64((_ball - 1) % 64)
+
+# Balls 65-69 only use the low 5 bits of the high word, so its popcount is a table lookup
+_POPCOUNT_HIGH = np.array([bin(i).count("1") for i in range(32)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Count set bits in each element of a uint64 array.
+
+    Uses ``np.bitwise_count`` when available (NumPy >= 2.0) and the classic
+    SWAR reduction otherwise.
+
+    Args:
+        words: uint64 array of any shape
+
+    Returns:
+        uint8 array of the same shape
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.uint8, copy=False)
+    x = words - ((words >> _ONE) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+def encode_white_balls(numbers) -> np.ndarray:
+    """
+    Encode rows of white balls as 69-bit masks.
+
+    Values outside 1..69 (e.g. NULLs mapped to 0) set no bit, so they never
+    count as a match.
+
+    Args:
+        numbers: Array-like of shape (N, 5) (or (5,) for a single ticket)
+
+    Returns:
+        uint64 array of shape (N, 2) (or (2,) for a single ticket)
+    """
+    arr = np.asarray(numbers, dtype=np.int64)
+    single = arr.ndim == 1
+    arr = arr.reshape(-1, arr.shape[-1])
+
+    if arr.size and (arr.min() < 0 or arr.max() > MAX_WHITE_BALL):
+        arr = np.where((arr >= 0) & (arr <= MAX_WHITE_BALL), arr, 0)
+
+    masks = np.zeros((arr.shape[0], 2), dtype=np.uint64)
+    for word, table in enumerate(_BALL_BITS):
+        bits = table.take(arr)
+        for i in range(arr.shape[1]):
+            masks[:, word] |= bits[:, i]
+    return masks[0] if single else masks
+
+
+def match_counts(ticket_masks: np.ndarray, draw_masks: np.ndarray) -> np.ndarray:
+    """
+    Count main-number matches between encoded tickets and draws.
+
+    Shapes broadcast on every axis but the last (the two mask words):
+    (N, 2) vs (2,) scores N tickets against one draw, (N, 2) vs (N, 2)
+    pairs each ticket with its own draw and (N, 1, 2) vs (1, M, 2) gives
+    the full N x M matrix.
+
+    Returns:
+        uint8 array of match counts (0-5)
+    """
+    low = popcount(ticket_masks[..., 0] & draw_masks[..., 0])
+    high = _POPCOUNT_HIGH.take((ticket_masks[..., 1] & draw_masks[..., 1]).astype(np.intp))
+    return low + high
+
+
+@lru_cache(maxsize=None)
+def prize_table(prize_calculator: PrizeCalculator) -> Tuple[np.ndarray, Tuple[Tuple[str, str], ...]]:
+    """
+    Tabulate a prize calculator as lookups indexed by [main_matches, powerball_match].
+
+    Args:
+        prize_calculator: Function (main_matches, powerball_match) -> (amount, description)
+
+    Returns:
+        Tuple of (amounts array of shape (6, 2), descriptions as nested tuples)
+    """
+    amounts = np.zeros((6, 2), dtype=np.float64)
+    descriptions = []
+    for matches in range(6):
+        row = []
+        for pb_match in (False, True):
+            amount, description = prize_calculator(matches, pb_match)
+            amounts[matches, int(pb_match)] = amount
+            row.append(description)
+        descriptions.append(tuple(row))
+    amounts.flags.writeable = False
+    return amounts, tuple(descriptions)
+
+
+@dataclass
+class TicketScores:
+    """Per ticket (or per ticket/draw pair) match and prize results"""
+    main_matches: np.ndarray      # uint8, 0-5
+    powerball_match: np.ndarray   # bool
+    tier: np.ndarray              # uint8, main_matches * 2 + powerball_match
+    prize_amount: np.ndarray      # float64
+    prize_calculator: PrizeCalculator
+
+    @property
+    def total_prize(self) -> float:
+        return float(self.prize_amount.sum())
+
+    @property
+    def winners(self) -> int:
+        return int(np.count_nonzero(self.prize_amount > 0))
+
+    def descriptions(self) -> List[str]:
+        """Prize description for each score, from the same calculator as the amounts."""
+        _, descriptions = prize_table(self.prize_calculator)
+        flat = [d for row in descriptions for d in row]
+        return [flat[t] for t in self.tier.ravel().tolist()]
+
+    def tier_counts(self) -> np.ndarray:
+        """Number of scores in each of the 12 tiers."""
+        return np.bincount(self.tier.ravel(), minlength=NUM_TIERS)
+
+
+def score(
+    ticket_masks: np.ndarray,
+    ticket_pb: np.ndarray,
+    draw_masks: np.ndarray,
+    draw_pb,
+    prize_calculator: PrizeCalculator,
+) -> TicketScores:
+    """
+    Score encoded tickets against encoded draws (see match_counts for shapes).
+
+    Args:
+        ticket_masks: Output of encode_white_balls for the tickets
+        ticket_pb: Ticket powerballs, broadcastable against draw_pb
+        draw_masks: Output of encode_white_balls for the draw(s)
+        draw_pb: Draw powerball(s)
+        prize_calculator: Function (main_matches, powerball_match) -> (amount, description)
+
+    Returns:
+        TicketScores
+    """
+    main = match_counts(ticket_masks, draw_masks)
+    pb_match = np.asarray(ticket_pb) == np.asarray(draw_pb)
+    tier = main * np.uint8(2) + pb_match
+    amounts, _ = prize_table(prize_calculator)
+    return TicketScores(
+        main_matches=main,
+        powerball_match=pb_match,
+        tier=tier,
+        prize_amount=amounts.ravel()[tier],
+        prize_calculator=prize_calculator,
+    )
+
+
+def score_tickets(numbers, powerball, winning_numbers, winning_pb, prize_calculator: PrizeCalculator) -> TicketScores:
+    """
+    Score tickets against a single draw.
+
+    Args:
+        numbers: Ticket white balls, shape (N, 5)
+        powerball: Ticket powerballs, shape (N,)
+        winning_numbers: The five official white balls
+        winning_pb: The official powerball
+        prize_calculator: Function (main_matches, powerball_match) -> (amount, description)
+
+    Returns:
+        TicketScores with arrays of shape (N,)
+    """
+    return score(
+        encode_white_balls(numbers),
+        np.asarray(powerball, dtype=np.int64),
+        encode_white_balls(winning_numbers),
+        winning_pb,
+        prize_calculator,
+    )
+
+
+def score_history(
+    numbers,
+    powerball,
+    draw_numbers,
+    draw_powerball,
+    prize_calculator: PrizeCalculator,
+    chunk_size: int = 2048,
+) -> TicketScores:
+    """
+    Score every ticket against every draw.
+
+    Tickets are processed in chunks so the temporary (chunk, M, 2) mask
+    products stay small; the returned arrays are (N, M).
+
+    Args:
+        numbers: Ticket white balls, shape (N, 5)
+        powerball: Ticket powerballs, shape (N,)
+        draw_numbers: Draw white balls, shape (M, 5)
+        draw_powerball: Draw powerballs, shape (M,)
+        prize_calculator: Function (main_matches, powerball_match) -> (amount, description)
+        chunk_size: Tickets scored per chunk
+
+    Returns:
+        TicketScores with arrays of shape (N, M)
+    """
+    ticket_masks = encode_white_balls(np.asarray(numbers).reshape(-1, 5))
+    ticket_pb = np.asarray(powerball, dtype=np.int64)
+    draw_masks = encode_white_balls(np.asarray(draw_numbers).reshape(-1, 5))[None, :, :]
+    draw_pb = np.asarray(draw_powerball, dtype=np.int64)[None, :]
+
+    n, m = ticket_masks.shape[0], draw_masks.shape[1]
+    main = np.empty((n, m), dtype=np.uint8)
+    pb_match = np.empty((n, m), dtype=bool)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        main[start:stop] = match_counts(ticket_masks[start:stop, None, :], draw_masks)
+        pb_match[start:stop] = ticket_pb[start:stop, None] == draw_pb
+
+    tier = main * np.uint8(2) + pb_match
+    amounts, _ = prize_table(prize_calculator)
+    return TicketScores(
+        main_matches=main,
+        powerball_match=pb_match,
+        tier=tier,
+        prize_amount=amounts.ravel()[tier],
+        prize_calculator=prize_calculator,
+    )
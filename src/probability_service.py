@@ -0,0 +1,361 @@
+"""
+SHIOL+ Probability Service
+==========================
+
+Shared cache of each model's next-draw probability vectors (69 white-ball
+and 26 Powerball probabilities).
+
+``AIGuidedStrategy``, ``XGBoostMLStrategy``, ``HybridEnsembleStrategy``
+(through its own XGBoost strategy), the Random Forest / LSTM strategies,
+``UnifiedPredictionEngine`` v2/hybrid and the v3 ``/compare`` endpoint all
+used to re-run feature engineering over the full history and call
+``predict_probabilities`` for themselves. The service computes each
+model's vectors once per
+
+- dataset fingerprint (hash of the draw history the model sees)
+- model fingerprint (path, mtime and size of the model files)
+
+keeps them in memory and persists them to the ``model_probabilities``
+table, so restarts and other workers reuse them as well. The pipeline warms
+it right after new draws are inserted (see ``warm_probabilities``).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src import database
+
+ProbabilityPair = Tuple[np.ndarray, np.ndarray]
+
+# In-memory entries kept per database (historical max_date runs add one per cutoff)
+MAX_MEMORY_ENTRIES = int(os.getenv("PROBABILITY_CACHE_MAX_ENTRIES", "64"))
+
+_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS model_probabilities (
+        model TEXT NOT NULL,
+        dataset_key TEXT NOT NULL,
+        model_key TEXT NOT NULL,
+        model_paths TEXT NOT NULL,
+        wb_probs TEXT NOT NULL,
+        pb_probs TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (model, dataset_key, model_key)
+    )
+"""
+
+
+def frame_fingerprint(draws_df: pd.DataFrame) -> str:
+    """
+    Fingerprint a draw history DataFrame (draw_date, n1..n5, pb).
+
+    Only dates and numbers are hashed, so the same draws loaded through
+    different code paths (draw store, DataLoader) get the same key.
+
+    Returns:
+        16-character hex digest
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    if draws_df is None or draws_df.empty:
+        return digest.hexdigest()
+    days = pd.to_datetime(draws_df["draw_date"]).to_numpy(dtype="datetime64[D]").astype(np.int64)
+    numbers = draws_df[["n1", "n2", "n3", "n4", "n5", "pb"]].to_numpy(dtype=np.int64)
+    digest.update(np.ascontiguousarray(days).tobytes())
+    digest.update(np.ascontiguousarray(numbers).tobytes())
+    return digest.hexdigest()
+
+
+# Serialized model formats; anything else under a model directory (feature
+# caches, temp files of an in-progress save, logs) does not change predictions
+MODEL_FILE_EXTENSIONS = (".pkl", ".joblib", ".json", ".h5", ".keras")
+
+
+def list_model_files(directory: str) -> List[str]:
+    """
+    Model artifacts under a directory, walked recursively.
+
+    Returns:
+        Sorted file paths with a MODEL_FILE_EXTENSIONS suffix (empty if the directory does not exist)
+    """
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(MODEL_FILE_EXTENSIONS):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+def path_fingerprint(paths: Sequence[str]) -> str:
+    """
+    Fingerprint model files: path, mtime and size of each file.
+
+    Directories contribute the model artifacts found by list_model_files().
+
+    Returns:
+        16-character hex digest; missing paths contribute a 'missing' marker
+    """
+    entries = []
+    for path in paths:
+        if os.path.isdir(path):
+            for full in list_model_files(path):
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                entries.append(f"{full}:{stat.st_mtime_ns}:{stat.st_size}")
+        else:
+            try:
+                stat = os.stat(path)
+                entries.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                entries.append(f"{path}:missing")
+    return hashlib.sha256("\n".join(sorted(entries)).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ProbabilityEntry:
+    """Cached probability vectors of one model for one dataset/model version"""
+    model: str
+    dataset_key: str
+    model_key: str
+    model_paths: Tuple[str, ...]
+    wb_probs: np.ndarray   # Shape: (69,), read-only
+    pb_probs: np.ndarray   # Shape: (26,), read-only
+    created_at: str
+
+    def pair(self) -> ProbabilityPair:
+        """Writable copies, so callers can never corrupt the shared vectors."""
+        return self.wb_probs.copy(), self.pb_probs.copy()
+
+
+class ProbabilityService:
+    """Probability cache for a single database file (memory + model_probabilities table)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._entries: "OrderedDict[Tuple[str, str, str], ProbabilityEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._compute_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._table_ready = False
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _ensure_table(self, conn) -> None:
+        if not self._table_ready:
+            conn.execute(_TABLE_SQL)
+            conn.commit()
+            self._table_ready = True
+
+    def _load(self, model: str, dataset_key: str, model_key: Optional[str]) -> Optional[ProbabilityEntry]:
+        """Latest persisted entry for (model, dataset_key[, model_key])."""
+        try:
+            conn = database.get_db_connection()
+            try:
+                self._ensure_table(conn)
+                query = ("SELECT model_key, model_paths, wb_probs, pb_probs, created_at FROM model_probabilities"
+                         " WHERE model = ? AND dataset_key = ?")
+                params: List[str] = [model, dataset_key]
+                if model_key is not None:
+                    query += " AND model_key = ?"
+                    params.append(model_key)
+                row = conn.execute(query + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.debug(f"Probability cache table unavailable: {e}")
+            return None
+        if row is None:
+            return None
+        return self._entry(model, dataset_key, row[0], json.loads(row[1]),
+                           np.array(json.loads(row[2])), np.array(json.loads(row[3])), row[4])
+
+    def _store(self, entry: ProbabilityEntry) -> None:
+        try:
+            conn = database.get_db_connection()
+            try:
+                self._ensure_table(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO model_probabilities"
+                    " (model, dataset_key, model_key, model_paths, wb_probs, pb_probs, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (entry.model, entry.dataset_key, entry.model_key, json.dumps(list(entry.model_paths)),
+                     json.dumps(entry.wb_probs.tolist()), json.dumps(entry.pb_probs.tolist()), entry.created_at),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Could not persist {entry.model} probabilities: {e}")
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _entry(model, dataset_key, model_key, model_paths, wb_probs, pb_probs, created_at) -> ProbabilityEntry:
+        wb = np.asarray(wb_probs, dtype=np.float64).ravel()
+        pb = np.asarray(pb_probs, dtype=np.float64).ravel()
+        if wb.shape != (69,) or pb.shape != (26,):
+            raise ValueError(f"{model}: expected 69 and 26 probabilities, got {wb.shape} and {pb.shape}")
+        wb.flags.writeable = False
+        pb.flags.writeable = False
+        return ProbabilityEntry(model, dataset_key, model_key, tuple(model_paths), wb, pb, created_at)
+
+    def _remember(self, entry: ProbabilityEntry) -> None:
+        with self._lock:
+            key = (entry.model, entry.dataset_key, entry.model_key)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > MAX_MEMORY_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, model: str, dataset_key: str, model_key: str) -> Optional[ProbabilityEntry]:
+        with self._lock:
+            entry = self._entries.get((model, dataset_key, model_key))
+            if entry is not None:
+                self._entries.move_to_end((model, dataset_key, model_key))
+        if entry is None:
+            entry = self._load(model, dataset_key, model_key)
+            if entry is not None:
+                self._remember(entry)
+        return entry
+
+    def peek(self, model: str, dataset_key: str) -> Optional[ProbabilityPair]:
+        """
+        Get cached vectors without computing anything.
+
+        The newest entry for (model, dataset_key) is returned only if its
+        model files are unchanged, so callers can skip loading the model
+        entirely on a hit.
+
+        Returns:
+            (wb_probs, pb_probs) copies, or None
+        """
+        with self._lock:
+            candidates = [e for (m, d, _), e in self._entries.items() if m == model and d == dataset_key]
+        entry = candidates[-1] if candidates else self._load(model, dataset_key, None)
+        if entry is None or path_fingerprint(entry.model_paths) != entry.model_key:
+            return None
+        self._remember(entry)
+        self.hits += 1
+        return entry.pair()
+
+    def get(
+        self,
+        model: str,
+        dataset_key: str,
+        model_paths: Sequence[str],
+        compute: Callable[[], Optional[ProbabilityPair]],
+    ) -> Optional[ProbabilityPair]:
+        """
+        Get a model's vectors, computing them once per dataset/model version.
+
+        Concurrent callers for the same model and dataset wait for a single
+        computation. A compute() result of None (model failure) is not cached.
+
+        Args:
+            model: Model name ('xgboost', 'xgboost_ensemble', 'random_forest', 'lstm')
+            dataset_key: frame_fingerprint() of the history the model predicts from
+            model_paths: Model files/directories the vectors depend on
+            compute: Produces (wb_probs, pb_probs), or None on failure
+
+        Returns:
+            (wb_probs, pb_probs) copies, or None if compute() failed
+        """
+        model_key = path_fingerprint(model_paths)
+        entry = self._lookup(model, dataset_key, model_key)
+        if entry is not None:
+            self.hits += 1
+            return entry.pair()
+
+        with self._lock:
+            compute_lock = self._compute_locks.setdefault((model, dataset_key), threading.Lock())
+        with compute_lock:
+            entry = self._lookup(model, dataset_key, model_key)
+            if entry is not None:
+                self.hits += 1
+                return entry.pair()
+
+            self.misses += 1
+            result = compute()
+            if result is None:
+                return None
+            # compute() may have loaded, trained or saved the model files, so
+            # key the entry by their state now for peek() to accept it
+            entry = self._entry(model, dataset_key, path_fingerprint(model_paths), model_paths,
+                                result[0], result[1], datetime.now().isoformat())
+            self._remember(entry)
+            self._store(entry)
+            logger.info(f"Probability cache: computed {model} vectors for dataset {dataset_key}")
+            return entry.pair()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            cached = [{"model": m, "dataset_key": d, "model_key": k} for (m, d, k) in self._entries]
+        return {"hits": self.hits, "misses": self.misses, "entries": cached}
+
+
+_services: Dict[str, ProbabilityService] = {}
+_services_lock = threading.Lock()
+
+
+def get_probability_service() -> ProbabilityService:
+    """Process-wide probability service for the configured database (keyed by path)."""
+    db_path = database.get_db_path()
+    with _services_lock:
+        service = _services.get(db_path)
+        if service is None:
+            service = ProbabilityService(db_path)
+            _services[db_path] = service
+        return service
+
+
+def warm_probabilities() -> Dict[str, bool]:
+    """
+    Compute and persist every available model's vectors for the current history.
+
+    Called by the pipeline right after new draws are inserted, so strategy
+    construction and the prediction endpoints only ever read the cache.
+
+    Returns:
+        Dict of model name -> whether vectors are now cached
+    """
+    from src.database import get_all_draws
+
+    results: Dict[str, bool] = {}
+    draws_df = get_all_draws()
+
+    try:
+        from src.predictor import Predictor
+        predictor = Predictor()
+        if predictor.model is not None:
+            predictor.predict_probabilities(use_ensemble=False)
+            results["xgboost"] = True
+        else:
+            results["xgboost"] = False
+    except Exception as e:
+        logger.warning(f"Probability warm-up failed for xgboost: {e}")
+        results["xgboost"] = False
+
+    from src.strategy_generators import LSTMNeuralStrategy, RandomForestMLStrategy
+    for name, strategy_cls in (("random_forest", RandomForestMLStrategy), ("lstm", LSTMNeuralStrategy)):
+        try:
+            strategy = strategy_cls()
+            results[name] = strategy._cached_wb_probs is not None
+        except Exception as e:
+            logger.warning(f"Probability warm-up failed for {name}: {e}")
+            results[name] = False
+
+    logger.info(f"Probability cache warmed for {len(draws_df)} draws: {results}")
+    return results
@@ -0,0 +1,167 @@
+"""
+SHIOL+ Single-Flight
+====================
+
+Request coalescing for expensive cache misses.
+
+When the data version behind a cached value changes, every request that
+arrives during the recompute used to start its own computation - on the
+event loop, since the work is synchronous code called from ``async def``
+endpoints. A ``SingleFlight`` group runs one computation per
+(cache name, version) on a work pool (src/work_pools.py); concurrent
+callers await the same future instead.
+
+With stale-while-revalidate (the default) callers keep receiving the
+previous version's value while the refresh runs in the background, so
+only the first request of a process ever waits.
+
+Counters per cache name:
+
+- hits: current value served
+- computes: computations started
+- coalesced: callers that awaited a computation started by another caller
+- stale: previous value served while a refresh was running
+- errors: computations that raised (nothing is cached; the next call retries)
+
+Usage:
+    value = await single_flight("analytics_snapshot", version, compute)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from loguru import logger
+
+from src.work_pools import pool_for
+
+COUNTERS = ("hits", "computes", "coalesced", "stale", "errors")
+
+
+@dataclass
+class _Entry:
+    """Latest value of one cache name and its in-flight computations"""
+    version: Hashable = None
+    value: Any = None
+    has_value: bool = False
+    value_seq: int = 0  # Sequence number of the flight that produced value
+    inflight: Dict[Hashable, "Future"] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(COUNTERS, 0))
+
+
+class SingleFlight:
+    """One computation per (cache name, version), shared by all concurrent callers."""
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        self._seq = 0
+
+    def _start(self, name: str, entry: _Entry, version: Hashable,
+               compute: Callable[[], Any], endpoint: str) -> Future:
+        """Submit compute for version (caller holds the lock)."""
+        self._seq += 1
+        seq = self._seq
+        future = pool_for(endpoint).submit(compute)
+        entry.inflight[version] = future
+        entry.stats["computes"] += 1
+        future.add_done_callback(lambda done: self._finish(name, version, seq, done))
+        return future
+
+    def _finish(self, name: str, version: Hashable, seq: int, future: Future) -> None:
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            if entry.inflight.get(version) is future:
+                del entry.inflight[version]
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or error is not None:
+                entry.stats["errors"] += 1
+            elif seq > entry.value_seq:
+                # A slow flight for an older version must not replace a newer value
+                entry.version, entry.value, entry.has_value, entry.value_seq = version, future.result(), True, seq
+        if error is not None:
+            logger.warning(f"Single-flight computation of '{name}' failed: {error}")
+
+    async def get(self, name: str, version: Hashable, compute: Callable[[], Any],
+                  stale_while_revalidate: bool = True, endpoint: Optional[str] = None) -> Any:
+        """
+        Value of ``name`` for ``version``, computing it at most once.
+
+        Args:
+            name: Cache name (include the database path for per-database values)
+            version: Data version the value depends on (any hashable)
+            compute: Synchronous function producing the value; runs in a worker thread
+            stale_while_revalidate: Serve the previous version's value while the
+                new one is computed in the background
+            endpoint: Work pool assignment (src.work_pools.ENDPOINT_POOLS key)
+                compute runs on; default the io pool
+
+        Returns:
+            The cached, freshly computed or (stale_while_revalidate) previous value
+
+        Raises:
+            Whatever compute raised, to every caller waiting for that computation
+        """
+        with self._lock:
+            entry = self._entries.setdefault(name, _Entry())
+            if entry.has_value and entry.version == version:
+                entry.stats["hits"] += 1
+                return entry.value
+
+            has_stale, stale = entry.has_value, entry.value
+            future = entry.inflight.get(version)
+            started = future is None
+            if started:
+                future = self._start(name, entry, version, compute, endpoint or name)
+
+            if stale_while_revalidate and has_stale and not future.done():
+                entry.stats["stale"] += 1
+                return stale
+            if not started:
+                entry.stats["coalesced"] += 1
+
+        # shield: a disconnecting client must not cancel the computation others await
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def forget(self, name: str) -> None:
+        """Drop the cached value of ``name`` (running computations still complete)."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry.version, entry.value, entry.has_value = None, None, False
+                entry.value_seq = self._seq
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters, in-flight computations and cached version per cache name."""
+        with self._lock:
+            return {
+                name: {
+                    **entry.stats,
+                    "in_flight": len(entry.inflight),
+                    "version": repr(entry.version) if entry.has_value else None,
+                }
+                for name, entry in self._entries.items()
+            }
+
+
+_group = SingleFlight()
+
+
+async def single_flight(name: str, version: Hashable, compute: Callable[[], Any],
+                        stale_while_revalidate: bool = True, endpoint: Optional[str] = None) -> Any:
+    """Coalesced value of ``name`` for ``version`` from the process-wide group (see SingleFlight.get)."""
+    return await _group.get(name, version, compute, stale_while_revalidate, endpoint)
+
+
+def forget_single_flight(name: str) -> None:
+    """Drop the cached value of ``name`` from the process-wide group."""
+    _group.forget(name)
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-cache counters of the process-wide group."""
+    return _group.stats()
@@ -5,15 +5,134 @@ Six different strategies for intelligent ticket generation.
 """
 
 import numpy as np
+import os
+import pandas as pd
 import random
-from typing import List, Dict, Tuple, Any
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Tuple, Any, Optional
 from loguru import logger
 from src.database import get_db_connection, get_all_draws
+from src.frequency_index import FrequencyIndex
+
+
+def _validated_probs(probs, size: int, min_support: int) -> np.ndarray:
+    """Return probs as a normalized float64 vector, or raise ValueError if unusable."""
+    p = np.asarray(probs, dtype=np.float64).ravel()
+    if p.shape[0] != size or not np.all(np.isfinite(p)) or np.any(p < 0):
+        raise ValueError(f"expected {size} finite non-negative probabilities")
+    if np.count_nonzero(p) < min_support:
+        raise ValueError(f"need at least {min_support} numbers with non-zero probability")
+    return p / p.sum()
+
+
+def _smallest_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k smallest keys per row (overwrites keys)."""
+    rows = np.arange(keys.shape[0])
+    picked = np.empty((keys.shape[0], k), dtype=np.intp)
+    # k argmin passes are much cheaper than a row-wise argpartition for k = 5
+    for i in range(k):
+        picked[:, i] = keys.argmin(axis=1)
+        keys[rows, picked[:, i]] = np.inf
+    return picked
+
+
+def sample_white_balls(count: int, probs: Optional[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw `count` sets of 5 distinct white balls in one vectorized step.
+
+    Gumbel-top-k in its exponential form: each number gets the key E / p with
+    E ~ Exp(1), and the 5 smallest keys per row win (-log(E / p) is log p plus
+    Gumbel noise). This is distributed exactly like 5 sequential draws without
+    replacement, i.e. np.random.choice(replace=False, p=probs) per ticket.
+
+    Args:
+        count: Number of tickets
+        probs: 69 weights for numbers 1-69 (None for uniform)
+        rng: NumPy random generator
+
+    Returns:
+        uint8 array of shape (count, 5), each row sorted ascending
+
+    Raises:
+        ValueError: If probs is malformed or has fewer than 5 non-zero entries
+    """
+    if probs is None:
+        keys = rng.random((count, 69), dtype=np.float32)
+    else:
+        p = _validated_probs(probs, 69, 5)
+        impossible = p == 0
+        with np.errstate(divide='ignore'):
+            inverse = (1.0 / p).astype(np.float32)
+        keys = rng.standard_exponential((count, 69), dtype=np.float32)
+        keys *= inverse
+        if impossible.any():
+            keys[:, impossible] = np.inf  # also covers E == 0 (0 * inf is nan)
+    picked = _smallest_k(keys, 5)
+    picked += 1
+    picked.sort(axis=1)
+    return picked.astype(np.uint8)
+
+
+def sample_powerballs(count: int, probs: Optional[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw `count` Powerballs (1-26) with the given weights (None for uniform).
+
+    Returns:
+        uint8 array of shape (count,)
+    """
+    if probs is None:
+        return rng.integers(1, 27, size=count).astype(np.uint8)
+    return (rng.choice(26, size=count, p=_validated_probs(probs, 26, 1)) + 1).astype(np.uint8)
+
+
+def batch_to_tickets(batch: np.ndarray, strategy: str, confidence: float) -> List[Dict]:
+    """Convert a (count x 6) ticket array into the ticket dicts used across the API."""
+    return [
+        {
+            'white_balls': row[:5],
+            'powerball': row[5],
+            'strategy': strategy,
+            'confidence': confidence
+        }
+        for row in batch.tolist()
+    ]
+
+
+def tickets_to_batch(tickets: List[Dict]) -> np.ndarray:
+    """Pack ticket dicts into a compact (count x 6) uint8 array (white balls sorted)."""
+    batch = np.empty((len(tickets), 6), dtype=np.uint8)
+    for i, ticket in enumerate(tickets):
+        batch[i, :5] = sorted(ticket['white_balls'])
+        batch[i, 5] = ticket['powerball']
+    return batch
+
+
+# Bit offsets of n1..n5, pb in a packed ticket key (7 bits per white ball, 5 for the Powerball)
+_KEY_SHIFTS = np.array([33, 26, 19, 12, 5, 0], dtype=np.int64)
+
+
+def pack_ticket_keys(batch: np.ndarray) -> np.ndarray:
+    """
+    Pack (count x 6) tickets (sorted white balls + Powerball) into one int64 each.
+
+    Equal tickets get equal keys, so a Python set of keys replaces a set of
+    (tuple(white_balls), powerball) pairs for deduplication.
+    """
+    return (batch.astype(np.int64) << _KEY_SHIFTS).sum(axis=1)
 
 
 class BaseStrategy:
     """Base class for all ticket generation strategies"""
 
+    # Strategies with a vectorized generate_batch() set this to True; the rest
+    # use the generic per-ticket fallback below
+    supports_batch = False
+    batch_confidence = 0.50
+
     def __init__(self, name: str, max_date: str = None):
         self.name = name
         self.max_date = max_date
@@ -28,6 +147,31 @@ class BaseStrategy:
         """Generate tickets. Must be implemented by subclasses"""
         raise NotImplementedError(f"Strategy {self.name} must implement generate()")
 
+    def generate_batch(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Generate `count` tickets as a compact array.
+
+        Generic fallback: packs the output of generate(). Strategies that can
+        sample all tickets at once override this and set supports_batch.
+
+        Args:
+            count: Number of tickets
+            rng: Random generator (only used by vectorized implementations)
+
+        Returns:
+            uint8 array of shape (count, 6): five sorted white balls + Powerball
+        """
+        return tickets_to_batch(self.generate(count))
+
+    def _sample_batch(self, count: int, wb_probs: Optional[np.ndarray], pb_probs: Optional[np.ndarray],
+                      rng: Optional[np.random.Generator]) -> np.ndarray:
+        """Vectorized weighted sampling of `count` tickets (None weights mean uniform)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        batch = np.empty((count, 6), dtype=np.uint8)
+        batch[:, :5] = sample_white_balls(count, wb_probs, rng)
+        batch[:, 5] = sample_powerballs(count, pb_probs, rng)
+        return batch
+
     def validate_ticket(self, white_balls: List[int], powerball: int) -> bool:
         """Validate ticket constraints"""
         if len(white_balls) != 5:
@@ -44,35 +188,22 @@ class BaseStrategy:
 class FrequencyWeightedStrategy(BaseStrategy):
     """Generate tickets using most frequent numbers with weighted probability"""
 
+    supports_batch = True
+    batch_confidence = 0.75
+
     def __init__(self, max_date: str = None):
         super().__init__("frequency_weighted", max_date=max_date)
+        self._index = FrequencyIndex.from_dataframe(self.draws_df)
         self.frequencies = self._calculate_frequencies()
+        self._pb_frequencies = None  # Computed on first generate_batch()
 
     def _calculate_frequencies(self) -> np.ndarray:
-        """Calculate normalized frequency of each number 1-69"""
-        freq = np.zeros(69)
-
-        if self.draws_df.empty:
-            # Uniform distribution if no data
-            return np.ones(69) / 69
-
-        for _, draw in self.draws_df.iterrows():
-            for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-                freq[num - 1] += 1
-
-        # Normalize to probabilities
-        total = freq.sum()
-        if total > 0:
-            freq = freq / total
-        else:
-            freq = np.ones(69) / 69
-
-        return freq
+        """Calculate normalized frequency of each number 1-69 (uniform if no data)"""
+        white_freq, _ = self._index.frequencies()
+        return white_freq
 
     def _calculate_pb_frequencies(self) -> np.ndarray:
         """Calculate Powerball frequencies using only current-era draws (PB 1-26)"""
-        freq = np.zeros(26)
-
         if self.draws_df.empty:
             return np.ones(26) / 26
 
@@ -92,18 +223,9 @@ class FrequencyWeightedStrategy(BaseStrategy):
             logger.info(f"Using {len(current_era_draws)} current-era draws for PB frequencies "
                        f"(skipped {skipped_historical} historical draws from 2009-2015)")
 
-        # Count frequencies
-        for _, draw in current_era_draws.iterrows():
-            pb = draw['pb']
-            if 1 <= pb <= 26:
-                freq[pb - 1] += 1
-
-        # Normalize
-        total = freq.sum()
-        if total > 0:
-            return freq / total
-        else:
-            return np.ones(26) / 26
+        # Historical Powerballs (27+) are not counted by the index
+        _, pb_freq = self._index.frequencies()
+        return pb_freq
 
     def generate(self, count: int = 5) -> List[Dict]:
         """Generate tickets favoring frequent numbers"""
@@ -153,6 +275,12 @@ class FrequencyWeightedStrategy(BaseStrategy):
         logger.debug(f"{self.name}: Generated {count} tickets")
         return tickets
 
+    def generate_batch(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Vectorized generate(): frequency-weighted white balls and Powerball"""
+        if self._pb_frequencies is None:
+            self._pb_frequencies = self._calculate_pb_frequencies()
+        return self._sample_batch(count, self.frequencies, self._pb_frequencies, rng)
+
 
 class CoverageOptimizerStrategy(BaseStrategy):
     """Maximize unique numbers across all tickets"""
@@ -256,6 +384,12 @@ class CooccurrenceStrategy(BaseStrategy):
 class RangeBalancedStrategy(BaseStrategy):
     """Generate with balanced distribution: 2 low, 2 mid, 1 high"""
 
+    supports_batch = True
+    batch_confidence = 0.68
+
+    # (first number, band size, numbers drawn from the band)
+    BANDS = ((1, 23, 2), (24, 23, 2), (47, 23, 1))
+
     def __init__(self, max_date: str = None):
         super().__init__("range_balanced", max_date=max_date)
 
@@ -293,10 +427,45 @@ class RangeBalancedStrategy(BaseStrategy):
         logger.debug(f"{self.name}: Generated {count} tickets")
         return tickets
 
+    def generate_batch(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Vectorized generate(): uniform picks within each band"""
+        rng = rng if rng is not None else np.random.default_rng()
+        batch = np.empty((count, 6), dtype=np.uint8)
+        column = 0
+        for first, size, picks in self.BANDS:
+            batch[:, column:column + picks] = _smallest_k(rng.random((count, size), dtype=np.float32), picks) + first
+            column += picks
+        batch[:, :5].sort(axis=1)
+        batch[:, 5] = sample_powerballs(count, None, rng)
+        return batch
+
+
+class MLProbabilityBatchMixin:
+    """
+    generate_batch() for ML strategies that cache (wb_probs, pb_probs) at init.
+
+    Batch sampling is only advertised while probabilities are cached; otherwise
+    the strategy's own generate() fallback is used through BaseStrategy.
+    """
+
+    @property
+    def supports_batch(self) -> bool:
+        return self._cached_wb_probs is not None and self._cached_pb_probs is not None
 
-class AIGuidedStrategy(BaseStrategy):
+    def generate_batch(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        if self.supports_batch:
+            try:
+                return self._sample_batch(count, self._cached_wb_probs, self._cached_pb_probs, rng)
+            except ValueError as e:
+                logger.error(f"{self.name}: Cached probabilities unusable for batch sampling: {e}")
+        return super().generate_batch(count, rng)
+
+
+class AIGuidedStrategy(MLProbabilityBatchMixin, BaseStrategy):
     """Use ML model (XGBoost) predictions for intelligent ticket generation"""
 
+    batch_confidence = 0.85
+
     def __init__(self, max_date: str = None):
         super().__init__("ai_guided", max_date=max_date)
         self._predictor = None
@@ -306,6 +475,13 @@ class AIGuidedStrategy(BaseStrategy):
 
     def _initialize_ml_predictor(self) -> bool:
         """Initialize the ML predictor and pre-compute probabilities."""
+        # Vectors computed by any strategy/endpoint for this history: no Predictor needed
+        shared = _shared_probabilities('xgboost', get_all_draws())
+        if shared is not None:
+            self._cached_wb_probs, self._cached_pb_probs = shared
+            logger.info(f"{self.name}: XGBoost probabilities served from the probability cache")
+            return True
+
         try:
             from src.predictor import Predictor
             self._predictor = Predictor()
@@ -429,6 +605,9 @@ class AIGuidedStrategy(BaseStrategy):
 class RandomBaselineStrategy(BaseStrategy):
     """Pure random generation (scientific control baseline)"""
 
+    supports_batch = True
+    batch_confidence = 0.50
+
     def __init__(self, max_date: str = None):
         super().__init__("random_baseline", max_date=max_date)
 
@@ -450,10 +629,16 @@ class RandomBaselineStrategy(BaseStrategy):
         logger.debug(f"{self.name}: Generated {count} tickets")
         return tickets
 
+    def generate_batch(self, count: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Vectorized generate(): uniform white balls and Powerball"""
+        return self._sample_batch(count, None, None, rng)
+
 
-class XGBoostMLStrategy(BaseStrategy):
+class XGBoostMLStrategy(MLProbabilityBatchMixin, BaseStrategy):
     """Generate tickets using XGBoost ML model from predictor.py"""
 
+    batch_confidence = 0.85
+
     def __init__(self, max_date: str = None):
         super().__init__("xgboost_ml", max_date=max_date)
         self._predictor = None
@@ -463,6 +648,13 @@ class XGBoostMLStrategy(BaseStrategy):
 
     def _initialize_ml_predictor(self) -> bool:
         """Initialize the XGBoost predictor and pre-compute probabilities."""
+        # Vectors computed by any strategy/endpoint for this history: no Predictor needed
+        shared = _shared_probabilities('xgboost', get_all_draws())
+        if shared is not None:
+            self._cached_wb_probs, self._cached_pb_probs = shared
+            logger.info(f"{self.name}: XGBoost probabilities served from the probability cache")
+            return True
+
         try:
             from src.predictor import Predictor
             self._predictor = Predictor()
@@ -549,9 +741,11 @@ class XGBoostMLStrategy(BaseStrategy):
         return tickets
 
 
-class RandomForestMLStrategy(BaseStrategy):
+class RandomForestMLStrategy(MLProbabilityBatchMixin, BaseStrategy):
     """Generate tickets using Random Forest ML model"""
 
+    batch_confidence = 0.80
+
     def __init__(self, max_date: str = None):
         super().__init__("random_forest_ml", max_date=max_date)
         self._rf_model = None
@@ -561,15 +755,24 @@ class RandomForestMLStrategy(BaseStrategy):
 
     def _initialize_rf_model(self) -> bool:
         """Initialize the Random Forest model and pre-compute probabilities."""
+        shared = _shared_probabilities('random_forest', self.draws_df)
+        if shared is not None:
+            self._cached_wb_probs, self._cached_pb_probs = shared
+            logger.info(f"{self.name}: Random Forest probabilities served from the probability cache")
+            return True
+
         try:
             from src.ml_models.random_forest_model import RandomForestModel
+            from src.probability_service import frame_fingerprint, get_probability_service
             self._rf_model = RandomForestModel(use_pretrained=True)
 
             # Verify models are loaded
             if self._rf_model.wb_models and self._rf_model.pb_model:
-                # PRE-COMPUTE probabilities once during initialization (OPTIMIZATION)
+                # PRE-COMPUTE probabilities once per history/model version (shared cache)
                 try:
-                    self._cached_wb_probs, self._cached_pb_probs = self._rf_model.predict_probabilities(self.draws_df)
+                    self._cached_wb_probs, self._cached_pb_probs = get_probability_service().get(
+                        'random_forest', frame_fingerprint(self.draws_df), [self._rf_model.model_dir],
+                        lambda: self._rf_model.predict_probabilities(self.draws_df))
                     logger.info(f"{self.name}: Random Forest models loaded and probabilities cached")
                 except Exception as e:
                     logger.warning(f"{self.name}: Could not cache RF probabilities: {e}")
@@ -647,9 +850,11 @@ class RandomForestMLStrategy(BaseStrategy):
         return tickets
 
 
-class LSTMNeuralStrategy(BaseStrategy):
+class LSTMNeuralStrategy(MLProbabilityBatchMixin, BaseStrategy):
     """Generate tickets using LSTM neural network model"""
 
+    batch_confidence = 0.78
+
     def __init__(self, max_date: str = None):
         super().__init__("lstm_neural", max_date=max_date)
         self._lstm_model = None
@@ -659,15 +864,24 @@ class LSTMNeuralStrategy(BaseStrategy):
 
     def _initialize_lstm_model(self) -> bool:
         """Initialize the LSTM model and pre-compute probabilities."""
+        shared = _shared_probabilities('lstm', self.draws_df)
+        if shared is not None:
+            self._cached_wb_probs, self._cached_pb_probs = shared
+            logger.info(f"{self.name}: LSTM probabilities served from the probability cache")
+            return True
+
         try:
             from src.ml_models.lstm_model import LSTMModel
+            from src.probability_service import frame_fingerprint, get_probability_service
             self._lstm_model = LSTMModel(use_pretrained=True)
 
             # Verify models are loaded
             if self._lstm_model.wb_model and self._lstm_model.pb_model:
-                # PRE-COMPUTE probabilities once during initialization (OPTIMIZATION)
+                # PRE-COMPUTE probabilities once per history/model version (shared cache)
                 try:
-                    self._cached_wb_probs, self._cached_pb_probs = self._lstm_model.predict_probabilities(self.draws_df)
+                    self._cached_wb_probs, self._cached_pb_probs = get_probability_service().get(
+                        'lstm', frame_fingerprint(self.draws_df), [self._lstm_model.model_dir],
+                        lambda: self._lstm_model.predict_probabilities(self.draws_df))
                     logger.info(f"{self.name}: LSTM models loaded and probabilities cached")
                 except Exception as e:
                     logger.warning(f"{self.name}: Could not cache LSTM probabilities: {e}")
@@ -1156,6 +1370,178 @@ class CustomInteractiveGenerator(BaseStrategy):
         return self.generate_custom(params)
 
 
+# Strategies managed by StrategyManager, in registration order
+STRATEGY_CLASSES = {
+    # Original 6 strategies
+    'frequency_weighted': FrequencyWeightedStrategy,
+    'coverage_optimizer': CoverageOptimizerStrategy,
+    'cooccurrence': CooccurrenceStrategy,
+    'range_balanced': RangeBalancedStrategy,
+    'ai_guided': AIGuidedStrategy,
+    'random_baseline': RandomBaselineStrategy,
+    # New 5 ML strategies (PHASE 2)
+    'xgboost_ml': XGBoostMLStrategy,
+    'random_forest_ml': RandomForestMLStrategy,
+    'lstm_neural': LSTMNeuralStrategy,
+    'hybrid_ensemble': HybridEnsembleStrategy,
+    'intelligent_scoring': IntelligentScoringStrategy
+}
+
+
+# Strategies whose construction loads ML models (Predictor, RF/LSTM files)
+ML_STRATEGIES = frozenset({'ai_guided', 'xgboost_ml', 'random_forest_ml', 'lstm_neural', 'hybrid_ensemble'})
+
+# How long balanced generation waits for an ML strategy that is still loading
+# before handing its quota to the random baseline
+ML_LOAD_TIMEOUT_SECONDS = float(os.getenv('STRATEGY_ML_LOAD_TIMEOUT_SECONDS', '10'))
+
+_loader_executor: Optional[ThreadPoolExecutor] = None
+_loader_lock = threading.Lock()
+
+
+def _get_loader_executor() -> ThreadPoolExecutor:
+    """Shared background pool for ML strategy construction"""
+    global _loader_executor
+    with _loader_lock:
+        if _loader_executor is None:
+            _loader_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="strategy-loader")
+        return _loader_executor
+
+
+class LazyStrategies(Mapping):
+    """
+    name -> strategy mapping that constructs each strategy on first access.
+
+    Membership, iteration over names and len() never build anything. ML
+    strategies are built on a background pool (see load()) so callers can
+    wait for them with a timeout.
+    """
+
+    def __init__(self, factories: Dict[str, type], build: Callable[[str, type], BaseStrategy]):
+        self._factories = dict(factories)
+        self._build = build
+        self._built: Dict[str, BaseStrategy] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> BaseStrategy:
+        strategy = self._built.get(name)
+        if strategy is not None:
+            return strategy
+        if name not in self._factories:
+            raise KeyError(name)
+        return self.load(name).result()
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __contains__(self, name) -> bool:
+        return name in self._factories
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._built
+
+    def loaded_names(self) -> List[str]:
+        return [name for name in self._factories if name in self._built]
+
+    def _construct(self, name: str) -> BaseStrategy:
+        try:
+            strategy = self._build(name, self._factories[name])
+            self._built[name] = strategy
+            return strategy
+        finally:
+            with self._lock:
+                self._pending.pop(name, None)
+
+    def load(self, name: str, background: Optional[bool] = None) -> Future:
+        """
+        Start (or join) construction of a strategy.
+
+        Args:
+            name: Strategy name
+            background: Build on the loader pool; defaults to True for ML strategies
+
+        Returns:
+            Future resolving to the strategy (already done if it was built)
+        """
+        if background is None:
+            background = name in ML_STRATEGIES
+        with self._lock:
+            if name in self._built:
+                done = Future()
+                done.set_result(self._built[name])
+                return done
+            future = self._pending.get(name)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[name] = future
+
+        def run():
+            try:
+                future.set_result(self._construct(name))
+            except Exception as e:
+                future.set_exception(e)
+
+        if background:
+            _get_loader_executor().submit(run)
+        else:
+            run()
+        return future
+
+    def get_within(self, name: str, timeout: Optional[float]) -> Optional[BaseStrategy]:
+        """Get a strategy, waiting at most `timeout` seconds for it to load (None: still loading)."""
+        try:
+            return self.load(name).result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+
+
+def _shared_probabilities(model: str, draws_df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Vectors from the shared probability service without loading the model (None on a miss)"""
+    try:
+        from src.probability_service import frame_fingerprint, get_probability_service
+        return get_probability_service().peek(model, frame_fingerprint(draws_df))
+    except Exception as e:
+        logger.debug(f"Probability cache lookup for {model} failed: {e}")
+        return None
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None if psutil is unavailable"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+@dataclass
+class StrategyRunStats:
+    """Per-strategy outcome of one StrategyManager generation call"""
+    requested: int = 0
+    generated: int = 0
+    duplicates: int = 0
+    calls: int = 0
+    elapsed_ms: float = 0.0
+    refilled: int = 0  # Tickets generated to cover other strategies' shortfall (not in requested/generated)
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requested': self.requested,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'calls': self.calls,
+            'elapsed_ms': round(self.elapsed_ms, 2),
+            'refilled': self.refilled,
+            'errors': list(self.errors)
+        }
+
+
 class StrategyManager:
     """
     Manages all 11 strategies and selects which to use based on adaptive weights.
@@ -1172,27 +1558,33 @@ class StrategyManager:
                       Critical for preventing data leakage when generating historical predictions.
         """
         self.max_date = max_date
-        self.strategies = {
-            # Original 6 strategies
-            'frequency_weighted': FrequencyWeightedStrategy(max_date=max_date),
-            'coverage_optimizer': CoverageOptimizerStrategy(max_date=max_date),
-            'cooccurrence': CooccurrenceStrategy(max_date=max_date),
-            'range_balanced': RangeBalancedStrategy(max_date=max_date),
-            'ai_guided': AIGuidedStrategy(max_date=max_date),
-            'random_baseline': RandomBaselineStrategy(max_date=max_date),
-            # New 5 ML strategies (PHASE 2)
-            'xgboost_ml': XGBoostMLStrategy(max_date=max_date),
-            'random_forest_ml': RandomForestMLStrategy(max_date=max_date),
-            'lstm_neural': LSTMNeuralStrategy(max_date=max_date),
-            'hybrid_ensemble': HybridEnsembleStrategy(max_date=max_date),
-            'intelligent_scoring': IntelligentScoringStrategy(max_date=max_date)
-        }
+        # Strategies are constructed the first time they are selected
+        self.load_stats: Dict[str, Dict[str, Any]] = {}
+        self.strategies = LazyStrategies(STRATEGY_CLASSES, self._build_strategy)
+
+        self.last_generation_stats: Dict[str, StrategyRunStats] = {}
 
         self._initialize_strategy_weights()
         if max_date:
-            logger.info(f"StrategyManager initialized with {len(self.strategies)} strategies (data filtered to before {max_date})")
+            logger.info(f"StrategyManager initialized with {len(self.strategies)} lazy strategies (data filtered to before {max_date})")
         else:
-            logger.info(f"StrategyManager initialized with {len(self.strategies)} strategies")
+            logger.info(f"StrategyManager initialized with {len(self.strategies)} lazy strategies")
+
+    def _build_strategy(self, name: str, strategy_cls: type) -> BaseStrategy:
+        """Construct one strategy, recording its load time and approximate RSS growth"""
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        strategy = strategy_cls(max_date=self.max_date)
+        load_ms = (time.perf_counter() - start) * 1000
+        rss_after = _rss_bytes()
+
+        self.load_stats[name] = {
+            'load_ms': round(load_ms, 2),
+            'rss_delta_mb': (round((rss_after - rss_before) / (1024 * 1024), 2)
+                             if rss_before is not None and rss_after is not None else None),
+            'batch': bool(strategy.supports_batch)
+        }
+        return strategy
 
     def _initialize_strategy_weights(self):
         """Initialize strategy_performance table with equal weights (1/11 each = ~0.091)"""
@@ -1226,106 +1618,194 @@ class StrategyManager:
 
         return weights
 
-    def generate_balanced_tickets(self, total: int = 5) -> List[Dict]:
+    # Extra calls per strategy to top up tickets lost to deduplication
+    MAX_TOP_UP_ROUNDS = 4
+
+    def _generate_quota(self, strategy_name: str, count: int, seen: set, stats: Dict[str, StrategyRunStats],
+                        rng: np.random.Generator, stamp_strategy: bool = False,
+                        load_timeout: Optional[float] = None, refill: bool = False) -> List[Dict]:
+        """
+        Get up to `count` tickets from one strategy that are not already in `seen`.
+
+        The strategy is called with its whole quota (generate_batch() when it
+        supports batches, generate() otherwise); only the shortfall left by
+        duplicates is requested again, for at most MAX_TOP_UP_ROUNDS extra calls.
+
+        Args:
+            strategy_name: Key in self.strategies
+            count: Tickets wanted
+            seen: Packed keys of tickets already generated (updated in place)
+            stats: Stats per strategy name (updated in place)
+            rng: Random generator for batch sampling
+            stamp_strategy: Overwrite each ticket's 'strategy' with strategy_name
+            load_timeout: Max seconds to wait for a strategy that is still loading (None: wait)
+            refill: The tickets cover other strategies' shortfall; count them as
+                    refilled instead of requested/generated
+
+        Returns:
+            List of unique ticket dictionaries (may be short if the strategy fails or is loading)
+        """
+        run = stats.setdefault(strategy_name, StrategyRunStats())
+        if not refill:
+            run.requested += count
+        accepted = []
+        start = time.perf_counter()
+
+        try:
+            strategy = self.strategies.get_within(strategy_name, load_timeout)
+        except Exception as e:
+            logger.error(f"Strategy {strategy_name} could not be loaded: {e}")
+            strategy = None
+            run.errors.append(f"load failed: {e}")
+        else:
+            if strategy is None:
+                logger.warning(f"Strategy {strategy_name} still loading after {load_timeout}s, skipping its quota")
+                run.errors.append("still loading")
+        if strategy is None:
+            run.elapsed_ms += (time.perf_counter() - start) * 1000
+            return accepted
+
+        for _ in range(1 + self.MAX_TOP_UP_ROUNDS):
+            missing = count - len(accepted)
+            if missing <= 0:
+                break
+            run.calls += 1
+            try:
+                if strategy.supports_batch:
+                    batch = strategy.generate_batch(missing, rng)
+                    tickets = batch_to_tickets(batch, strategy.name, strategy.batch_confidence)
+                else:
+                    tickets = strategy.generate(missing)
+                    batch = tickets_to_batch(tickets)
+            except Exception as e:
+                logger.error(f"Strategy {strategy_name} failed: {e}")
+                run.errors.append(str(e))
+                break
+
+            for ticket, key in zip(tickets, pack_ticket_keys(batch).tolist()):
+                if key in seen:
+                    run.duplicates += 1
+                    continue
+                seen.add(key)
+                if stamp_strategy:
+                    ticket['strategy'] = strategy_name
+                accepted.append(ticket)
+                if len(accepted) == count:
+                    break
+
+        if refill:
+            run.refilled += len(accepted)
+        else:
+            run.generated += len(accepted)
+        run.elapsed_ms += (time.perf_counter() - start) * 1000
+        return accepted
+
+    def _log_generation_stats(self, stats: Dict[str, StrategyRunStats]) -> None:
+        """Keep the stats of the last call and surface the slowest strategies"""
+        self.last_generation_stats = stats
+        slowest = sorted(stats.items(), key=lambda item: item[1].elapsed_ms, reverse=True)[:3]
+        logger.info("StrategyManager timings (slowest): " +
+                    ", ".join(f"{name}={run.elapsed_ms:.1f}ms/{run.generated} tickets" for name, run in slowest))
+
+    def generate_balanced_tickets(self, total: int = 5, rng: Optional[np.random.Generator] = None,
+                                  return_stats: bool = False,
+                                  load_timeout: Optional[float] = ML_LOAD_TIMEOUT_SECONDS):
         """
         Generate tickets using weighted strategy selection.
 
-        Each strategy is chosen proportionally to its adaptive weight.
+        Ticket counts per strategy are drawn from a multinomial over the
+        adaptive weights and each selected strategy is called once with its
+        whole quota. Strategies are built on first selection; ML strategies
+        load in the background and are waited for at most `load_timeout`
+        seconds. Tickets are unique across strategies; any shortfall
+        (failures, models still loading, exhausted retries) is filled by the
+        random baseline and counted in its `refilled` stat, not as tickets
+        random_baseline was selected for.
         Ensures 5 different Powerballs across all tickets.
 
         Args:
             total: Number of tickets to generate (default 5)
+            rng: Optional random generator (for reproducible runs)
+            return_stats: Also return per-strategy StrategyRunStats
+            load_timeout: Max seconds to wait for a selected strategy that is
+                          still loading (default ML_LOAD_TIMEOUT_SECONDS, for
+                          interactive requests); None waits for every
+                          selected strategy (batch callers such as the pipeline)
 
         Returns:
-            List of ticket dictionaries
+            List of ticket dictionaries, or (tickets, stats) if return_stats is True.
+            The stats of the last call are also kept in self.last_generation_stats.
         """
         logger.info(f"StrategyManager.generate_balanced_tickets called with total={total}")
+        rng = rng if rng is not None else np.random.default_rng()
         weights = self.get_strategy_weights()
 
-        # Normalize weights to sum to 1.0
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            normalized = {k: v/total_weight for k, v in weights.items()}
+        # Only strategies this manager owns can be selected
+        names = list(self.strategies.keys())
+        probs = np.array([max(float(weights.get(name) or 0.0), 0.0) for name in names])
+        if probs.sum() > 0:
+            probs = probs / probs.sum()
         else:
-            # Fallback to equal weights
-            normalized = {k: 1/len(weights) for k in weights.keys()}
+            logger.error("Invalid strategy weights, using uniform selection")
+            probs = np.full(len(names), 1 / len(names))
 
-        # Select strategies proportionally
-        try:
-            selected = np.random.choice(
-                list(normalized.keys()),
-                size=total,
-                p=list(normalized.values()),
-                replace=True
-            )
-        except ValueError as e:
-            logger.error(f"Error in strategy selection: {e}, using uniform")
-            selected = np.random.choice(list(self.strategies.keys()), size=total)
-
-        # Generate one ticket per selected strategy
+        quotas = rng.multinomial(total, probs)
+
+        stats: Dict[str, StrategyRunStats] = {}
+        seen = set()
         all_tickets = []
-        for strategy_name in selected:
-            try:
-                tickets = self.strategies[strategy_name].generate(1)
-                all_tickets.extend(tickets)
-            except Exception as e:
-                logger.error(f"Strategy {strategy_name} failed: {e}")
-                # Fallback to random
-                fallback = RandomBaselineStrategy().generate(1)
-                all_tickets.extend(fallback)
+        for strategy_name, quota in zip(names, quotas.tolist()):
+            if quota:
+                all_tickets.extend(self._generate_quota(strategy_name, quota, seen, stats, rng,
+                                                        load_timeout=load_timeout))
+
+        shortfall = total - len(all_tickets)
+        if shortfall > 0:
+            missing = ", ".join(f"{name}: {run.requested - run.generated}" for name, run in stats.items()
+                                if run.generated < run.requested)
+            logger.warning(f"Filling {shortfall} missing ticket(s) with random_baseline ({missing})")
+            all_tickets.extend(self._generate_quota('random_baseline', shortfall, seen, stats, rng, refill=True))
 
         # Ensure 5 different Powerballs
         all_tickets = self._ensure_different_powerballs(all_tickets[:total])
 
+        self._log_generation_stats(stats)
         logger.info(f"StrategyManager generated {len(all_tickets)} tickets (requested: {total})")
-        return all_tickets
+        return (all_tickets, stats) if return_stats else all_tickets
 
-    def generate_tickets_per_strategy(self, count_per_strategy: int = 10) -> List[Dict]:
+    def generate_tickets_per_strategy(self, count_per_strategy: int = 10, rng: Optional[np.random.Generator] = None,
+                                      return_stats: bool = False):
         """
         Generate exactly N tickets per strategy for equal evaluation.
 
+        Each strategy is called once with count_per_strategy; duplicates of
+        tickets from any strategy are dropped and only the shortfall is
+        requested again.
+
         Args:
             count_per_strategy: Number of tickets to generate per strategy (default: 10)
+            rng: Optional random generator (for reproducible runs)
+            return_stats: Also return per-strategy StrategyRunStats
 
         Returns:
-            List of tickets with exactly count_per_strategy tickets from each strategy
+            List of tickets with exactly count_per_strategy tickets from each strategy,
+            or (tickets, stats) if return_stats is True
         """
         logger.info(f"StrategyManager.generate_tickets_per_strategy called with {count_per_strategy} per strategy")
+        rng = rng if rng is not None else np.random.default_rng()
 
+        stats: Dict[str, StrategyRunStats] = {}
+        seen = set()  # Packed keys of unique combinations
         all_tickets = []
-        generated_set = set()  # Track unique combinations
-
-        for strategy_name, strategy in self.strategies.items():
-            strategy_tickets = []
-            attempts = 0
-            max_attempts = count_per_strategy * 5  # Allow retries for duplicates
-
-            while len(strategy_tickets) < count_per_strategy and attempts < max_attempts:
-                attempts += 1
-                try:
-                    tickets = strategy.generate(1)
-                    for ticket in tickets:
-                        # Create unique key
-                        wb = tuple(sorted(ticket['white_balls']))
-                        pb = ticket['powerball']
-                        key = (wb, pb)
-
-                        if key not in generated_set:
-                            generated_set.add(key)
-                            ticket['strategy'] = strategy_name
-                            strategy_tickets.append(ticket)
-
-                            if len(strategy_tickets) >= count_per_strategy:
-                                break
-                except Exception as e:
-                    logger.warning(f"Error generating ticket for {strategy_name}: {e}")
-
+        for strategy_name in self.strategies:
+            strategy_tickets = self._generate_quota(strategy_name, count_per_strategy, seen, stats, rng,
+                                                    stamp_strategy=True)
             logger.debug(f"{strategy_name}: Generated {len(strategy_tickets)} tickets")
             all_tickets.extend(strategy_tickets)
 
-        total_expected = count_per_strategy * len(self.strategies)
+        self._log_generation_stats(stats)
         logger.info(f"StrategyManager generated {len(all_tickets)} tickets ({count_per_strategy} per strategy × {len(self.strategies)} strategies)")
-        return all_tickets
+        return (all_tickets, stats) if return_stats else all_tickets
 
     def _ensure_different_powerballs(self, tickets: List[Dict]) -> List[Dict]:
         """Modify Powerballs to ensure all are unique"""
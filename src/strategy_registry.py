@@ -0,0 +1,259 @@
+"""
+SHIOL+ Strategy Registry
+========================
+
+Process-wide, long-lived ``StrategyManager`` shared by the API endpoints,
+``UnifiedPredictionEngine`` and the pipeline.
+
+Building a manager constructs 11 strategies (draw history loads, a
+``Predictor``, Random Forest / LSTM model loading), which used to happen on
+every generation request. The registry builds it once and serves the same
+instance until its inputs change:
+
+- the draw history (draw count and latest draw date in the draw store)
+- the model files under ``SHIOL_MODELS_DIR`` (default ``models``; mtime and size)
+
+Inputs are re-checked at most every ``STRATEGY_REGISTRY_REVALIDATE_SECONDS``.
+When they changed, a new manager is built in a background thread while
+callers keep getting the current one, and the reference is then swapped
+atomically (``get(revalidate=True)`` rebuilds synchronously instead). Historical
+generation with ``max_date`` still builds its own manager.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from src import database
+from src.probability_service import list_model_files
+
+REVALIDATE_INTERVAL_SECONDS = float(os.getenv("STRATEGY_REGISTRY_REVALIDATE_SECONDS", "30"))
+MODELS_DIR = os.getenv("SHIOL_MODELS_DIR", "models")
+
+
+def models_fingerprint(models_dir: Optional[str] = None) -> str:
+    """
+    Hash the path, mtime and size of every model artifact under the models directory.
+
+    Only files listed by ``probability_service.list_model_files`` count, so
+    caches and temp files written next to the models do not trigger a rebuild.
+
+    Args:
+        models_dir: Directory to scan (default MODELS_DIR)
+
+    Returns:
+        16-character hex digest (of an empty listing if the directory does not exist)
+    """
+    models_dir = models_dir or MODELS_DIR
+    entries = []
+    for path in list_model_files(models_dir):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append(f"{os.path.relpath(path, models_dir)}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha256("\n".join(sorted(entries)).encode()).hexdigest()[:16]
+
+
+def data_fingerprint() -> Tuple[int, Optional[int]]:
+    """(draw count, latest draw day ordinal) of the current draw history."""
+    from src.draw_store import get_draw_store
+
+    snap = get_draw_store().snapshot()
+    return len(snap), (int(snap.days[-1]) if len(snap) else None)
+
+
+@dataclass(frozen=True)
+class RegistryVersion:
+    """Inputs a StrategyManager was built from"""
+    draw_count: int
+    last_draw_day: Optional[int]
+    models: str
+
+    @classmethod
+    def current(cls) -> "RegistryVersion":
+        draw_count, last_draw_day = data_fingerprint()
+        return cls(draw_count=draw_count, last_draw_day=last_draw_day, models=models_fingerprint())
+
+
+@dataclass(frozen=True)
+class RegistryEntry:
+    """An immutable (manager, version) pair; swapped as a whole on reload"""
+    manager: Any
+    version: RegistryVersion
+    generation: int
+    built_at: str
+    build_ms: float
+    reason: str
+
+
+class StrategyRegistry:
+    """
+    Holds the shared StrategyManager for a single database file.
+
+    Reads are lock-free (one attribute load); only builds are serialized.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._entry: Optional[RegistryEntry] = None
+        self._build_lock = threading.Lock()
+        self._last_validated = 0.0
+        self._generation = 0
+
+    @staticmethod
+    def _factory():
+        # Looked up on every build so a replaced/patched StrategyManager is picked up
+        from src import strategy_generators
+        return strategy_generators.StrategyManager
+
+    def _build(self, reason: str) -> RegistryEntry:
+        """Build a manager and swap it in. Caller must hold _build_lock."""
+        factory = self._factory()
+        try:
+            version = RegistryVersion.current()
+        except Exception as e:
+            logger.warning(f"Strategy registry could not read data/model versions: {e}")
+            version = RegistryVersion(draw_count=0, last_draw_day=None, models="")
+        start = time.perf_counter()
+        manager = factory()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        self._generation += 1
+        entry = RegistryEntry(
+            manager=manager,
+            version=version,
+            generation=self._generation,
+            built_at=datetime.now().isoformat(),
+            build_ms=round(build_ms, 2),
+            reason=reason,
+        )
+        self._entry = entry
+        self._last_validated = time.monotonic()
+        logger.info(f"Strategy registry built manager #{entry.generation} in {build_ms:.0f}ms ({reason})")
+        return entry
+
+    def get(self, revalidate: bool = False):
+        """
+        Get the shared StrategyManager.
+
+        Args:
+            revalidate: Check draw/model versions now instead of waiting for
+                        the revalidation interval (e.g. right after new draws)
+
+        Returns:
+            StrategyManager instance
+        """
+        entry = self._entry
+        if entry is None:
+            with self._build_lock:
+                entry = self._entry
+                if entry is None:
+                    entry = self._build("initial build")
+            return entry.manager
+
+        now = time.monotonic()
+        if not revalidate and now - self._last_validated < REVALIDATE_INTERVAL_SECONDS:
+            return entry.manager
+
+        # Another caller is already rebuilding: keep serving the current manager
+        if not self._build_lock.acquire(blocking=revalidate):
+            return entry.manager
+        release = True
+        try:
+            self._last_validated = now
+            current = self._entry
+            try:
+                version = RegistryVersion.current()
+            except Exception as e:
+                logger.warning(f"Strategy registry could not check data/model versions: {e}")
+                return current.manager
+            if version != current.version:
+                reason = f"inputs changed: {current.version} -> {version}"
+                if revalidate:
+                    current = self._build(reason)
+                else:
+                    # Rebuild in the background; the thread releases the build lock
+                    release = False
+                    threading.Thread(target=self._build_and_release, args=(reason,),
+                                     name="strategy-registry-rebuild", daemon=True).start()
+            return current.manager
+        finally:
+            if release:
+                self._build_lock.release()
+
+    def _build_and_release(self, reason: str) -> None:
+        try:
+            self._build(reason)
+        except Exception as e:
+            logger.error(f"Strategy registry rebuild failed, keeping manager #{self._generation}: {e}")
+        finally:
+            self._build_lock.release()
+
+    def reload(self, reason: str = "manual reload"):
+        """Rebuild the manager now (blocking) and return the new instance."""
+        with self._build_lock:
+            return self._build(reason).manager
+
+    def stats(self) -> Dict[str, Any]:
+        """Build info of the current manager plus per-strategy load stats."""
+        entry = self._entry
+        if entry is None:
+            return {"loaded": False, "db_path": self.db_path}
+        return {
+            "loaded": True,
+            "db_path": self.db_path,
+            "generation": entry.generation,
+            "built_at": entry.built_at,
+            "build_ms": entry.build_ms,
+            "reason": entry.reason,
+            "version": {
+                "draw_count": entry.version.draw_count,
+                "last_draw_day": entry.version.last_draw_day,
+                "models": entry.version.models,
+            },
+            # Strategies are built lazily, so only the ones used so far appear here
+            "strategies": dict(getattr(entry.manager, "load_stats", {}) or {}),
+        }
+
+
+_registries: Dict[str, StrategyRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_strategy_registry() -> StrategyRegistry:
+    """
+    Get the process-wide registry for the configured database.
+
+    Keyed by database path, like the draw store, so tests pointing
+    get_db_path() at another file never share a manager.
+    """
+    db_path = database.get_db_path()
+    with _registries_lock:
+        registry = _registries.get(db_path)
+        if registry is None:
+            registry = StrategyRegistry(db_path)
+            _registries[db_path] = registry
+        return registry
+
+
+def reset_strategy_registry() -> None:
+    """Forget every registry; the next call builds a new manager (tests, replaced StrategyManager)."""
+    with _registries_lock:
+        _registries.clear()
+
+
+def get_strategy_manager(revalidate: bool = False):
+    """Shortcut for get_strategy_registry().get()."""
+    return get_strategy_registry().get(revalidate=revalidate)
+
+
+def reload_strategy_manager(reason: str = "manual reload"):
+    """Shortcut for get_strategy_registry().reload()."""
+    return get_strategy_registry().reload(reason)
@@ -5,10 +5,11 @@ Verifies extracted ticket numbers against official draw results and calculates p
 
 from typing import Dict, List, Optional
 from loguru import logger
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import src.database as db
+from src.draw_store import get_draw_store
 from src.prize_calculator import calculate_prize_amount
+from src.prize_kernel import score_tickets
 
 
 class TicketVerifier:
@@ -31,56 +32,20 @@ class TicketVerifier:
             Draw result dictionary or None if not found
         """
         try:
-            # Get all draws from database
-            all_draws = db.get_all_draws()
-
-            if all_draws is None or all_draws.empty:
+            # Binary search over the in-memory draw store instead of scanning a DataFrame
+            store = get_draw_store()
+            if len(store) == 0:
                 logger.warning("No draws found in database")
                 return None
 
-            # Look for exact date match first
-            for _, draw in all_draws.iterrows():
-                # Handle pandas Timestamp objects properly
-                if hasattr(draw['draw_date'], 'strftime'):
-                    # It's a pandas Timestamp or datetime object
-                    draw_date_str = draw['draw_date'].strftime('%Y-%m-%d')
-                else:
-                    # It's a string, convert and extract just the date part
-                    draw_date_str = str(draw['draw_date'])
-                    if 'T' in draw_date_str:  # If it's a datetime string, extract just the date
-                        draw_date_str = draw_date_str.split('T')[0]
-
-                if draw_date_str == draw_date:
-                    logger.info(f"Found exact match for draw date: {draw_date}")
-                    return draw.to_dict()
+            exact_draw = store.find(draw_date)
+            if exact_draw:
+                logger.info(f"Found exact match for draw date: {draw_date}")
+                return exact_draw
 
             # If no exact match, try to find the closest draw date
             # (in case the date parsing was slightly off)
-            target_date = datetime.strptime(draw_date, '%Y-%m-%d')
-            closest_draw = None
-            min_diff = timedelta.max
-
-            for _, draw in all_draws.iterrows():
-                try:
-                    # Handle both pandas Timestamp and string formats
-                    if hasattr(draw['draw_date'], 'strftime'):
-                        # It's a pandas Timestamp or datetime object
-                        draw_datetime = draw['draw_date'].to_pydatetime() if hasattr(draw['draw_date'], 'to_pydatetime') else draw['draw_date']
-                    else:
-                        # It's a string, parse it
-                        draw_date_str = str(draw['draw_date'])
-                        if 'T' in draw_date_str:  # If it's a datetime string, extract just the date
-                            draw_date_str = draw_date_str.split('T')[0]
-                        draw_datetime = datetime.strptime(draw_date_str, '%Y-%m-%d')
-
-                    diff = abs(target_date - draw_datetime)
-                    if diff < min_diff and diff <= timedelta(days=3):  # Within 3 days
-                        min_diff = diff
-                        closest_draw = draw.to_dict()
-                except (ValueError, KeyError, AttributeError) as e:
-                    logger.debug(f"Error parsing date {draw['draw_date']}: {e}")
-                    continue
-
+            closest_draw = store.find(draw_date, tolerance_days=3)
             if closest_draw:
                 logger.info(f"Found closest draw for {draw_date}: {closest_draw['draw_date']}")
                 return closest_draw
@@ -107,14 +72,13 @@ class TicketVerifier:
             Verification result with matches and prize information
         """
         try:
-            # Count main number matches
-            main_matches = len(set(play_numbers) & set(official_numbers))
-
-            # Check powerball match
-            powerball_match = (powerball == official_powerball)
-
-            # Determine prize tier and amount
-            prize_amount, prize_description = calculate_prize_amount(main_matches, powerball_match)
+            # Count matches and determine prize tier and amount with the shared kernel
+            scores = score_tickets([play_numbers], [powerball], official_numbers,
+                                   official_powerball, calculate_prize_amount)
+            main_matches = int(scores.main_matches[0])
+            powerball_match = bool(scores.powerball_match[0])
+            prize_amount = float(scores.prize_amount[0])
+            prize_description = scores.descriptions()[0]
             prize_info = {
                 'amount': prize_amount,
                 'tier': prize_description
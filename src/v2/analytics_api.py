@@ -12,19 +12,20 @@ Provides comprehensive analytics for PredictLottoPro integration:
 - Strategy performance metrics
 
 Performance Optimization:
-- In-memory cache with 5-minute TTL (data only changes 3x/week)
-- Reduces response time from ~9s to <10ms for cached requests
+- Served from the persisted analytics snapshot (src/analytics_snapshot.py),
+  computed once per new draw (data only changes 3x/week)
 """
 
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from loguru import logger
 import numpy as np
 
 from src.database import get_all_draws, get_db_connection
+from src.http_cache import conditional_response
 from .statistical_core import (
     TemporalDecayModel,
     MomentumAnalyzer,
@@ -34,40 +35,27 @@ from .statistical_core import (
 
 
 # =============================================================================
-# CACHE CONFIGURATION
+# CACHE
 # =============================================================================
-# Cache for analytics overview - data only changes after draws (Mon/Wed/Sat)
-# 5-minute TTL is sufficient since draws happen 3x per week
-
-_analytics_cache: Optional[Dict[str, Any]] = None
-_cache_timestamp: Optional[float] = None
-CACHE_TTL_SECONDS = 300  # 5 minutes
+# The overview is one section of the analytics snapshot (src/analytics_snapshot.py),
+# computed once per draw history version and persisted, instead of a 5-minute TTL cache.
 
 
 def _is_cache_valid() -> bool:
-    """Check if cache exists and is not expired"""
-    if _analytics_cache is None or _cache_timestamp is None:
-        return False
-    age = time.time() - _cache_timestamp
-    return age < CACHE_TTL_SECONDS
-
+    """Check if the snapshot of the current draw history is already in memory"""
+    from src.analytics_snapshot import get_snapshot_store
 
-def _get_cache_age() -> float:
-    """Get cache age in seconds"""
-    if _cache_timestamp is None:
-        return 0.0
-    return time.time() - _cache_timestamp
+    return get_snapshot_store().peek() is not None
 
 
 def invalidate_analytics_cache() -> None:
     """
-    Invalidate the analytics cache.
-    Call this after new draw data is loaded or after pipeline runs.
+    Invalidate the analytics snapshot.
+    New draws are picked up automatically; use this after manual data edits.
     """
-    global _analytics_cache, _cache_timestamp
-    _analytics_cache = None
-    _cache_timestamp = None
-    logger.info("Analytics cache invalidated")
+    from src.analytics_snapshot import invalidate_analytics_snapshot
+
+    invalidate_analytics_snapshot()
 
 
 # Pydantic models for response
@@ -125,13 +113,83 @@ class AnalyticsOverview(BaseModel):
 analytics_router = APIRouter(prefix="/api/v3/analytics", tags=["Analytics v3"])
 
 
+def compute_analytics_overview() -> Optional[Dict[str, Any]]:
+    """
+    Compute the analytics overview from the full draw history.
+
+    Used by the analytics snapshot builder; the endpoint serves the stored result.
+
+    Returns:
+        AnalyticsOverview fields (without cache metadata) as a JSON-ready dict,
+        or None if there are no draws
+    """
+    start_time = time.time()
+
+    # Load historical draws
+    draws_df = get_all_draws()
+
+    if draws_df.empty:
+        return None
+
+    logger.info(f"Generating analytics for {len(draws_df)} draws")
+
+    # Initialize analytical components
+    temporal_model = TemporalDecayModel(decay_factor=0.05)
+    momentum_analyzer = MomentumAnalyzer(short_window=10, long_window=50)
+    gap_analyzer = GapAnalyzer()
+    pattern_engine = PatternEngine()
+
+    # Perform analyses
+    weights = temporal_model.calculate_weights(draws_df)
+    momentum = momentum_analyzer.analyze(draws_df)
+    gaps = gap_analyzer.analyze(draws_df)
+    patterns = pattern_engine.analyze(draws_df)
+
+    # Build hot/cold analysis
+    hot_cold = _build_hot_cold_analysis(weights)
+
+    # Build momentum report
+    momentum_report = _build_momentum_report(momentum)
+
+    # Build gap report
+    gap_report = _build_gap_report(gaps)
+
+    # Build pattern stats
+    pattern_stats = _build_pattern_stats(patterns)
+
+    # Get top co-occurrences
+    cooccurrences = _get_top_cooccurrences(limit=10)
+
+    # Generate summary commentary
+    commentary = _generate_summary_commentary(
+        len(draws_df),
+        hot_cold,
+        momentum_report,
+        gap_report
+    )
+
+    overview = AnalyticsOverview(
+        hot_cold=hot_cold,
+        momentum=momentum_report,
+        gaps=gap_report,
+        patterns=pattern_stats,
+        top_cooccurrences=cooccurrences,
+        summary_commentary=commentary,
+        total_draws=len(draws_df),
+        last_updated=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+    logger.info(f"Analytics overview calculated in {(time.time() - start_time) * 1000:.0f}ms")
+    return overview.model_dump(exclude={"from_cache", "cache_age_seconds", "calculation_time_ms"})
+
+
 @analytics_router.get(
     "/overview",
     response_model=AnalyticsOverview,
     summary="Get comprehensive lottery analytics",
-    description="Returns multi-dimensional analytics including hot/cold analysis, momentum, gaps, patterns, and visualizations. Results are cached for 5 minutes."
+    description="Returns multi-dimensional analytics including hot/cold analysis, momentum, gaps, patterns, and visualizations. Results are computed once per new draw and persisted."
 )
-async def get_analytics_overview() -> AnalyticsOverview:
+async def get_analytics_overview(request: Request = None, response: Response = None) -> AnalyticsOverview:
     """
     Get comprehensive analytics overview for PredictLottoPro.
 
@@ -145,104 +203,47 @@ async def get_analytics_overview() -> AnalyticsOverview:
     - Summary commentary
 
     Performance:
-    - Results cached for 5 minutes (data only changes 3x/week after draws)
-    - First request: ~1-2 seconds (full calculation)
-    - Cached requests: <10ms
+    - Served from the analytics snapshot of the current draw history
+      (memory, then the analytics_snapshots table)
+    - Only the first request after a new draw computes it (~10-20ms), in a
+      worker thread; concurrent requests share that computation and, once a
+      previous snapshot exists, are answered from it meanwhile
+    - ETag / Last-Modified follow the snapshot; If-None-Match answers 304
     """
-    global _analytics_cache, _cache_timestamp
+    from src.analytics_snapshot import get_analytics_snapshot_async
 
-    # Check if we have valid cached data
-    if _is_cache_valid():
-        cache_age = _get_cache_age()
-        logger.debug(f"Returning cached analytics (age: {cache_age:.1f}s)")
-
-        # Return cached response with updated cache metadata
-        cached = _analytics_cache.copy()
-        cached["from_cache"] = True
-        cached["cache_age_seconds"] = round(cache_age, 1)
-        cached["calculation_time_ms"] = None
-
-        return AnalyticsOverview(**cached)
-
-    # Calculate fresh analytics
-    logger.info("Cache miss - calculating fresh analytics")
-    start_time = time.time()
+    requested_at = time.time()
 
     try:
-        # Load historical draws (limit to recent for performance)
-        draws_df = get_all_draws()
+        snapshot = await get_analytics_snapshot_async()
+        overview = snapshot.sections["overview_v3"]
 
-        if draws_df.empty:
+        if overview is None:
             raise HTTPException(
                 status_code=503,
                 detail="No historical data available for analytics"
             )
 
-        logger.info(f"Generating analytics for {len(draws_df)} draws")
-
-        # Initialize analytical components
-        temporal_model = TemporalDecayModel(decay_factor=0.05)
-        momentum_analyzer = MomentumAnalyzer(short_window=10, long_window=50)
-        gap_analyzer = GapAnalyzer()
-        pattern_engine = PatternEngine()
-
-        # Perform analyses
-        weights = temporal_model.calculate_weights(draws_df)
-        momentum = momentum_analyzer.analyze(draws_df)
-        gaps = gap_analyzer.analyze(draws_df)
-        patterns = pattern_engine.analyze(draws_df)
-
-        # Build hot/cold analysis
-        hot_cold = _build_hot_cold_analysis(weights)
-
-        # Build momentum report
-        momentum_report = _build_momentum_report(momentum)
-
-        # Build gap report
-        gap_report = _build_gap_report(gaps)
-
-        # Build pattern stats
-        pattern_stats = _build_pattern_stats(patterns)
-
-        # Get top co-occurrences
-        cooccurrences = _get_top_cooccurrences(limit=10)
-
-        # Generate summary commentary
-        commentary = _generate_summary_commentary(
-            len(draws_df),
-            hot_cold,
-            momentum_report,
-            gap_report
+        # The pipeline rebuilds the snapshot for the same draws after refreshing
+        # co-occurrences, so the build time is part of the version
+        not_modified = conditional_response(
+            request, response,
+            version_tag=f"{snapshot.latest_draw_date}.{snapshot.draw_count}@{snapshot.created_at}",
+            last_modified=snapshot.created_at
+        )
+        if not_modified is not None:
+            return not_modified
+
+        from_cache = snapshot.created_at < requested_at
+        if from_cache:
+            logger.debug(f"Returning analytics snapshot (age: {snapshot.age_seconds():.1f}s)")
+
+        return AnalyticsOverview(
+            **overview,
+            from_cache=from_cache,
+            cache_age_seconds=round(snapshot.age_seconds(), 1),
+            calculation_time_ms=None if from_cache else snapshot.build_ms
         )
-
-        # Get current timestamp
-        last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Calculate elapsed time
-        calculation_time_ms = (time.time() - start_time) * 1000
-
-        # Build response data (for caching)
-        response_data = {
-            "hot_cold": hot_cold,
-            "momentum": momentum_report,
-            "gaps": gap_report,
-            "patterns": pattern_stats,
-            "top_cooccurrences": cooccurrences,
-            "summary_commentary": commentary,
-            "total_draws": len(draws_df),
-            "last_updated": last_updated,
-            "from_cache": False,
-            "cache_age_seconds": 0.0,
-            "calculation_time_ms": round(calculation_time_ms, 2)
-        }
-
-        # Update cache
-        _analytics_cache = response_data.copy()
-        _cache_timestamp = time.time()
-
-        logger.info(f"Analytics calculated and cached in {calculation_time_ms:.0f}ms")
-
-        return AnalyticsOverview(**response_data)
 
     except HTTPException:
         raise
@@ -257,7 +258,7 @@ async def get_analytics_overview() -> AnalyticsOverview:
 @analytics_router.post(
     "/cache/invalidate",
     summary="Invalidate analytics cache",
-    description="Force refresh of analytics data on next request. Use after loading new draw data."
+    description="Force refresh of analytics data on next request. New draws are picked up automatically; use after editing the database by hand."
 )
 async def invalidate_cache():
     """Manually invalidate the analytics cache"""
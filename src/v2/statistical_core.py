@@ -10,6 +10,10 @@ Components:
 - MomentumAnalyzer: Trend detection (rising/falling numbers)
 - GapAnalyzer: Drought theory with return probability
 - PatternEngine: Conformity analysis (odd/even, ranges, sum, clustering)
+
+All analyzers work on the (N, 5) white ball matrix and the Powerball vector
+of the draws DataFrame; counts and weights are np.bincount calls, never a
+per-row loop.
 """
 
 import numpy as np
@@ -19,6 +23,32 @@ from dataclasses import dataclass
 from loguru import logger
 from datetime import datetime, timedelta
 
+from src.frequency_index import last_seen_rows, number_counts
+
+WHITE_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5']
+
+
+def _white_balls(draws_df: pd.DataFrame) -> np.ndarray:
+    """White balls as an (N, 5) float array (NaN compares False like the old scalar checks)."""
+    return draws_df[WHITE_COLUMNS].to_numpy(dtype=np.float64)
+
+
+def _current_era_powerballs(draws_df: pd.DataFrame) -> np.ndarray:
+    """Powerballs of current-era draws (1-26), in draw order."""
+    pb = draws_df['pb'].to_numpy(dtype=np.float64)
+    return pb[(pb >= 1) & (pb <= 26)]
+
+
+def _last_seen_gaps(numbers: np.ndarray, max_num: int) -> np.ndarray:
+    """
+    Draws since each number's last appearance (0 = in the most recent draw).
+
+    Numbers never drawn get len(numbers).
+    """
+    n_draws = len(numbers)
+    last_seen = last_seen_rows(numbers, max_num)
+    return np.where(last_seen >= 0, n_draws - 1 - last_seen, n_draws)
+
 
 @dataclass
 class TemporalWeights:
@@ -104,11 +134,7 @@ class TemporalDecayModel:
         recent = draws_df.tail(50)
         
         # Calculate variance in number frequencies
-        all_numbers = []
-        for _, draw in recent.iterrows():
-            all_numbers.extend([draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']])
-        
-        variance = np.var(all_numbers)
+        variance = np.var(_white_balls(recent).ravel())
         
         # Map variance to window size (50-200 draws)
         # High variance (>400) → 50 draws
@@ -125,20 +151,7 @@ class TemporalDecayModel:
     
     def _calculate_white_ball_weights(self, draws_df: pd.DataFrame) -> np.ndarray:
         """Calculate exponentially decayed weights for white balls (1-69)"""
-        weights = np.zeros(69)
-        n_draws = len(draws_df)
-        
-        for idx, (_, draw) in enumerate(draws_df.iterrows()):
-            # Time distance from most recent draw (0 = most recent)
-            time_distance = n_draws - idx - 1
-            
-            # Exponential decay weight
-            decay_weight = np.exp(-self.decay_factor * time_distance)
-            
-            # Add weight to each number in this draw
-            for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-                if 1 <= num <= 69:
-                    weights[num - 1] += decay_weight
+        weights = number_counts(_white_balls(draws_df), 69, self._decay(len(draws_df)))
         
         # Normalize to probabilities
         total = weights.sum()
@@ -151,24 +164,14 @@ class TemporalDecayModel:
     
     def _calculate_powerball_weights(self, draws_df: pd.DataFrame) -> np.ndarray:
         """Calculate exponentially decayed weights for powerball (1-26, current era only)"""
-        weights = np.zeros(26)
-        
         # Filter to current era (pb between 1-26)
-        current_era = draws_df[(draws_df['pb'] >= 1) & (draws_df['pb'] <= 26)]
+        current_era = _current_era_powerballs(draws_df)
         
-        if current_era.empty:
+        if len(current_era) == 0:
             logger.warning("No current-era draws for PB weights, using uniform")
             return np.ones(26) / 26
         
-        n_draws = len(current_era)
-        
-        for idx, (_, draw) in enumerate(current_era.iterrows()):
-            time_distance = n_draws - idx - 1
-            decay_weight = np.exp(-self.decay_factor * time_distance)
-            
-            pb = int(draw['pb'])
-            if 1 <= pb <= 26:
-                weights[pb - 1] += decay_weight
+        weights = number_counts(current_era, 26, self._decay(len(current_era)))
         
         # Normalize
         total = weights.sum()
@@ -178,6 +181,11 @@ class TemporalDecayModel:
             weights = np.ones(26) / 26
         
         return weights
+    
+    def _decay(self, n_draws: int) -> np.ndarray:
+        """Decay weight per draw, oldest first (the most recent draw weighs 1.0)"""
+        time_distance = n_draws - 1 - np.arange(n_draws)
+        return np.exp(-self.decay_factor * time_distance)
 
 
 @dataclass
@@ -261,66 +269,39 @@ class MomentumAnalyzer:
         long_freq = self._calculate_frequency(draws_df.tail(self.long_window), 69)
         
         # Momentum = (short - long) / long (percentage change)
-        # Avoid division by zero
-        momentum = np.zeros(69)
-        for i in range(69):
-            if long_freq[i] > 0:
-                momentum[i] = (short_freq[i] - long_freq[i]) / long_freq[i]
-            elif short_freq[i] > 0:
-                momentum[i] = 1.0  # Appeared recently but not historically
-        
-        return momentum
+        return self._momentum(short_freq, long_freq)
     
     def _calculate_powerball_momentum(self, draws_df: pd.DataFrame) -> np.ndarray:
         """Calculate momentum scores for powerball (1-26, current era)"""
         # Filter to current era
-        current_era = draws_df[(draws_df['pb'] >= 1) & (draws_df['pb'] <= 26)]
+        current_era = _current_era_powerballs(draws_df)
         
         if len(current_era) < self.long_window:
             return np.zeros(26)
         
-        short_freq = self._calculate_pb_frequency(current_era.tail(self.short_window))
-        long_freq = self._calculate_pb_frequency(current_era.tail(self.long_window))
-        
-        momentum = np.zeros(26)
-        for i in range(26):
-            if long_freq[i] > 0:
-                momentum[i] = (short_freq[i] - long_freq[i]) / long_freq[i]
-            elif short_freq[i] > 0:
-                momentum[i] = 1.0
-        
+        n_draws = len(current_era)
+        short_freq = self._normalize(number_counts(current_era[n_draws - self.short_window:], 26))
+        long_freq = self._normalize(number_counts(current_era[n_draws - self.long_window:], 26))
+        
+        return self._momentum(short_freq, long_freq)
+    
+    @staticmethod
+    def _momentum(short_freq: np.ndarray, long_freq: np.ndarray) -> np.ndarray:
+        """(short - long) / long; 1.0 for numbers seen recently but not in the baseline"""
+        momentum = np.zeros(len(long_freq))
+        seen = long_freq > 0
+        momentum[seen] = (short_freq[seen] - long_freq[seen]) / long_freq[seen]
+        momentum[~seen & (short_freq > 0)] = 1.0  # Appeared recently but not historically
         return momentum
     
-    def _calculate_frequency(self, draws_df: pd.DataFrame, max_num: int) -> np.ndarray:
-        """Calculate normalized frequency for white balls"""
-        freq = np.zeros(max_num)
-        
-        for _, draw in draws_df.iterrows():
-            for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-                if 1 <= num <= max_num:
-                    freq[num - 1] += 1
-        
-        # Normalize to [0, 1]
+    @staticmethod
+    def _normalize(freq: np.ndarray) -> np.ndarray:
         total = freq.sum()
-        if total > 0:
-            freq = freq / total
-        
-        return freq
+        return freq / total if total > 0 else freq
     
-    def _calculate_pb_frequency(self, draws_df: pd.DataFrame) -> np.ndarray:
-        """Calculate normalized frequency for powerball"""
-        freq = np.zeros(26)
-        
-        for _, draw in draws_df.iterrows():
-            pb = int(draw['pb'])
-            if 1 <= pb <= 26:
-                freq[pb - 1] += 1
-        
-        total = freq.sum()
-        if total > 0:
-            freq = freq / total
-        
-        return freq
+    def _calculate_frequency(self, draws_df: pd.DataFrame, max_num: int) -> np.ndarray:
+        """Calculate normalized frequency for white balls"""
+        return self._normalize(number_counts(_white_balls(draws_df), max_num))
     
     def _get_top_momentum_numbers(self, momentum: np.ndarray, top_n: int, direction: str) -> List[int]:
         """Get numbers with highest momentum (hot) or lowest momentum (cold)"""
@@ -404,34 +385,16 @@ class GapAnalyzer:
     
     def _calculate_white_ball_gaps(self, draws_df: pd.DataFrame) -> np.ndarray:
         """Calculate gaps (draws since last appearance) for white balls"""
-        gaps = np.full(69, len(draws_df))  # Initialize with max gap
-        
-        # Iterate from most recent to oldest
-        for idx, (_, draw) in enumerate(reversed(list(draws_df.iterrows()))):
-            for num in [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]:
-                if 1 <= num <= 69:
-                    # If not yet recorded, record this gap
-                    if gaps[num - 1] == len(draws_df):
-                        gaps[num - 1] = idx
-        
-        return gaps
+        return _last_seen_gaps(_white_balls(draws_df), 69)
     
     def _calculate_powerball_gaps(self, draws_df: pd.DataFrame) -> np.ndarray:
         """Calculate gaps for powerball (current era only)"""
-        current_era = draws_df[(draws_df['pb'] >= 1) & (draws_df['pb'] <= 26)]
+        current_era = _current_era_powerballs(draws_df)
         
-        if current_era.empty:
+        if len(current_era) == 0:
             return np.zeros(26)
         
-        gaps = np.full(26, len(current_era))
-        
-        for idx, (_, draw) in enumerate(reversed(list(current_era.iterrows()))):
-            pb = int(draw['pb'])
-            if 1 <= pb <= 26:
-                if gaps[pb - 1] == len(current_era):
-                    gaps[pb - 1] = idx
-        
-        return gaps
+        return _last_seen_gaps(current_era, 26)
     
     def _calculate_return_probabilities(self, gaps: np.ndarray, expected_freq: float) -> np.ndarray:
         """
@@ -502,11 +465,12 @@ class PatternEngine:
             logger.warning("No draws for pattern analysis")
             return self._empty_analysis()
         
-        # Analyze each pattern dimension
-        odd_even = self._analyze_odd_even(draws_df)
-        high_low = self._analyze_high_low(draws_df)
-        sum_stats = self._analyze_sum_range(draws_df)
-        tens = self._analyze_tens_clustering(draws_df)
+        # Analyze each pattern dimension on one shared (N, 5) matrix
+        white_balls = _white_balls(draws_df)
+        odd_even = self._analyze_odd_even(white_balls)
+        high_low = self._analyze_high_low(white_balls)
+        sum_stats = self._analyze_sum_range(white_balls)
+        tens = self._analyze_tens_clustering(white_balls)
         templates = self._extract_typical_patterns(draws_df)
         
         analysis = PatternAnalysis(
@@ -534,14 +498,10 @@ class PatternEngine:
             typical_patterns=[]
         )
     
-    def _analyze_odd_even(self, draws_df: pd.DataFrame) -> Dict[str, float]:
+    def _analyze_odd_even(self, white_balls: np.ndarray) -> Dict[str, float]:
         """Analyze odd/even distribution (0-5 odds per draw)"""
-        distribution = {str(i): 0 for i in range(6)}
-        
-        for _, draw in draws_df.iterrows():
-            numbers = [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]
-            odd_count = sum(1 for n in numbers if n % 2 == 1)
-            distribution[str(odd_count)] += 1
+        odd_counts = (white_balls % 2 == 1).sum(axis=1)
+        distribution = {str(i): count for i, count in enumerate(np.bincount(odd_counts, minlength=6).tolist())}
         
         # Normalize
         total = sum(distribution.values())
@@ -550,21 +510,12 @@ class PatternEngine:
         
         return distribution
     
-    def _analyze_high_low(self, draws_df: pd.DataFrame) -> Dict[str, float]:
+    def _analyze_high_low(self, white_balls: np.ndarray) -> Dict[str, float]:
         """Analyze low (1-23), mid (24-46), high (47-69) distribution"""
-        counts = {'low': 0, 'mid': 0, 'high': 0}
-        total_numbers = 0
-        
-        for _, draw in draws_df.iterrows():
-            numbers = [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]
-            for n in numbers:
-                if n <= 23:
-                    counts['low'] += 1
-                elif n <= 46:
-                    counts['mid'] += 1
-                else:
-                    counts['high'] += 1
-                total_numbers += 1
+        low = int((white_balls <= 23).sum())
+        mid = int(((white_balls > 23) & (white_balls <= 46)).sum())
+        total_numbers = white_balls.size
+        counts = {'low': low, 'mid': mid, 'high': total_numbers - low - mid}
         
         # Normalize
         if total_numbers > 0:
@@ -572,32 +523,21 @@ class PatternEngine:
         
         return counts
     
-    def _analyze_sum_range(self, draws_df: pd.DataFrame) -> Tuple[float, float]:
+    def _analyze_sum_range(self, white_balls: np.ndarray) -> Tuple[float, float]:
         """Analyze sum of 5 white balls (mean, std)"""
-        sums = []
-        
-        for _, draw in draws_df.iterrows():
-            total = draw['n1'] + draw['n2'] + draw['n3'] + draw['n4'] + draw['n5']
-            sums.append(total)
-        
-        if sums:
-            return (float(np.mean(sums)), float(np.std(sums)))
-        else:
+        if len(white_balls) == 0:
             return (175.0, 40.0)  # Default values
+        
+        sums = white_balls.sum(axis=1)
+        return (float(np.mean(sums)), float(np.std(sums)))
     
-    def _analyze_tens_clustering(self, draws_df: pd.DataFrame) -> Dict[str, float]:
+    def _analyze_tens_clustering(self, white_balls: np.ndarray) -> Dict[str, float]:
         """Analyze distribution across tens decades (0-9, 10-19, ..., 60-69)"""
-        decades = {f'{i*10}-{i*10+9}': 0 for i in range(7)}
-        total_numbers = 0
-        
-        for _, draw in draws_df.iterrows():
-            numbers = [draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']]
-            for n in numbers:
-                decade = (n - 1) // 10  # 0-6
-                key = f'{decade*10}-{decade*10+9}'
-                if key in decades:
-                    decades[key] += 1
-                total_numbers += 1
+        decade = (white_balls - 1) // 10  # 0-6
+        valid = (decade >= 0) & (decade <= 6)
+        histogram = np.bincount(decade[valid].astype(np.intp), minlength=7)
+        decades = {f'{i*10}-{i*10+9}': int(histogram[i]) for i in range(7)}
+        total_numbers = white_balls.size
         
         # Normalize
         if total_numbers > 0:
@@ -607,26 +547,20 @@ class PatternEngine:
     
     def _extract_typical_patterns(self, draws_df: pd.DataFrame) -> List[Dict]:
         """Extract common pattern templates from historical draws"""
-        templates = []
-        
         # Sample up to 10 representative draws
         sample_size = min(10, len(draws_df))
         samples = draws_df.sample(n=sample_size) if len(draws_df) > 0 else draws_df
-        
-        for _, draw in samples.iterrows():
-            numbers = sorted([draw['n1'], draw['n2'], draw['n3'], draw['n4'], draw['n5']])
-            odd_count = sum(1 for n in numbers if n % 2 == 1)
-            total_sum = sum(numbers)
-            spread = numbers[-1] - numbers[0]
-            
-            templates.append({
-                'numbers': numbers,
-                'odd_count': odd_count,
-                'sum': total_sum,
-                'spread': spread
-            })
-        
-        return templates
+        numbers = np.sort(samples[WHITE_COLUMNS].to_numpy(), axis=1)
+        
+        return [
+            {
+                'numbers': row.tolist(),
+                'odd_count': int((row % 2 == 1).sum()),
+                'sum': row.sum().item(),
+                'spread': (row[-1] - row[0]).item()
+            }
+            for row in numbers
+        ]
     
     def score_pattern_conformity(self, white_balls: List[int]) -> float:
         """
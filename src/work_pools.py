@@ -0,0 +1,190 @@
+"""
+SHIOL+ Work Pools
+=================
+
+Bounded worker pools for blocking work called from ``async def`` endpoints.
+
+Most handlers are ``async def`` but run synchronous SQLite queries, pandas /
+numpy analytics and ticket generation directly on the event loop, so one
+slow request stalls every other client, health checks included. Endpoints
+hand that work to a named pool instead:
+
+- io: SQLite queries and other blocking I/O (sqlite3 releases the GIL)
+- cpu: analytics, scoring and ticket generation; deliberately small so a
+  burst of heavy requests queues here instead of exhausting the io pool
+
+Each endpoint is assigned to a pool in ``ENDPOINT_POOLS`` (overridable with
+``WORK_POOL_ENDPOINTS="recent_draws=cpu,system_stats=io"``); pool sizes come
+from ``WORK_POOL_IO_SIZE`` / ``WORK_POOL_CPU_SIZE``. Every pool counts
+submitted, completed and failed jobs, the current queue depth and active
+workers, and cumulative queue wait and run time (``get_work_pool_stats()``,
+reported by ``/system/stats``).
+
+These are thread pools: the draw store, frequency index, analytics
+snapshot and loaded models are per-process state that a process pool
+would have to rebuild for every worker.
+
+Usage:
+    result = await offload("recent_draws", load_recent_draws, limit)
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+POOL_SIZES: Dict[str, int] = {
+    "io": int(os.getenv("WORK_POOL_IO_SIZE", "8")),
+    "cpu": int(os.getenv("WORK_POOL_CPU_SIZE", "2")),
+}
+
+DEFAULT_POOL = "io"
+
+ENDPOINT_POOLS: Dict[str, str] = {
+    "analytics_snapshot": "cpu",
+    "analyze_ticket": "cpu",
+    "generate_multi_strategy": "cpu",
+    "pipeline": "cpu",  # Only with PIPELINE_WORKER=0 (src/pipeline_worker.py)
+    "recent_draws": "io",
+    "system_stats": "io",
+}
+
+
+def _parse_assignments(value: str) -> Dict[str, str]:
+    assignments = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        endpoint, _, pool = item.partition("=")
+        if pool.strip() not in POOL_SIZES:
+            logger.warning(f"Ignoring work pool assignment '{item}': unknown pool")
+            continue
+        assignments[endpoint.strip()] = pool.strip()
+    return assignments
+
+
+ENDPOINT_POOLS.update(_parse_assignments(os.getenv("WORK_POOL_ENDPOINTS", "")))
+
+
+class WorkPool:
+    """Thread pool with queue-depth and latency counters."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"work-{name}")
+        self._lock = threading.Lock()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "queued": 0,
+            "active": 0,
+            "max_queued": 0,
+            "wait_ms_total": 0.0,
+            "run_ms_total": 0.0,
+        }
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Run fn(*args, **kwargs) on the pool, in a copy of the caller's context.
+
+        Returns:
+            concurrent.futures.Future of the result
+        """
+        context = contextvars.copy_context()
+        queued_at = time.perf_counter()
+        started = False
+
+        def job():
+            nonlocal started
+            started_at = time.perf_counter()
+            with self._lock:
+                started = True
+                self.stats["queued"] -= 1
+                self.stats["active"] += 1
+                self.stats["wait_ms_total"] += (started_at - queued_at) * 1000
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self.stats["active"] -= 1
+                    self.stats["run_ms_total"] += (time.perf_counter() - started_at) * 1000
+
+        def done(future: Future) -> None:
+            with self._lock:
+                if not started:
+                    # Cancelled while still queued
+                    self.stats["queued"] -= 1
+                outcome = "failed" if future.cancelled() or future.exception() is not None else "completed"
+                self.stats[outcome] += 1
+
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["queued"] += 1
+            self.stats["max_queued"] = max(self.stats["max_queued"], self.stats["queued"])
+        future = self._executor.submit(job)
+        future.add_done_callback(done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Await fn(*args, **kwargs) on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        finished = stats["completed"] + stats["failed"]
+        stats["wait_ms_total"] = round(stats["wait_ms_total"], 1)
+        stats["run_ms_total"] = round(stats["run_ms_total"], 1)
+        stats["avg_wait_ms"] = round(stats["wait_ms_total"] / finished, 2) if finished else 0.0
+        stats["max_workers"] = self.max_workers
+        return stats
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[str, WorkPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_work_pool(name: str) -> WorkPool:
+    """Get (or lazily create) a named pool; unknown names fall back to the io pool."""
+    if name not in POOL_SIZES:
+        name = DEFAULT_POOL
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = WorkPool(name, POOL_SIZES[name])
+            _pools[name] = pool
+        return pool
+
+
+def pool_for(endpoint: str) -> WorkPool:
+    """Pool assigned to an endpoint (ENDPOINT_POOLS, default io)."""
+    return get_work_pool(ENDPOINT_POOLS.get(endpoint, DEFAULT_POOL))
+
+
+async def offload(endpoint: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run an endpoint's blocking work on its assigned pool and await the result."""
+    return await pool_for(endpoint).run(fn, *args, **kwargs)
+
+
+def get_work_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-pool counters, keyed by pool name."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.snapshot_stats() for pool in pools}
+
+
+def shutdown_work_pools() -> None:
+    """Cancel queued jobs and stop accepting work (call on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
@@ -249,6 +249,33 @@ def test_db_file():
     return TEST_DB_PATH
 
 
+@pytest.fixture
+def draws_db(tmp_path, monkeypatch):
+    """Isolated database with an empty powerball_draws table; returns its path"""
+    import src.database as db
+    from tests.helpers import DRAWS_TABLE_SQL
+
+    path = str(tmp_path / "draws.db")
+    conn = sqlite3.connect(path)
+    conn.execute(DRAWS_TABLE_SQL)
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    return path
+
+
+@pytest.fixture
+def tickets_db(draws_db):
+    """draws_db plus an empty generated_tickets table"""
+    from tests.helpers import TICKETS_TABLE_SQL
+
+    conn = sqlite3.connect(draws_db)
+    conn.execute(TICKETS_TABLE_SQL)
+    conn.commit()
+    conn.close()
+    return draws_db
+
+
 @pytest.fixture(autouse=True)
 def patch_db_path(test_db_file, monkeypatch):
     # Force the application to use the on-disk test database
@@ -0,0 +1,70 @@
+"""
+Shared test data: synthetic draw histories and isolated draw databases.
+
+Import as ``from tests.helpers import ...`` (conftest puts the repository
+root on sys.path).
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+WHITE_COLUMNS = ["n1", "n2", "n3", "n4", "n5"]
+DRAW_COLUMNS = ["draw_date", "n1", "n2", "n3", "n4", "n5", "pb"]
+
+# Bare table, as in a database written by an external process
+DRAWS_TABLE_SQL = (
+    "CREATE TABLE powerball_draws (draw_date TEXT PRIMARY KEY, n1 INTEGER, n2 INTEGER,"
+    " n3 INTEGER, n4 INTEGER, n5 INTEGER, pb INTEGER)"
+)
+
+# generated_tickets columns read by the ticket endpoints and the data version digest
+TICKETS_TABLE_SQL = (
+    "CREATE TABLE generated_tickets (id INTEGER PRIMARY KEY AUTOINCREMENT, draw_date TEXT,"
+    " strategy_used TEXT, n1 INTEGER, n2 INTEGER, n3 INTEGER, n4 INTEGER, n5 INTEGER,"
+    " powerball INTEGER, confidence_score REAL, was_played INTEGER DEFAULT 0,"
+    " evaluated INTEGER DEFAULT 0, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+)
+
+
+def make_draws(n: int, seed: int = 0, start: str = "2020-01-01", freq: str = "3D", max_pb: int = 26,
+               legacy_pb: int = 0, text_dates: bool = True, intraday: bool = False) -> pd.DataFrame:
+    """
+    Random draw history: five distinct white balls (ascending) and a Powerball per draw.
+
+    Args:
+        n: Number of draws
+        seed: Generator seed
+        start: First draw date
+        freq: Spacing of the draw dates
+        max_pb: Highest Powerball (above 26 mixes in 2009-2015 era values)
+        legacy_pb: Give the first legacy_pb draws 2009-2015 era Powerballs (27-35)
+        text_dates: 'YYYY-MM-DD' strings as stored in SQLite, else Timestamps
+        intraday: Add a random time of day to every (Timestamp) date
+
+    Returns:
+        DataFrame with draw_date, n1..n5 and pb
+    """
+    rng = np.random.default_rng(seed)
+    white = np.sort(np.argsort(rng.random((n, 69)), axis=1)[:, :5] + 1, axis=1)
+    df = pd.DataFrame(white, columns=WHITE_COLUMNS)
+    dates = pd.date_range(start, periods=n, freq=freq)
+    if intraday:
+        dates = dates + pd.to_timedelta(rng.integers(0, 86400, n), unit="s")
+    df.insert(0, "draw_date", dates.strftime("%Y-%m-%d") if text_dates else dates)
+    df["pb"] = rng.integers(1, max_pb + 1, n)
+    if legacy_pb:
+        df.loc[:legacy_pb - 1, "pb"] = rng.integers(27, 36, legacy_pb)
+    return df
+
+
+def insert_draws(path: str, draws: pd.DataFrame) -> None:
+    """Insert draws with plain sqlite3, bypassing the app's write path (no store sync, no publish)."""
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        f"INSERT INTO powerball_draws ({', '.join(DRAW_COLUMNS)}) VALUES (?,?,?,?,?,?,?)",
+        draws[DRAW_COLUMNS].itertuples(index=False),
+    )
+    conn.commit()
+    conn.close()
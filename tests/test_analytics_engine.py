@@ -7,9 +7,12 @@ Focus: Test update_analytics() function that has 0% coverage but is called
 
 import pytest
 import sqlite3
+import numpy as np
 import pandas as pd
+from itertools import combinations
 from unittest.mock import patch, MagicMock
 from src.analytics_engine import update_analytics, AnalyticsEngine
+from tests.helpers import make_draws
 
 
 class TestAnalyticsEngine:
@@ -196,6 +199,119 @@ class TestAnalyticsIntegration:
         assert len(patterns) > 0
 
 
+class TestVectorizedCooccurrence:
+    """Vectorized co-occurrence (X.T @ X) must match the original pair loop"""
+
+    @pytest.fixture
+    def random_draws_df(self):
+        rng = np.random.default_rng(7)
+        rows = [sorted(rng.choice(np.arange(1, 70), 5, replace=False)) for _ in range(300)]
+        df = pd.DataFrame(rows, columns=['n1', 'n2', 'n3', 'n4', 'n5'])
+        df['pb'] = rng.integers(1, 27, len(df))
+        df['draw_date'] = pd.date_range('2020-01-01', periods=len(df), freq='3D')
+        # Invalid rows must be skipped exactly like _safe_get_numbers does
+        df.loc[3, 'n2'] = df.loc[3, 'n1']
+        df.loc[4, 'n5'] = 70
+        return df
+
+    @patch('src.analytics_engine.get_all_draws')
+    def test_matrix_matches_pair_loop(self, mock_get_draws, random_draws_df):
+        mock_get_draws.return_value = random_draws_df
+        engine = AnalyticsEngine()
+
+        expected = np.zeros((69, 69), dtype=int)
+        for _, draw in random_draws_df.iterrows():
+            numbers = engine._safe_get_numbers(draw)
+            for a, b in combinations(numbers, 2):
+                expected[a - 1][b - 1] += 1
+                expected[b - 1][a - 1] += 1
+
+        matrix = engine.calculate_cooccurrence_matrix()
+        np.testing.assert_array_equal(matrix, expected)
+        assert matrix.sum() == 2 * 10 * (len(random_draws_df) - 2)
+
+    @patch('src.analytics_engine.get_all_draws')
+    def test_top_triples_counts(self, mock_get_draws):
+        mock_get_draws.return_value = pd.DataFrame({
+            'draw_date': pd.date_range('2024-01-01', periods=3),
+            'n1': [1, 1, 2], 'n2': [2, 2, 3], 'n3': [3, 3, 4],
+            'n4': [10, 11, 12], 'n5': [20, 21, 22], 'pb': [1, 2, 3]
+        })
+        engine = AnalyticsEngine()
+
+        triples = engine.calculate_top_triples(top_k=2)
+        assert triples[0]['numbers'] == [1, 2, 3]
+        assert triples[0]['count'] == 2
+        assert triples[1]['count'] == 1
+        assert len(engine.calculate_top_triples(top_k=1000)) == 29  # 3 draws x 10 triples, [1, 2, 3] counted twice
+
+
+class TestIncrementalAnalytics:
+    """Incremental co-occurrence/pattern maintenance must match a full rebuild"""
+
+    @pytest.fixture
+    def analytics_db(self, draws_db):
+        import src.database as db
+        db.create_analytics_tables()
+        return db, make_draws(60, seed=11, start='2024-01-01')
+
+    @staticmethod
+    def _tables(db):
+        conn = sqlite3.connect(db.get_db_path())
+        pairs = conn.execute(
+            "SELECT number_a, number_b, count, expected, deviation_pct, is_significant FROM cooccurrences ORDER BY 1, 2"
+        ).fetchall()
+        patterns = conn.execute(
+            "SELECT pattern_type, pattern_value, mean_value, std_dev FROM pattern_stats ORDER BY 1, 2"
+        ).fetchall()
+        conn.close()
+        return pairs, patterns
+
+    def _assert_tables_close(self, actual, expected):
+        (pairs_a, patterns_a), (pairs_e, patterns_e) = actual, expected
+        assert len(pairs_a) == len(pairs_e) == 2346
+        np.testing.assert_allclose(np.array(pairs_a, dtype=float), np.array(pairs_e, dtype=float))
+        assert [p[:2] for p in patterns_a] == [p[:2] for p in patterns_e]
+        np.testing.assert_allclose([p[2:] for p in patterns_a], [p[2:] for p in patterns_e])
+
+    def test_incremental_matches_full_rebuild(self, analytics_db):
+        db, draws = analytics_db
+        db.bulk_insert_draws(draws.iloc[:-2])
+        assert update_analytics() is True  # first run: full rebuild + accumulators
+
+        db.bulk_insert_draws(draws.iloc[-2:])
+        engine = AnalyticsEngine()
+        assert engine.update_incremental() is True
+        incremental = self._tables(db)
+
+        assert update_analytics(incremental=False) is True
+        self._assert_tables_close(incremental, self._tables(db))
+
+    def test_corrected_draw_requires_full_rebuild(self, analytics_db):
+        db, draws = analytics_db
+        db.bulk_insert_draws(draws)
+        assert update_analytics() is True
+
+        # Re-publishing an already processed draw goes through the upsert path
+        corrected = draws.iloc[[10]].copy()
+        corrected['pb'] = 26 if corrected['pb'].iloc[0] != 26 else 25
+        db.bulk_insert_draws(corrected)
+
+        assert AnalyticsEngine().update_incremental() is False
+
+    def test_accumulator_moments_match_pattern_statistics(self, analytics_db):
+        db, draws = analytics_db
+        db.bulk_insert_draws(draws)
+        engine = AnalyticsEngine()
+
+        from_moments = engine.build_accumulator().pattern_statistics()
+        full = engine.calculate_pattern_statistics()
+        for key in ('sum', 'range', 'gaps'):
+            assert from_moments[key]['mean'] == pytest.approx(full[key]['mean'])
+            assert from_moments[key]['std'] == pytest.approx(full[key]['std'])
+        assert from_moments['distribution'] == pytest.approx(full['distribution'])
+
+
 # Note: These tests focus on basic functionality and error handling.
 # Full integration tests would require mocking the entire database schema
 # and testing the save_patterns_to_db() and save_cooccurrence_to_db() methods.
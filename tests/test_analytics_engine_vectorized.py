@@ -0,0 +1,122 @@
+"""
+Regression tests for the array-based legacy analytics functions.
+
+The reference functions below are the iterrows implementations that
+compute_gap_analysis, compute_temporal_frequencies, compute_momentum_scores
+and AnalyticsEngine.calculate_pattern_statistics used to run; outputs must
+be identical, including value types.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+import src.analytics_engine as analytics
+from src.analytics_engine import (
+    AnalyticsEngine,
+    compute_gap_analysis,
+    compute_momentum_scores,
+    compute_temporal_frequencies,
+    get_analytics_overview,
+)
+from tests.helpers import make_draws
+
+WHITE = ["n1", "n2", "n3", "n4", "n5"]
+
+
+def _reference_gaps(df):
+    last_white, last_pb = {}, {}
+    for _, draw in df.iterrows():
+        for num in draw[WHITE]:
+            last_white[int(num)] = draw["draw_date"]
+        if 1 <= int(draw["pb"]) <= 26:
+            last_pb[int(draw["pb"])] = draw["draw_date"]
+    recent = df["draw_date"].max()
+    return {
+        "white_balls": {n: (recent - last_white[n]).days if n in last_white else 999 for n in range(1, 70)},
+        "powerball": {n: (recent - last_pb[n]).days if n in last_pb else 999 for n in range(1, 27)},
+    }
+
+
+def _reference_temporal(df, decay_rate):
+    white, pb = np.zeros(69), np.zeros(26)
+    recent = df["draw_date"].max()
+    for _, draw in df.iterrows():
+        weight = np.exp(-decay_rate * (recent - draw["draw_date"]).days)
+        for num in draw[WHITE]:
+            white[int(num) - 1] += weight
+        if 1 <= int(draw["pb"]) <= 26:
+            pb[int(draw["pb"]) - 1] += weight
+    return white / white.sum(), pb / pb.sum()
+
+
+def _reference_momentum(df, window):
+    df = df.sort_values("draw_date").reset_index(drop=True)
+    half = window // 2
+
+    def counts(rows):
+        white, pb = np.zeros(69), np.zeros(26)
+        for _, draw in rows.iterrows():
+            for num in draw[WHITE]:
+                white[int(num) - 1] += 1
+            if 1 <= int(draw["pb"]) <= 26:
+                pb[int(draw["pb"]) - 1] += 1
+        return white, pb
+
+    (recent_wb, recent_pb), (prev_wb, prev_pb) = counts(df.tail(half)), counts(df.tail(window).head(half))
+    return {
+        "white_balls": {n: float((recent_wb[n - 1] - prev_wb[n - 1]) / (recent_wb[n - 1] + prev_wb[n - 1] + 0.1))
+                        for n in range(1, 70)},
+        "powerball": {n: float((recent_pb[n - 1] - prev_pb[n - 1]) / (recent_pb[n - 1] + prev_pb[n - 1] + 0.1))
+                      for n in range(1, 27)},
+    }
+
+
+def _reference_patterns(df):
+    rows = [[int(v) for v in draw[WHITE]] for _, draw in df.iterrows()]
+    sums = [sum(r) for r in rows]
+    ranges = [r[4] - r[0] for r in rows]
+    gaps = [np.mean([r[i + 1] - r[i] for i in range(4)]) for r in rows]
+
+    def stats(values):
+        return {"mean": float(np.mean(values)), "std": float(np.std(values)),
+                "typical_range": (float(np.percentile(values, 16)), float(np.percentile(values, 84)))}
+
+    return {
+        "sum": {**stats(sums), "min": int(np.min(sums)), "max": int(np.max(sums))},
+        "range": stats(ranges),
+        "gaps": stats(gaps),
+        "distribution": {
+            "low_mean": float(np.mean([sum(n <= 23 for n in r) for r in rows])),
+            "mid_mean": float(np.mean([sum(24 <= n <= 46 for n in r) for r in rows])),
+            "high_mean": float(np.mean([sum(n >= 47 for n in r) for r in rows])),
+        },
+    }
+
+
+@pytest.mark.parametrize("n,seed,shuffle", [(25, 1, False), (300, 2, True), (1200, 3, False)])
+def test_legacy_analytics_match_row_wise_reference(n, seed, shuffle):
+    # Intra-day times exercise the whole-day (Timedelta.days) rounding; pb includes 2009-2015 era values
+    df = make_draws(n, seed, start="2012-01-01", max_pb=39, text_dates=False, intraday=True)
+    if shuffle:
+        df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    assert compute_gap_analysis(df) == _reference_gaps(df)
+
+    temporal = compute_temporal_frequencies(df, decay_rate=0.05)
+    white, pb = _reference_temporal(df, 0.05)
+    np.testing.assert_array_equal(temporal["white_balls"], white)
+    np.testing.assert_array_equal(temporal["powerball"], pb)
+
+    for window in (20, 21):
+        assert compute_momentum_scores(df, window=window) == _reference_momentum(df, window)
+
+    with patch.object(analytics, "get_all_draws", return_value=df):
+        patterns = AnalyticsEngine().calculate_pattern_statistics()
+        overview = get_analytics_overview()
+    expected = _reference_patterns(df)
+    assert patterns == expected
+    assert overview["pattern_statistics"] == expected
+    assert overview["gap_analysis"] == _reference_gaps(df)
+    assert overview["data_summary"]["current_era_draws"] == int((df["pb"] <= 26).sum())
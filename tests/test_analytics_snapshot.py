@@ -0,0 +1,90 @@
+"""
+Tests for the persisted analytics snapshot (src/analytics_snapshot.py).
+"""
+
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.analytics_snapshot as snapshots
+from src.analytics_engine import get_analytics_overview
+from src.draw_store import invalidate_draw_store
+from tests.helpers import insert_draws, make_draws
+
+
+def _cold_process(monkeypatch):
+    """Forget every in-memory snapshot store, as after a restart."""
+    monkeypatch.setattr(snapshots, "_stores", {})
+
+
+def test_snapshot_is_built_once_per_version_and_persisted(draws_db, monkeypatch):
+    df = make_draws(300, seed=1)
+    insert_draws(draws_db, df.iloc[:250])
+
+    first = snapshots.get_analytics_snapshot()
+    assert first.version == (df["draw_date"].iloc[249], 250)
+    assert snapshots.get_analytics_snapshot() is first
+    assert snapshots.get_snapshot_store().builds == 1
+    assert first.sections["draw_stats"] == {
+        "total_draws": 250, "most_recent": df["draw_date"].iloc[249], "current_era": 250,
+    }
+    assert first.sections["overview_v3"]["total_draws"] == 250
+
+    # A new draw is a new version; both are persisted under their latest draw date
+    insert_draws(draws_db, df.iloc[250:])
+    invalidate_draw_store()
+    second = snapshots.get_analytics_snapshot()
+    assert second.version == (df["draw_date"].iloc[-1], 300)
+    assert snapshots.get_snapshot_store().builds == 2
+
+    conn = sqlite3.connect(draws_db)
+    rows = conn.execute("SELECT latest_draw_date, draw_count FROM analytics_snapshots ORDER BY 1").fetchall()
+    conn.close()
+    assert rows == [(df["draw_date"].iloc[249], 250), (df["draw_date"].iloc[-1], 300)]
+
+
+def test_cold_process_serves_the_persisted_snapshot(draws_db, monkeypatch):
+    insert_draws(draws_db, make_draws(200, seed=2))
+    built = snapshots.get_analytics_snapshot()
+
+    _cold_process(monkeypatch)
+    loaded = snapshots.get_analytics_snapshot()
+    assert snapshots.get_snapshot_store().builds == 0
+    assert loaded.sections == built.sections
+    assert loaded.created_at == pytest.approx(built.created_at, abs=1e-3)
+
+    overview = get_analytics_overview()
+    restored = loaded.analytics_overview()
+    assert restored["gap_analysis"] == overview["gap_analysis"]
+    assert restored["momentum_scores"] == overview["momentum_scores"]
+    assert restored["temporal_frequencies"] == overview["temporal_frequencies"]
+
+    # Invalidation drops the persisted blob too
+    snapshots.invalidate_analytics_snapshot()
+    _cold_process(monkeypatch)
+    snapshots.get_analytics_snapshot()
+    assert snapshots.get_snapshot_store().builds == 1
+
+
+def test_v3_overview_endpoint_serves_the_snapshot(draws_db):
+    from src.v2.analytics_api import analytics_router
+
+    app = FastAPI()
+    app.include_router(analytics_router)
+    client = TestClient(app)
+
+    # No draws: nothing to analyze
+    assert client.get("/api/v3/analytics/overview").status_code == 503
+
+    insert_draws(draws_db, make_draws(120, seed=3))
+    invalidate_draw_store()
+    first = client.get("/api/v3/analytics/overview").json()
+    second = client.get("/api/v3/analytics/overview").json()
+
+    assert first["from_cache"] is False and first["calculation_time_ms"] is not None
+    assert second["from_cache"] is True and second["calculation_time_ms"] is None
+    assert first["total_draws"] == second["total_draws"] == 120
+    assert first["hot_cold"] == second["hot_cold"]
+    assert snapshots.get_snapshot_store().builds == 2
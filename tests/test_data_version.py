@@ -0,0 +1,98 @@
+"""
+Tests for the data version bus (src/data_version.py).
+"""
+
+import sqlite3
+
+import pytest
+
+import src.data_version as data_version
+import src.database as db
+from src.data_version import get_data_version, publish_draws, publish_tickets, subscribe
+from tests.helpers import make_draws
+
+
+@pytest.fixture
+def published():
+    events = []
+    unsubscribe = subscribe(lambda db_path, version: events.append((db_path, version)))
+    yield events
+    unsubscribe()
+
+
+def test_bulk_insert_publishes_the_new_draws_version(draws_db, published):
+    assert get_data_version().draws == (None, 0)
+
+    df = make_draws(30)
+    db.bulk_insert_draws(df.iloc[:20])
+    db.bulk_insert_draws(df.iloc[20:])
+
+    assert [version.draws for _, version in published] == [
+        (df["draw_date"].iloc[19], 20),
+        (df["draw_date"].iloc[-1], 30),
+    ]
+    assert all(path == draws_db for path, _ in published)
+    assert get_data_version().tag == f"{df['draw_date'].iloc[-1]}.30.none"
+
+
+def _write_ticket(path, evaluated=0):
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO generated_tickets (draw_date, n1, n2, n3, n4, n5, powerball, evaluated)"
+                 " VALUES ('2022-01-01', 1, 2, 3, 4, 5, 6, ?)", (evaluated,))
+    conn.commit()
+    conn.close()
+
+
+def test_tickets_writes_change_only_the_tickets_part(tickets_db, published):
+    db.bulk_insert_draws(make_draws(10))
+    before = get_data_version()
+
+    _write_ticket(tickets_db)
+    publish_tickets()
+    after = get_data_version()
+    assert after.draws == before.draws
+    assert after.tickets != before.tickets
+    assert published[-1][1] == after
+
+    # Unchanged data is not announced again
+    count = len(published)
+    publish_tickets()
+    publish_draws()
+    assert len(published) == count
+
+
+def test_batched_ticket_saves_publish_once(tickets_db, monkeypatch, published):
+    read_digest = data_version._read_tickets_digest
+    reads = []
+    monkeypatch.setattr(data_version, "_read_tickets_digest", lambda: reads.append(1) or read_digest())
+    count = len(published)
+
+    for pb in (1, 2, 3):
+        ticket = {"numbers": [5, 12, 23, 34, 45], "powerball": pb, "draw_date": "2025-01-01"}
+        assert db.save_prediction_log(ticket, publish=False)
+    assert reads == [] and len(published) == count
+
+    publish_tickets()
+    assert len(reads) == 1 and len(published) == count + 1
+
+
+def test_ticket_writes_of_other_processes_are_noticed_on_revalidation(tickets_db, monkeypatch):
+    before = get_data_version()
+
+    _write_ticket(tickets_db, evaluated=1)  # No publish_tickets(): another process wrote it
+    assert get_data_version() == before
+
+    monkeypatch.setattr(data_version, "REVALIDATE_INTERVAL_SECONDS", 0.0)
+    assert get_data_version().tickets != before.tickets
+
+
+def test_failing_listener_does_not_break_writers(draws_db, published):
+    def broken(db_path, version):
+        raise RuntimeError("listener bug")
+
+    unsubscribe = subscribe(broken)
+    try:
+        assert db.bulk_insert_draws(make_draws(5)) == 5
+    finally:
+        unsubscribe()
+    assert published[-1][1].draw_count == 5
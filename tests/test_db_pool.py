@@ -0,0 +1,115 @@
+"""
+Tests for pooled SQLite connections (src/db_pool.py).
+"""
+
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from src.database import get_db_connection
+from src.db_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_size=2)
+    yield pool
+    pool.close_all()
+
+
+def test_close_returns_connection_for_reuse(pool):
+    conn = pool.acquire()
+    conn.close()
+    again = pool.acquire()
+
+    assert again is conn
+    assert pool.stats["created"] == 1
+    assert pool.stats["thread_affinity_hits"] == 1
+    again.close()
+
+
+def test_context_manager_commits_and_releases(pool):
+    with pool.acquire() as conn:
+        conn.execute("CREATE TABLE t (a INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    assert pool.snapshot_stats()["in_use"] == 0
+    with pool.acquire() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+
+def test_exit_after_close_leaves_next_checkout_alone(pool):
+    with pool.acquire() as conn:
+        conn.execute("CREATE TABLE t (a INTEGER)")
+        conn.close()
+        # Same thread, so affinity hands the same object straight back
+        again = pool.acquire()
+        assert again is conn
+        again.execute("INSERT INTO t VALUES (1)")
+
+    # Leaving the first block neither committed nor released the new checkout
+    assert pool.snapshot_stats()["in_use"] == 1
+    assert again.in_transaction
+    again.rollback()
+    assert again.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    again.close()
+
+
+def test_release_resets_connection_state(pool):
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (a INTEGER)")
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO t VALUES (1)")  # left uncommitted
+    conn.close()
+
+    conn = pool.acquire()
+    assert conn.row_factory is None
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+
+
+def test_max_size_falls_back_to_overflow_connection(pool, monkeypatch):
+    monkeypatch.setattr("src.db_pool.CHECKOUT_TIMEOUT_SECONDS", 0.01)
+    held = [pool.acquire(), pool.acquire()]
+    overflow = pool.acquire()
+
+    assert pool.stats["overflow"] == 1
+    overflow.close()
+    for conn in held:
+        conn.close()
+    assert pool.snapshot_stats()["idle"] == 2
+
+
+def test_waiter_gets_released_connection(pool):
+    held = [pool.acquire(), pool.acquire()]
+    result = {}
+
+    def worker():
+        result["conn"] = pool.acquire()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    held[0].close()
+    t.join(timeout=5)
+
+    assert result["conn"] is held[0]
+    assert pool.stats["overflow"] == 0
+
+
+def test_read_only_connection_rejects_writes():
+    with get_db_connection(read_only=True) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM powerball_draws").fetchone()[0] >= 0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO powerball_draws (draw_date, n1, n2, n3, n4, n5, pb) VALUES ('1999-01-01',1,2,3,4,5,6)")
+
+
+def test_pooled_connection_works_with_pandas():
+    conn = get_db_connection()
+    try:
+        df = pd.read_sql_query("SELECT draw_date FROM powerball_draws", conn)
+    finally:
+        conn.close()
+    assert "draw_date" in df.columns
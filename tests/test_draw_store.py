@@ -0,0 +1,100 @@
+"""
+Tests for the process-wide in-memory draw store (src/draw_store.py).
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.database as db
+from src.draw_store import get_draw_store, date_to_day, day_to_date
+from tests.helpers import DRAW_COLUMNS, insert_draws
+
+
+@pytest.fixture
+def draws_db(draws_db):
+    """Isolated database with a small draw history"""
+    insert_draws(draws_db, pd.DataFrame(
+        [
+            ("2025-01-01", 1, 2, 3, 4, 5, 6),
+            ("2025-01-04", 10, 20, 30, 40, 50, 7),
+            ("2025-01-06", 11, 22, 33, 44, 69, 26),
+        ],
+        columns=DRAW_COLUMNS,
+    ))
+    return draws_db
+
+
+def test_day_ordinal_roundtrip():
+    assert day_to_date(date_to_day("2025-01-04")) == "2025-01-04"
+    assert date_to_day("2025-01-04 00:00:00") == date_to_day("2025-01-04")
+
+
+def test_snapshot_uses_compact_dtypes(draws_db):
+    snap = get_draw_store().snapshot()
+
+    assert len(snap) == 3
+    assert snap.days.dtype == np.int32
+    assert snap.white_balls.dtype == np.uint8
+    assert snap.white_balls.shape == (3, 5)
+    assert snap.powerball.tolist() == [6, 7, 26]
+    assert not snap.white_balls.flags.writeable
+
+
+def test_max_date_view_is_zero_copy_prefix(draws_db):
+    store = get_draw_store()
+    full = store.snapshot()
+    prefix = store.snapshot(max_date="2025-01-04")
+
+    assert len(prefix) == 1
+    assert np.shares_memory(prefix.white_balls, full.white_balls)
+
+
+def test_get_all_draws_matches_legacy_frame(draws_db):
+    df = db.get_all_draws()
+    legacy = pd.read_sql_query(
+        "SELECT * FROM powerball_draws ORDER BY draw_date ASC",
+        sqlite3.connect(draws_db),
+        parse_dates=["draw_date"],
+    )
+
+    pd.testing.assert_frame_equal(df, legacy, check_dtype=False)
+    assert df["n1"].dtype == np.int64
+    assert len(db.get_all_draws(max_date="2025-01-05")) == 2
+
+
+def test_bulk_insert_appends_without_reload(draws_db):
+    store = get_draw_store()
+    store.snapshot()
+    loads_before = store.load_count
+
+    new_draw = pd.DataFrame([{"draw_date": "2025-01-08", "n1": 5, "n2": 6, "n3": 7, "n4": 8, "n5": 9, "pb": 1}])
+    assert db.bulk_insert_draws(new_draw) == 1
+
+    snap = store.snapshot()
+    assert len(snap) == 4
+    assert snap.white_balls[-1].tolist() == [5, 6, 7, 8, 9]
+    assert store.load_count == loads_before
+
+
+def test_corrected_draw_triggers_reload(draws_db):
+    store = get_draw_store()
+    store.snapshot()
+    loads_before = store.load_count
+
+    corrected = pd.DataFrame([{"draw_date": "2025-01-04", "n1": 12, "n2": 20, "n3": 30, "n4": 40, "n5": 50, "pb": 7}])
+    db.bulk_insert_draws(corrected)
+
+    assert store.find("2025-01-04")["n1"] == 12
+    assert store.load_count == loads_before + 1
+
+
+def test_find_exact_and_closest(draws_db):
+    store = get_draw_store()
+
+    assert store.find("2025-01-04")["pb"] == 7
+    assert store.find("2025-01-05") is None
+    assert store.find("2025-01-05", tolerance_days=3)["draw_date"] in ("2025-01-04", "2025-01-06")
+    assert store.find("2030-01-01", tolerance_days=3) is None
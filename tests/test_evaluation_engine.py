@@ -0,0 +1,99 @@
+"""
+Tests for the batch ticket evaluation engine (src/evaluation_engine.py).
+"""
+
+import asyncio
+import random
+import sqlite3
+
+import pytest
+
+import src.database as db
+from src.evaluation_engine import evaluate_draw
+from src.prediction_evaluator import PredictionEvaluator
+from src.prize_calculator import calculate_prize_amount
+
+WINNING = [5, 12, 23, 41, 60]
+WINNING_PB = 9
+
+
+@pytest.fixture
+def eval_db(tmp_path, monkeypatch):
+    """Fresh production-schema database with one draw and 300 tickets"""
+    path = str(tmp_path / "eval.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    db.initialize_database()
+
+    rng = random.Random(3)
+    tickets = [sorted(WINNING), sorted(WINNING[:4] + [61])]
+    tickets += [sorted(rng.sample(range(1, 70), 5)) for _ in range(298)]
+    rows = []
+    for i, numbers in enumerate(tickets):
+        pb = WINNING_PB if i % 7 == 0 else rng.randint(1, 26)
+        rows.append(("2025-03-01", "frequency_weighted", *numbers, pb, 0.5))
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO powerball_draws (draw_date, n1, n2, n3, n4, n5, pb) VALUES (?,?,?,?,?,?,?)",
+                 ("2025-03-01", *WINNING, WINNING_PB))
+    conn.executemany(
+        "INSERT INTO generated_tickets (draw_date, strategy_used, n1, n2, n3, n4, n5, powerball, confidence_score)"
+        " VALUES (?,?,?,?,?,?,?,?,?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _reference(numbers, pb, calculator=db.calculate_prize_amount):
+    matches = len(set(numbers) & set(WINNING))
+    return (matches, pb == WINNING_PB, *calculator(matches, pb == WINNING_PB))
+
+
+def test_api_evaluation_writes_every_ticket_in_one_pass(eval_db):
+    from src.api import evaluate_predictions_for_draw
+
+    assert asyncio.run(evaluate_predictions_for_draw("2025-03-01")) is True
+
+    conn = sqlite3.connect(eval_db)
+    rows = conn.execute(
+        "SELECT id, n1, n2, n3, n4, n5, powerball, evaluated, matches_wb, matches_pb, prize_won, prize_description"
+        " FROM generated_tickets ORDER BY id"
+    ).fetchall()
+    tracked = conn.execute("SELECT COUNT(*) FROM performance_tracking WHERE draw_date = '2025-03-01'").fetchone()[0]
+    conn.close()
+
+    assert tracked == 300
+    for row in rows:
+        matches, pb_match, amount, description = _reference(list(row[1:6]), row[6])
+        assert row[7:] == (1, matches, int(pb_match), amount, description)
+
+    # Already evaluated tickets are not evaluated (or tracked) twice
+    assert asyncio.run(evaluate_predictions_for_draw("2025-03-01")) is True
+    conn = sqlite3.connect(eval_db)
+    assert conn.execute("SELECT COUNT(*) FROM performance_tracking").fetchone()[0] == 300
+    conn.close()
+
+
+def test_prediction_evaluator_summary(eval_db):
+    summary = PredictionEvaluator().evaluate_predictions_for_date("2025-03-01")
+
+    assert summary["predictions_evaluated"] == 300
+    assert summary["best_prediction"]["prize_description"] == "Jackpot"
+    assert summary["best_prediction"]["numbers"] == sorted(WINNING)
+
+    details = summary["evaluation_details"]
+    expected_total = sum(d["prize_amount"] for d in details)
+    assert summary["total_prize"] == pytest.approx(expected_total)
+    assert summary["predictions_with_prizes"] == sum(1 for d in details if d["prize_amount"] > 0)
+
+    conn = sqlite3.connect(eval_db)
+    stored = dict(conn.execute("SELECT id, prize_won FROM generated_tickets").fetchall())
+    conn.close()
+    assert all(stored[d["prediction_id"]] == d["prize_amount"] for d in details)
+
+
+def test_missing_draw_returns_none(eval_db):
+    conn = sqlite3.connect(eval_db)
+    assert evaluate_draw(conn.cursor(), "1999-01-01", calculate_prize_amount) is None
+    conn.close()
@@ -0,0 +1,138 @@
+"""
+Parity tests for the vectorized FeatureEngineer.
+
+The reference functions below are the per-row loops the vectorized code
+replaced (iterrows recency, scipy euclidean distances, per-number polyfit
+trends and statsmodels autocorrelation).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from scipy.spatial.distance import euclidean
+
+from src.intelligent_generator import FeatureEngineer
+from tests.helpers import make_draws
+
+WHITE = ["n1", "n2", "n3", "n4", "n5"]
+
+
+def _draws(n, seed, with_nan=False):
+    """make_draws() with float number columns, optionally with missing values."""
+    df = make_draws(n, seed, start="2010-01-01", text_dates=False).astype({col: float for col in WHITE + ["pb"]})
+    if with_nan:
+        rng = np.random.default_rng(seed)
+        df.loc[rng.integers(0, n, n // 20), "n3"] = np.nan
+        df.loc[rng.integers(0, n, n // 30), "pb"] = np.nan
+    return df
+
+
+def _reference_delays(df):
+    last_seen, rows = {}, []
+    for index, row in df.iterrows():
+        delays = []
+        for col in WHITE:
+            num = row[col]
+            if pd.notna(num):
+                delays.append(index - last_seen.get(num, index))
+                last_seen[num] = index
+        rows.append(delays + [0] * (5 - len(delays)))
+    delays = pd.DataFrame(rows)
+    return delays.mean(axis=1), delays.max(axis=1), delays.min(axis=1)
+
+
+def _reference_distance(row, reference):
+    row, reference = np.asarray(row, dtype=float), np.asarray(reference, dtype=float)
+    if not (np.isfinite(row).all() and np.isfinite(reference).all()):
+        return np.nan
+    return euclidean(row, reference)
+
+
+def _reference_trend_labels(df, window_size, num_windows, max_ball, cols):
+    window_count = min(num_windows, len(df) // window_size)
+    freqs = {num: [] for num in range(1, max_ball + 1)}
+    for w in range(window_count):
+        end = len(df) - w * window_size
+        window = df.iloc[max(0, end - window_size):end]
+        values = window[cols].to_numpy().ravel()
+        for num in freqs:
+            freqs[num].append((values == num).sum() / len(window))
+    labels = {}
+    for num, series in freqs.items():
+        slope = np.polyfit(np.arange(len(series)), series, 1)[0]
+        labels[num] = "increasing" if slope > 0.005 else "decreasing" if slope < -0.005 else "stable"
+    return labels
+
+
+def _reference_seasonal(df, period, threshold, max_ball, cols):
+    seasonal = set()
+    for num in range(1, max_ball + 1):
+        series = (df[cols] == num).any(axis=1).astype(int)
+        if series.sum() == 0:
+            continue
+        acf = sm.tsa.acf(series, nlags=period * 2, fft=True)
+        if abs(acf[period]) > threshold:
+            seasonal.add(num)
+    return seasonal
+
+
+@pytest.mark.parametrize("n,seed,with_nan", [(45, 1, True), (400, 2, False), (700, 3, True)])
+def test_vectorized_features_match_row_wise_reference(n, seed, with_nan):
+    engineer = FeatureEngineer(_draws(n, seed, with_nan))
+    result = engineer.engineer_features(use_temporal_analysis=True)
+    numbers = result[WHITE]
+
+    avg_delay, max_delay, min_delay = _reference_delays(result)
+    np.testing.assert_allclose(result["avg_delay"], avg_delay)
+    assert result["max_delay"].tolist() == max_delay.tolist()
+    assert result["min_delay"].tolist() == min_delay.tolist()
+
+    recent = numbers.iloc[-1].to_numpy()
+    centroid = numbers.mean().to_numpy()
+    top = [c for c in numbers.iloc[-6:-1].to_numpy() if np.isfinite(c).all()]
+    np.testing.assert_allclose(result["dist_to_recent"], [_reference_distance(r, recent) for r in numbers.to_numpy()])
+    np.testing.assert_allclose(result["dist_to_centroid"], [_reference_distance(r, centroid) for r in numbers.to_numpy()])
+    np.testing.assert_allclose(
+        result["avg_dist_to_top_n"],
+        [np.mean([_reference_distance(r, c) for c in top]) if np.isfinite(r).all() else np.nan
+         for r in numbers.to_numpy()],
+    )
+
+    consecutive = [sum(1 for a, b in zip(s, s[1:]) if b - a == 1)
+                   for s in (sorted(x for x in r if pd.notna(x)) for r in numbers.to_numpy())]
+    assert result["consecutive_count"].tolist() == consecutive
+    balance = [f"{sum(x <= 35 for x in r if pd.notna(x))}L-{sum(x > 35 for x in r if pd.notna(x))}H"
+               for r in numbers.to_numpy()]
+    assert result["low_high_balance"].tolist() == balance
+
+    white_trends = _reference_trend_labels(result, engineer.moving_window_size, engineer.num_windows, 69, WHITE)
+    pb_trends = _reference_trend_labels(result, engineer.moving_window_size, engineer.num_windows, 26, ["pb"])
+    for i, row in result.iterrows():
+        labels = [white_trends[row[c]] for c in WHITE if row[c] in white_trends]
+        if row["pb"] in pb_trends:
+            labels.append(pb_trends[row["pb"]])
+        counts = [labels.count(label) for label in ("increasing", "decreasing", "stable")]
+        assert [row["increasing_trend_count"], row["decreasing_trend_count"], row["stable_trend_count"]] == counts
+        assert row["dominant_trend"] == ("increasing", "decreasing", "stable")[int(np.argmax(counts))]
+
+
+def test_seasonal_numbers_match_statsmodels_acf():
+    df = _draws(300, 4)
+    # Number 7 and Powerball 3 appear exactly every 30 draws
+    df[WHITE] = df[WHITE].replace(7, 8)
+    df["pb"] = df["pb"].replace(3, 4)
+    df.loc[::30, "n1"] = 7
+    df.loc[::30, "pb"] = 3
+
+    engineer = FeatureEngineer(df)
+    result = engineer.engineer_features(use_temporal_analysis=True)
+    period, threshold = engineer.seasonality_period, engineer.seasonality_threshold
+    seasonal = _reference_seasonal(result, period, threshold, 69, WHITE)
+    seasonal_pb = _reference_seasonal(result, period, threshold, 26, ["pb"])
+
+    assert 7 in seasonal and 3 in seasonal_pb
+    expected = result[WHITE].isin(seasonal).sum(axis=1)
+    assert result["seasonal_number_count"].tolist() == expected.tolist()
+    assert result["pb_seasonal"].tolist() == result["pb"].isin(seasonal_pb).astype(int).tolist()
+    assert result["has_seasonality"].tolist() == ((expected > 0) | result["pb"].isin(seasonal_pb)).tolist()
@@ -0,0 +1,109 @@
+"""
+Tests for the persisted, append-only feature store.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.database as db
+from src.feature_store import FeatureFamily, FeatureStore, feature_store_path, get_feature_store
+from src.intelligent_generator import PREDICTION_FEATURES, XGBOOST_FEATURES, FeatureEngineer
+from src.ml_models.random_forest_model import RF_FEATURES, engineer_features
+from src.probability_service import path_fingerprint
+from src.strategy_registry import models_fingerprint
+from tests.helpers import make_draws
+
+
+def _spy(family):
+    """Copy of a family whose builder records the start of every build."""
+    starts = []
+
+    def build(draws_df, start, state):
+        starts.append(start)
+        return family.build(draws_df, start, state)
+
+    return FeatureFamily(family.name, build, family.code, family.params), starts
+
+
+@pytest.mark.parametrize("family", [XGBOOST_FEATURES, RF_FEATURES], ids=["xgboost", "random_forest"])
+def test_new_draws_are_appended_and_persisted(tmp_path, family):
+    draws = make_draws(260)
+    spy, starts = _spy(family)
+    path = feature_store_path(family.name, str(tmp_path))
+
+    store = FeatureStore(spy, path)
+    store.rows(draws.iloc[:200])
+    latest = store.rows(draws, last=1)
+    assert starts == [0, 200]
+    assert latest.index.tolist() == [259]
+
+    rebuilt = FeatureStore(family, str(tmp_path / "full.npz")).rows(draws)
+    np.testing.assert_allclose(store.rows(draws).to_numpy(), rebuilt.to_numpy(), rtol=1e-12)
+
+    # A new process reads the file and has nothing to engineer
+    reopened, reopened_starts = _spy(family)
+    FeatureStore(reopened, path).rows(draws, last=1)
+    assert reopened_starts == []
+
+
+def test_xgboost_rows_equal_last_row_of_engineer_features(tmp_path):
+    draws = make_draws(240, seed=1)
+    store = FeatureStore(XGBOOST_FEATURES, str(tmp_path / "xgb.npz"))
+    for count in (3, 12, 35, 101, 240):
+        expected = FeatureEngineer(draws.iloc[:count]).engineer_features().iloc[-1]
+        expected = [float(expected[c]) if c in expected.index else np.nan for c in PREDICTION_FEATURES]
+        latest = store.rows(draws.iloc[:count], last=1)
+        assert list(latest.columns) == PREDICTION_FEATURES
+        np.testing.assert_allclose(latest.iloc[0].to_numpy(), expected, rtol=1e-12)
+
+
+def test_random_forest_rows_equal_full_engineering(tmp_path):
+    draws = make_draws(180, seed=2)
+    store = FeatureStore(RF_FEATURES, str(tmp_path / "rf.npz"))
+    store.rows(draws.iloc[:2])   # Too short for the lag features: column set changes later
+    store.rows(draws.iloc[:120])
+    rows = store.rows(draws)
+    expected = engineer_features(draws.copy())
+    assert list(rows.columns) == list(expected.columns)
+    np.testing.assert_allclose(rows.to_numpy(), expected.to_numpy(dtype=float), rtol=1e-10)
+
+
+def test_changed_history_or_code_rebuilds_and_prefix_is_served(tmp_path):
+    draws = make_draws(150, seed=3)
+    spy, starts = _spy(RF_FEATURES)
+    store = FeatureStore(spy, str(tmp_path / "rf.npz"))
+    store.rows(draws)
+
+    # Earlier cut of the same history: served from the stored rows
+    assert len(store.rows(draws.iloc[:100])) == 100
+    assert starts == [0]
+
+    edited = draws.copy()
+    edited.loc[10, "pb"] = 26 if edited.loc[10, "pb"] != 26 else 1
+    store.rows(edited)
+    assert starts == [0, 0] and store.rebuilds == 1
+
+    changed = FeatureFamily(spy.name, spy.build, spy.code, lambda: {"feature_history": 0})
+    FeatureStore(changed, str(tmp_path / "rf.npz")).rows(edited)
+    assert starts == [0, 0, 0]
+
+
+def test_appends_leave_model_fingerprints_unchanged(tmp_path, monkeypatch):
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "model.pkl").write_bytes(b"v1")
+    db_path = str(tmp_path / "data" / "shiolplus.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: db_path, raising=True)
+    before = path_fingerprint([str(models)]), models_fingerprint(str(models))
+
+    store = get_feature_store(RF_FEATURES)
+    draws = make_draws(120)
+    store.rows(draws.iloc[:100])
+    store.rows(draws, last=1)
+
+    assert store.appended_rows == 120
+    assert os.path.dirname(store.path) == str(tmp_path / "data" / "feature_store")
+    assert (path_fingerprint([str(models)]), models_fingerprint(str(models))) == before
@@ -0,0 +1,94 @@
+"""
+Tests for the prefix-sum frequency index (src/frequency_index.py).
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.analytics_engine import compute_momentum_scores, get_analytics_overview
+from src.draw_store import get_draw_store
+from src.frequency_index import FrequencyIndex, get_frequency_index
+from tests.helpers import insert_draws, make_draws
+
+
+def _reference_hot_cold(df, limit):
+    """The SELECT ... WHERE pb_is_current = 1 ORDER BY draw_date DESC + Counter implementation."""
+    current = df[(df["pb"] >= 1) & (df["pb"] <= 26)].iloc[::-1].head(limit)
+    white, pb = Counter(), Counter()
+    for draw in current[["n1", "n2", "n3", "n4", "n5", "pb"]].itertuples(index=False):
+        for ball in draw[:5]:
+            white[ball] += 1
+        pb[draw[5]] += 1
+    white_sorted, pb_sorted = white.most_common(), pb.most_common()
+    return {
+        "hot_numbers": {"white_balls": [n for n, _ in white_sorted[:10]], "powerballs": [n for n, _ in pb_sorted[:5]]},
+        "cold_numbers": {"white_balls": [n for n, _ in white_sorted[-10:]], "powerballs": [n for n, _ in pb_sorted[-5:]]},
+        "draws_analyzed": len(current),
+    }
+
+
+def test_window_counts_match_direct_counts(draws_db):
+    df = make_draws(300, seed=1, legacy_pb=40)
+    insert_draws(draws_db, df)
+    index = get_frequency_index()
+
+    for start, stop in [(0, 300), (17, 18), (40, 250), (-50, None), (120, 60)]:
+        window = df.iloc[start:stop]
+        white = np.bincount(window[["n1", "n2", "n3", "n4", "n5"]].to_numpy().ravel(), minlength=70)[1:]
+        pb = np.bincount(window["pb"][window["pb"] <= 26], minlength=27)[1:]
+        assert index.white_counts(start, stop).tolist() == white.tolist()
+        assert index.powerball_counts(start, stop).tolist() == pb.tolist()
+
+    cutoff = df["draw_date"].iloc[200]
+    assert len(get_frequency_index(max_date=cutoff)) == 200
+    assert index.position(cutoff) == 200
+
+
+@pytest.mark.parametrize("n,legacy_pb,limit", [(300, 0, 100), (150, 80, 100), (40, 0, 100)])
+def test_hot_cold_matches_counter_implementation(draws_db, n, legacy_pb, limit):
+    df = make_draws(n, seed=n, legacy_pb=legacy_pb)
+    insert_draws(draws_db, df)
+    assert get_frequency_index().hot_cold(last=limit) == _reference_hot_cold(df, limit)
+
+
+def test_counts_are_extended_on_append(draws_db):
+    df = make_draws(260, seed=3)
+    insert_draws(draws_db, df.iloc[:200])
+    store = get_draw_store()
+    store.snapshot()
+    store.append(df.iloc[200:])
+
+    appended = store.frequency_index()
+    rebuilt = FrequencyIndex.from_dataframe(df)
+    assert store.load_count == 1
+    np.testing.assert_array_equal(appended.white, rebuilt.white)
+    np.testing.assert_array_equal(appended.powerball, rebuilt.powerball)
+
+
+def test_momentum_compares_the_two_halves_of_the_window():
+    df = make_draws(120, seed=4)
+    white, pb = FrequencyIndex.from_dataframe(df).momentum(window=20)
+
+    def counts(rows):
+        wb = np.bincount(rows[["n1", "n2", "n3", "n4", "n5"]].to_numpy().ravel(), minlength=70)[1:]
+        return wb, np.bincount(rows["pb"], minlength=27)[1:]
+
+    (recent_wb, recent_pb), (previous_wb, previous_pb) = counts(df.tail(10)), counts(df.iloc[-20:-10])
+    np.testing.assert_allclose(white, (recent_wb - previous_wb) / (recent_wb + previous_wb + 0.1))
+    np.testing.assert_allclose(pb, (recent_pb - previous_pb) / (recent_pb + previous_pb + 0.1))
+
+
+@pytest.mark.parametrize("n,legacy_pb", [(120, 30), (15, 5)])
+def test_momentum_matches_compute_momentum_scores(draws_db, n, legacy_pb):
+    df = make_draws(n, seed=5, legacy_pb=legacy_pb)
+    insert_draws(draws_db, df)
+    index = get_frequency_index()
+
+    for window in (20, 21):
+        white, pb = index.momentum(window=window)
+        expected = compute_momentum_scores(df, window=window)
+        assert dict(enumerate(white.tolist(), 1)) == expected["white_balls"]
+        assert dict(enumerate(pb.tolist(), 1)) == expected["powerball"]
+    assert get_analytics_overview()["momentum_scores"] == compute_momentum_scores(df, window=20)
@@ -0,0 +1,119 @@
+"""
+Tests for the set-based grouped prediction history queries in src/database.py.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+import src.database as db
+
+
+@pytest.fixture
+def history_db(tmp_path, monkeypatch):
+    """Isolated database with three drawn dates and random tickets for each"""
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE powerball_draws (draw_date TEXT PRIMARY KEY, n1 INTEGER, n2 INTEGER,"
+        " n3 INTEGER, n4 INTEGER, n5 INTEGER, pb INTEGER)"
+    )
+    # Carries both the legacy 'pb' and current 'powerball' ticket columns used by the two queries
+    conn.execute(
+        "CREATE TABLE generated_tickets (id INTEGER PRIMARY KEY AUTOINCREMENT, draw_date TEXT,"
+        " strategy_used TEXT, n1 INTEGER, n2 INTEGER, n3 INTEGER, n4 INTEGER, n5 INTEGER,"
+        " pb INTEGER, powerball INTEGER, confidence_score REAL, dataset_hash TEXT,"
+        " json_details_path TEXT, evaluated INTEGER DEFAULT 0, prize_won REAL DEFAULT 0, created_at TEXT)"
+    )
+
+    rng = random.Random(7)
+    draws = {
+        "2025-01-01": ([1, 2, 3, 4, 5], 6),
+        "2025-01-04": ([10, 20, 30, 40, 50], 7),
+        "2025-01-06": ([11, 22, 33, 44, 55], 26),
+    }
+    for date, (white, pb) in draws.items():
+        conn.execute("INSERT INTO powerball_draws VALUES (?,?,?,?,?,?,?)", (date, *white, pb))
+        for i in range(40):
+            if i < 3:
+                # Guarantee a few winners: jackpot-ish and partial matches
+                numbers = sorted(white[:5 - i] + rng.sample([n for n in range(60, 70)], i))
+                ticket_pb = pb if i != 1 else (pb % 26) + 1
+            else:
+                numbers = sorted(rng.sample(range(1, 70), 5))
+                ticket_pb = rng.randint(1, 26)
+            conn.execute(
+                "INSERT INTO generated_tickets (draw_date, strategy_used, n1, n2, n3, n4, n5, pb, powerball,"
+                " confidence_score, dataset_hash, json_details_path, created_at)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (date, "frequency_weighted", *numbers, ticket_pb, ticket_pb, rng.random(),
+                 "a" * 16, "details.json", f"{date} 0{i % 10}:00:00"),
+            )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    return path, draws
+
+
+def _reference_tickets(path, order_by):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        f"SELECT draw_date, id, n1, n2, n3, n4, n5, powerball FROM generated_tickets ORDER BY {order_by}"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_grouped_by_date_matches_per_ticket_scoring(history_db):
+    path, draws = history_db
+    groups = db.get_predictions_grouped_by_date(limit_dates=2)
+
+    assert [g["date"] for g in groups] == ["2025-01-06", "2025-01-04"]
+    for group in groups:
+        white, pb = draws[group["date"]]
+        expected = [r for r in _reference_tickets(path, "confidence_score DESC, id ASC") if r[0] == group["date"]]
+
+        assert [p["prediction_id"] for p in group["predictions"]] == [r[1] for r in expected]
+        for pred, row in zip(group["predictions"], expected):
+            matches = len(set(row[2:7]) & set(white))
+            amount, description = db.calculate_prize_amount(matches, row[7] == pb)
+            assert pred["matches_main"] == matches
+            assert pred["powerball_match"] is (row[7] == pb)
+            assert (pred["prize_amount"], pred["prize_description"]) == (amount, description)
+
+        assert group["total_plays"] == 40
+        assert group["best_prize"] == "Jackpot"
+        assert group["total_prize_display"] == "JACKPOT!"
+        assert group["total_prize_amount"] == sum(p["prize_amount"] for p in group["predictions"])
+
+
+def test_results_comparison_summary(history_db):
+    path, draws = history_db
+    groups = db.get_grouped_predictions_with_results_comparison(limit_groups=5)
+
+    assert [g["draw_date"] for g in groups] == ["2025-01-06", "2025-01-04", "2025-01-01"]
+    for group in groups:
+        white, pb = draws[group["draw_date"]]
+        assert group["winning_numbers"] == white
+        assert group["summary"]["total_predictions"] == 40
+        assert group["summary"]["best_result"] == "JACKPOT"
+
+        second = group["predictions"][1]
+        assert [m["is_match"] for m in second["number_matches"]] == [n in white for n in second["prediction_numbers"]]
+        winners = sum(1 for p in group["predictions"] if p["has_prize"])
+        assert group["summary"]["predictions_with_prizes"] == winners
+        assert [p["play_number"] for p in group["predictions"]] == list(range(1, 41))
+
+
+def test_empty_history_returns_no_groups(tmp_path, monkeypatch):
+    path = str(tmp_path / "empty.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE powerball_draws (draw_date TEXT PRIMARY KEY, n1, n2, n3, n4, n5, pb)")
+    conn.execute("CREATE TABLE generated_tickets (id INTEGER PRIMARY KEY, draw_date TEXT, n1, n2, n3, n4, n5,"
+                 " powerball, created_at TEXT)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+
+    assert db.get_grouped_predictions_with_results_comparison() == []
@@ -0,0 +1,112 @@
+"""
+Tests for conditional responses and Cache-Control policies (src/http_cache.py).
+"""
+
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.database as db
+from src.data_version import publish_tickets
+from src.http_cache import PRIVATE_DATA, PUBLIC_DATA, STATIC_ASSETS, cache_policy
+from tests.helpers import make_draws
+
+
+@pytest.fixture
+def client(tickets_db):
+    db.bulk_insert_draws(make_draws(40, start="2023-01-02", freq="7D"))
+
+    from src.api_public_endpoints import public_frontend_router
+    from src.v2.analytics_api import analytics_router
+
+    app = FastAPI()
+    app.include_router(public_frontend_router)
+    app.include_router(analytics_router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("url", [
+    "/api/v1/public/recent-draws?limit=10",
+    "/api/v1/public/predictions/by-draw/2023-01-02",
+    "/api/v3/analytics/overview",
+])
+def test_matching_etag_gets_304_without_body(client, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == cache_policy(url.split("?")[0])
+    assert "Last-Modified" in first.headers
+
+    second = client.get(url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+    # A client holding an older tag, or none, gets the body
+    assert client.get(url, headers={"If-None-Match": 'W/"stale", "other"'}).status_code == 200
+
+
+def test_etag_changes_with_the_data_version_and_query(client):
+    first = client.get("/api/v1/public/recent-draws?limit=10")
+    other_limit = client.get("/api/v1/public/recent-draws?limit=11")
+    assert other_limit.headers["ETag"] != first.headers["ETag"]
+
+    conn = sqlite3.connect(db.get_db_path())
+    conn.execute("INSERT INTO generated_tickets (draw_date, n1, n2, n3, n4, n5, powerball) VALUES ('2023-01-02', 1, 2, 3, 4, 5, 6)")
+    conn.commit()
+    conn.close()
+    publish_tickets()
+    after_tickets = client.get("/api/v1/public/recent-draws?limit=10",
+                               headers={"If-None-Match": first.headers["ETag"]})
+    assert after_tickets.status_code == 200
+
+    db.bulk_insert_draws(make_draws(41, start="2023-01-02", freq="7D").iloc[40:])
+    overview = client.get("/api/v3/analytics/overview")
+    assert overview.json()["total_draws"] == 41
+    assert client.get("/api/v1/public/recent-draws?limit=10",
+                      headers={"If-None-Match": after_tickets.headers["ETag"]}).status_code == 200
+
+
+def test_etag_changes_with_the_deploy(client, monkeypatch):
+    import src.http_cache as http_cache
+
+    before = client.get("/api/v1/public/recent-draws?limit=10")
+    monkeypatch.setattr(http_cache, "DEPLOY_TOKEN", "next-release")
+    after = client.get("/api/v1/public/recent-draws?limit=10", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_by_draw_etag_varies_by_caller(client):
+    guest = client.get("/api/v1/public/predictions/by-draw/2023-01-02")
+    assert guest.headers["Vary"] == "Cookie, Authorization"
+
+    # An invalid session resolves to guest access but must not reuse the anonymous fast path blindly
+    client.cookies.set("session_token", "not-a-jwt")
+    signed = client.get("/api/v1/public/predictions/by-draw/2023-01-02",
+                        headers={"If-None-Match": guest.headers["ETag"]})
+    assert signed.status_code == 200
+    assert signed.headers["ETag"] != guest.headers["ETag"]
+
+
+def test_if_modified_since_is_used_without_if_none_match(client):
+    first = client.get("/api/v1/public/history/grouped")
+    assert first.headers["Cache-Control"] == PUBLIC_DATA
+    cached = client.get("/api/v1/public/history/grouped",
+                        headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert cached.status_code == 304
+    old = client.get("/api/v1/public/history/grouped",
+                     headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert old.status_code == 200
+
+
+def test_cache_policies_by_path():
+    assert cache_policy("/api/v3/analytics/overview") == PUBLIC_DATA
+    assert cache_policy("/api/v2/plp-dashboard") == PRIVATE_DATA
+    assert cache_policy("/api/v1/public/predictions/by-draw/2024-01-01") == PRIVATE_DATA
+    assert cache_policy("/static/app.js") == STATIC_ASSETS
+    assert cache_policy("/") == STATIC_ASSETS
+    assert cache_policy("/api/v1/auth/login") is None
@@ -0,0 +1,59 @@
+"""
+Tests for the event-loop stall detector (src/loop_stalls.py).
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from src.loop_stalls import LoopStallDetector, get_loop_stall_report
+
+
+def _blocking_work():
+    time.sleep(0.3)
+
+
+def test_blocking_endpoint_is_reported_with_route_and_stack():
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        _blocking_work()  # Synchronous work on the event loop
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    detector = LoopStallDetector(threshold_ms=100, interval_ms=20)
+    detector.register_routes(app.routes)
+
+    async def scenario():
+        detector.start()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                # The in-process transport never yields, so give the heartbeat a turn between requests
+                for path in ("/fast", "/slow", "/slow"):
+                    await asyncio.sleep(0.1)
+                    await client.get(path)
+                await asyncio.sleep(0.1)
+        finally:
+            detector.stop()
+
+    asyncio.run(scenario())
+    report = detector.report()
+
+    assert report["lag"]["stalls"] == 2
+    assert report["lag"]["max_ms"] >= 250
+    top = report["top_offenders"][0]
+    assert top["route"] == "GET /slow"
+    assert top["count"] == 2 and top["total_ms"] >= 500
+    assert "_blocking_work" in top["stack"][-2]
+    assert len(report["top_offenders"]) == 1
+
+
+def test_report_without_detector_says_disabled():
+    assert get_loop_stall_report()["enabled"] is False
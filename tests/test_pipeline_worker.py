@@ -0,0 +1,108 @@
+"""
+Tests for the pipeline worker process (src/pipeline_worker.py).
+"""
+
+import asyncio
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import src.database as db
+import src.pipeline_worker as worker
+
+WINNING = [5, 12, 23, 41, 60]
+
+
+@pytest.fixture
+def pipeline_db(tmp_path, monkeypatch):
+    """Production-schema database with one draw, its tickets and a running execution log"""
+    path = str(tmp_path / "pipeline.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    db.initialize_database()
+
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO powerball_draws (draw_date, n1, n2, n3, n4, n5, pb) VALUES (?,?,?,?,?,?,?)",
+                 ("2025-03-01", *WINNING, 9))
+    conn.executemany(
+        "INSERT INTO generated_tickets (draw_date, strategy_used, n1, n2, n3, n4, n5, powerball, confidence_score)"
+        " VALUES (?,?,?,?,?,?,?,?,?)",
+        [("2025-03-01", "frequency_weighted", *WINNING, 9, 0.5),
+         ("2025-03-01", "frequency_weighted", 1, 2, 3, 4, 6, 7, 0.5)],
+    )
+    conn.commit()
+    conn.close()
+    db.insert_pipeline_execution_log("exec0001", datetime.now().isoformat())
+    yield path
+    worker.shutdown_pipeline_worker()
+
+
+def _query(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_step_runs_in_worker_process_and_reports_progress(pipeline_db, monkeypatch):
+    from src.data_version import get_data_version
+
+    tickets_before = get_data_version().tickets
+    assert asyncio.run(worker.run_pipeline_step("exec0001", "STEP 4: Evaluation", "evaluation", "2025-03-01"))
+
+    assert _query(pipeline_db, "SELECT evaluated, prize_won FROM generated_tickets ORDER BY id") == [
+        (1, pytest.approx(db.calculate_prize_amount(5, True)[0])),
+        (1, 0.0),
+    ]
+    step = _query(pipeline_db, "SELECT current_step FROM pipeline_execution_logs WHERE execution_id = 'exec0001'")[0][0]
+    assert step.startswith("STEP 4: Evaluation [worker pid ")
+    assert int(step.rsplit(" ", 1)[1].rstrip("]")) != os.getpid()
+    # The parent publishes what the worker wrote
+    assert get_data_version().tickets != tickets_before
+
+
+def test_worker_above_memory_cap_is_killed_and_replaced(pipeline_db, monkeypatch):
+    monkeypatch.setattr(worker, "MEMORY_LIMIT_MB", 1)
+    monkeypatch.setattr(worker, "MEMORY_POLL_SECONDS", 0.05)
+    with pytest.raises(worker.PipelineWorkerError, match="memory cap"):
+        asyncio.run(worker.run_pipeline_step("exec0001", "STEP 4: Evaluation", "evaluation", "2025-03-01"))
+    assert _query(pipeline_db, "SELECT COUNT(*) FROM generated_tickets WHERE evaluated = 1") == [(0,)]
+
+    monkeypatch.setattr(worker, "MEMORY_LIMIT_MB", 0)
+    assert asyncio.run(worker.run_pipeline_step("exec0001", "STEP 4: Evaluation", "evaluation", "2025-03-01"))
+
+
+def test_shutdown_fails_the_running_step(pipeline_db):
+    async def scenario():
+        step = asyncio.create_task(worker.run_pipeline_step("exec0001", "STEP 3", "analytics"))
+        await asyncio.sleep(0.2)
+        worker.shutdown_pipeline_worker()
+        return await step
+
+    with pytest.raises(worker.PipelineWorkerError):
+        asyncio.run(scenario())
+
+
+def test_disabled_worker_runs_steps_on_the_cpu_pool(pipeline_db, monkeypatch):
+    monkeypatch.setattr(worker, "ENABLED", False)
+    assert asyncio.run(worker.run_pipeline_step("exec0001", "STEP 4: Evaluation", "evaluation", "2025-03-01"))
+    assert worker._executor is None
+    assert _query(pipeline_db, "SELECT COUNT(*) FROM generated_tickets WHERE evaluated = 1") == [(2,)]
+
+
+def test_generation_step_waits_for_every_selected_strategy(pipeline_db, monkeypatch):
+    import src.strategy_registry as strategy_registry
+
+    calls = []
+
+    class FakeManager:
+        def generate_balanced_tickets(self, **kwargs):
+            calls.append(kwargs)
+            return []
+
+    monkeypatch.setattr(strategy_registry, "get_strategy_manager", lambda revalidate=False: FakeManager())
+    monkeypatch.setattr(worker, "ENABLED", False)
+    assert asyncio.run(worker.run_pipeline_step("exec0001", "STEP 6", "generation", 55)) == []
+    assert calls == [{"total": 55, "load_timeout": None}]
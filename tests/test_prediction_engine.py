@@ -8,6 +8,15 @@ import pytest
 import os
 from unittest.mock import patch, MagicMock
 from src.prediction_engine import UnifiedPredictionEngine
+from src.strategy_registry import reset_strategy_registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_strategy_registry():
+    """The shared manager is built once per database; patched StrategyManagers need a fresh one."""
+    reset_strategy_registry()
+    yield
+    reset_strategy_registry()
 
 
 class TestUnifiedPredictionEngineInit:
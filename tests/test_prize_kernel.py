@@ -0,0 +1,81 @@
+"""
+Tests for the shared bitmask prize kernel (src/prize_kernel.py).
+"""
+
+import numpy as np
+
+import src.database as db
+from src.prize_calculator import calculate_prize_amount
+from src.prize_kernel import (
+    encode_white_balls,
+    match_counts,
+    popcount,
+    prize_table,
+    score_history,
+    score_tickets,
+)
+
+WINNING = [5, 12, 64, 65, 69]
+WINNING_PB = 9
+
+
+def _random_tickets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    numbers = np.argsort(rng.random((n, 69)), axis=1)[:, :5] + 1
+    return np.sort(numbers, axis=1), rng.integers(1, 27, size=n)
+
+
+def test_popcount_and_encoding():
+    words = np.array([0, 1, 2**63, 2**64 - 1, 0b1011], dtype=np.uint64)
+    assert popcount(words).tolist() == [0, 1, 1, 64, 3]
+
+    mask = encode_white_balls([1, 2, 64, 65, 69])
+    assert mask.tolist() == [(1 << 0) | (1 << 1) | (1 << 63), (1 << 0) | (1 << 4)]
+    # Out-of-range values (NULLs mapped to 0) never set a bit
+    assert encode_white_balls([0, 0, 0, 0, 70]).tolist() == [0, 0]
+
+
+def test_prize_table_matches_calculator():
+    amounts, descriptions = prize_table(calculate_prize_amount)
+    for matches in range(6):
+        for pb_match in (False, True):
+            assert (amounts[matches, int(pb_match)], descriptions[matches][pb_match]) == \
+                calculate_prize_amount(matches, pb_match)
+
+
+def test_score_tickets_matches_set_intersection():
+    numbers, powerball = _random_tickets(2000)
+    numbers[:3] = WINNING
+    powerball[:2] = WINNING_PB
+
+    scores = score_tickets(numbers, powerball, WINNING, WINNING_PB, db.calculate_prize_amount)
+    descriptions = scores.descriptions()
+
+    for i in range(len(numbers)):
+        matches = len(set(numbers[i].tolist()) & set(WINNING))
+        pb_match = int(powerball[i]) == WINNING_PB
+        assert (scores.main_matches[i], scores.powerball_match[i]) == (matches, pb_match)
+        assert (scores.prize_amount[i], descriptions[i]) == db.calculate_prize_amount(matches, pb_match)
+    assert scores.tier_counts()[11] == 2
+
+
+def test_history_matrix_matches_pairwise_scores():
+    tickets, ticket_pb = _random_tickets(60, seed=1)
+    draws, draw_pb = _random_tickets(45, seed=2)
+
+    history = score_history(tickets, ticket_pb, draws, draw_pb, calculate_prize_amount, chunk_size=7)
+
+    assert history.main_matches.shape == (60, 45)
+    for j in range(45):
+        single = score_tickets(tickets, ticket_pb, draws[j], draw_pb[j], calculate_prize_amount)
+        assert np.array_equal(history.main_matches[:, j], single.main_matches)
+        assert np.array_equal(history.prize_amount[:, j], single.prize_amount)
+
+
+def test_per_ticket_draw_pairs_broadcast():
+    tickets, _ = _random_tickets(10, seed=3)
+    draws, _ = _random_tickets(10, seed=4)
+
+    paired = match_counts(encode_white_balls(tickets), encode_white_balls(draws))
+
+    assert paired.tolist() == [len(set(t) & set(d)) for t, d in zip(tickets.tolist(), draws.tolist())]
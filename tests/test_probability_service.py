@@ -0,0 +1,90 @@
+"""
+Tests for the shared next-draw probability cache (src/probability_service.py).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.database as db
+from src.probability_service import ProbabilityService, frame_fingerprint, get_probability_service
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    path = str(tmp_path / "probs.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    model = tmp_path / "model.pkl"
+    model.write_bytes(b"v1")
+    return get_probability_service(), path, str(model)
+
+
+def _vectors(seed):
+    rng = np.random.default_rng(seed)
+    wb, pb = rng.random(69), rng.random(26)
+    return wb / wb.sum(), pb / pb.sum()
+
+
+def test_vectors_are_computed_once_per_dataset_and_model(service):
+    svc, path, model = service
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _vectors(len(calls))
+
+    first = svc.get("xgboost", "data-a", [model], compute)
+    second = svc.get("xgboost", "data-a", [model], compute)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first[0], second[0])
+
+    # Returned arrays are copies; the cache cannot be corrupted
+    first[0][:] = 0
+    assert svc.get("xgboost", "data-a", [model], compute)[0].sum() == pytest.approx(1.0)
+
+    svc.get("xgboost", "data-b", [model], compute)
+    assert len(calls) == 2
+
+    os.utime(model, ns=(os.stat(model).st_atime_ns, os.stat(model).st_mtime_ns + 10**9))
+    assert svc.peek("xgboost", "data-a") is None  # model changed since data-a was cached
+    svc.get("xgboost", "data-a", [model], compute)
+    assert len(calls) == 3
+
+
+def test_vectors_persist_across_processes(service):
+    svc, path, model = service
+    expected = svc.get("random_forest", "data-a", [model], lambda: _vectors(5))
+
+    fresh = ProbabilityService(path)
+    assert fresh.peek("random_forest", "data-a") is not None
+    cached = fresh.get("random_forest", "data-a", [model], lambda: pytest.fail("recomputed"))
+    np.testing.assert_allclose(cached[0], expected[0])
+    np.testing.assert_allclose(cached[1], expected[1])
+
+
+def test_model_saved_by_compute_is_peekable(service, tmp_path):
+    svc, _, _ = service
+    model = tmp_path / "trained.pkl"
+
+    def train_and_predict():
+        model.write_bytes(b"trained")  # First use trains and saves the model
+        return _vectors(2)
+
+    svc.get("random_forest", "data-a", [str(model)], train_and_predict)
+    assert svc.peek("random_forest", "data-a") is not None
+
+
+def test_failed_computation_is_not_cached(service):
+    svc, _, model = service
+    assert svc.get("lstm", "data-a", [model], lambda: None) is None
+    assert svc.get("lstm", "data-a", [model], lambda: _vectors(1)) is not None
+
+
+def test_frame_fingerprint_ignores_representation():
+    base = pd.DataFrame({"draw_date": ["2025-01-01", "2025-01-04"], "n1": [1, 2], "n2": [3, 4],
+                         "n3": [5, 6], "n4": [7, 8], "n5": [9, 10], "pb": [11, 12]})
+    parsed = base.assign(draw_date=pd.to_datetime(base["draw_date"])).astype({"n1": "uint8"})
+    assert frame_fingerprint(base) == frame_fingerprint(parsed)
+    assert frame_fingerprint(base) != frame_fingerprint(base.iloc[:1])
@@ -17,6 +17,8 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from tests.helpers import make_draws
+
 
 def test_feature_engineering_performance():
     """
@@ -189,6 +191,44 @@ def test_no_nan_in_features():
     print(f"✓ No NaN values in {len(features.columns)} features")
 
 
+def test_window_and_lag_features_match_direct_computation():
+    """
+    Prefix-sum window statistics and bitmask lag matches equal the
+    straightforward per-row computation.
+    """
+    from src.ml_models.random_forest_model import RandomForestModel
+    
+    draws_df = make_draws(120, start='2015-01-01', text_dates=False)
+    features = RandomForestModel(use_pretrained=False)._engineer_features(draws_df.copy())
+    white = draws_df[['n1', 'n2', 'n3', 'n4', 'n5']].to_numpy()
+    
+    for idx in (0, 1, 19, 20, 55, 119):
+        for window in (20, 50):
+            previous = white[max(0, idx - window):idx].ravel()
+            expected_var = np.var(previous) if len(previous) else 0
+            expected_mean = np.mean(previous) if len(previous) else 0
+            assert np.isclose(features[f'num_variance_last_{window}'].iloc[idx], expected_var)
+            assert np.isclose(features[f'num_mean_last_{window}'].iloc[idx], expected_mean)
+        for lag in (1, 2, 3):
+            expected = len(set(white[idx]) & set(white[idx - lag])) if idx >= lag else 0
+            assert features[f'draw_minus_{lag}_matches'].iloc[idx] == expected
+
+
+def test_latest_only_matches_last_row_of_full_features():
+    """latest_only computes just the final row, identical to the full run."""
+    from src.ml_models.random_forest_model import RandomForestModel
+    
+    model = RandomForestModel(use_pretrained=False)
+    for n_draws in (10, 400):
+        draws_df = make_draws(n_draws, seed=n_draws, start='2015-01-01', text_dates=False)
+        full = model._engineer_features(draws_df.copy())
+        latest = model._engineer_features(draws_df, latest_only=True)
+        
+        assert len(latest) == 1
+        assert latest.index[0] == draws_df.index[-1]
+        pd.testing.assert_frame_equal(latest, full.iloc[-1:], check_exact=False, rtol=1e-10)
+
+
 if __name__ == "__main__":
     # Run tests manually
     print("Testing Random Forest Optimization...")
@@ -0,0 +1,89 @@
+"""
+Tests for request coalescing (src/single_flight.py).
+"""
+
+import asyncio
+import threading
+
+import src.analytics_snapshot as snapshots
+import src.database as db
+from src.single_flight import SingleFlight
+from tests.helpers import make_draws
+
+
+def _gated(value, calls, gate):
+    def compute():
+        calls.append(threading.current_thread().name)
+        assert gate.wait(5)
+        return value
+    return compute
+
+
+def test_concurrent_misses_share_one_computation_off_the_loop():
+    group, calls, gate = SingleFlight(), [], threading.Event()
+
+    async def scenario():
+        waiters = [asyncio.create_task(group.get("overview", 1, _gated("v1", calls, gate))) for _ in range(5)]
+        await asyncio.sleep(0.05)  # The loop keeps running while the computation is blocked
+        gate.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == ["v1"] * 5
+    assert len(calls) == 1 and calls[0].startswith("work-io")
+    stats = group.stats()["overview"]
+    assert (stats["computes"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+    assert asyncio.run(group.get("overview", 1, _gated("unused", calls, gate))) == "v1"
+    assert group.stats()["overview"]["hits"] == 1
+
+
+def test_previous_value_is_served_while_the_new_version_computes():
+    group, calls, gate = SingleFlight(), [], threading.Event()
+    gate.set()
+    asyncio.run(group.get("context", "a", _gated("old", calls, gate)))
+
+    gate.clear()
+
+    async def scenario():
+        stale = [await group.get("context", "b", _gated("new", calls, gate)) for _ in range(3)]
+        gate.set()
+        fresh = await group.get("context", "b", _gated("new", calls, gate), stale_while_revalidate=False)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(scenario())
+    assert stale == ["old"] * 3
+    assert fresh == "new"
+    assert len(calls) == 2  # one refresh, however many callers
+    assert group.stats()["context"]["stale"] == 3
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached():
+    group, attempts = SingleFlight(), []
+
+    def broken():
+        attempts.append(1)
+        raise RuntimeError("db locked")
+
+    async def scenario():
+        return await asyncio.gather(*(group.get("overview", 1, broken) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert asyncio.run(group.get("overview", 1, lambda: "ok")) == "ok"
+    assert group.stats()["overview"]["errors"] >= 1
+
+
+def test_concurrent_snapshot_requests_build_once(draws_db, monkeypatch):
+    db.bulk_insert_draws(make_draws(120, seed=3))
+
+    async def scenario():
+        return await asyncio.gather(*(snapshots.get_analytics_snapshot_async() for _ in range(8)))
+
+    results = asyncio.run(scenario())
+    assert all(snapshot is results[0] for snapshot in results)
+    assert snapshots.get_snapshot_store().builds == 1
+
+    snapshots.invalidate_analytics_snapshot()
+    assert asyncio.run(snapshots.get_analytics_snapshot_async()) is not results[0]
+    assert snapshots.get_snapshot_store().builds == 2
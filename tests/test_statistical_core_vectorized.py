@@ -0,0 +1,79 @@
+"""
+Parity tests for the vectorized v2 statistical core.
+
+The reference functions below are the iterrows loops the array code
+replaced; results must be identical, not just close.
+"""
+
+import numpy as np
+import pytest
+
+from src.v2.statistical_core import GapAnalyzer, MomentumAnalyzer, PatternEngine, TemporalDecayModel
+from tests.helpers import make_draws
+
+WHITE = ["n1", "n2", "n3", "n4", "n5"]
+
+
+def _reference_decay(draws, max_num, decay):
+    weights = np.zeros(max_num)
+    for idx, num in enumerate(draws):
+        for value in np.atleast_1d(num):
+            if 1 <= value <= max_num:
+                weights[value - 1] += np.exp(-decay * (len(draws) - idx - 1))
+    return weights / weights.sum()
+
+
+def _reference_gaps(draws, max_num):
+    gaps = np.full(max_num, len(draws))
+    for idx, numbers in enumerate(reversed(draws)):
+        for value in np.atleast_1d(numbers):
+            if 1 <= value <= max_num and gaps[value - 1] == len(draws):
+                gaps[value - 1] = idx
+    return gaps
+
+
+def _reference_frequency(draws, max_num):
+    freq = np.zeros(max_num)
+    for numbers in draws:
+        for value in np.atleast_1d(numbers):
+            if 1 <= value <= max_num:
+                freq[value - 1] += 1
+    return freq / freq.sum() if freq.sum() > 0 else freq
+
+
+@pytest.mark.parametrize("n,seed", [(30, 1), (400, 2), (1500, 3)])
+def test_analyzers_match_row_wise_reference(n, seed):
+    df = make_draws(n, seed, max_pb=39)  # Includes 2009-2015 era Powerballs
+    white = df[WHITE].to_numpy().tolist()
+    pb = df["pb"][df["pb"] <= 26].tolist()
+
+    weights = TemporalDecayModel(decay_factor=0.05, adaptive_window=False).calculate_weights(df)
+    np.testing.assert_array_equal(weights.white_ball_weights, _reference_decay(white, 69, 0.05))
+    np.testing.assert_array_equal(weights.powerball_weights, _reference_decay(pb, 26, 0.05))
+
+    gaps = GapAnalyzer().analyze(df)
+    np.testing.assert_array_equal(gaps.white_ball_gaps, _reference_gaps(white, 69))
+    np.testing.assert_array_equal(gaps.powerball_gaps, _reference_gaps(pb, 26))
+
+    momentum = MomentumAnalyzer(short_window=10, long_window=20).analyze(df)
+    short, long = _reference_frequency(white[-10:], 69), _reference_frequency(white[-20:], 69)
+    expected = np.where(long > 0, (short - long) / np.where(long > 0, long, 1), np.where(short > 0, 1.0, 0.0))
+    np.testing.assert_array_equal(momentum.white_ball_momentum, expected)
+
+    patterns = PatternEngine().analyze(df)
+    odd = [sum(v % 2 == 1 for v in row) for row in white]
+    assert patterns.odd_even_distribution == {str(i): odd.count(i) / n for i in range(6)}
+    flat = [v for row in white for v in row]
+    assert patterns.high_low_distribution == {
+        "low": sum(v <= 23 for v in flat) / len(flat),
+        "mid": sum(23 < v <= 46 for v in flat) / len(flat),
+        "high": sum(v > 46 for v in flat) / len(flat),
+    }
+    assert patterns.tens_clustering == {
+        f"{d * 10}-{d * 10 + 9}": sum((v - 1) // 10 == d for v in flat) / len(flat) for d in range(7)
+    }
+    sums = [sum(row) for row in white]
+    assert patterns.sum_range == (float(np.mean(sums)), float(np.std(sums)))
+    for template in patterns.typical_patterns:
+        assert template["numbers"] in white
+        assert template["sum"] == sum(template["numbers"])
@@ -0,0 +1,204 @@
+"""
+Tests for vectorized batch ticket generation (BaseStrategy.generate_batch).
+"""
+
+import numpy as np
+import pytest
+
+from src.strategy_generators import (
+    CoverageOptimizerStrategy,
+    FrequencyWeightedStrategy,
+    RandomBaselineStrategy,
+    RangeBalancedStrategy,
+    XGBoostMLStrategy,
+    batch_to_tickets,
+    pack_ticket_keys,
+    sample_white_balls,
+    tickets_to_batch,
+)
+
+
+def _assert_valid_batch(batch, count):
+    assert batch.shape == (count, 6)
+    assert batch.dtype == np.uint8
+    white = batch[:, :5].astype(int)
+    assert white.min() >= 1 and white.max() <= 69
+    assert np.all(np.diff(white, axis=1) > 0)  # sorted and distinct
+    assert batch[:, 5].min() >= 1 and batch[:, 5].max() <= 26
+
+
+@pytest.mark.parametrize("strategy_cls", [FrequencyWeightedStrategy, RandomBaselineStrategy, RangeBalancedStrategy])
+def test_vectorized_strategies_return_valid_batches(strategy_cls):
+    strategy = strategy_cls()
+    assert strategy.supports_batch
+    _assert_valid_batch(strategy.generate_batch(5000, np.random.default_rng(1)), 5000)
+
+
+def test_range_balanced_batch_respects_bands():
+    batch = RangeBalancedStrategy().generate_batch(2000, np.random.default_rng(2)).astype(int)
+    white = batch[:, :5]
+    assert np.all(((white >= 1) & (white <= 23)).sum(axis=1) == 2)
+    assert np.all(((white >= 24) & (white <= 46)).sum(axis=1) == 2)
+    assert np.all((white >= 47).sum(axis=1) == 1)
+
+
+def test_generic_fallback_packs_generate_output():
+    strategy = CoverageOptimizerStrategy()
+    assert not strategy.supports_batch
+    _assert_valid_batch(strategy.generate_batch(20), 20)
+
+
+def test_ml_strategy_batches_only_with_cached_probabilities():
+    strategy = XGBoostMLStrategy()
+    strategy._cached_wb_probs = np.full(69, 1 / 69)
+    strategy._cached_pb_probs = np.full(26, 1 / 26)
+    assert strategy.supports_batch
+    _assert_valid_batch(strategy.generate_batch(100, np.random.default_rng(3)), 100)
+
+    strategy._cached_wb_probs = None
+    assert not strategy.supports_batch
+    _assert_valid_batch(strategy.generate_batch(10), 10)
+
+
+def test_gumbel_top_k_matches_sequential_sampling():
+    """Inclusion rates equal those of np.random.choice(replace=False, p=...)"""
+    probs = np.linspace(1, 10, 69) ** 2
+    probs[:10] = 0  # numbers 1-10 can never be drawn
+    probs /= probs.sum()
+
+    draws = 20000
+    batch = sample_white_balls(draws, probs, np.random.default_rng(4))
+    rng = np.random.default_rng(5)
+    reference = np.array([rng.choice(69, 5, replace=False, p=probs) + 1 for _ in range(draws)])
+
+    batch_rate = np.bincount(batch.ravel(), minlength=70)[1:] / draws
+    reference_rate = np.bincount(reference.ravel(), minlength=70)[1:] / draws
+    assert batch_rate[:10].sum() == 0
+    assert np.abs(batch_rate - reference_rate).max() < 0.02
+
+
+def test_invalid_probabilities_are_rejected():
+    with pytest.raises(ValueError):
+        sample_white_balls(10, np.ones(50), np.random.default_rng())
+    with pytest.raises(ValueError):
+        sample_white_balls(10, np.eye(1, 69).ravel(), np.random.default_rng())
+
+
+def test_batch_ticket_round_trip():
+    batch = RandomBaselineStrategy().generate_batch(50, np.random.default_rng(6))
+    tickets = batch_to_tickets(batch, "random_baseline", 0.5)
+    assert tickets[0].keys() == {"white_balls", "powerball", "strategy", "confidence"}
+    assert all(isinstance(n, int) for n in tickets[0]["white_balls"])
+    assert np.array_equal(tickets_to_batch(tickets), batch)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """StrategyManager on a fresh production-schema database (no draws, no models)"""
+    import src.database as db
+    from src.strategy_generators import StrategyManager
+
+    path = str(tmp_path / "strategies.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    db.initialize_database()
+    return StrategyManager()
+
+
+def test_balanced_generation_is_unique_and_reports_stats(manager):
+    tickets, stats = manager.generate_balanced_tickets(total=55, rng=np.random.default_rng(7), return_stats=True)
+
+    assert len(tickets) == 55
+    keys = pack_ticket_keys(tickets_to_batch(tickets))
+    assert len(set(keys.tolist())) == 55
+    assert manager.last_generation_stats is stats
+    assert sum(run.generated + run.refilled for run in stats.values()) == 55
+    # Each strategy is called once per quota; top-ups only happen after duplicates
+    for name, run in stats.items():
+        assert run.generated <= run.requested
+        if run.duplicates == 0 and not run.errors and name != 'random_baseline':
+            assert run.calls == 1
+        assert run.elapsed_ms >= 0
+
+
+def test_per_strategy_generation_tops_up_duplicates(manager):
+    strategy = manager.strategies['random_baseline']
+    calls = []
+    original = strategy.generate_batch
+
+    def first_batch_all_duplicates(count, rng=None):
+        calls.append(count)
+        batch = original(count, rng)
+        if len(calls) == 1:
+            batch[:] = batch[0]
+        return batch
+
+    strategy.generate_batch = first_batch_all_duplicates
+    tickets, stats = manager.generate_tickets_per_strategy(count_per_strategy=4, return_stats=True)
+
+    assert calls[:2] == [4, 3]  # only the shortfall is requested again
+    assert stats['random_baseline'].duplicates == 3
+    assert [t['strategy'] for t in tickets].count('random_baseline') == 4
+    assert len(set(pack_ticket_keys(tickets_to_batch(tickets)).tolist())) == len(tickets)
+
+
+def test_strategies_are_built_on_first_selection(manager, monkeypatch):
+    assert manager.strategies.loaded_names() == []
+    assert 'ai_guided' in manager.strategies and len(manager.strategies) == 11
+
+    weights = {name: 0.0 for name in manager.strategies}
+    weights['range_balanced'] = 1.0
+    monkeypatch.setattr(manager, "get_strategy_weights", lambda: weights)
+    tickets = manager.generate_balanced_tickets(total=5)
+
+    assert {t['strategy'] for t in tickets} == {'range_balanced'}
+    assert manager.strategies.loaded_names() == ['range_balanced']
+    assert list(manager.load_stats) == ['range_balanced']
+
+
+def test_slow_ml_strategy_quota_goes_to_random_baseline(manager, monkeypatch):
+    import threading
+    import src.strategy_generators as sg
+
+    release = threading.Event()
+
+    def slow_build(name, strategy_cls):
+        if name == 'xgboost_ml':
+            release.wait(5)
+        return strategy_cls()
+
+    manager.strategies = sg.LazyStrategies(sg.STRATEGY_CLASSES, slow_build)
+    weights = {name: 0.0 for name in manager.strategies}
+    weights['xgboost_ml'] = 1.0
+    monkeypatch.setattr(manager, "get_strategy_weights", lambda: weights)
+
+    tickets, stats = manager.generate_balanced_tickets(total=5, return_stats=True, load_timeout=0.05)
+    release.set()
+
+    assert len(tickets) == 5
+    assert stats['xgboost_ml'].errors == ["still loading"]
+    # Refills are not counted as tickets random_baseline was selected for
+    assert (stats['random_baseline'].refilled, stats['random_baseline'].generated) == (5, 0)
+    assert stats['random_baseline'].to_dict()['refilled'] == 5
+    # The model keeps loading in the background and is used once ready
+    assert manager.strategies.load('xgboost_ml').result(timeout=5) is manager.strategies['xgboost_ml']
+
+
+def test_batch_callers_can_wait_for_slow_strategies(manager, monkeypatch):
+    import threading
+    import src.strategy_generators as sg
+
+    def slow_build(name, strategy_cls):
+        if name == 'xgboost_ml':
+            threading.Event().wait(0.3)
+        return strategy_cls()
+
+    manager.strategies = sg.LazyStrategies(sg.STRATEGY_CLASSES, slow_build)
+    weights = {name: 0.0 for name in manager.strategies}
+    weights['xgboost_ml'] = 1.0
+    monkeypatch.setattr(manager, "get_strategy_weights", lambda: weights)
+
+    tickets, stats = manager.generate_balanced_tickets(total=5, return_stats=True, load_timeout=None)
+
+    assert stats['xgboost_ml'].errors == []
+    assert 'random_baseline' not in stats
+    assert len(tickets) == 5
@@ -0,0 +1,101 @@
+"""
+Tests for the shared, hot-reloadable StrategyManager registry (src/strategy_registry.py).
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+import src.database as db
+import src.strategy_generators as strategy_generators
+import src.strategy_registry as strategy_registry
+from src.draw_store import invalidate_draw_store
+
+
+class FakeManager:
+    """Stands in for StrategyManager; counts how often it is built"""
+    builds = 0
+
+    def __init__(self):
+        FakeManager.builds += 1
+        self.load_stats = {"random_baseline": {"load_ms": 1.0, "rss_delta_mb": 0.0, "batch": True}}
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    path = str(tmp_path / "registry.db")
+    monkeypatch.setattr(db, "get_db_path", lambda: path, raising=True)
+    db.initialize_database()
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "model.pkl").write_bytes(b"v1")
+    monkeypatch.setattr(strategy_registry, "MODELS_DIR", str(models))
+    monkeypatch.setattr(strategy_generators, "StrategyManager", FakeManager)
+    FakeManager.builds = 0
+    return strategy_registry.get_strategy_registry(), path, models
+
+
+def _insert_draw(path, date):
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO powerball_draws (draw_date, n1, n2, n3, n4, n5, pb) VALUES (?,1,2,3,4,5,6)", (date,))
+    conn.commit()
+    conn.close()
+    invalidate_draw_store()
+
+
+def test_manager_is_built_once_and_shared(registry):
+    reg, _, _ = registry
+    first = strategy_registry.get_strategy_manager()
+    assert strategy_registry.get_strategy_manager() is first
+    assert reg.get(revalidate=True) is first
+    assert FakeManager.builds == 1
+
+    stats = reg.stats()
+    assert stats["generation"] == 1
+    assert stats["strategies"]["random_baseline"]["load_ms"] == 1.0
+
+
+def test_new_draw_or_model_file_swaps_in_a_new_manager(registry):
+    reg, path, models = registry
+    first = reg.get()
+
+    _insert_draw(path, "2025-01-01")
+    second = reg.get(revalidate=True)
+    assert second is not first
+    assert reg.stats()["version"]["draw_count"] == 1
+
+    model = models / "model.pkl"
+    model.write_bytes(b"retrained")
+    os.utime(model, ns=(model.stat().st_atime_ns, model.stat().st_mtime_ns + 10**9))
+    third = reg.get(revalidate=True)
+    assert third is not second
+    assert FakeManager.builds == 3
+
+
+def test_non_model_files_do_not_trigger_a_rebuild(registry):
+    reg, _, models = registry
+    first = reg.get()
+
+    (models / "features_random_forest.npz").write_bytes(b"cache")
+    (models / "rf_scaler.pkl.123.tmp").write_bytes(b"partial")
+    assert reg.get(revalidate=True) is first
+    assert FakeManager.builds == 1
+
+
+def test_reload_and_reset_pick_up_a_replaced_manager(registry, monkeypatch):
+    reg, _, _ = registry
+    first = reg.get()
+    assert reg.reload("test") is not first
+    assert reg.stats()["reason"] == "test"
+
+    class OtherManager(FakeManager):
+        pass
+
+    monkeypatch.setattr(strategy_generators, "StrategyManager", OtherManager)
+    assert not isinstance(reg.get(), OtherManager)  # No factory check on the read path
+    assert isinstance(reg.reload("replaced"), OtherManager)
+
+    strategy_registry.reset_strategy_registry()
+    assert strategy_registry.get_strategy_registry() is not reg
+    assert isinstance(strategy_registry.get_strategy_manager(), OtherManager)
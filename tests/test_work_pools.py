@@ -0,0 +1,79 @@
+"""
+Tests for the off-event-loop work pools (src/work_pools.py).
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import src.analytics_snapshot as snapshots
+import src.database as db
+from src.work_pools import WorkPool, _parse_assignments
+from tests.helpers import make_draws
+
+
+def test_queue_depth_and_outcomes_are_counted():
+    pool, gate = WorkPool("test", 1), threading.Event()
+    try:
+        futures = [pool.submit(gate.wait, 5) for _ in range(3)]
+        futures.append(pool.submit(lambda: 1 / 0))
+        time.sleep(0.05)
+        stats = pool.snapshot_stats()
+        assert (stats["active"], stats["queued"], stats["max_queued"]) == (1, 3, 3)
+
+        gate.set()
+        for future in futures:
+            future.exception(5)
+        stats = pool.snapshot_stats()
+        assert (stats["submitted"], stats["completed"], stats["failed"]) == (4, 3, 1)
+        assert (stats["active"], stats["queued"]) == (0, 0)
+        assert stats["wait_ms_total"] > 0
+    finally:
+        pool.shutdown()
+
+
+def test_endpoint_assignments_from_env_ignore_unknown_pools():
+    assert _parse_assignments("recent_draws=cpu, system_stats = io,bad=gpu,") == {
+        "recent_draws": "cpu",
+        "system_stats": "io",
+    }
+
+
+def test_health_check_stays_fast_while_analytics_recomputes(draws_db, monkeypatch):
+    db.bulk_insert_draws(make_draws(100, seed=5))
+
+    build_sections = snapshots.build_sections
+
+    def slow_build_sections():
+        time.sleep(0.5)  # Blocking, like a large history
+        return build_sections()
+
+    monkeypatch.setattr(snapshots, "build_sections", slow_build_sections)
+
+    from src.v2.analytics_api import analytics_router
+
+    app = FastAPI()
+    app.include_router(analytics_router)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            overviews = [asyncio.create_task(client.get("/api/v3/analytics/overview")) for _ in range(4)]
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            health = await client.get("/health")
+            health_ms = (time.perf_counter() - started) * 1000
+            return health, health_ms, await asyncio.gather(*overviews)
+
+    health, health_ms, overviews = asyncio.run(scenario())
+    assert health.status_code == 200
+    assert health_ms < 250
+    assert all(response.status_code == 200 for response in overviews)
+    assert snapshots.get_snapshot_store().builds == 1